@@ -0,0 +1,207 @@
+import contextlib
+import glob
+import io
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ctr.bclyt import Bclyt
+from ctr.msbp import Msbp
+
+"""
+Batch conversion of whole folders of files to JSON.
+
+The inputs can be folders (searched recursively), glob patterns or single files. Every supported
+file found is parsed and serialized by a pool of worker processes, and written to the output
+folder under the same relative path it had under its input, with '.json' appended:
+
+    convert_all(['romfs/Layout', 'romfs/**/*.msbp'], 'out', jobs=8)
+
+A file that fails to convert is reported in the result instead of stopping the batch, and so is a file
+whose worker process dies (e.g. of a crash in a native library): the files the dead worker took down
+with it are converted again. Two files that would be written to the same output path (such as x.msbp
+at the top of two input folders) are an error, raised before anything is converted.
+"""
+
+def convert_msbp(inpath: str, outpath: str) -> None:
+    """Converts an MSBP file to JSON, the same way as scripts/Message/MSBP-to-JSON.py."""
+    project = Msbp(inpath)
+    with open(outpath, "w", encoding="utf-8") as f:
+        project.export_json(f, ascii=True)
+
+def convert_bclyt(inpath: str, outpath: str) -> None:
+    """Converts a BCLYT file to JSON, the same way as scripts/Layout/BCLYT-to-JSON-(WIP).py."""
+    layout = Bclyt(inpath)
+    with open(outpath, "w", encoding="utf-8") as f:
+        layout.export_json(f)
+
+# The converter for each supported file extension
+CONVERTERS = {
+    ".msbp": convert_msbp,
+    ".bclyt": convert_bclyt,
+}
+
+class BatchJob:
+    """A file to convert, and where to write it."""
+
+    def __init__(self, inpath: str, outpath: str):
+        self.inpath = inpath
+        self.outpath = outpath
+
+class BatchFailure:
+    """A file that failed to convert, with the error and its traceback."""
+
+    def __init__(self, inpath: str, error: str, details: str):
+        self.inpath = inpath
+        self.error = error
+        self.details = details
+
+    def __str__(self) -> str:
+        return self.inpath + ": " + self.error
+
+class BatchResult:
+    """The outcome of a batch conversion."""
+
+    def __init__(self):
+        self.converted: list[str] = []
+        self.failures: list[BatchFailure] = []
+        self.seconds: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return len(self.converted) + len(self.failures)
+
+def glob_root(pattern: str) -> str:
+    """Returns the folder a glob pattern starts matching in, i.e. its path up to the first wildcard."""
+    parts = []
+    for part in pattern.replace("\\", "/").split("/"):
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return "/".join(parts) or "."
+
+def find_jobs(inputs: list[str], outputDir: str, extensions=CONVERTERS.keys()) -> list[BatchJob]:
+    """Finds the files to convert in a list of folders, glob patterns and files,
+    and pairs each one with its output path (keeping its path relative to its input).
+    Raises a ValueError if two different files would be written to the same output path."""
+    jobs: list[BatchJob] = []
+    seen: set = set()
+
+    # The input of each output path, to catch two inputs that would overwrite each other's outputs
+    outputs: dict[str, str] = {}
+
+    def add(path: str, root: str) -> None:
+        key = os.path.normcase(os.path.abspath(path))
+        if os.path.splitext(path)[1].lower() not in extensions or key in seen:
+            return
+        seen.add(key)
+        relativePath = os.path.relpath(path, root)
+        outpath = os.path.join(outputDir, relativePath + ".json")
+
+        outputKey = os.path.normcase(os.path.abspath(outpath))
+        if outputKey in outputs:
+            raise ValueError("Inputs '" + outputs[outputKey] + "' and '" + path + "' would both be written to '" + outpath + "'!")
+        outputs[outputKey] = path
+        jobs.append(BatchJob(path, outpath))
+
+    for inputPath in inputs:
+        if os.path.isdir(inputPath):
+            # Search the folder recursively, in a stable order
+            for folder, folders, files in os.walk(inputPath):
+                folders.sort()
+                for name in sorted(files):
+                    add(os.path.join(folder, name), inputPath)
+        elif glob.has_magic(inputPath):
+            root = glob_root(inputPath)
+            for path in sorted(glob.glob(inputPath, recursive=True)):
+                if os.path.isfile(path):
+                    add(path, root)
+        elif os.path.isfile(inputPath):
+            add(inputPath, os.path.dirname(inputPath))
+        else:
+            raise FileNotFoundError("Input '" + inputPath + "' is not a file, folder or glob pattern with matches!")
+
+    return jobs
+
+def convert_file(job: BatchJob) -> BatchFailure or None:
+    """Converts a single file, returning the failure instead of raising it so the batch can go on."""
+    try:
+        os.makedirs(os.path.dirname(job.outpath) or ".", exist_ok=True)
+
+        # The parsers print their progress, which would only interleave between the workers
+        with contextlib.redirect_stdout(io.StringIO()):
+            CONVERTERS[os.path.splitext(job.inpath)[1].lower()](job.inpath, job.outpath)
+        return None
+    except Exception as e:
+        return BatchFailure(job.inpath, type(e).__name__ + ": " + str(e), traceback.format_exc())
+
+def convert_files(jobs: list[BatchJob]) -> list[BatchFailure or None]:
+    """Converts a chunk of files in a worker process."""
+    return [convert_file(job) for job in jobs]
+
+def convert_in_pool(batchJobs: list[BatchJob], jobs: int, report) -> None:
+    """Converts the files with a pool of jobs worker processes, calling report with each job and its failure.
+
+    A worker that dies breaks the whole pool, and every file that hadn't finished by then fails with
+    BrokenProcessPool. Those files are converted again by a single worker, which takes them in order, so the
+    first of them to break it is the one that killed its worker: it's reported as failed, and the files after it
+    go back to the full pool."""
+    remaining = batchJobs
+    isolating = False
+    while remaining:
+        workers = 1 if isolating else jobs
+        # Hand the files out in chunks, so the workers aren't waiting on the main process for small files
+        chunkSize = 1 if isolating else max(1, min(32, len(remaining) // (workers * 4)))
+        chunks = [remaining[i:i + chunkSize] for i in range(0, len(remaining), chunkSize)]
+
+        unfinished: list[BatchJob] = []
+        broken = False
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(convert_files, chunk) for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                try:
+                    failures = future.result()
+                except BrokenProcessPool:
+                    if isolating and not broken:
+                        report(chunk[0], BatchFailure(chunk[0].inpath, "BrokenProcessPool: the worker process died while converting the file",
+                                                      traceback.format_exc()))
+                    else:
+                        unfinished.extend(chunk)
+                    broken = True
+                    continue
+                for job, failure in zip(chunk, failures):
+                    report(job, failure)
+
+        # Find the file that broke the pool, or carry on with the files after it
+        isolating = not isolating and len(unfinished) > 0
+        remaining = unfinished
+
+def convert_all(inputs: list[str], outputDir: str, jobs: int = None, progress=None) -> BatchResult:
+    """Converts every supported file in the inputs to JSON in outputDir, using jobs worker processes
+    (as many as there are CPUs if None, and no workers at all if 1). The progress function is
+    called with each job and its failure (or None) as the files finish."""
+    batchJobs = find_jobs(inputs, outputDir)
+    result = BatchResult()
+    start = time.perf_counter()
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+
+    def report(job: BatchJob, failure: BatchFailure or None) -> None:
+        if failure is None:
+            result.converted.append(job.inpath)
+        else:
+            result.failures.append(failure)
+        if progress is not None:
+            progress(job, failure)
+
+    if jobs <= 1:
+        for job in batchJobs:
+            report(job, convert_file(job))
+    else:
+        convert_in_pool(batchJobs, jobs, report)
+
+    result.seconds = time.perf_counter() - start
+    return result
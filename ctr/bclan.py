@@ -0,0 +1,129 @@
+from typing import TextIO
+
+from ctr.util.data_stream import DataStream
+from ctr.util.serialize import JsonWriter, to_json
+
+from ctr.lib.lan.pat1 import Pat1
+from ctr.lib.lan.pai1 import Pai1
+from ctr.lib.lan.curves import AnimationCurves, curveLabel
+
+"""
+BCLAN (Binary CTR Layout Animation)
+===================
+Offset |  Size  |   Type   | Description
+-------+--------+----------+------------
+ 0x00  |  0x04  |  string  | Signature (CLAN)
+ 0x04  |  0x02  |  uint16  | Byte Order Mark
+ 0x06  |  0x02  |  uint16  | Header Length (0x14)
+ 0x08  |  0x04  |  uint32  | Revision
+ 0x0C  |  0x04  |  uint32  | File Size
+ 0x10  |  0x02  |  uint16  | Section Count
+ 0x12  |  0x02  |  uint16  | Padding
+===================
+The sections are a PAT1 (the name of the animation, its frame range and the groups it applies to)
+and a PAI1 (the animated panes and materials, and the curves of their values), see ctr.lib.lan.
+"""
+
+# The section classes, with the attribute they are stored in
+SECTIONS = {
+    'pat1': (Pat1, 'patternInfo'),
+    'pai1': (Pai1, 'animationInfo'),
+}
+
+class Bclan:
+    """A class to represent a BCLAN file.
+
+    The keys of the animation's curves are numpy arrays, and curves() gathers the curves into an
+    AnimationCurves, which evaluates all of them at many frames in one call."""
+
+    filepath: str = None
+
+    byteOrderMark: str = None
+    revision: int = None
+    fileSize: int = None
+    sectionCount: int = None
+
+    patternInfo: Pat1 = None
+    animationInfo: Pai1 = None
+
+    def __init__(self, filepath: str = None):
+        if filepath is not None:
+            self.parse(filepath)
+
+    def parse(self, filepath: str) -> None:
+        self.filepath = filepath
+        with open(filepath, 'rb') as d, DataStream.from_file(d) as data:
+            self.read(data)
+
+    def read(self, data: DataStream) -> None:
+        """Reads a BCLAN file from a data stream covering the whole file."""
+
+        # Read the first 4 bytes of the file as a string to check for a valid signature
+        signature = data.read_string(4)
+        if signature != 'CLAN':
+            raise ValueError("Input file specified has an invalid signature! (Expected 'CLAN', got '" + str(signature) + "')")
+
+        # Read the byte order mark, and set the byte order of the data stream
+        bom = data.read_bytes(2)
+        if not (bom == b'\xFE\xFF' or bom == b'\xFF\xFE'):
+            raise ValueError("Input file specified has an invalid byte order mark! (Expected b'\\xFE\\xFF' or b'\\xFF\\xFE', got " + str(bom) + ")")
+        self.byteOrderMark = 'little' if bom == b'\xFF\xFE' else 'big'
+        data.byteOrder = self.byteOrderMark
+
+        headerLength = data.read_uint16()
+        self.revision = data.read_uint32()
+        self.fileSize = data.read_uint32()
+        self.sectionCount = data.read_uint16()
+        data.read_uint16() # Padding
+
+        # Read the sections, each starting with its magic and its size (which includes the magic and size)
+        self.patternInfo = self.animationInfo = None
+        offset = headerLength
+        for _ in range(self.sectionCount):
+            data.seek(offset)
+            magic = data.read_string(4)
+            size = data.read_uint32()
+            if size < 8:
+                raise ValueError("Section '" + str(magic) + "' at offset " + hex(offset) + " has an invalid size! (" + str(size) + ")")
+
+            if magic in SECTIONS:
+                sectionType, attribute = SECTIONS[magic]
+                data.seek(offset + 4)
+                setattr(self, attribute, sectionType(data))
+            else:
+                print("Unknown section magic '" + str(magic) + "' at offset " + str(offset) + "!")
+            offset += size
+
+    def curves(self, tags: tuple[str, ...] = None) -> AnimationCurves:
+        """Gathers the curves of the animation (only those of the given tags, such as ('CLPA', 'CLVI'), if tags
+        is set) into an AnimationCurves, with a row per curve labelled by its entry, tag, target and index."""
+        labels = []
+        targets = []
+        if self.animationInfo is not None:
+            for entry in self.animationInfo.entries:
+                for tag in entry.tags:
+                    if tags is not None and tag.magic not in tags:
+                        continue
+                    for target in tag.targets:
+                        labels.append(curveLabel(entry.name, tag.magic, tag.target_name(target), target.index))
+                        targets.append(target)
+
+        frameSize = self.animationInfo.frameSize if self.animationInfo is not None else None
+        loop = bool(self.animationInfo.loop) if self.animationInfo is not None else False
+        return AnimationCurves(labels, targets, frameSize, loop)
+
+    def to_dict(self) -> dict:
+        return {
+            "byteOrderMark": self.byteOrderMark,
+            "revision": self.revision,
+            "fileSize": self.fileSize,
+            "patternInfo": self.patternInfo.to_dict() if self.patternInfo is not None else None,
+            "animationInfo": self.animationInfo.to_dict() if self.animationInfo is not None else None,
+        }
+
+    def export_json(self, file: TextIO, indent: int = None, compact: bool = False, ascii: bool = False) -> None:
+        """Writes the animation to a text file object as JSON."""
+        JsonWriter(file, indent, compact, ascii=ascii).write(self.to_dict())
+
+    def __str__(self) -> str:
+        return to_json(self.to_dict())
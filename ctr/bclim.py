@@ -0,0 +1,226 @@
+import os
+
+from ctr.util.data_stream import DataStream
+from ctr.util.serialize import to_json
+from ctr.util.write_stream import WriteStream
+
+"""
+BCLIM (Binary CTR Layout Image)
+===================
+The texture data comes first, and is followed by a 0x28 byte footer:
+
+Offset |  Size  |   Type   | Description
+-------+--------+----------+------------
+ 0x00  |  0x04  |  string  | Signature (CLIM)
+ 0x04  |  0x02  |  uint16  | Byte Order Mark
+ 0x06  |  0x02  |  uint16  | Header Length (0x14)
+ 0x08  |  0x04  |  uint32  | Version
+ 0x0C  |  0x04  |  uint32  | File Size
+ 0x10  |  0x02  |  uint16  | Block Count (1)
+ 0x12  |  0x02  |  uint16  | Padding
+ 0x14  |  0x04  |  string  | Signature (imag)
+ 0x18  |  0x04  |  uint32  | Block Size (0x10)
+ 0x1C  |  0x02  |  uint16  | Width
+ 0x1E  |  0x02  |  uint16  | Height
+ 0x20  |  0x04  |  uint32  | Format (see ctr.lib.texture.formats)
+ 0x24  |  0x04  |  uint32  | Texture Data Size
+===================
+Notes: The texture is stored with its width and height rounded up to powers of two (of at least 8),
+and the image is the top left width x height pixels of it.
+"""
+
+FOOTER_SIZE = 0x28
+HEADER_LENGTH = 0x14
+IMAGE_BLOCK_SIZE = 0x10
+DEFAULT_VERSION = 0x02020000
+
+
+def texture_dimension(size: int) -> int:
+    """Rounds an image dimension up to the dimension of its texture, a power of two of at least 8."""
+    dimension = 8
+    while dimension < size:
+        dimension *= 2
+    return dimension
+
+
+class Bclim:
+    """A class to represent a BCLIM file (a texture used by layouts).
+
+    decode() returns the image as a height x width x 4 numpy array of RGBA pixels, and from_image() builds
+    a BCLIM from one. The texture modules need numpy, so they're only imported when the image (or the
+    name of its format) is needed."""
+
+    filepath: str = None
+
+    byteOrderMark: str = None
+    version: int = None
+    fileSize: int = None
+
+    width: int = None
+    height: int = None
+    format: int = None
+    imageData: bytes = None
+
+    def __init__(self, filepath: str = None):
+        if filepath is not None:
+            self.parse(filepath)
+
+    @classmethod
+    def from_image(cls, image, format: int or str, quality: str = 'fast', jobs: int = 1) -> 'Bclim':
+        """Builds a BCLIM from a height x width x 4 numpy array of RGBA pixels, encoded in a format (its id or
+        name). ETC1 textures are encoded with a quality tier ('fast' or 'full'), by jobs worker processes."""
+        import numpy
+        from ctr.lib.texture.formats import FORMAT_IDS, TEXTURE_FORMATS, encode_texture
+
+        formatId = FORMAT_IDS.get(format) if isinstance(format, str) else format
+        if formatId not in TEXTURE_FORMATS:
+            raise ValueError("Unknown texture format '" + str(format) + "'!")
+
+        bclim = cls()
+        bclim.byteOrderMark = 'little'
+        bclim.version = DEFAULT_VERSION
+        bclim.height, bclim.width = image.shape[:2]
+        bclim.format = formatId
+
+        # Pad the image to the size of its texture by repeating its edges, which keeps the edge blocks of ETC1 smooth
+        textureWidth, textureHeight = bclim.textureSize
+        padded = numpy.pad(image, ((0, textureHeight - bclim.height), (0, textureWidth - bclim.width), (0, 0)), mode='edge')
+        bclim.imageData = encode_texture(padded, formatId, quality, jobs)
+        bclim.fileSize = len(bclim.imageData) + FOOTER_SIZE
+        return bclim
+
+    def parse(self, filepath: str) -> None:
+        self.filepath = filepath
+        with open(filepath, 'rb') as d, DataStream.from_file(d) as data:
+            self.read(data)
+
+    def read(self, data: DataStream) -> None:
+        """Reads the footer of a BCLIM file and its texture data, the stream covering the whole file."""
+        length = len(data.data)
+        if length < FOOTER_SIZE:
+            raise ValueError("Input file specified is too short to be a BCLIM! (" + str(length) + " bytes)")
+
+        # Read the signature at the start of the footer
+        footerStart = length - FOOTER_SIZE
+        data.seek(footerStart)
+        signature = data.read_string(4)
+        if signature != 'CLIM':
+            raise ValueError("Input file specified has an invalid signature! (Expected 'CLIM', got '" + str(signature) + "')")
+
+        # Read the byte order mark, and set the byte order of the data stream
+        bom = data.read_bytes(2)
+        if not (bom == b'\xFE\xFF' or bom == b'\xFF\xFE'):
+            raise ValueError("Input file specified has an invalid byte order mark! (Expected b'\\xFE\\xFF' or b'\\xFF\\xFE', got " + str(bom) + ")")
+        self.byteOrderMark = 'little' if bom == b'\xFF\xFE' else 'big'
+        data.byteOrder = self.byteOrderMark
+
+        headerLength = data.read_uint16()
+        self.version = data.read_uint32()
+        self.fileSize = data.read_uint32()
+        data.read_uint16() # Block count
+        data.read_uint16() # Padding
+
+        # The image block follows the header
+        data.seek(footerStart + headerLength)
+        magic = data.read_string(4)
+        if magic != 'imag':
+            raise ValueError("Input file specified has an invalid magic! (Expected 'imag', got '" + str(magic) + "')")
+        data.read_uint32() # Block size
+        self.width = data.read_uint16()
+        self.height = data.read_uint16()
+        self.format = data.read_uint32()
+
+        # The size of the texture data is the last value of the file
+        data.seek(length - 4)
+        dataSize = data.read_uint32()
+        if dataSize > footerStart:
+            raise ValueError("The texture data of the BCLIM is larger than the file! (" + str(dataSize) + " bytes)")
+        data.seek(0)
+        self.imageData = data.read_bytes(dataSize)
+
+    @property
+    def formatName(self) -> str:
+        """The name of the pixel format of the texture (such as 'RGBA8' or 'ETC1')."""
+        from ctr.lib.texture.formats import TEXTURE_FORMATS
+        return TEXTURE_FORMATS[self.format].name if self.format in TEXTURE_FORMATS else None
+
+    @property
+    def textureSize(self) -> tuple[int, int]:
+        """The width and height the texture is stored with."""
+        return texture_dimension(self.width), texture_dimension(self.height)
+
+    def decode(self, bandHeight: int = None):
+        """Decodes the image into a height x width x 4 numpy array of RGBA pixels, with the rows from top to bottom.
+        ETC1 textures are decoded bandHeight rows at a time (a multiple of 8), which bounds the memory used."""
+        from ctr.lib.texture.formats import ETC1_BAND_HEIGHT, decode_texture
+
+        textureWidth, textureHeight = self.textureSize
+        pixels = decode_texture(self.imageData, textureWidth, textureHeight, self.format, bandHeight or ETC1_BAND_HEIGHT)
+        return pixels[:self.height, :self.width]
+
+    def export(self, outpath=None):
+        """Exports the BCLIM class as a BCLIM file."""
+
+        # Set the output path to the input path if it's not specified.
+        if outpath is None:
+            outpath = self.filepath
+
+        # Build the file in memory first, so a failed export doesn't leave a partial file behind
+        fileBytes = self.export_bytes()
+
+        # Delete the file if it already exists
+        if os.path.exists(outpath):
+            os.remove(outpath)
+
+        # Write the whole file in one go
+        with open(outpath, 'wb') as f:
+            f.write(fileBytes)
+
+    def export_bytes(self) -> bytes:
+        """Exports the BCLIM class as the bytes of a BCLIM file."""
+        data = WriteStream(None, self.byteOrderMark)
+
+        # Write the texture data, then the footer after it
+        data.write_bytes(self.imageData)
+        data.write_string('CLIM')
+
+        # Write the byte order mark
+        if self.byteOrderMark == "little":
+            data.write_bytes(b'\xFF\xFE')
+        elif self.byteOrderMark == "big":
+            data.write_bytes(b'\xFE\xFF')
+
+        data.write_uint16(HEADER_LENGTH)
+        data.write_uint32(self.version)
+
+        # Reserve the file size, followed by the block count and padding
+        fileSize = data.reserve_uint32()
+        data.write_uint16(1)
+        data.write_uint16(0)
+
+        # Write the image block
+        data.write_string('imag')
+        data.write_uint32(IMAGE_BLOCK_SIZE)
+        data.write_uint16(self.width)
+        data.write_uint16(self.height)
+        data.write_uint32(self.format)
+        data.write_uint32(len(self.imageData))
+
+        # Fill in the file size
+        fileSize.set(data.tell())
+        self.fileSize = data.tell()
+        return data.getvalue()
+
+    def to_dict(self) -> dict:
+        return {
+            "byteOrderMark": self.byteOrderMark,
+            "version": self.version,
+            "fileSize": self.fileSize,
+            "width": self.width,
+            "height": self.height,
+            "format": self.formatName,
+            "dataSize": len(self.imageData),
+        }
+
+    def __str__(self) -> str:
+        return to_json(self.to_dict())
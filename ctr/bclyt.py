@@ -1,8 +1,9 @@
 import os
+from typing import Iterator, TextIO
 
 from ctr.util.data_stream import DataStream
 from ctr.util.write_stream import WriteStream
-from ctr.util.serialize import JsonSerialize
+from ctr.util.serialize import JsonWriter, to_json
 
 from ctr.lib.lyt.layoutbase import LayoutBase
 from ctr.lib.lyt.lyt1 import Lyt1
@@ -17,8 +18,47 @@ from ctr.lib.lyt.wnd1 import Wnd1
 from ctr.lib.lyt.grp1 import Grp1
 from ctr.clyt import Clyt
 
+# The sections decoded on their own, with their class and the attribute they are stored in
+LIST_SECTIONS = {
+    'txl1': (Txl1, '_textureList'),
+    'fnl1': (Fnl1, '_fontList'),
+    'mat1': (Mat1, '_materialList'),
+}
+
+# The pane sections that can be created without arguments
+PANE_TYPES = {
+    'pan1': Pan1,
+    'pic1': Pic1,
+    'bnd1': Bnd1,
+    'txt1': Txt1,
+}
+
+def lazy_part(attribute: str, part: str, shared: bool = False) -> property:
+    """Creates a property for a part of the layout, which is decoded the first time it's accessed
+    when the file was opened lazily. Assigning the property replaces the part without decoding it,
+    unless the part is shared with other properties (as the tree is by the root pane and group),
+    in which case it's decoded first so the others keep their value."""
+
+    def get(self):
+        if part in self._pending:
+            self._decode(part)
+        return getattr(self, attribute)
+
+    def set(self, value):
+        if shared and part in self._pending:
+            self._decode(part)
+        self._pending.discard(part)
+        setattr(self, attribute, value)
+
+    return property(get, set)
+
 class Bclyt(LayoutBase):
-    """A class to represent a BCLYT file."""
+    """A class to represent a BCLYT file.
+
+    Opening a file with lazy=True only reads the header and walks the section headers into
+    sectionIndex, a list of (magic, offset, size) tuples. The texture, font and material lists and
+    the pane and group trees are then decoded from the memory-mapped file the first time they are
+    accessed, and the file stays open until everything has been decoded or close() is called."""
 
     filepath: str = None
 
@@ -29,189 +69,352 @@ class Bclyt(LayoutBase):
     padding: int = None
 
     layoutParams: Lyt1 = None
+    sectionIndex: list[tuple[str, int, int]] = None
 
-    textureList: Txl1 = None
-    fontList: Fnl1 = None
-    materialList: Mat1 = None
     layout = None
-    rootPane = None
-    rootGroup = None
 
-    def __init__(self, filepath: str = None):
+    textureList: Txl1 = lazy_part('_textureList', 'txl1')
+    fontList: Fnl1 = lazy_part('_fontList', 'fnl1')
+    materialList: Mat1 = lazy_part('_materialList', 'mat1')
+    rootPane = lazy_part('_rootPane', 'tree', shared=True)
+    rootGroup = lazy_part('_rootGroup', 'tree', shared=True)
+
+    def __init__(self, filepath: str = None, lazy: bool = False):
         super().__init__()
         self.type = 'Layout'
-        if filepath is not None:
-            self.parse(filepath)
 
-    def parse(self, filepath: str):
-        self.filepath = filepath
-
-        # Read the BCLYT file
-        with open(filepath, 'rb') as d:
+        self._textureList = None
+        self._fontList = None
+        self._materialList = None
+        self._rootPane = None
+        self._rootGroup = None
 
-            print("Parsing BCLYT file...")
+        # The parts that still have to be decoded, and the open file they are decoded from
+        self._pending = set()
+        self._file = None
+        self._data = None
 
-            # Create a data stream object
-            data = DataStream(d)
-
-            # Read the first 4 bytes of the file as a string to check for a valid signature
-            signature = data.read_string(4)
-            if signature != 'CLYT':
-                raise ValueError("Input file specified has an invalid signature! (Expected 'CLYT', got '" + str(self.signature) + "')")
-            
-            # Read the next 2 bytes to get the byte order mark
-            bom = data.read_bytes(2)
-            if not (bom == b'\xFE\xFF' or bom == b'\xFF\xFE'):
-                raise ValueError("Input file specified has an invalid byte order mark! (Expected b'\\xFE\\xFF' or b'\\xFF\\xFE', got " + str(bom) + ")")
-            bom = 'little' if bom == b'\xFF\xFE' else 'big'
-            self.byteOrderMark = bom
+        if filepath is not None:
+            self.parse(filepath, lazy)
 
-            # Set the byte order of the data stream
-            data.byteOrder = bom
+    def parse(self, filepath: str, lazy: bool = False):
+        self.close()
+        self.filepath = filepath
 
-            # Read the next 2 bytes to get the header length
-            headerLength = data.read_uint16()
+        # Open the BCLYT file through a memory-mapped data stream, which is kept open for lazy decoding
+        self._file = open(filepath, 'rb')
+        self._data = data = DataStream.from_file(self._file)
 
-            # Read the next 4 bytes to the get the revision
-            self.revision = data.read_uint32()
+        try:
+            print("Parsing BCLYT file...")
 
-            # Read the next 4 bytes to get the file size
-            self.fileSize = data.read_uint32()
+            headerLength = self.read_header(data)
 
-            # Read the next 4 bytes to get the number of sections
-            self.sectionCount = data.read_uint32()
+            # Walk the section headers
+            data.seek(headerLength)
+            self.sectionIndex = self.read_section_index(data, self.sectionCount)
 
-            # Read the next 4 bytes to check for valid magic
-            magic = data.read_string(4)
+            # The layout parameters always come first
+            magic, offset, size = self.sectionIndex[0]
             if magic != 'lyt1':
                 raise ValueError("Input file specified has an invalid magic! (Expected 'lyt1', got '" + str(magic) + "')")
             
             # Pass the data a new Lyt1 class to determine the layout parameters
+            data.seek(offset + 4)
             self.layoutParams = Lyt1()
-            data = self.layoutParams.read(data)
-
-            # Set some variables
-            layoutPrevious: LayoutBase = None
-            layoutParent: LayoutBase = None
-            groupPrevious: LayoutBase = None
-            groupParent: LayoutBase = None
-            isRootPaneSet = False
-            isRootGroupSet = False
+            self.layoutParams.read(data)
 
             # Clear the children of the layout
             self.children = []
 
-            # Loop through each section
-            for i in range(self.sectionCount-1):
-                # Read the next 4 bytes to get the magic
-                magic = data.read_string(4)
+            # Queue the parts of the layout the file contains
+            self._textureList = self._fontList = self._materialList = self._rootPane = self._rootGroup = None
+            self._pending = {magic for magic, offset, size in self.sectionIndex if magic in LIST_SECTIONS}
+            self._pending.add('tree')
+
+            # Decode everything straight away unless the layout is lazy
+            if not lazy:
+                for part in ('txl1', 'fnl1', 'mat1', 'tree'):
+                    if part in self._pending:
+                        self._decode(part)
+        except:
+            self.close()
+            raise
+
+    def read_header(self, data: DataStream) -> int:
+        """Reads the BCLYT header, sets the byte order of the data stream and returns the header length."""
+
+        # Read the first 4 bytes of the file as a string to check for a valid signature
+        signature = data.read_string(4)
+        if signature != 'CLYT':
+            raise ValueError("Input file specified has an invalid signature! (Expected 'CLYT', got '" + str(signature) + "')")
+        
+        # Read the next 2 bytes to get the byte order mark
+        bom = data.read_bytes(2)
+        if not (bom == b'\xFE\xFF' or bom == b'\xFF\xFE'):
+            raise ValueError("Input file specified has an invalid byte order mark! (Expected b'\\xFE\\xFF' or b'\\xFF\\xFE', got " + str(bom) + ")")
+        bom = 'little' if bom == b'\xFF\xFE' else 'big'
+        self.byteOrderMark = bom
+
+        # Set the byte order of the data stream
+        data.byteOrder = bom
+
+        # Read the next 2 bytes to get the header length
+        headerLength = data.read_uint16()
+
+        # Read the next 4 bytes to the get the revision
+        self.revision = data.read_uint32()
+
+        # Read the next 4 bytes to get the file size
+        self.fileSize = data.read_uint32()
+
+        # Read the next 2 bytes to get the number of sections
+        self.sectionCount = data.read_uint16()
+        data.read_uint16() # Padding
+
+        return headerLength
+
+    @staticmethod
+    def walk_sections(data: DataStream, sectionCount: int) -> Iterator[tuple[str, int, int]]:
+        """Walks the headers of the sections starting at the current position of the stream,
+        without decoding them, and yields the (magic, offset, size) of each section.
+        The stream can be moved between sections, the walk keeps its own position."""
+        offset = data.tell()
+        for _ in range(sectionCount):
+            # Every section starts with its magic and its size (which includes the magic and size)
+            data.seek(offset)
+            magic = data.read_string(4)
+            size = data.read_uint32()
+            if size < 8:
+                raise ValueError("Section '" + str(magic) + "' at offset " + hex(offset) + " has an invalid size! (" + str(size) + ")")
+
+            yield magic, offset, size
+            offset += size
+
+    @staticmethod
+    def read_section_index(data: DataStream, sectionCount: int) -> list[tuple[str, int, int]]:
+        """Walks the headers of the sections starting at the current position of the stream,
+        and returns the (magic, offset, size) of each section."""
+        return list(Bclyt.walk_sections(data, sectionCount))
+
+    @staticmethod
+    def iter_sections(filepath: str, groups: bool = True) -> Iterator[tuple[LayoutBase, int, str]]:
+        """Decodes the panes (and groups, unless groups is False) of a BCLYT file one at a time, and yields
+        each one as a (section, depth, parentName) tuple in file order. Root sections have a depth of 0 and
+        a parentName of None.
+
+        The sections aren't linked into trees (their parent and children are left empty, though user data
+        is attached), so memory use doesn't grow with the size of the layout. The file is closed when
+        the generator finishes or is closed, so breaking out of a loop over it stops the decoding."""
+        with open(filepath, 'rb') as d, DataStream.from_file(d) as data:
+            header = Bclyt()
+            headerLength = header.read_header(data)
+            data.seek(headerLength)
+
+            materialList: Mat1 = None
+
+            # The names of the panes and groups the current section is nested in, and of the last ones seen
+            paneParents: list[str] = []
+            groupParents: list[str] = []
+            lastPane: str = None
+            lastGroup: str = None
+
+            # A decoded section is held back until the sections after it are known not to be its user data
+            pending: tuple = None
+
+            for magic, offset, size in Bclyt.walk_sections(data, header.sectionCount):
+                # Skip past the magic
+                data.seek(offset + 4)
+
+                if magic == 'usd1':
+                    if pending is not None:
+                        usd = Usd1()
+                        usd.read(data)
+                        pending[0].add_user_data(usd)
+                    continue
+
+                if pending is not None:
+                    yield pending
+                    pending = None
+
                 match magic:
-                    case 'txl1':
-                        # Pass the data to a new Txl1 class to determine the texture list
-                        self.textureList = Txl1()
-                        data = self.textureList.read(data)
-                    case 'fnl1':
-                        # Pass the data to a new Fnl1 class to determine the font list
-                        self.fontList = Fnl1()
-                        data = self.fontList.read(data)
                     case 'mat1':
-                        # Pass the data to a new Mat1 class to determine the material list
-                        self.materialList = Mat1()
-                        data = self.materialList.read(data)
-                    case 'pan1':
-                        # Pass the data to a new Pan1 class to create a new pane
-                        pane = Pan1()
-                        data = pane.read(data)
-                        
-                        # Set the root pane if it hasn't been set already
-                        if not isRootPaneSet:
-                            self.rootPane = pane
-                            isRootPaneSet = True
-                        
-                        if layoutParent is not None:
-                            layoutParent.add_child(pane)
-                        
-                        layoutPrevious = pane
-                    case 'pic1':
-                        # Pass the data to a new Pic1 class to create a new picture
-                        pic = Pic1()
-                        data = pic.read(data)
-
-                        if layoutParent is not None:
-                            layoutParent.add_child(pic)
-                        
-                        layoutPrevious = pic
-                    case 'bnd1':
-                        # Pass the data to a new Bnd1 class to create a new bounding box
-                        bnd = Bnd1()
-                        data = bnd.read(data)
-
-                        if layoutParent is not None:
-                            layoutParent.add_child(bnd)
-                        
-                        layoutPrevious = bnd
-                    case 'txt1':
-                        # Pass the data to a new Txt1 class to create a new text
-                        txt = Txt1()
-                        data = txt.read(data)
-
-                        if layoutParent is not None:
-                            layoutParent.add_child(txt)
-                        
-                        layoutPrevious = txt
-                    case 'usd1':
-                        # Pass the data to a new Usd1 class to create a new user data
-                        usd = Usd1()
-                        data = usd.read(data)
-
-                        if layoutPrevious is not None:
-                            layoutPrevious.add_user_data(usd)
-                    case 'wnd1':
-                        # Pass the data to a new Wnd1 class to create a new window
-                        wnd = Wnd1(self.materialList)
-                        data = wnd.read(data)
-
-                        if layoutParent is not None:
-                            layoutParent.add_child(wnd)
-                        
-                        layoutPrevious = wnd
+                        # Window panes need the material list
+                        materialList = Mat1()
+                        materialList.read(data)
+                    case 'pan1' | 'pic1' | 'bnd1' | 'txt1' | 'wnd1':
+                        pane = Wnd1(materialList) if magic == 'wnd1' else PANE_TYPES[magic]()
+                        pane.read(data)
+                        pending = (pane, len(paneParents), paneParents[-1] if paneParents else None)
+                        lastPane = pane.name
                     case 'pas1':
-                        if layoutPrevious is not None:
-                            layoutParent = layoutPrevious
-                        
-                        data.read_uint32() # Unknown?
+                        paneParents.append(lastPane)
                     case 'pae1':
-                        layoutPrevious = layoutParent
-                        layoutParent = layoutPrevious.parent
-
-                        data.read_uint32() # Unknown?
-                    case 'pts1':
-                        print("PTS1 found! These are seemingly unknown/undocumented... Please let one of the contributors know about this!")
-                    case 'grp1':
-                        # Pass the data to a new Grp1 class to create a new group
+                        if paneParents:
+                            lastPane = paneParents.pop()
+                    case 'grp1' if groups:
                         grp = Grp1()
-                        data = grp.read(data)
-
-                        if not isRootGroupSet:
-                            self.rootGroup = grp
-                            isRootGroupSet = True
-                        
-                        if groupParent is not None:
-                            groupParent.add_child(grp)
-                        
-                        groupPrevious = grp
+                        grp.read(data)
+                        pending = (grp, len(groupParents), groupParents[-1] if groupParents else None)
+                        lastGroup = grp.name
                     case 'grs1':
-                        if groupPrevious is not None:
-                            groupParent = groupPrevious
-
-                        data.read_uint32() # Padding?
+                        groupParents.append(lastGroup)
                     case 'gre1':
-                        groupPrevious = groupParent
-                        groupParent = groupPrevious.parent
+                        if groupParents:
+                            lastGroup = groupParents.pop()
+
+            if pending is not None:
+                yield pending
 
-                        data.read_uint32() # Padding?
-                    case _:
-                        print("Unknown section magic '" + str(magic) + "' at offset " + str(data.tell() - 4) + "!")
+    @staticmethod
+    def iter_panes(filepath: str) -> Iterator[tuple[LayoutBase, int, str]]:
+        """Decodes the panes of a BCLYT file one at a time, like iter_sections without the groups."""
+        return Bclyt.iter_sections(filepath, groups=False)
+
+    def _decode(self, part: str) -> None:
+        """Decodes a part of the layout from the open file."""
+        data = self._data
+        if data is None:
+            raise ValueError("Can't decode the layout's '" + part + "' section(s), the BCLYT file has been closed!")
+
+        if part == 'tree':
+            self._read_tree(data)
+        else:
+            # Pass the data to a new Txl1, Fnl1 or Mat1 class, skipping the magic
+            _, offset, _ = next(entry for entry in self.sectionIndex if entry[0] == part)
+            data.seek(offset + 4)
+            sectionType, attribute = LIST_SECTIONS[part]
+            section = sectionType()
+            section.read(data)
+            setattr(self, attribute, section)
+
+        # The file isn't needed anymore once everything has been decoded
+        self._pending.discard(part)
+        if not self._pending:
+            self.close()
+
+    def _read_tree(self, data: DataStream) -> None:
+        """Decodes the pane and group trees from their sections."""
+
+        # Window panes need the material list
+        materialList = self.materialList
+
+        # Set some variables
+        layoutPrevious: LayoutBase = None
+        layoutParent: LayoutBase = None
+        groupPrevious: LayoutBase = None
+        groupParent: LayoutBase = None
+        isRootPaneSet = False
+        isRootGroupSet = False
+
+        # Loop through each section after the layout parameters
+        for magic, offset, size in self.sectionIndex[1:]:
+            # Skip past the magic
+            data.seek(offset + 4)
+            match magic:
+                case 'txl1' | 'fnl1' | 'mat1':
+                    # These are decoded on their own
+                    pass
+                case 'pan1':
+                    # Pass the data to a new Pan1 class to create a new pane
+                    pane = Pan1()
+                    pane.read(data)
+                    
+                    # Set the root pane if it hasn't been set already
+                    if not isRootPaneSet:
+                        self._rootPane = pane
+                        isRootPaneSet = True
+                    
+                    if layoutParent is not None:
+                        layoutParent.add_child(pane)
+                    
+                    layoutPrevious = pane
+                case 'pic1':
+                    # Pass the data to a new Pic1 class to create a new picture
+                    pic = Pic1()
+                    pic.read(data)
+
+                    if layoutParent is not None:
+                        layoutParent.add_child(pic)
+                    
+                    layoutPrevious = pic
+                case 'bnd1':
+                    # Pass the data to a new Bnd1 class to create a new bounding box
+                    bnd = Bnd1()
+                    bnd.read(data)
+
+                    if layoutParent is not None:
+                        layoutParent.add_child(bnd)
+                    
+                    layoutPrevious = bnd
+                case 'txt1':
+                    # Pass the data to a new Txt1 class to create a new text
+                    txt = Txt1()
+                    txt.read(data)
+
+                    if layoutParent is not None:
+                        layoutParent.add_child(txt)
+                    
+                    layoutPrevious = txt
+                case 'usd1':
+                    # Pass the data to a new Usd1 class to create a new user data
+                    usd = Usd1()
+                    usd.read(data)
+
+                    if layoutPrevious is not None:
+                        layoutPrevious.add_user_data(usd)
+                case 'wnd1':
+                    # Pass the data to a new Wnd1 class to create a new window
+                    wnd = Wnd1(materialList)
+                    wnd.read(data)
+
+                    if layoutParent is not None:
+                        layoutParent.add_child(wnd)
+                    
+                    layoutPrevious = wnd
+                case 'pas1':
+                    if layoutPrevious is not None:
+                        layoutParent = layoutPrevious
+                case 'pae1':
+                    layoutPrevious = layoutParent
+                    layoutParent = layoutPrevious.parent
+                case 'pts1':
+                    print("PTS1 found! These are seemingly unknown/undocumented... Please let one of the contributors know about this!")
+                case 'grp1':
+                    # Pass the data to a new Grp1 class to create a new group
+                    grp = Grp1()
+                    grp.read(data)
+
+                    if not isRootGroupSet:
+                        self._rootGroup = grp
+                        isRootGroupSet = True
+                    
+                    if groupParent is not None:
+                        groupParent.add_child(grp)
+                    
+                    groupPrevious = grp
+                case 'grs1':
+                    if groupPrevious is not None:
+                        groupParent = groupPrevious
+                case 'gre1':
+                    groupPrevious = groupParent
+                    groupParent = groupPrevious.parent
+                case _:
+                    print("Unknown section magic '" + str(magic) + "' at offset " + str(offset) + "!")
+
+    def close(self) -> None:
+        """Closes the file of a lazily opened layout. Parts that haven't been accessed yet can't be decoded after this."""
+        if self._data is not None:
+            self._data.close()
+            self._file.close()
+            self._data = None
+            self._file = None
+
+    def __enter__(self) -> 'Bclyt':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
 
     def export(self, outpath=None):
         """Exports the BCLYT class as a BCLYT file."""
@@ -219,85 +422,82 @@ class Bclyt(LayoutBase):
         # Set the output path to the input path if it's not specified.
         if outpath is None:
             outpath = self.filepath
+
+        # Build the file in memory first, so a failed export doesn't leave a partial file behind
+        fileBytes = self.export_bytes()
         
         # Delete the file if it already exists
         if os.path.exists(outpath):
             os.remove(outpath)
 
-        # Create a new file
+        # Write the whole file in one go
         with open(outpath, 'wb') as f:
-            data = WriteStream(f)
-
-            # Write the header:
+            f.write(fileBytes)
 
-            # Write the signature
-            data.write_string('CLYT')
+    def export_bytes(self) -> bytes:
+        """Exports the BCLYT class as the bytes of a BCLYT file."""
+        data = WriteStream(None, self.byteOrderMark)
 
-            # Write the byte order mark
-            if self.byteOrderMark == "little":
-                data.write_bytes(bytes(0xFFFE), 2)
-            elif self.byteOrderMark == "big":
-                data.write_bytes(bytes(0xFEFF), 2)
+        # Write the header:
 
-            # Write the header length (temporary)
-            data.write_uint16(0)
+        # Write the signature
+        data.write_string('CLYT')
 
-            # Write the revision
-            data.write_uint32(self.revision)
+        # Write the byte order mark
+        if self.byteOrderMark == "little":
+            data.write_bytes(b'\xFF\xFE')
+        elif self.byteOrderMark == "big":
+            data.write_bytes(b'\xFE\xFF')
 
-            # Write the file size (temporary)
-            data.write_uint32(0)
+        # Reserve the header length
+        headerLength = data.reserve_uint16()
 
-            # Write the section count (temporary)
-            data.write_uint16(0)
+        # Write the revision
+        data.write_uint32(self.revision)
 
-            # Store the header length
-            headerLength = data.tell()
+        # Reserve the file size
+        fileSize = data.reserve_uint32()
 
-            # Write the layout parameters
-            data = self.layoutParams.write(data)
+        # Reserve the section count, followed by padding
+        sectionCount = data.reserve_uint16()
+        data.write_uint16(0)
 
-            sectionCount = 0
-
-            # Write the texture list if it exists
-            if self.textureList is not None:
-                data = self.textureList.write(data)
-                sectionCount += 1
-            
-            # Write the font list if it exists
-            if self.fontList is not None:
-                data = self.fontList.write(data)
-                sectionCount += 1
+        # Fill in the header length
+        headerLength.set(data.tell())
 
-            # Write the material list if it exists
-            if self.materialList is not None:
-                data = self.materialList.write(data)
-                sectionCount += 1
+        # Write the layout parameters
+        data = self.layoutParams.write(data)
 
-            # Write the root pane
-            data = self.rootPane.write(data)
-            sectionCount += 1
+        count = 0
 
-            # Write the root group
-            data = self.rootGroup.write(data)
-            sectionCount += 1
-
-            # Store the file size
-            fileSize = data.tell()
+        # Write the texture list if it exists
+        if self.textureList is not None:
+            data = self.textureList.write(data)
+            count += 1
+        
+        # Write the font list if it exists
+        if self.fontList is not None:
+            data = self.fontList.write(data)
+            count += 1
 
-            # Write the section count
-            data.seek(headerLength + 0x8)
-            data.write_uint16(sectionCount)
+        # Write the material list if it exists
+        if self.materialList is not None:
+            data = self.materialList.write(data)
+            count += 1
 
-            # Write the file size
-            data.seek(headerLength + 0xC)
-            data.write_uint32(fileSize)
+        # Write the root pane
+        data = self.rootPane.write(data)
+        count += 1
 
-            # Write the header length
-            data.seek(headerLength + 0x2)
-            data.write_uint16(headerLength)
+        # Write the root group
+        data = self.rootGroup.write(data)
+        count += 1
 
+        # Fill in the section count and file size
+        sectionCount.set(count)
+        fileSize.set(data.tell())
 
+        return data.getvalue()
 
 
     def convertToClyt(self) -> Clyt:
@@ -305,44 +505,29 @@ class Bclyt(LayoutBase):
 
         # TODO: Implement a BCLYT to CLYT converter once the Clyt class is implemented
     
-    def __str__(self) -> str:
-        j = JsonSerialize()
+    def to_dict(self, streamed: bool = False) -> dict:
+        """Returns the layout as plain Python containers (a missing section is stored as an empty list).
+        With streamed=True, the materials and panes are converted only as a JsonWriter reaches them."""
+        return {
+            # Add header information
+            "byteOrderMark": self.byteOrderMark,
+            "revision": self.revision,
+            "fileSize": self.fileSize,
+            "sectionCount": self.sectionCount,
+            "layoutParams": self.layoutParams.to_dict() if self.layoutParams is not None else None,
+
+            # Add the sections if they exist
+            "textureList": self.textureList.to_dict() if self.textureList is not None else [],
+            "fontList": self.fontList.to_dict() if self.fontList is not None else [],
+            "materialList": self.materialList.to_dict(streamed) if self.materialList is not None else [],
+            "rootPane": self.rootPane.to_dict(streamed) if self.rootPane is not None else [],
+            "rootGroup": self.rootGroup.to_dict(streamed) if self.rootGroup is not None else [],
+        }
+
+    def export_json(self, file: TextIO, indent: int = None, compact: bool = False, ascii: bool = False) -> None:
+        """Writes the layout to a text file object as JSON, with the same output as to_json(self.to_dict(), ...)
+        (str() of the layout, with the default options). The panes are converted and written one at a time."""
+        JsonWriter(file, indent, compact, ascii=ascii).write(self.to_dict(streamed=True))
 
-        # Add header information
-        j.add("byteOrderMark", self.byteOrderMark)
-        j.add("revision", self.revision)
-        j.add("fileSize", self.fileSize)
-        j.add("sectionCount", self.sectionCount)
-        j.add("layoutParams", self.layoutParams)
-
-        # Add the texture list if it exists
-        if self.textureList is not None:
-            j.add("textureList", self.textureList)
-        else:
-            j.add("textureList", [])
-        
-        # Add the font list if it exists
-        if self.fontList is not None:
-            j.add("fontList", self.fontList)
-        else:
-            j.add("fontList", [])
-        
-        # Add the material list if it exists
-        if self.materialList is not None:
-            j.add("materialList", self.materialList)
-        else:
-            j.add("materialList", [])
-        
-        # Add the root pane if it exists
-        if self.rootPane is not None:
-            j.add("rootPane", self.rootPane)
-        else:
-            j.add("rootPane", [])
-        
-        # Add the root group if it exists
-        if self.rootGroup is not None:
-            j.add("rootGroup", self.rootGroup)
-        else:
-            j.add("rootGroup", [])
-
-        return j.serialize()
\ No newline at end of file
+    def __str__(self) -> str:
+        return to_json(self.to_dict())
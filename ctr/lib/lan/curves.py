@@ -0,0 +1,127 @@
+from typing import NamedTuple
+
+import numpy
+
+from ctr.lib.lan.pai1 import STEP_CURVE, AnimationTarget
+
+"""
+Batch evaluation of the curves of an animation, for baking and previewing it.
+
+The keys of every curve are concatenated into flat arrays, the curves one after the other. Evaluating
+the curves at a set of frames doesn't search the keys for every (curve, frame) pair: the keys are
+placed among the sorted frames instead (there are far fewer keys than pairs), and a cumulative sum of
+the keys placed at each frame gives, for every curve and frame, the key before the frame.
+
+    curves = animation.curves(('CLPA',))
+    values = curves.evaluate(numpy.arange(600))    # a curves x 600 array
+    values[curves.row('P_Title', 'CLPA', 'translateY')]
+
+Hermite curves interpolate between the two keys around a frame with their values and slopes (the slopes
+are per frame), and step curves hold the value of the last key at or before it. Each segment between
+two keys is turned into a cubic once, so a value is a gather of its cubic and four multiply-adds. Before
+the first key, and after the last, a curve holds the value of that key. A frame with two keys takes the
+later one.
+"""
+
+
+class curveLabel(NamedTuple):
+    """What a curve animates: the entry (pane or material), the tag, the target's name and its index"""
+    entryName: str
+    magic: str
+    target: str
+    index: int
+
+
+class AnimationCurves:
+    """The curves of an animation, as flat arrays of their keys, evaluated all at once"""
+
+    def __init__(self, labels: list[curveLabel], targets: list[AnimationTarget], frameSize: int = None, loop: bool = False):
+        self.labels = labels
+        self.frameSize = frameSize
+        self.loop = loop
+
+        # The keys of each curve are the run from starts to ends, sorted by frame (keeping the order of equal frames)
+        counts = numpy.array([target.keyCount for target in targets], dtype=numpy.intp)
+        self.ends = numpy.cumsum(counts)
+        self.starts = self.ends - counts
+        curveIndexes = numpy.repeat(numpy.arange(len(targets)), counts)
+        frames = numpy.concatenate([target.frames for target in targets] or [numpy.empty(0, numpy.float32)]).astype(numpy.float64)
+        order = numpy.lexsort((frames, curveIndexes))
+
+        self.frames = frames[order]
+        values = numpy.concatenate([target.values for target in targets] or [numpy.empty(0, numpy.float32)]).astype(numpy.float64)[order]
+        slopes = numpy.concatenate([target.slopes for target in targets] or [numpy.empty(0, numpy.float32)]).astype(numpy.float64)[order]
+        self.curveIndexes = curveIndexes
+        self.isStep = numpy.array([target.curveType == STEP_CURVE for target in targets], dtype=bool)
+
+        # The cubic from each key to the next, in the frames since the key (the hermite basis functions expanded with
+        # the segment's length). The last key of a curve, the keys of step curves and the first of two keys on the same
+        # frame hold their value instead
+        length = numpy.zeros_like(self.frames)
+        length[:-1] = self.frames[1:] - self.frames[:-1]
+        isSegment = numpy.zeros(len(self.frames), dtype=bool)
+        isSegment[:-1] = curveIndexes[1:] == curveIndexes[:-1]
+        isSegment &= (length > 0) & ~numpy.repeat(self.isStep, counts)
+
+        nextValues = numpy.append(values[1:], 0)
+        nextSlopes = numpy.append(slopes[1:], 0)
+        safeLength = numpy.where(isSegment, length, 1)
+        difference = nextValues - values
+        self.coefficients = (
+            values,
+            numpy.where(isSegment, slopes, 0),
+            numpy.where(isSegment, (3 * difference - (2 * slopes + nextSlopes) * safeLength) / safeLength ** 2, 0),
+            numpy.where(isSegment, (-2 * difference + (slopes + nextSlopes) * safeLength) / safeLength ** 3, 0),
+        )
+
+        self.rows = {label: row for row, label in enumerate(labels)}
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def row(self, entryName: str, magic: str, target: str, index: int = 0) -> int:
+        """Returns the row of a curve in the arrays returned by evaluate."""
+        return self.rows[curveLabel(entryName, magic, target, index)]
+
+    def evaluate(self, frames) -> numpy.ndarray:
+        """Evaluates every curve at every frame, returning a curves x frames array of float64 values (NaN for
+        curves without keys). With loop set, the frames wrap around the frame size of the animation."""
+        frames = numpy.asarray(frames, dtype=numpy.float64).reshape(-1)
+        if self.loop and self.frameSize:
+            frames = numpy.mod(frames, self.frameSize)
+        if len(self.frames) == 0 or len(frames) == 0:
+            return numpy.full((len(self.labels), len(frames)), numpy.nan)
+
+        # Count the keys of each curve at or before each frame: a key counts for every frame from the first one at or
+        # after it on, so each key adds one at that frame, and a cumulative sum across the frames gives the counts
+        order = numpy.argsort(frames, kind='stable')
+        sortedFrames = frames[order]
+        positions = numpy.searchsorted(sortedFrames, self.frames, side='left')
+        frameCount = len(frames) + 1
+        counts = numpy.bincount(self.curveIndexes * frameCount + positions, minlength=len(self.labels) * frameCount)
+        counts = counts.reshape(len(self.labels), frameCount)[:, :-1].cumsum(axis=1)
+
+        # The key before each frame, or the first key of the curve for the frames before it (which then holds its value,
+        # as the frames since the key are clamped to 0). Curves without keys are pointed at any key, and dropped later
+        keys = numpy.maximum(counts, 1, out=counts)
+        keys += self.starts[:, None] - 1
+        numpy.minimum(keys, len(self.frames) - 1, out=keys)
+        since = numpy.maximum(sortedFrames - self.frames[keys], 0)
+
+        # Evaluate the cubics with Horner's method
+        constant, linear, quadratic, cubic = self.coefficients
+        values = cubic[keys]
+        values *= since
+        values += quadratic[keys]
+        values *= since
+        values += linear[keys]
+        values *= since
+        values += constant[keys]
+
+        # Curves without keys stay NaN, and the frames go back to the order they were given in
+        hasKeys = self.ends > self.starts
+        if hasKeys.all() and (order[1:] > order[:-1]).all():
+            return values
+        result = numpy.full((len(self.labels), len(frames)), numpy.nan)
+        result[numpy.ix_(hasKeys, order)] = values[hasKeys]
+        return result
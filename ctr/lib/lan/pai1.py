@@ -0,0 +1,277 @@
+import numpy
+
+from ctr.util.data_stream import DataStream
+from ctr.util.serialize import to_json
+from ctr.util.schema import Schema, uint8, uint16, uint32, string, padding
+
+"""
+PAI1 (Pattern Animation Info 1)
+===================
+Offset |  Size  |   Type   | Description
+-------+--------+----------+------------
+ 0x00  |  0x04  |  string  | Signature (pai1)
+ 0x04  |  0x04  |  uint32  | Section Size
+ 0x08  |  0x02  |  uint16  | Frame Size
+ 0x0A  |  0x01  |  uint8   | Loop
+ 0x0B  |  0x01  |  padding | Padding
+ 0x0C  |  0x02  |  uint16  | Texture Count = N
+ 0x0E  |  0x02  |  uint16  | Entry Count = M
+ 0x10  |  0x04  |  uint32  | Entry Offsets Offset (Relative to the start of this section)
+ 0x14  | N*0x04 | uint32[] | Texture Name Offsets (Relative to the start of this array)
+  ...  | M*0x04 | uint32[] | Entry Offsets (Relative to the start of this section)
+===================
+An entry is an animated pane or material, and its tags are the kinds of animation applied to it:
+
+Offset |  Size  |   Type   | Description
+-------+--------+----------+------------
+ 0x00  |  0x14  |  string  | Name
+ 0x14  |  0x01  |  uint8   | Tag Count = N
+ 0x15  |  0x01  |  uint8   | Entry Type (0: Pane, 1: Material)
+ 0x16  |  0x02  |  padding | Padding
+ 0x18  | N*0x04 | uint32[] | Tag Offsets (Relative to the start of the entry)
+
+A tag (e.g. CLPA for the pane's SRT) holds a uint8 target count and 3 bytes of padding after its magic,
+then the offsets of its targets (relative to the start of the tag). A target is one animated value:
+
+Offset |  Size  |   Type   | Description
+-------+--------+----------+------------
+ 0x00  |  0x01  |  uint8   | Index (e.g. the texture or color the value belongs to)
+ 0x01  |  0x01  |  uint8   | Target (the value, see TARGET_NAMES)
+ 0x02  |  0x01  |  uint8   | Curve Type (1: Step, 2: Hermite)
+ 0x03  |  0x01  |  padding | Padding
+ 0x04  |  0x02  |  uint16  | Key Count
+ 0x06  |  0x02  |  padding | Padding
+ 0x08  |  0x04  |  uint32  | Keys Offset (Relative to the start of the target)
+===================
+Hermite keys are 3 floats (frame, value, slope), and step keys a float frame and a uint16 value followed by
+2 bytes of padding. The keys of every target are read into contiguous numpy arrays of their frames, values
+and slopes (step keys have a slope of 0), so the curves can be evaluated without going through Python.
+"""
+
+# The descriptions of the tags, by their magic
+ANIMATION_TAGS = {
+    'CLPA': "Pane SRT",
+    'CLTS': "Texture SRT",
+    'CLVI': "Visibility",
+    'CLVC': "Vertex Color",
+    'CLMC': "Material Color",
+    'CLTP': "Texture Pattern",
+    'CLIM': "Indirect Parameter",
+}
+
+# The names of the targets of the tags that have them
+TARGET_NAMES = {
+    'CLPA': ['translateX', 'translateY', 'translateZ', 'rotateX', 'rotateY', 'rotateZ', 'scaleX', 'scaleY', 'width', 'height'],
+    'CLTS': ['translateU', 'translateV', 'rotate', 'scaleU', 'scaleV'],
+    'CLVI': ['visible'],
+    'CLVC': [corner + channel for corner in ('topLeft', 'topRight', 'bottomLeft', 'bottomRight') for channel in 'RGBA'] + ['paneAlpha'],
+}
+
+STEP_CURVE = 1
+HERMITE_CURVE = 2
+
+# Everything after the section size
+PAI1_SCHEMA = Schema(
+    uint16('frameSize'),
+    uint8('loop'),
+    padding(1),
+    uint16('textureCount'),
+    uint16('entryCount'),
+    uint32('entriesOffset'),
+)
+
+ENTRY_SCHEMA = Schema(
+    string('name', 0x14),
+    uint8('tagCount'),
+    uint8('entryType'),
+    padding(2),
+)
+
+TARGET_SCHEMA = Schema(
+    uint8('index'),
+    uint8('target'),
+    uint8('curveType'),
+    padding(1),
+    uint16('keyCount'),
+    padding(2),
+    uint32('keysOffset'),
+)
+
+# The dtypes of the keys of each curve type, by byte order
+KEY_DTYPES = {
+    byteOrder: {
+        HERMITE_CURVE: numpy.dtype([('frame', prefix + 'f4'), ('value', prefix + 'f4'), ('slope', prefix + 'f4')]),
+        STEP_CURVE: numpy.dtype([('frame', prefix + 'f4'), ('value', prefix + 'u2'), ('padding', prefix + 'u2')]),
+    }
+    for byteOrder, prefix in (('little', '<'), ('big', '>'))
+}
+
+
+class AnimationTarget:
+    """A value animated by a curve, with its keys as contiguous float32 arrays of their frames, values and slopes"""
+
+    index: int = None
+    target: int = None
+    curveType: int = None
+    keyCount: int = 0
+    keysOffset: int = None
+
+    frames: numpy.ndarray = None
+    values: numpy.ndarray = None
+    slopes: numpy.ndarray = None
+
+    def __init__(self, data: DataStream = None):
+        if data is not None:
+            self.read(data)
+
+    def read(self, data: DataStream) -> DataStream:
+        """Reads the target and its keys from a data stream"""
+        startPos = data.tell()
+        TARGET_SCHEMA.read(self, data)
+
+        dtype = KEY_DTYPES[data.byteOrder].get(self.curveType)
+        if dtype is None:
+            raise ValueError("Animation target at offset " + hex(startPos) + " has an invalid curve type! (Expected 1 or 2, got " + str(self.curveType) + ")")
+
+        # Read all the keys at once, and copy each field into its own array (which also detaches them from the file)
+        keys = numpy.frombuffer(data.data, dtype, self.keyCount, startPos + self.keysOffset)
+        self.frames = keys['frame'].astype(numpy.float32)
+        self.values = keys['value'].astype(numpy.float32)
+        self.slopes = keys['slope'].astype(numpy.float32) if self.curveType == HERMITE_CURVE else numpy.zeros(self.keyCount, numpy.float32)
+
+        data.seek(startPos + self.keysOffset + self.keyCount * dtype.itemsize)
+        return data
+
+    def to_dict(self) -> dict:
+        return {
+            "index": self.index,
+            "target": self.target,
+            "curveType": "step" if self.curveType == STEP_CURVE else "hermite",
+            "keys": [list(key) for key in zip(self.frames.tolist(), self.values.tolist(), self.slopes.tolist())],
+        }
+
+
+class AnimationTag:
+    """A kind of animation applied to an entry (such as CLPA), with the targets it animates"""
+
+    magic: str = None
+    targets: list[AnimationTarget] = []
+
+    def __init__(self, data: DataStream = None):
+        self.targets = []
+        if data is not None:
+            self.read(data)
+
+    def read(self, data: DataStream) -> DataStream:
+        """Reads the tag and its targets from a data stream"""
+        startPos = data.tell()
+        self.magic = data.read_string(4)
+        targetCount = data.read_record('B3x')[0]
+
+        offsets = data.read_array('I', targetCount)
+        self.targets = []
+        for offset in offsets:
+            data.seek(startPos + offset)
+            self.targets.append(AnimationTarget(data))
+        return data
+
+    def target_name(self, target: AnimationTarget) -> str:
+        """Returns the name of the value a target animates, or its number if the tag's targets aren't named."""
+        names = TARGET_NAMES.get(self.magic, [])
+        return names[target.target] if target.target < len(names) else str(target.target)
+
+    def to_dict(self) -> dict:
+        return {
+            "magic": self.magic,
+            "description": ANIMATION_TAGS.get(self.magic),
+            "targets": [dict(target.to_dict(), name=self.target_name(target)) for target in self.targets],
+        }
+
+
+class AnimationEntry:
+    """An animated pane or material, with its tags"""
+
+    name: str = None
+    tagCount: int = 0
+    entryType: int = None
+    tags: list[AnimationTag] = []
+
+    def __init__(self, data: DataStream = None):
+        self.tags = []
+        if data is not None:
+            self.read(data)
+
+    def read(self, data: DataStream) -> DataStream:
+        """Reads the entry and its tags from a data stream"""
+        startPos = data.tell()
+        ENTRY_SCHEMA.read(self, data)
+
+        offsets = data.read_array('I', self.tagCount)
+        self.tags = []
+        for offset in offsets:
+            data.seek(startPos + offset)
+            self.tags.append(AnimationTag(data))
+        return data
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "type": "material" if self.entryType == 1 else "pane",
+            "tags": [tag.to_dict() for tag in self.tags],
+        }
+
+
+class Pai1:
+    """A PAI1 section in a CTR animation file"""
+
+    frameSize: int = None
+    loop: int = None
+    textureCount: int = 0
+    entryCount: int = 0
+    entriesOffset: int = None
+
+    textureNames: list[str] = []
+    entries: list[AnimationEntry] = []
+
+    def __init__(self, data: DataStream = None):
+        self.textureNames = []
+        self.entries = []
+        if data is not None:
+            self.read(data)
+
+    def read(self, data: DataStream) -> DataStream:
+        """Reads the PAI1 section from a data stream"""
+
+        # Store the start offset of the section
+        startPos = data.tell() - 4
+
+        sectionSize = data.read_uint32()
+        PAI1_SCHEMA.read(self, data)
+
+        # Read the texture name offsets, then the whole string table they point into
+        tableStart = data.tell()
+        self.textureNames = data.read_string_table(tableStart, data.read_array('I', self.textureCount))
+
+        # Read the entries
+        data.seek(startPos + self.entriesOffset)
+        offsets = data.read_array('I', self.entryCount)
+        self.entries = []
+        for offset in offsets:
+            data.seek(startPos + offset)
+            self.entries.append(AnimationEntry(data))
+
+        # Seek to the end of the section
+        data.seek(startPos + sectionSize)
+
+        return data
+
+    def to_dict(self) -> dict:
+        return {
+            "frameSize": self.frameSize,
+            "loop": bool(self.loop),
+            "textureNames": self.textureNames,
+            "entries": [entry.to_dict() for entry in self.entries],
+        }
+
+    def __str__(self) -> str:
+        return to_json(self.to_dict())
@@ -0,0 +1,90 @@
+from ctr.util.data_stream import DataStream
+from ctr.util.serialize import to_json
+from ctr.util.schema import Schema, uint8, uint16, int16, uint32, padding, decode_padded_string
+
+"""
+PAT1 (Pattern 1)
+===================
+Offset |  Size  |   Type   | Description
+-------+--------+----------+------------
+ 0x00  |  0x04  |  string  | Signature (pat1)
+ 0x04  |  0x04  |  uint32  | Section Size
+ 0x08  |  0x02  |  uint16  | Animation Order
+ 0x0A  |  0x02  |  uint16  | Group Count = N
+ 0x0C  |  0x04  |  uint32  | Animation Name Offset (Relative to the start of this section)
+ 0x10  |  0x04  |  uint32  | Group Names Offset (Relative to the start of this section)
+ 0x14  |  0x02  |  int16   | Start Frame
+ 0x16  |  0x02  |  int16   | End Frame
+ 0x18  |  0x01  |  uint8   | Child Binding
+ 0x19  |  0x03  |  padding | Padding
+===================
+Each group is 0x14 bytes: its name (0x10 bytes), a uint8 of flags and 3 bytes of padding.
+"""
+
+# Everything after the section size
+PAT1_SCHEMA = Schema(
+    uint16('animationOrder'),
+    uint16('groupCount'),
+    uint32('nameOffset'),
+    uint32('groupsOffset'),
+    int16('startFrame'),
+    int16('endFrame'),
+    uint8('childBinding'),
+    padding(3),
+)
+
+class Pat1:
+    """A PAT1 section in a CTR animation file"""
+
+    animationOrder: int = None
+    groupCount: int = 0
+    nameOffset: int = None
+    groupsOffset: int = None
+    startFrame: int = None
+    endFrame: int = None
+    childBinding: int = None
+
+    name: str = None
+    groups: list[tuple[str, int]] = []
+
+    def __init__(self, data: DataStream = None):
+        self.groups = []
+        if data is not None:
+            self.read(data)
+
+    def read(self, data: DataStream) -> DataStream:
+        """Reads the PAT1 section from a data stream"""
+
+        # Store the start offset of the section
+        startPos = data.tell() - 4
+
+        sectionSize = data.read_uint32()
+        PAT1_SCHEMA.read(self, data)
+
+        # Read the animation name
+        self.name = data.read_string_nt_from(startPos + self.nameOffset)
+
+        # Read the names and flags of the groups the animation applies to
+        data.seek(startPos + self.groupsOffset)
+        self.groups = []
+        for _ in range(self.groupCount):
+            name, flags = data.read_record('16sB3x')
+            self.groups.append((decode_padded_string(name), flags))
+
+        # Seek to the end of the section
+        data.seek(startPos + sectionSize)
+
+        return data
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "animationOrder": self.animationOrder,
+            "startFrame": self.startFrame,
+            "endFrame": self.endFrame,
+            "childBinding": self.childBinding,
+            "groups": [{"name": name, "flags": flags} for name, flags in self.groups],
+        }
+
+    def __str__(self) -> str:
+        return to_json(self.to_dict())
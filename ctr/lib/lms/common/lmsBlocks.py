@@ -1,5 +1,8 @@
+import operator
+
 from ctr.util.data_stream import DataStream
 from ctr.lib.lms.common.lmsCommonTypes import label, dataOffsetEntry, itemOffsetEntry
+from ctr.lib.lms.common.lmsLabelIndex import lmsLabelIndex
 
 
 class lmsBlockHeader:
@@ -35,7 +38,7 @@ class lmsDataBlock(lmsBlockHeader):
         super().__init__(data)
         self.entries: list = []
         for _ in range(self.numberOfEntries):
-            entry: entryType = entryType(self.data)
+            entry: entryType = entryType.read(self.data)
             self.entries.append(entry)
         self.seekToEndOfSection()
 
@@ -59,13 +62,13 @@ class lmsItemBlock(lmsBlockHeader):
 
         itemOffsets: list[int] = []
         for _ in range(self.numberOfEntries):
-            itemData: itemOffsetEntry = itemOffsetEntry(self.data)
+            itemData: itemOffsetEntry = itemOffsetEntry.read(self.data)
             itemOffsets.append(itemData)
 
         for itemData in itemOffsets:
             self.data.seek(self.relativeStart)
             self.data.seek(itemData.offset, 1)
-            entry: entryType = entryType(self.data)
+            entry: entryType = entryType.read(self.data)
             self.entries.append(entry)
 
         self.seekToEndOfSection()
@@ -82,20 +85,33 @@ class lmsLabelBlock(lmsBlockHeader):
       - FEN1 (MSBF)
     """
 
+    _index: lmsLabelIndex = None
+
     def __init__(self, data: DataStream):
         super().__init__(data)
         self.entries: list[label] = []
 
         dataEntries: list[dataOffsetEntry] = []
         for _ in range(self.numberOfEntries):
-            entry: dataOffsetEntry = dataOffsetEntry(self.data)
+            entry: dataOffsetEntry = dataOffsetEntry.read(self.data)
             dataEntries.append(entry)
 
         for entry in dataEntries:
             self.data.seek(self.relativeStart)
             self.data.seek(entry.offset, 1)
             for _ in range(entry.labelCount):
-                labelData: label = label(self.data)
+                labelData: label = label.read(self.data)
                 self.entries.append(labelData)
+
+        # The labels in the order of their items, sorted once
+        self.sortedEntries: list[label] = sorted(self.entries, key=operator.attrgetter("itemIndex"))
         
         self.seekToEndOfSection()
+
+    @property
+    def index(self) -> lmsLabelIndex:
+        """The index of the labels, built from the decoded entries the first time it's used (so the data of
+        the block isn't kept). The number of entries of a label block is the number of buckets of its hash table."""
+        if self._index is None:
+            self._index = lmsLabelIndex.from_labels(self.entries, self.numberOfEntries)
+        return self._index
@@ -0,0 +1,108 @@
+import struct
+
+import numpy
+
+from ctr.util.data_stream import DataStream
+from ctr.util.schema import Schema, Bits
+from ctr.util.struct_codecs import BYTE_ORDER_PREFIXES
+from ctr.lib.lms.common.lmsBlocks import lmsBlockHeader
+
+"""
+Columnar (struct-of-arrays) storage for the LMS data blocks of fixed-size records (CLR1, ATI2 and SYL3).
+
+The records of a block are decoded with a single numpy.frombuffer call into a structured array, whose
+fields are exposed as one read-only array per field: colors.color is an N x 4 uint8 array, and
+attributes.type, attributes.listIndex and attributes.offset are parallel arrays of N values.
+The columns can still be used like the list of records they replace: indexing or iterating them
+builds the record (e.g. a color) for each entry on demand.
+
+This module needs numpy, so the blocks only import it when they're decoded with columnar=True.
+"""
+
+# The numpy types of the struct formats the columns support
+NUMPY_TYPES = {
+    'b': 'i1', 'B': 'u1',
+    'h': 'i2', 'H': 'u2',
+    'i': 'i4', 'I': 'u4',
+    'q': 'i8', 'Q': 'u8',
+    'f': 'f4', 'd': 'f8',
+}
+
+
+def schema_dtype(schema: Schema, byteOrder: str) -> numpy.dtype:
+    """Returns the structured numpy type of the records of a schema in a byte order.
+    Padding is skipped, and multi-value fields (such as colors) become subarrays."""
+    prefix = BYTE_ORDER_PREFIXES[byteOrder]
+    names, formats, offsets = [], [], []
+
+    offset = 0
+    for field in schema.fields:
+        size = struct.calcsize('<' + field.fmt)
+        if field.name is not None:
+            if isinstance(field, Bits) or field.decode is not None or field.fmt[-1] not in NUMPY_TYPES:
+                raise ValueError("Field '" + str(field.name) + "' can't be stored in a column! (Format '" + field.fmt + "')")
+            count = field.fmt[:-1]
+            names.append(field.name)
+            formats.append((prefix + NUMPY_TYPES[field.fmt[-1]], (int(count),)) if count else prefix + NUMPY_TYPES[field.fmt[-1]])
+            offsets.append(offset)
+        offset += size
+
+    return numpy.dtype({'names': names, 'formats': formats, 'offsets': offsets, 'itemsize': schema.size})
+
+
+class RecordColumns:
+    """The entries of a data block stored as one array per field (available as attributes named after the
+    fields), which also acts as a read-only sequence of the entries as records of entryType."""
+
+    def __init__(self, entryType: type, records: numpy.ndarray):
+        self.entryType = entryType
+        self.records = records
+        self.columns: dict[str, numpy.ndarray] = {name: records[name] for name in records.dtype.names}
+
+    def __getattr__(self, name: str) -> numpy.ndarray:
+        columns = self.__dict__.get('columns')
+        if columns is None or name not in columns:
+            raise AttributeError("'" + type(self).__name__ + "' object has no attribute '" + name + "'")
+        return columns[name]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index: int):
+        if isinstance(index, slice):
+            return RecordColumns(self.entryType, self.records[index])
+        return self.entryType._make(self._python_value(column[index]) for column in self.columns.values())
+
+    def __iter__(self):
+        # Convert each column to Python values in one go, rather than one entry at a time
+        values = []
+        for column in self.columns.values():
+            values.append(list(map(tuple, column.tolist())) if column.ndim > 1 else column.tolist())
+        for fields in zip(*values):
+            yield self.entryType._make(fields)
+
+    @staticmethod
+    def _python_value(value):
+        value = value.tolist()
+        return tuple(value) if isinstance(value, list) else value
+
+    def __getstate__(self) -> tuple:
+        # The columns are views of the records, so only the records are pickled
+        return self.entryType, self.records
+
+    def __setstate__(self, state: tuple) -> None:
+        self.__init__(*state)
+
+
+class lmsColumnarBlock(lmsBlockHeader):
+    """A class that represents a data block of fixed-size records, decoded into columns"""
+
+    def __init__(self, data: DataStream, entryType: type, schema: Schema):
+        super().__init__(data)
+
+        # Decode every record with one call (reading the records copies them out of the file)
+        dtype = schema_dtype(schema, self.data.codecs.byteOrder)
+        records = numpy.frombuffer(self.data.read_bytes(self.numberOfEntries * schema.size), dtype)
+        self.entries: RecordColumns = RecordColumns(entryType, records)
+
+        self.seekToEndOfSection()
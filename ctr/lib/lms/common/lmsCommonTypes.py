@@ -1,134 +1,195 @@
+from typing import NamedTuple
+
 from ctr.util.data_stream import DataStream
+from ctr.util.schema import Schema, uint8, uint16, uint32, rgba8, padding
+
+"""
+The entry types of the LMS blocks.
+
+Every entry is an immutable record (a NamedTuple, so it has no per-instance __dict__), read from a
+data stream with its read class method. Entries don't keep a reference to the stream they were read from.
+Runs of indexes and list items are stored as tuples.
+"""
 
+# Layouts of the fixed-size types
+DATA_OFFSET_ENTRY_SCHEMA = Schema(uint32('labelCount'), uint32('offset'))
+ITEM_OFFSET_ENTRY_SCHEMA = Schema(uint32('offset'))
+COLOR_SCHEMA = Schema(rgba8('color'))
+ATTRIBUTE_SCHEMA = Schema(uint8('type'), padding(1), uint16('listIndex'), uint32('offset'))
+STYLE_SCHEMA = Schema(uint32('regionWidth'), uint32('lineNumber'), uint32('fontIndex'), rgba8('baseColorIndex'))
 
-class label:
+
+class label(NamedTuple):
     """A class that represents a label"""
+    label: str
+    itemIndex: int
+
+    @classmethod
+    def read(cls, d: DataStream) -> 'label':
+        labelLength: int = d.read_uint8()
+        return cls(d.read_string(labelLength), d.read_uint32())
 
-    def __init__(self, d: DataStream):
-        self.data: DataStream = d
-        labelLength: int = self.data.read_uint8()
-        self.label: str = self.data.read_string(labelLength)
-        self.itemIndex: int = self.data.read_uint32()
+    def to_dict(self) -> dict:
+        return {"label": self.label, "itemIndex": self.itemIndex}
 
 
-class dataOffsetEntry:
+class dataOffsetEntry(NamedTuple):
     """A class that represents a data offset entry"""
+    labelCount: int
+    offset: int
 
-    def __init__(self, d: DataStream):
-        self.data: DataStream = d
-        self.labelCount: int = self.data.read_uint32()
-        self.offset: int = self.data.read_uint32()
+    @classmethod
+    def read(cls, d: DataStream) -> 'dataOffsetEntry':
+        return cls._make(DATA_OFFSET_ENTRY_SCHEMA.read_values(d))
 
+    def to_dict(self) -> dict:
+        return {"labelCount": self.labelCount, "offset": self.offset}
 
-class itemOffsetEntry:
+
+class itemOffsetEntry(NamedTuple):
     """A class that represents an item offset entry"""
+    offset: int
+
+    @classmethod
+    def read(cls, d: DataStream) -> 'itemOffsetEntry':
+        return cls._make(ITEM_OFFSET_ENTRY_SCHEMA.read_values(d))
 
-    def __init__(self, d: DataStream):
-        self.data: DataStream = d
-        self.offset: int = self.data.read_uint32()
+    def to_dict(self) -> dict:
+        return {"offset": self.offset}
 
 
-class color:
+class color(NamedTuple):
     """A class that represents a color"""
+    color: tuple
 
-    def __init__(self, d: DataStream):
-        self.data: DataStream = d
-        self.color: tuple = self.data.read_color_rgba8()
+    @classmethod
+    def read(cls, d: DataStream) -> 'color':
+        return cls._make(COLOR_SCHEMA.read_values(d))
 
+    def to_dict(self) -> dict:
+        return {"color": self.color}
 
-class attribute:
+
+class attribute(NamedTuple):
     """A class that represents an attribute"""
+    type: int
+    listIndex: int
+    offset: int
+
+    @classmethod
+    def read(cls, d: DataStream) -> 'attribute':
+        return cls._make(ATTRIBUTE_SCHEMA.read_values(d))
 
-    def __init__(self, d: DataStream):
-        self.data: DataStream = d
-        self.type: int = self.data.read_uint8()
-        self.data.read_bytes(1)
-        self.listIndex: int = self.data.read_uint16()
-        self.offset: int = self.data.read_uint32()
+    def to_dict(self) -> dict:
+        return {"type": self.type, "listIndex": self.listIndex, "offset": self.offset}
 
 
-class attributeList:
+class attributeList(NamedTuple):
     """A class that represents an attribute list"""
+    list: tuple[str, ...]
 
-    def __init__(self, d: DataStream):
-        self.data: DataStream = d
-        self.list: list[str] = []
-        itemOffsets: list[int] = []
-        relativeStart = self.data.tell()
-        itemCount = self.data.read_uint32()
-        for _ in range(itemCount):
-            itemOffsets.append(self.data.read_uint32())
-        for offset in itemOffsets:
-            self.data.seek(relativeStart)
-            self.data.seek(offset, 1)
-            listItem = self.data.read_string_nt()
-            self.list.append(listItem)
-
-
-class tagGroup:
-    """A class that represents a tag group"""
+    @classmethod
+    def read(cls, d: DataStream) -> 'attributeList':
+        relativeStart = d.tell()
+        itemCount = d.read_uint32()
+        itemOffsets: list[int] = d.read_array('I', itemCount)
+        return cls(tuple(d.read_string_table(relativeStart, itemOffsets)))
 
-    def __init__(self, d: DataStream):
-        self.data: DataStream = d
-        self.tagCount: int = self.data.read_uint16()
-        self.tagIndexes: list[int] = []
-        for _ in range(self.tagCount):
-            index = self.data.read_uint16()
-            self.tagIndexes.append(index)
-        self.groupName: str = self.data.read_string_nt()
+    def to_dict(self) -> dict:
+        return {"list": self.list}
 
 
-class tag:
-    """A class that represents a tag"""
+class tagGroup(NamedTuple):
+    """A class that represents a tag group"""
+    tagCount: int
+    tagIndexes: tuple[int, ...]
+    groupName: str
 
-    def __init__(self, d: DataStream):
-        self.data: DataStream = d
-        self.parameterCount: int = self.data.read_uint16()
-        self.parameterIndexes: list[int] = []
-        for _ in range(self.parameterCount):
-            parameterIndex: int = self.data.read_uint16()
-            self.parameterIndexes.append(parameterIndex)
-        self.name: str = self.data.read_string_nt()
+    @classmethod
+    def read(cls, d: DataStream) -> 'tagGroup':
+        tagCount: int = d.read_uint16()
+        tagIndexes = tuple(d.read_array('H', tagCount))
+        return cls(tagCount, tagIndexes, d.read_string_nt())
 
+    def to_dict(self) -> dict:
+        return {"tagCount": self.tagCount, "tagIndexes": self.tagIndexes, "groupName": self.groupName}
 
-class tagParameter:
-    """A class that represents a tag parameter"""
 
-    def __init__(self, d: DataStream):
-        self.data: DataStream = d
-        self.type: int = self.data.read_uint8()
+class tag(NamedTuple):
+    """A class that represents a tag"""
+    parameterCount: int
+    parameterIndexes: tuple[int, ...]
+    name: str
+
+    @classmethod
+    def read(cls, d: DataStream) -> 'tag':
+        parameterCount: int = d.read_uint16()
+        parameterIndexes = tuple(d.read_array('H', parameterCount))
+        return cls(parameterCount, parameterIndexes, d.read_string_nt())
+
+    def to_dict(self) -> dict:
+        return {"parameterCount": self.parameterCount, "parameterIndexes": self.parameterIndexes, "name": self.name}
+
+
+class tagParameter(NamedTuple):
+    """A class that represents a tag parameter (only list parameters, of type 9, have list items)"""
+    type: int
+    parameterName: str
+    ListItemCount: int = 0
+    ListItemIndexes: tuple[int, ...] = ()
+
+    @classmethod
+    def read(cls, d: DataStream) -> 'tagParameter':
+        type: int = d.read_uint8()
+        if type != 9:
+            return cls(type, d.read_string_nt())
+        d.read_bytes(1)
+        listItemCount: int = d.read_uint16()
+        listItemIndexes = tuple(d.read_array('H', listItemCount))
+        return cls(type, d.read_string_nt(), listItemCount, listItemIndexes)
+
+    def to_dict(self) -> dict:
         if self.type != 9:
-            self.parameterName: str = self.data.read_string_nt()
-        else:
-            self.data.read_bytes(1)
-            self.ListItemIndexes: list[int] = []
-            self.ListItemCount: int = self.data.read_uint16()
-            for _ in range(self.ListItemCount):
-                index = self.data.read_uint16()
-                self.ListItemIndexes.append(index)
-            self.parameterName: str = self.data.read_string_nt()
+            return {"type": self.type, "parameterName": self.parameterName}
+        return {"type": self.type, "ListItemCount": self.ListItemCount, "ListItemIndexes": self.ListItemIndexes,
+                "parameterName": self.parameterName}
+
 
+class tagList(NamedTuple):
+    """A class that represents a tag list"""
+    item: str
 
-class tagList:
-    def __init__(self, d: DataStream):
-        """A class that represents a tag list"""
-        self.data: DataStream = d
-        self.item: str = self.data.read_string_nt()
+    @classmethod
+    def read(cls, d: DataStream) -> 'tagList':
+        return cls(d.read_string_nt())
 
+    def to_dict(self) -> dict:
+        return {"item": self.item}
 
-class style:
+
+class style(NamedTuple):
     """A class that represents a style"""
+    regionWidth: int
+    lineNumber: int
+    fontIndex: int
+    baseColorIndex: tuple
+
+    @classmethod
+    def read(cls, d: DataStream) -> 'style':
+        return cls._make(STYLE_SCHEMA.read_values(d))
+
+    def to_dict(self) -> dict:
+        return {"regionWidth": self.regionWidth, "lineNumber": self.lineNumber, "fontIndex": self.fontIndex,
+                "baseColorIndex": self.baseColorIndex}
+
 
-    def __init__(self, d: DataStream):
-        self.data: DataStream = d
-        self.regionWidth: int = self.data.read_uint32()
-        self.lineNumber: int = self.data.read_uint32()
-        self.fontIndex: int = self.data.read_uint32()
-        self.baseColorIndex: tuple = self.data.read_color_rgba8()
+class contentInfo(NamedTuple):
+    """A class that represents content info"""
+    sourceFile: str
 
+    @classmethod
+    def read(cls, d: DataStream) -> 'contentInfo':
+        return cls(d.read_string_nt())
 
-class contentInfo:
-    def __init__(self, d: DataStream):
-        """A class that represents content info"""
-        self.data: DataStream = d
-        self.sourceFile: str = self.data.read_string_nt()
+    def to_dict(self) -> dict:
+        return {"sourceFile": self.sourceFile}
@@ -0,0 +1,226 @@
+import codecs
+import re
+import struct
+from typing import NamedTuple, Union
+
+from ctr.util.struct_codecs import BYTE_ORDER_PREFIXES, get_struct
+from ctr.lib.lms.common.lmsTagTable import lmsTagTable, tagInfo
+
+"""
+Decoding of the control codes (inline tags) of MSBT messages, with decoders compiled from the tags of an MSBP project.
+
+A message is UTF-16 text, in which a tag starts with the code unit 0x000E followed by its group index,
+its tag index and the size of its parameters (all u16), and then the parameters themselves. The end of
+a tag's span is the code unit 0x000F followed by its group index and tag index.
+
+The layout of each tag's parameters is known from the project, so compile_tag_decoders turns the tag
+table into a dispatch table of decoders generated for each tag around the one struct.Struct of its
+layout, and decoding a tag is a lookup and an unpack. String parameters (a u16 byte size and the text)
+split the layout into several structs:
+
+    decoder = project.control_code_decoder('little')
+    for segment in decoder.decode(message):
+        if isinstance(segment, controlTag):
+            segment.tag.name, segment.parameters
+
+The parameters of tags missing from the project, of types that aren't supported, or of a size that
+doesn't match the layout, are left as raw bytes. A tag cut off by the end of the message raises a ValueError.
+"""
+
+# The struct formats of the parameter types (list parameters are stored as the index of their item)
+PARAMETER_FORMATS = {
+    0: 'B', 1: 'H', 2: 'I',
+    3: 'b', 4: 'h', 5: 'i',
+    6: 'f',
+    9: 'B',
+}
+STRING_PARAMETER = 8
+
+TAG_START = 0x0E
+TAG_END = 0x0F
+
+
+class controlTag(NamedTuple):
+    """A tag in a message, with its parameter values in order (or the raw parameter data when they can't be decoded)"""
+    groupIndex: int
+    tagIndex: int
+    tag: tagInfo
+    values: Union[tuple, bytes]
+
+    @property
+    def parameters(self) -> dict:
+        """The parameter values by name, or the raw parameter data when they couldn't be decoded."""
+        if isinstance(self.values, bytes):
+            return self.values
+        return {parameter.name: value for parameter, value in zip(self.tag.parameters, self.values)}
+
+
+class controlTagEnd(NamedTuple):
+    """The end of a tag's span in a message"""
+    groupIndex: int
+    tagIndex: int
+
+
+def list_items(values: tuple, listItems: tuple) -> tuple:
+    """Replaces the values of list parameters (those with items in listItems) by their items."""
+    return tuple(items[value] if items is not None and value < len(items) else value for items, value in zip(listItems, values))
+
+
+def compile_string_tag(groupIndex: int, tagIndex: int, tag: tagInfo, segments: list, listItems: tuple, byteOrder: str) -> callable:
+    """Compiles the decoder of a tag with string parameters, which reads its runs of fixed-size parameters
+    (each with a struct) and its strings (a None segment) in turn."""
+    length = get_struct('H', byteOrder).unpack_from
+    decode_text = codecs.utf_16_le_decode if byteOrder == 'little' else codecs.utf_16_be_decode
+
+    def decode(message: bytes, offset: int, size: int) -> controlTag:
+        end = offset + size
+        values: tuple = ()
+        for segment in segments:
+            # A string length or a run of parameters past the end of the parameter data leaves it raw
+            if segment is None:
+                start = offset + 2
+                if start > end:
+                    return controlTag(groupIndex, tagIndex, tag, message[end - size:end])
+                offset = start + length(message, offset)[0]
+                if offset > end:
+                    return controlTag(groupIndex, tagIndex, tag, message[end - size:end])
+                values += (decode_text(message[start:offset], 'surrogatepass')[0],)
+            else:
+                if offset + segment.size > end:
+                    return controlTag(groupIndex, tagIndex, tag, message[end - size:end])
+                values += segment.unpack_from(message, offset)
+                offset += segment.size
+        if end - offset > 1:
+            return controlTag(groupIndex, tagIndex, tag, message[end - size:end])
+        return controlTag(groupIndex, tagIndex, tag, values if listItems is None else list_items(values, listItems))
+
+    return decode
+
+
+def compile_tag(groupIndex: int, tagIndex: int, tag: tagInfo, byteOrder: str) -> callable:
+    """Compiles the decoder of a tag's parameters: a function of (message, offset, size), the offset and size
+    of the parameter data in the message, which returns the controlTag. Returns None if a parameter has
+    an unsupported type."""
+    segments: list = []
+    fmt = ''
+    for parameter in tag.parameters:
+        if parameter.type == STRING_PARAMETER:
+            segments.append(get_struct(fmt, byteOrder))
+            segments.append(None)
+            fmt = ''
+        elif parameter.type in PARAMETER_FORMATS:
+            fmt += PARAMETER_FORMATS[parameter.type]
+        else:
+            return None
+    segments.append(get_struct(fmt, byteOrder))
+
+    # List parameters are replaced by their items, only in the decoders of tags that have any
+    listItems = tuple(parameter.listItems if parameter.type == 9 else None for parameter in tag.parameters)
+    if not any(listItems):
+        listItems = None
+
+    if len(segments) > 1:
+        return compile_string_tag(groupIndex, tagIndex, tag, segments, listItems, byteOrder)
+
+    # The parameter data is a single struct, which may be padded to a whole code unit
+    unpack_from = segments[0].unpack_from
+    sizes = {segments[0].size, segments[0].size + (segments[0].size & 1)}
+
+    if listItems is None:
+        def decode(message: bytes, offset: int, size: int) -> controlTag:
+            if size in sizes:
+                return controlTag(groupIndex, tagIndex, tag, unpack_from(message, offset))
+            return controlTag(groupIndex, tagIndex, tag, message[offset:offset + size])
+    else:
+        def decode(message: bytes, offset: int, size: int) -> controlTag:
+            if size in sizes:
+                return controlTag(groupIndex, tagIndex, tag, list_items(unpack_from(message, offset), listItems))
+            return controlTag(groupIndex, tagIndex, tag, message[offset:offset + size])
+    return decode
+
+
+def tag_key(groupIndex: int, tagIndex: int, byteOrder: str) -> int:
+    """The key of a tag in a dispatch table: its group and tag index as they are stored, read as a single u32."""
+    return get_struct('I', byteOrder).unpack(get_struct('HH', byteOrder).pack(groupIndex, tagIndex))[0]
+
+
+def compile_tag_decoders(tagTable: lmsTagTable, byteOrder: str = 'little') -> dict[int, callable]:
+    """Compiles the decoders of every tag in a tag table into a dispatch table, keyed by tag_key."""
+    decoders: dict = {}
+    for (groupIndex, tagIndex), tag in tagTable.items():
+        decode = compile_tag(groupIndex, tagIndex, tag, byteOrder)
+        if decode is not None:
+            decoders[tag_key(groupIndex, tagIndex, byteOrder)] = decode
+    return decoders
+
+
+class lmsControlCodeDecoder:
+    """A class that splits UTF-16 messages into their text and tags, using the tag decoders compiled from a tag table"""
+
+    def __init__(self, tagTable: lmsTagTable, byteOrder: str = 'little'):
+        self.tagTable: lmsTagTable = tagTable
+        self.byteOrder: str = byteOrder
+        self.decodeText = codecs.utf_16_le_decode if byteOrder == 'little' else codecs.utf_16_be_decode
+        self.decoders: dict[int, callable] = compile_tag_decoders(tagTable, byteOrder)
+
+        # The start or end of a tag (the code unit is checked to be aligned when it's found)
+        prefix = BYTE_ORDER_PREFIXES[byteOrder]
+        self.tagStart: bytes = struct.pack(prefix + 'H', TAG_START)
+        self.codePattern: re.Pattern = re.compile(re.escape(self.tagStart) + b'|' + re.escape(struct.pack(prefix + 'H', TAG_END)))
+        self.tagHeader: struct.Struct = get_struct('IH', byteOrder)
+        self.endHeader: struct.Struct = get_struct('HH', byteOrder)
+
+    def decode(self, message: bytes) -> list:
+        """Splits a message into its text (as strings) and its tags (as controlTag and controlTagEnd).
+        A terminating null character is left out of the text."""
+        segments: list = []
+        if message[-2:] == b'\0\0':
+            message = message[:-2]
+
+        # Bind what the loop uses to locals, as it runs once per tag
+        search = self.codePattern.search
+        tagStart = self.tagStart
+        tagHeader = self.tagHeader.unpack_from
+        endHeader = self.endHeader.unpack_from
+        decoders = self.decoders
+        decode_text = self.decodeText
+
+        position = 0
+        match = search(message)
+        while match is not None:
+            start = match.start()
+            if start & 1:
+                # The code units of the text straddle the match
+                match = search(message, start + 1)
+                continue
+
+            if start > position:
+                segments.append(decode_text(message[position:start], 'surrogatepass')[0])
+            if match.group() == tagStart:
+                # The group and tag index are read together as the key of the tag's decoder
+                if start + 8 > len(message):
+                    raise ValueError("Message has a truncated tag header at offset " + hex(start) + "! (Expected 8 bytes, got " + str(len(message) - start) + ")")
+                key, size = tagHeader(message, start + 2)
+                position = start + 8 + size
+                if position > len(message):
+                    raise ValueError("Message has truncated tag parameters at offset " + hex(start + 8) + "! (Expected " + str(size) + " bytes, got " + str(len(message) - start - 8) + ")")
+                decode_tag = decoders.get(key)
+                if decode_tag is not None:
+                    segments.append(decode_tag(message, start + 8, size))
+                else:
+                    segments.append(self.unknown_tag(message, start, size))
+            else:
+                if start + 6 > len(message):
+                    raise ValueError("Message has a truncated tag end at offset " + hex(start) + "! (Expected 6 bytes, got " + str(len(message) - start) + ")")
+                segments.append(controlTagEnd(*endHeader(message, start + 2)))
+                position = start + 6
+            match = search(message, position)
+
+        if position < len(message):
+            segments.append(decode_text(message[position:], 'surrogatepass')[0])
+        return segments
+
+    def unknown_tag(self, message: bytes, start: int, size: int) -> controlTag:
+        """Returns a tag without a decoder (starting at start) with its raw parameter data."""
+        groupIndex, tagIndex = self.endHeader.unpack_from(message, start + 2)
+        return controlTag(groupIndex, tagIndex, self.tagTable.get((groupIndex, tagIndex)), message[start + 8:start + 8 + size])
@@ -16,8 +16,14 @@ class lmsBinaryHeader:
     def __init__(self, data: DataStream):
         self.data: DataStream = data
         self.magic: str = self.data.read_string(8)
-        self.byteOrderMark = 'little' if self.data.read_bytes(
-            2) == b'\xFF\xFE' else 'big'
+        bom: bytes = self.data.read_bytes(2)
+        if bom not in (b'\xFF\xFE', b'\xFE\xFF'):
+            raise lmsInvalidBOM(
+                f"Invalid BOM, expected b'\\xFF\\xFE' or b'\\xFE\\xFF' got {bom}")
+        self.byteOrderMark = 'little' if bom == b'\xFF\xFE' else 'big'
+
+        # Everything after the BOM is stored in the file's byte order
+        self.data.byteOrder = self.byteOrderMark
         self.data.read_bytes(2)
         self.messageEncoding: int
         messageEncodingNumber: int = self.data.read_uint8()
@@ -30,7 +36,8 @@ class lmsBinaryHeader:
                 self.messageEncoding = "UTF-32"
 
         self.revision: int = self.data.read_uint8()
-        self.blockCount: int = self.data.read_uint32()
+        self.blockCount: int = self.data.read_uint16()
+        self.data.read_bytes(2)
         self.fileSize: int = self.data.read_uint32()
         self.data.read_bytes(10)
 
@@ -38,9 +45,6 @@ class lmsBinaryHeader:
         if self.magic != "MsgPrjBn":
             raise lmsInvalidHeader(
                 f"Invalid header, expected 'MsgPrjBn' got '{self.magic}'")
-        if self.byteOrderMark != "little":
-            raise lmsInvalidBOM(
-                f"Invalid BOM, expected 'little' got '{self.byteOrderMark}'")
         if self.revision != 3:
             raise lmsInvalidRevision(
                 f"Invalid revision, expected '3', got '{self.revision}'")
@@ -0,0 +1,94 @@
+from ctr.util.struct_codecs import get_struct
+
+"""
+Lookups of labels in LMS label blocks (LBL1, CLB1, ALB1, SLB1, ...) through their hash table.
+
+A label block is a hash table: its data starts with the number of buckets, followed by a
+(labelCount, offset) entry per bucket, and each bucket holds its labels (a length byte, the label
+and the index of its item). A label is found in the bucket its hash points to:
+
+    index = lmsLabelIndex(blockData, 'little')
+    index.get('Red')    # Hashes 'Red', and only decodes the labels of its bucket
+
+Each bucket is decoded the first time a label hashes to it, and kept for the next lookups in it.
+With prebuild(), every label is decoded into a single dict up front instead, which skips the hashing.
+A label block that already decoded its labels builds that dict from them with from_labels.
+"""
+
+
+def lms_label_hash(label: str, bucketCount: int) -> int:
+    """The hash function of LMS label blocks, which picks the bucket of a label."""
+    value = 0
+    for char in label.encode('utf-8'):
+        value = (value * 0x492 + char) & 0xFFFFFFFF
+    return value % bucketCount
+
+
+class lmsLabelIndex:
+    """A class that looks up the item index of labels in the data of a label block (from the bucket count on)"""
+
+    def __init__(self, blockData: bytes, byteOrder: str, prebuilt: bool = False):
+        self.blockData: bytes = blockData
+        self.byteOrder: str = byteOrder
+        self.bucketCount: int = get_struct('I', byteOrder).unpack_from(blockData)[0] if blockData is not None else 0
+
+        # The buckets decoded so far (by bucket number), and every label once prebuilt
+        self.buckets: dict[int, dict[bytes, int]] = {}
+        self.labels: dict[str, int] = None
+        if prebuilt:
+            self.prebuild()
+
+    @classmethod
+    def from_labels(cls, labels: list, bucketCount: int, byteOrder: str = 'little') -> 'lmsLabelIndex':
+        """Returns a prebuilt index of labels that are already decoded (as (label, itemIndex) pairs), without
+        the data of their block."""
+        index = cls(None, byteOrder)
+        index.bucketCount = bucketCount
+        index.labels = {label: itemIndex for label, itemIndex in labels}
+        return index
+
+    def read_bucket(self, bucket: int) -> dict[bytes, int]:
+        """Decodes the labels of a bucket (still encoded) and their item indexes."""
+        data = self.blockData
+        itemIndex = get_struct('I', self.byteOrder)
+        labelCount, offset = get_struct('II', self.byteOrder).unpack_from(data, 4 + 8 * bucket)
+
+        labels: dict[bytes, int] = {}
+        for _ in range(labelCount):
+            end = offset + 1 + data[offset]
+            labels[data[offset + 1:end]] = itemIndex.unpack_from(data, end)[0]
+            offset = end + 4
+        return labels
+
+    def get(self, label: str, default: int = None) -> int:
+        """Returns the item index of a label, or default if the block doesn't have it."""
+        if self.labels is not None:
+            return self.labels.get(label, default)
+        if self.bucketCount == 0:
+            return default
+
+        bucket = lms_label_hash(label, self.bucketCount)
+        labels = self.buckets.get(bucket)
+        if labels is None:
+            labels = self.buckets[bucket] = self.read_bucket(bucket)
+        return labels.get(label.encode('utf-8'), default)
+
+    def prebuild(self) -> None:
+        """Decodes every label into a dict, which answers the lookups from then on."""
+        if self.labels is not None:
+            return
+        labels: dict[str, int] = {}
+        for bucket in range(self.bucketCount):
+            for encoded, itemIndex in (self.buckets.get(bucket) or self.read_bucket(bucket)).items():
+                labels[encoded.decode('utf-8')] = itemIndex
+        self.labels = labels
+        self.buckets = {}
+
+    def __getitem__(self, label: str) -> int:
+        itemIndex = self.get(label)
+        if itemIndex is None:
+            raise KeyError(label)
+        return itemIndex
+
+    def __contains__(self, label: str) -> bool:
+        return self.get(label) is not None
@@ -0,0 +1,80 @@
+from typing import NamedTuple, Iterator
+
+"""
+The tags of an MSBP project resolved once into a table, for decoding the control codes of messages.
+
+A control code names its tag by the index of its tag group (in TGG2) and the index of the tag within
+that group, so the table is keyed by (groupIndex, tagIndex). Each entry holds the tag's names and its
+parameters with their types and list items, resolved through TAG2, TGP2 and TGL2:
+
+    tag = project.tagTable[(0, 3)]
+    tag.groupName, tag.name, [(parameter.name, parameter.type) for parameter in tag.parameters]
+
+The entries are immutable records, and the table can be pickled to share it with worker processes.
+"""
+
+
+class tagParameterInfo(NamedTuple):
+    """A resolved parameter of a tag (only list parameters, of type 9, have list items)"""
+    name: str
+    type: int
+    listItemIndexes: tuple[int, ...]
+    listItems: tuple[str, ...]
+
+
+class tagInfo(NamedTuple):
+    """A resolved tag"""
+    groupIndex: int
+    tagIndex: int
+    groupName: str
+    name: str
+    parameterIndexes: tuple[int, ...]
+    parameters: tuple[tagParameterInfo, ...]
+
+
+class lmsTagTable:
+    """A class that represents the resolved tags of a project, by (groupIndex, tagIndex)"""
+
+    def __init__(self, tagGroups: list, tags: list, tagParameters: list, tagList: list):
+        # Resolve every parameter once, as they are shared between tags
+        parameters: list[tagParameterInfo] = []
+        for parameter in tagParameters:
+            if parameter.type == 9:
+                listItems = tuple(tagList[listIndex].item for listIndex in parameter.ListItemIndexes)
+                parameters.append(tagParameterInfo(parameter.parameterName, parameter.type, parameter.ListItemIndexes, listItems))
+            else:
+                parameters.append(tagParameterInfo(parameter.parameterName, parameter.type, (), ()))
+
+        self.entries: dict[tuple[int, int], tagInfo] = {}
+        self.groupNames: tuple[str, ...] = tuple(group.groupName for group in tagGroups)
+        for groupIndex, group in enumerate(tagGroups):
+            for tagIndex, index in enumerate(group.tagIndexes):
+                tag = tags[index]
+                self.entries[(groupIndex, tagIndex)] = tagInfo(
+                    groupIndex, tagIndex, group.groupName, tag.name, tag.parameterIndexes,
+                    tuple(parameters[parameterIndex] for parameterIndex in tag.parameterIndexes))
+
+    def get(self, key: tuple[int, int], default: tagInfo = None) -> tagInfo:
+        return self.entries.get(key, default)
+
+    def group(self, groupIndex: int) -> Iterator[tagInfo]:
+        """Yields the tags of a group, in order."""
+        tagIndex = 0
+        while (groupIndex, tagIndex) in self.entries:
+            yield self.entries[(groupIndex, tagIndex)]
+            tagIndex += 1
+
+    def __getitem__(self, key: tuple[int, int]) -> tagInfo:
+        return self.entries[key]
+
+    def __contains__(self, key: tuple[int, int]) -> bool:
+        return key in self.entries
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def items(self):
+        return self.entries.items()
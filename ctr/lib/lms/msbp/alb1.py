@@ -1,5 +1,6 @@
 from ctr.util.data_stream import DataStream
 from ctr.lib.lms.common.lmsBlocks import lmsLabelBlock
+from ctr.lib.lms.common.lmsLabelIndex import lmsLabelIndex
 
 
 class ALB1:
@@ -9,3 +10,12 @@ class ALB1:
         self.data = data
         self.block: lmsLabelBlock = lmsLabelBlock(self.data)
         self.entries: dict = self.block.entries
+        self.sortedEntries: list = self.block.sortedEntries
+
+    @property
+    def index(self) -> lmsLabelIndex:
+        """The index of the labels, to find them by name."""
+        return self.block.index
+
+    def to_dict(self) -> dict:
+        return {"entries": [entry.to_dict() for entry in self.entries]}
@@ -10,3 +10,6 @@ class ALI2:
         self.data: DataStream = data
         self.block: lmsItemBlock = lmsItemBlock(self.data, attributeList)
         self.attributeLists: list[attributeList] = self.block.entries
+
+    def to_dict(self) -> dict:
+        return {"attributeLists": [entry.to_dict() for entry in self.attributeLists]}
@@ -1,12 +1,23 @@
 from ctr.util.data_stream import DataStream
 from ctr.lib.lms.common.lmsBlocks import lmsDataBlock
-from ctr.lib.lms.common.lmsCommonTypes import attribute
+from ctr.lib.lms.common.lmsCommonTypes import attribute, ATTRIBUTE_SCHEMA
 
 
 class ATI2:
-    """A class that represents an ATI2 block"""
+    """A class that represents an ATI2 block
 
-    def __init__(self, data: DataStream = None) -> None:
+    With columnar=True, the entries are decoded into columns (attributes.type, attributes.listIndex
+    and attributes.offset are parallel arrays), which can still be indexed and iterated as a list of records."""
+
+    def __init__(self, data: DataStream = None, columnar: bool = False) -> None:
         self.data: DataStream = data
-        self.block: lmsDataBlock = lmsDataBlock(self.data, attribute)
+        if columnar:
+            # The columnar blocks need numpy, so they're only imported when they're used
+            from ctr.lib.lms.common.lmsColumns import lmsColumnarBlock
+            self.block = lmsColumnarBlock(self.data, attribute, ATTRIBUTE_SCHEMA)
+        else:
+            self.block: lmsDataBlock = lmsDataBlock(self.data, attribute)
         self.attributes: list[attribute] = self.block.entries
+
+    def to_dict(self) -> dict:
+        return {"attributes": [entry.to_dict() for entry in self.attributes]}
@@ -1,5 +1,6 @@
 from ctr.util.data_stream import DataStream
 from ctr.lib.lms.common.lmsBlocks import lmsLabelBlock
+from ctr.lib.lms.common.lmsLabelIndex import lmsLabelIndex
 
 
 class CLB1:
@@ -9,3 +10,12 @@ class CLB1:
         self.data = data
         self.labelBlock = lmsLabelBlock(self.data)
         self.entries: dict = self.labelBlock.entries
+        self.sortedEntries: list = self.labelBlock.sortedEntries
+
+    @property
+    def index(self) -> lmsLabelIndex:
+        """The index of the labels, to find them by name."""
+        return self.labelBlock.index
+
+    def to_dict(self) -> dict:
+        return {"entries": [entry.to_dict() for entry in self.entries]}
@@ -1,12 +1,23 @@
 from ctr.util.data_stream import DataStream
 from ctr.lib.lms.common.lmsBlocks import lmsDataBlock
-from ctr.lib.lms.common.lmsCommonTypes import color
+from ctr.lib.lms.common.lmsCommonTypes import color, COLOR_SCHEMA
 
 
 class CLR1:
-    """A class representing a CLR1 block"""
+    """A class representing a CLR1 block
 
-    def __init__(self, data: DataStream = None):
+    With columnar=True, the entries are decoded into columns (colors.color is an N x 4 uint8 array),
+    which can still be indexed and iterated as a list of records."""
+
+    def __init__(self, data: DataStream = None, columnar: bool = False):
         self.data: DataStream = data
-        self.block: lmsDataBlock = lmsDataBlock(self.data, color)
+        if columnar:
+            # The columnar blocks need numpy, so they're only imported when they're used
+            from ctr.lib.lms.common.lmsColumns import lmsColumnarBlock
+            self.block = lmsColumnarBlock(self.data, color, COLOR_SCHEMA)
+        else:
+            self.block: lmsDataBlock = lmsDataBlock(self.data, color)
         self.colors: list = self.block.entries
+
+    def to_dict(self) -> dict:
+        return {"colors": [entry.to_dict() for entry in self.colors]}
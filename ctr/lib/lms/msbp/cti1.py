@@ -10,3 +10,6 @@ class CTI1:
         self.data: DataStream = data
         self.cti1Block: lmsItemBlock = lmsItemBlock(self.data, contentInfo)
         self.contentInfo: list[contentInfo] = self.cti1Block.entries
+
+    def to_dict(self) -> dict:
+        return {"contentInfo": [entry.to_dict() for entry in self.contentInfo]}
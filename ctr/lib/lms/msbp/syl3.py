@@ -1,12 +1,23 @@
 from ctr.util.data_stream import DataStream
 from ctr.lib.lms.common.lmsBlocks import lmsDataBlock
-from ctr.lib.lms.common.lmsCommonTypes import style
+from ctr.lib.lms.common.lmsCommonTypes import style, STYLE_SCHEMA
 
 
 class SYL3:
-    """A class representing a SYL3 block"""
+    """A class representing a SYL3 block
 
-    def __init__(self, data: DataStream = None):
+    With columnar=True, the entries are decoded into columns (styles.regionWidth, styles.lineNumber,
+    styles.fontIndex and the N x 4 styles.baseColorIndex), which can still be indexed and iterated as a list of records."""
+
+    def __init__(self, data: DataStream = None, columnar: bool = False):
         self.data: DataStream = data
-        self.block: lmsDataBlock = lmsDataBlock(self.data, style)
+        if columnar:
+            # The columnar blocks need numpy, so they're only imported when they're used
+            from ctr.lib.lms.common.lmsColumns import lmsColumnarBlock
+            self.block = lmsColumnarBlock(self.data, style, STYLE_SCHEMA)
+        else:
+            self.block: lmsDataBlock = lmsDataBlock(self.data, style)
         self.styles: list[style] = self.block.entries
+
+    def to_dict(self) -> dict:
+        return {"styles": [entry.to_dict() for entry in self.styles]}
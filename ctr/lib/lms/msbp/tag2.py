@@ -10,3 +10,6 @@ class TAG2:
         self.data: DataStream = data
         self.tag2Block: lmsItemBlock = lmsItemBlock(self.data, tag)
         self.tags: list[tag] = self.tag2Block.entries
+
+    def to_dict(self) -> dict:
+        return {"tags": [entry.to_dict() for entry in self.tags]}
@@ -10,3 +10,6 @@ class TGG2:
         self.data: DataStream = data
         self.tgg2Block: lmsItemBlock = lmsItemBlock(self.data, tagGroup)
         self.tagGroups: list[tagGroup] = self.tgg2Block.entries
+
+    def to_dict(self) -> dict:
+        return {"tagGroups": [entry.to_dict() for entry in self.tagGroups]}
@@ -10,3 +10,6 @@ class TGL2:
         self.data: DataStream = data
         self.tgl2Block: lmsItemBlock = lmsItemBlock(self.data, tagList)
         self.tagList: list[str] = self.tgl2Block.entries
+
+    def to_dict(self) -> dict:
+        return {"tagList": [entry.to_dict() for entry in self.tagList]}
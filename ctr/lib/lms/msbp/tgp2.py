@@ -10,3 +10,6 @@ class TGP2:
         self.data: DataStream = data
         self.tgp2block: lmsItemBlock = lmsItemBlock(self.data, tagParameter)
         self.tagParameters: list[tagParameter] = self.tgp2block.entries
+
+    def to_dict(self) -> dict:
+        return {"tagParameters": [entry.to_dict() for entry in self.tagParameters]}
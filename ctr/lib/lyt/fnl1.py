@@ -1,6 +1,6 @@
 from ctr.util.data_stream import DataStream
 from ctr.util.write_stream import WriteStream
-from ctr.util.serialize import JsonSerialize
+from ctr.util.serialize import to_json
 
 """
 FNL1 (Font List 1)
@@ -40,13 +40,9 @@ class Fnl1:
         # All offsets are relative to the start of the section
         curPos = data.tell()
 
-        # Loop through each texture offset
-        self.strings = []
-        for i in range(self.fontCount):
-            # Read the next 4 bytes to get the texture offset
-            offset = data.read_uint32()
-            # Add the string from the curPos + offset (Equivalent of C#'s ReadStringNTFrom)
-            self.strings.append(data.read_string_nt_from(curPos + offset))
+        # Read the font name offsets, then the whole string table they point into
+        offsets = data.read_array('I', self.fontCount)
+        self.strings = data.read_string_table(curPos, offsets)
         
         # Seek to the end of the section
         data.seek(startPos + sectionSize)
@@ -62,8 +58,8 @@ class Fnl1:
         # Write the signature
         data.write_string("fnl1")
 
-        # Write the section size (Temporary value that will be overwritten later)
-        data.write_uint32(0)
+        # Reserve the section size
+        sectionSize = data.reserve_uint32()
 
         # Write the font count
         data.write_uint32(self.fontCount)
@@ -71,36 +67,25 @@ class Fnl1:
         # Store section start
         sectionStart = data.tell()
 
-        # Write the font name offsets (Temporary values that will be overwritten later)
-        for i in range(self.fontCount):
-            data.write_uint32(0)
+        # Reserve the font name offsets
+        fontNameOffsets = [data.reserve_uint32() for _ in range(self.fontCount)]
 
         # Write the font names
-        fontNameOffsets = []
         for i in range(self.fontCount):
-            fontNameOffsets.append(data.tell() - sectionStart)
+            fontNameOffsets[i].set(data.tell() - sectionStart)
             data.write_string_nt(self.strings[i])
         
-        # Calculate the section size
-        sectionSize = data.tell() - startPos
-
-        # Write the font name offsets
-        for i in range(self.fontCount):
-            data.seek(startPos + 0xC + (i * 4))
-            data.write_uint32(fontNameOffsets[i])
-
-        # Write the section size
-        data.seek(startPos + 4)
-        data.write_uint32(sectionSize)
-
-        # Seek to the end of the section
-        data.seek(startPos + sectionSize)
+        # Fill in the section size
+        sectionSize.set(data.tell() - startPos)
 
         return data
     
+    def to_dict(self) -> dict:
+        return {
+            "fontCount": self.fontCount,
+            "strings": self.strings,
+        }
+
     def __str__(self) -> str:
-        j = JsonSerialize()
-        j.add("fontCount", self.fontCount)
-        j.add("strings", self.strings)
-        return j.serialize()
+        return to_json(self.to_dict())
 
@@ -1,6 +1,6 @@
 from ctr.util.data_stream import DataStream
 from ctr.util.write_stream import WriteStream
-from ctr.util.serialize import JsonSerialize
+from ctr.util.schema import Schema, string, uint16, padding, decode_padded_string
 
 from ctr.lib.lyt.layoutbase import LayoutBase
 
@@ -18,9 +18,17 @@ Offset |  Size  |   Type   | Description
 ===================
 """
 
+# Everything between the section size and the pane references
+GRP1_SCHEMA = Schema(
+    string('name', 0x10),
+    uint16('paneCount'),
+    padding(2),
+)
+
 class Grp1(LayoutBase):
     """A GRP1 section in a CTR file"""
 
+    paneCount: int = 0
     entries: list[str] = None
 
     def __init__(self, data: DataStream = None):
@@ -36,15 +44,11 @@ class Grp1(LayoutBase):
         startPos = data.tell() - 4
 
         sectionSize = data.read_uint32()
-        self.name = data.read_string(0x10).replace("\0", "")
-        paneCount = data.read_uint16()
-        data.read_uint16() # Padding?
+        data = GRP1_SCHEMA.read(self, data)
 
         # Root group never has any entries
-        if paneCount > 0:
-            self.entries = []
-            for _ in range(paneCount):
-                self.entries.append(data.read_string(0x10).replace("\0", ""))
+        if self.paneCount > 0:
+            self.entries = [decode_padded_string(entry) for entry in data.read_record('16s' * self.paneCount)]
         
         # Seek to the end of the section
         data.seek(startPos + sectionSize)
@@ -60,37 +64,24 @@ class Grp1(LayoutBase):
         # Write the section header
         data.write_string("grp1")
 
-        # Write the section size (placeholder)
-        data.write_uint32(0)
-
-        # Write the name
-        data.write_string(self.name, 0x10)
-
-        # Write the pane count
-        if self.entries is None:
-            data.write_uint16(0)
-        else:
-            data.write_uint16(len(self.entries))
+        # Reserve the section size
+        sectionSize = data.reserve_uint32()
 
-        # Write the padding
-        data.write_uint16(0)
+        # Write the name, pane count and padding
+        self.paneCount = 0 if self.entries is None else len(self.entries)
+        data = GRP1_SCHEMA.write(self, data)
 
         # Write the pane references
         if self.entries is not None:
             for entry in self.entries:
                 data.write_string(entry, 0x10)
         
-        # Write the section size
-        sectionSize = data.tell() - startPos
-        data.seek(startPos + 4)
-        data.write_uint32(sectionSize)
-
-        # Seek to the end of the section
-        data.seek(startPos + sectionSize)
+        # Fill in the section size
+        sectionSize.set(data.tell() - startPos)
 
         return data
     
-    def __str__(self) -> str:
-        j = JsonSerialize(super().__str__())
-        j.add("entries", self.entries)
-        return j.serialize()
\ No newline at end of file
+    def to_dict(self, streamed: bool = False) -> dict:
+        d = super().to_dict(streamed)
+        d["entries"] = self.entries
+        return d
\ No newline at end of file
@@ -1,4 +1,4 @@
-from ctr.util.serialize import JsonSerialize
+from ctr.util.serialize import StreamedArray, to_json
 
 from ctr.lib.lyt.usd1 import Usd1
 
@@ -24,17 +24,22 @@ class LayoutBase:
     def add_user_data(self, user_data):
         self.userData.append(user_data)
 
-    def __str__(self) -> str:
-        j = JsonSerialize()
-        j.add("type", self.type)
-        j.add("name", self.name)
-        j.add("children", self.children)
-        
-        if self.parent is not None:
-            j.add("parent", self.parent.name)
+    def to_dict(self, streamed: bool = False) -> dict:
+        """Returns the section as plain Python containers. With streamed=True, the children are
+        returned as a StreamedArray that converts each child only when a JsonWriter reaches it."""
+        if streamed:
+            children = StreamedArray(child.to_dict(True) for child in self.children)
         else:
-            j.add("parent", None)
+            children = [child.to_dict() for child in self.children]
+
+        return {
+            "type": self.type,
+            "name": self.name,
+            "children": children,
+            "parent": self.parent.name if self.parent is not None else None,
+            "rootPane": self.rootPane.to_dict(streamed) if self.rootPane is not None else None,
+            "userData": [userData.to_dict() for userData in self.userData],
+        }
 
-        j.add("rootPane", self.rootPane)
-        j.add("userData", self.userData)
-        return j.serialize()
+    def __str__(self) -> str:
+        return to_json(self.to_dict())
@@ -2,7 +2,8 @@ from enum import IntEnum
 
 from ctr.util.data_stream import DataStream
 from ctr.util.write_stream import WriteStream
-from ctr.util.serialize import JsonSerialize
+from ctr.util.serialize import to_json
+from ctr.util.schema import Schema, enum, vector2
 
 """
 LYT1 (Layout 1)
@@ -22,6 +23,12 @@ class OriginType(IntEnum):
     CLASSIC = 0
     NORMAL = 1
 
+# Everything after the section size
+LYT1_SCHEMA = Schema(
+    enum('originType', 'I', OriginType),
+    vector2('canvasSize'),
+)
+
 # Lyt1 Class
 class Lyt1:
     """A LYT1 section in a CTR file"""
@@ -42,11 +49,8 @@ class Lyt1:
         # Read the first 4 bytes to get the section size
         sectionSize = data.read_uint32()
 
-        # Read the next 4 bytes to get the origin type
-        self.originType = OriginType(data.read_uint32())
-
-        # Read the next 8 bytes to get the x and y floats for the canvas size
-        self.canvasSize = data.read_vector2()
+        # Read the origin type and the x and y floats for the canvas size
+        data = LYT1_SCHEMA.read(self, data)
 
         # Seek to the end of the section
         data.seek(startPos + sectionSize)
@@ -61,27 +65,22 @@ class Lyt1:
         # Write the signature
         data.write_string("lyt1")
 
-        # Write the section size (placeholder)
-        data.write_uint32(0)
+        # Reserve the section size
+        sectionSize = data.reserve_uint32()
 
-        # Write the origin type
-        data.write_uint32(self.originType.value)
+        # Write the origin type and canvas size
+        data = LYT1_SCHEMA.write(self, data)
 
-        # Write the canvas size
-        data.write_vector2(self.canvasSize)
-
-        # Write the section size
-        sectionSize = data.tell() - startPos
-        data.seek(startPos + 4)
-        data.write_uint32(sectionSize)
-
-        # Seek to the end of the section
-        data.seek(startPos + sectionSize)
+        # Fill in the section size
+        sectionSize.set(data.tell() - startPos)
 
         return data
     
+    def to_dict(self) -> dict:
+        return {
+            "originType": str(self.originType),
+            "canvasSize": self.canvasSize,
+        }
+
     def __str__(self) -> str:
-        j = JsonSerialize()
-        j.add("originType", self.originType, True)
-        j.add("canvasSize", self.canvasSize)
-        return j.serialize()
\ No newline at end of file
+        return to_json(self.to_dict())
\ No newline at end of file
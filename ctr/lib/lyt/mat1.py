@@ -1,7 +1,8 @@
 from ctr.util.data_stream import DataStream
 from ctr.util.write_stream import WriteStream
 from ctr.util.bit import extract_bits, insert_bits
-from ctr.util.serialize import JsonSerialize
+from ctr.util.serialize import StreamedArray, to_json
+from ctr.util.schema import Schema, string, rgba8, rgba8_array, uint32
 
 from ctr.lib.lyt.material.texmap import TexMap
 from ctr.lib.lyt.material.texsrt import TexSRT
@@ -43,6 +44,14 @@ Offset |  Size  |   Type   | Description
 ===================
 """
 
+# The fixed-size start of a material entry
+MAT1_MATERIAL_SCHEMA = Schema(
+    string('name', 0x14),
+    rgba8('tevColor'),
+    rgba8_array('tevConstantColors', 6),
+    uint32('flags'),
+)
+
 class Mat1:
     """A MAT1 section in a CTR file"""
 
@@ -65,11 +74,8 @@ class Mat1:
         # Read the next 4 bytes to get the texture count
         materialCount = data.read_uint32()
 
-        # Loop through each material
-        self.sectionOffsets = []
-        for _ in range(materialCount):
-            # Read the next 4 bytes to get the section offset
-            self.sectionOffsets.append(data.read_uint32())
+        # Read the material entry offsets
+        self.sectionOffsets = data.read_array('I', materialCount)
         
         # Loop through each section offset
         self.materials = []
@@ -94,36 +100,22 @@ class Mat1:
         # Write the signature
         data.write_string("mat1")
 
-        # Write the section size (placeholder)
-        data.write_uint32(0)
+        # Reserve the section size
+        sectionSize = data.reserve_uint32()
 
         # Write the material count
         data.write_uint32(len(self.materials))
 
-        # Write the material entry offsets (placeholder)
-        for _ in range(len(self.materials)):
-            data.write_uint32(0)
+        # Reserve the material entry offsets
+        materialOffsets = [data.reserve_uint32() for _ in self.materials]
 
         # Write the material entries
-        materialOffsets = []
-        for material in self.materials:
-            materialOffsets.append(data.tell() - startPos)
+        for materialOffset, material in zip(materialOffsets, self.materials):
+            materialOffset.set(data.tell() - startPos)
             data = material.write(data)
         
-        # Calculate the section size
-        sectionSize = data.tell() - startPos
-
-        # Write the material entry offsets
-        for i in range(len(self.materials)):
-            data.seek(startPos + 8 + (i * 4))
-            data.write_uint32(materialOffsets[i])
-        
-        # Write the section size
-        data.seek(startPos + 4)
-        data.write_uint32(sectionSize)
-
-        # Seek to the end of the section
-        data.seek(startPos + sectionSize)
+        # Fill in the section size
+        sectionSize.set(data.tell() - startPos)
 
         return data
     
@@ -131,16 +123,22 @@ class Mat1:
         """Gets the material name from an index"""
         return self.materials[index].name
 
+    def to_dict(self, streamed: bool = False) -> dict:
+        if streamed:
+            return {"materials": StreamedArray(material.to_dict() for material in self.materials)}
+        return {
+            "materials": [material.to_dict() for material in self.materials],
+        }
+
     def __str__(self) -> str:
-        j = JsonSerialize()
-        j.add("materials", self.materials)
-        return j.serialize()
+        return to_json(self.to_dict())
 
 class Mat1Material:
 
     name: str = ""
     tevColor: list[int] = None
     tevConstantColors: list[list[int]] = None
+    flags: int = None
 
     useTextureOnly: bool = None
 
@@ -161,19 +159,9 @@ class Mat1Material:
         
     def read(self, data: DataStream) -> DataStream:
 
-        # Read the first 20 bytes to get the material name
-        self.name = data.read_string(0x14).replace("\0", "")
-
-        # Read the next few bytes to get the tev color
-        self.tevColor = data.read_color_rgba8()
-
-        # Read the 6 constant colors
-        self.tevConstantColors = []
-        for _ in range(6):
-            self.tevConstantColors.append(data.read_color_rgba8())
-        
-        # Read the next 4 bytes to get the flags
-        flags = data.read_uint32()
+        # Read the material name, tev color, the 6 constant colors and the flags
+        data = MAT1_MATERIAL_SCHEMA.read(self, data)
+        flags = self.flags
 
         # Extract the info from the flags
         texMapCount = extract_bits(flags, 2, 0)
@@ -258,17 +246,7 @@ class Mat1Material:
     
     def write(self, data: WriteStream) -> WriteStream:
 
-        # Write the material name
-        data.write_string(self.name, 0x14)
-
-        # Write the tev color
-        data.write_color_rgba8(self.tevColor)
-
-        # Write the 6 constant colors
-        for color in self.tevConstantColors:
-            data.write_color_rgba8(color)
-        
-        # Write the flags
+        # Determine the flags
         flags = 0
         flags = insert_bits(flags, 0, len(self.texMaps), 2)
         flags = insert_bits(flags, 2, len(self.texSRTs), 2)
@@ -281,7 +259,10 @@ class Mat1Material:
         flags = insert_bits(flags, 14, 1 if self.indParam is not None else 0, 1)
         flags = insert_bits(flags, 15, len(self.projTextGenParam), 2)
         flags = insert_bits(flags, 17, 1 if self.fontShadowParam is not None else 0, 1)
-        data.write_uint32(flags)
+        self.flags = flags
+
+        # Write the material name, tev color, the 6 constant colors and the flags
+        data = MAT1_MATERIAL_SCHEMA.write(self, data)
         
         # Loop through each texture map
         for texMap in self.texMaps:
@@ -332,22 +313,25 @@ class Mat1Material:
         return data
 
     
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "tevColor": self.tevColor,
+            "tevConstantColors": self.tevConstantColors,
+            # "flags": self.flags,
+            "useTextureOnly": self.useTextureOnly,
+            "texMaps": [texMap.to_dict() for texMap in self.texMaps],
+            "texSRTs": [texSRT.to_dict() for texSRT in self.texSRTs],
+            "texCoords": [texCoord.to_dict() for texCoord in self.texCoords],
+            "tevStages": [tevStage.to_dict() for tevStage in self.tevStages],
+            "alphaCompare": self.alphaCompare.to_dict() if self.alphaCompare is not None else None,
+            "blendModeBlend": self.blendModeBlend.to_dict() if self.blendModeBlend is not None else None,
+            "blendModeLogic": self.blendModeLogic.to_dict() if self.blendModeLogic is not None else None,
+            "indParam": self.indParam.to_dict() if self.indParam is not None else None,
+            "projTextGenParam": [projTextGenParam.to_dict() for projTextGenParam in self.projTextGenParam],
+            "fontShadowParam": self.fontShadowParam.to_dict() if self.fontShadowParam is not None else None,
+        }
+
     def __str__(self) -> str:
-        j = JsonSerialize()
-        j.add("name", self.name)
-        j.add("tevColor", self.tevColor)
-        j.add("tevConstantColors", self.tevConstantColors)
-        # j.add("flags", self.flags)
-        j.add("useTextureOnly", self.useTextureOnly)
-        j.add("texMaps", self.texMaps)
-        j.add("texSRTs", self.texSRTs)
-        j.add("texCoords", self.texCoords)
-        j.add("tevStages", self.tevStages)
-        j.add("alphaCompare", self.alphaCompare)
-        j.add("blendModeBlend", self.blendModeBlend)
-        j.add("blendModeLogic", self.blendModeLogic)
-        j.add("indParam", self.indParam)
-        j.add("projTextGenParam", self.projTextGenParam)
-        j.add("fontShadowParam", self.fontShadowParam)
-        return j.serialize()
+        return to_json(self.to_dict())
         
\ No newline at end of file
@@ -1,23 +1,30 @@
 from ctr.util.data_stream import DataStream
 from ctr.util.write_stream import WriteStream
-from ctr.util.serialize import JsonSerialize
+from ctr.util.serialize import to_json
+from ctr.util.schema import Schema, uint8, float32, raw
 
 """
 Alpha Compare Entry
 ===================
 Offset |  Size  |   Type   | Description
 -------+--------+----------+------------
- 0x00  |  0x01  |   byte  | Compare Mode
+ 0x00  |  0x01  |  uint8  | Compare Mode
  0x01  |  0x04  |  float  | Reference Alpha
  0x05  |  0x03  |  ?????  | Unknown. In flyte this isn't even stored in a variable, but it's still read to advance the seeker.
 ===================
 """
 
+ALPHA_COMPARE_SCHEMA = Schema(
+    uint8('compareMode'),
+    float32('referenceAlpha'),
+    raw('unknown', 0x3),
+)
+
 class AlphaCompare:
 
     compareMode: int = None
-    referenceAlpha: int = None
-    unknown: int = None
+    referenceAlpha: float = None
+    unknown: bytes = None
 
     def __init__(self, data: DataStream = None):
         if data is not None:
@@ -26,34 +33,25 @@ class AlphaCompare:
     def read(self, data: DataStream) -> DataStream:
         """Reads the AlphaCompare section from a material data stream"""
 
-        # Read in the compare mode as a byte
-        self.compareMode = data.read_bytes(1)
-
-        # Read in the reference alpha as a 32-bit float
-        self.referenceAlpha = data.read_float()
-
-        # Read the unknown bytes
-        self.unknown = data.read_bytes(0x3)
+        # Read in the compare mode, reference alpha and the unknown bytes
+        data = ALPHA_COMPARE_SCHEMA.read(self, data)
 
         return data
     
     def write(self, data: WriteStream) -> WriteStream:
         """Writes the AlphaCompare section to a data stream"""
 
-        # Write the compare mode as a byte
-        data.write_bytes(self.compareMode)
-
-        # Write the reference alpha as a 32-bit float
-        data.write_float(self.referenceAlpha)
-
-        # Write the unknown bytes
-        data.write_bytes(self.unknown, 0x3)
+        # Write the compare mode, reference alpha and the unknown bytes
+        data = ALPHA_COMPARE_SCHEMA.write(self, data)
 
         return data
     
+    def to_dict(self) -> dict:
+        return {
+            "compareMode": self.compareMode,
+            "referenceAlpha": self.referenceAlpha,
+            "unknown": self.unknown.decode("utf-8"),
+        }
+
     def __str__(self) -> str:
-        j = JsonSerialize()
-        j.add("compareMode", self.compareMode)
-        j.add("referenceAlpha", self.referenceAlpha)
-        j.add("unknown", self.unknown)
-        return j.serialize()
+        return to_json(self.to_dict())
@@ -2,7 +2,8 @@ from enum import IntEnum
 
 from ctr.util.data_stream import DataStream
 from ctr.util.write_stream import WriteStream
-from ctr.util.serialize import JsonSerialize
+from ctr.util.serialize import to_json
+from ctr.util.schema import Schema, enum
 
 """
 Blend Mode Entry
@@ -58,6 +59,13 @@ class LogicOp(IntEnum):
     REV_OR = 15
     INV_OR = 16
 
+BLEND_MODE_SCHEMA = Schema(
+    enum('blendOp', 'B', BlendOp),
+    enum('blendFactorSrc', 'B', BlendFactor),
+    enum('blendFactorDest', 'B', BlendFactor),
+    enum('logicOp', 'B', LogicOp),
+)
+
 class BlendMode:
 
     blendOp: BlendOp = None
@@ -73,10 +81,7 @@ class BlendMode:
         """Reads the BlendMode section from a material data stream"""
 
         # Read in each mode as a single byte
-        self.blendOp = BlendOp(data.read_bytes(1))
-        self.blendFactorSrc = BlendFactor(data.read_bytes(1))
-        self.blendFactorDest = BlendFactor(data.read_bytes(1))
-        self.logicOp = LogicOp(data.read_bytes(1))
+        data = BLEND_MODE_SCHEMA.read(self, data)
 
         return data
     
@@ -84,17 +89,17 @@ class BlendMode:
         """Writes the BlendMode section to a data stream"""
 
         # Write each mode as a single byte
-        data.write_bytes(bytes(self.blendOp.value))
-        data.write_bytes(bytes(self.blendFactorSrc.value))
-        data.write_bytes(bytes(self.blendFactorDest.value))
-        data.write_bytes(bytes(self.logicOp.value))
+        data = BLEND_MODE_SCHEMA.write(self, data)
 
         return data
     
+    def to_dict(self) -> dict:
+        return {
+            "blendOp": str(self.blendOp),
+            "blendFactorSrc": str(self.blendFactorSrc),
+            "blendFactorDest": str(self.blendFactorDest),
+            "logicOp": str(self.logicOp),
+        }
+
     def __str__(self) -> str:
-        j = JsonSerialize()
-        j.add("blendOp", self.blendOp, True)
-        j.add("blendFactorSrc", self.blendFactorSrc, True)
-        j.add("blendFactorDest", self.blendFactorDest, True)
-        j.add("logicOp", self.logicOp, True)
-        return j.serialize()
+        return to_json(self.to_dict())
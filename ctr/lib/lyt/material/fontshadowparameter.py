@@ -1,6 +1,7 @@
 from ctr.util.data_stream import DataStream
 from ctr.util.write_stream import WriteStream
-from ctr.util.serialize import JsonSerialize
+from ctr.util.serialize import to_json
+from ctr.util.schema import Schema, uint8, padding
 
 """
 Font Shadow Parameter Entry
@@ -14,10 +15,21 @@ Offset |  Size  |   Type   | Description
  0x04  |  0x01  |   byte   | White - Green Value
  0x05  |  0x01  |   byte   | White - Blue Value
  0x06  |  0x01  |   byte   | White - Alpha Value
- 0x06  |  0x01  |   byte   | Unknown byte that's read in but not stored in flyte
+ 0x07  |  0x01  |   byte   | Unknown byte that's read in but not stored in flyte
 ===================
 """
 
+FONT_SHADOW_PARAMETER_SCHEMA = Schema(
+    uint8('blackRed'),
+    uint8('blackGreen'),
+    uint8('blackBlue'),
+    uint8('whiteRed'),
+    uint8('whiteGreen'),
+    uint8('whiteBlue'),
+    uint8('whiteAlpha'),
+    padding(1),
+)
+
 class FontShadowParameter:
 
     blackRed: int = None
@@ -35,42 +47,29 @@ class FontShadowParameter:
     def read(self, data: DataStream) -> DataStream:
         """Reads the FontShadowParameter section from a material data stream"""
 
-        # Read in each value as a single byte
-        self.blackRed = data.read_uint8()
-        self.blackGreen = data.read_uint8()
-        self.blackBlue = data.read_uint8()
-        self.whiteRed = data.read_uint8()
-        self.whiteGreen = data.read_uint8()
-        self.whiteBlue = data.read_uint8()
-        self.whiteAlpha = data.read_uint8()
-
-        data.read_bytes(1) # Read in padding (?)
+        # Read in each value as a single byte, followed by padding (?)
+        data = FONT_SHADOW_PARAMETER_SCHEMA.read(self, data)
 
         return data
     
     def write(self, data: WriteStream) -> WriteStream:
         """Writes the FontShadowParameter section to a data stream"""
 
-        # Write each value as a single byte
-        data.write_uint8(self.blackRed)
-        data.write_uint8(self.blackGreen)
-        data.write_uint8(self.blackBlue)
-        data.write_uint8(self.whiteRed)
-        data.write_uint8(self.whiteGreen)
-        data.write_uint8(self.whiteBlue)
-        data.write_uint8(self.whiteAlpha)
-
-        data.write_bytes(0, 1) # Write padding (?)
+        # Write each value as a single byte, followed by padding (?)
+        data = FONT_SHADOW_PARAMETER_SCHEMA.write(self, data)
 
         return data
 
+    def to_dict(self) -> dict:
+        return {
+            "blackRed": self.blackRed,
+            "blackGreen": self.blackGreen,
+            "blackBlue": self.blackBlue,
+            "whiteRed": self.whiteRed,
+            "whiteGreen": self.whiteGreen,
+            "whiteBlue": self.whiteBlue,
+            "whiteAlpha": self.whiteAlpha,
+        }
+
     def __str__(self) -> str:
-        j = JsonSerialize()
-        j.add("blackRed", self.blackRed)
-        j.add("blackGreen", self.blackGreen)
-        j.add("blackBlue", self.blackBlue)
-        j.add("whiteRed", self.whiteRed)
-        j.add("whiteGreen", self.whiteGreen)
-        j.add("whiteBlue", self.whiteBlue)
-        j.add("whiteAlpha", self.whiteAlpha)
-        return j.serialize()
\ No newline at end of file
+        return to_json(self.to_dict())
\ No newline at end of file
@@ -1,6 +1,7 @@
 from ctr.util.data_stream import DataStream
 from ctr.util.write_stream import WriteStream
-from ctr.util.serialize import JsonSerialize
+from ctr.util.serialize import to_json
+from ctr.util.schema import Schema, float32, vector2
 
 """
 Indirect Parameter Entry
@@ -12,6 +13,11 @@ Offset |  Size  |   Type   | Description
 ===================
 """
 
+INDIRECT_PARAMETER_SCHEMA = Schema(
+    float32('rotation'),
+    vector2('scale'),
+)
+
 class IndirectParameter:
 
     rotation: float = None
@@ -24,28 +30,25 @@ class IndirectParameter:
     def read(self, data: DataStream) -> DataStream:
         """Reads the IndirectParameter section from a material data stream"""
 
-        # Read in the rotation as a 32-bit float
-        self.rotation = data.read_float()
-
-        # Read in the scale as two 32-bit floats
-        self.scale = data.read_vector2()
+        # Read in the rotation and scale (three 32-bit floats)
+        data = INDIRECT_PARAMETER_SCHEMA.read(self, data)
 
         return data
     
     def write(self, data: WriteStream) -> WriteStream:
         """Writes the IndirectParameter section to a data stream"""
 
-        # Write the rotation as a 32-bit float
-        data.write_float(self.rotation)
-
-        # Write the scale as two 32-bit floats
-        data.write_vector2(self.scale)
+        # Write the rotation and scale (three 32-bit floats)
+        data = INDIRECT_PARAMETER_SCHEMA.write(self, data)
 
         return data
 
+    def to_dict(self) -> dict:
+        return {
+            "rotation": self.rotation,
+            "scale": self.scale,
+        }
+
     def __str__(self) -> str:
-        j = JsonSerialize()
-        j.add("rotation", self.rotation)
-        j.add("scale", self.scale)
-        return j.serialize()
+        return to_json(self.to_dict())
     
@@ -1,19 +1,27 @@
 from ctr.util.data_stream import DataStream
 from ctr.util.write_stream import WriteStream
-from ctr.util.serialize import JsonSerialize
+from ctr.util.serialize import to_json
+from ctr.util.schema import Schema, vector2, raw, bits, bitfield
 
 """
 Projection Tex Gen Param Entry
 ===================
 Offset |  Size  |   Type   | Description
 -------+--------+----------+------------
- 0x00  |  0x10  |  vector2 | Position (32-bit float, 32-bit float)
- 0x10  |  0x10  |  vector2 | Scale (32-bit float, 32-bit float)
- 0x20  |  0x01  |   byte   | Flags (bit 0: isFittingLayoutSize, bit 1: isFittingPaneSize, bit 2: isAdjustProjectionSR)
- 0x21  |  0x03  |  ??????  | Unknown. In flyte it's not stored in a variable, but a comment simply says "padding" next to it
+ 0x00  |  0x08  |  vector2 | Position (32-bit float, 32-bit float)
+ 0x08  |  0x08  |  vector2 | Scale (32-bit float, 32-bit float)
+ 0x10  |  0x01  |   byte   | Flags (bit 0: isFittingLayoutSize, bit 1: isFittingPaneSize, bit 2: isAdjustProjectionSR)
+ 0x11  |  0x03  |  ??????  | Unknown. In flyte it's not stored in a variable, but a comment simply says "padding" next to it
 ===================
 """
 
+PROJECTION_TEX_GEN_PARAM_SCHEMA = Schema(
+    vector2('position'),
+    vector2('scale'),
+    bits('B', bitfield('isFittingLayoutSize', 0), bitfield('isFittingPaneSize', 1), bitfield('isAdjustProjectionSR', 2)),
+    raw('padding', 3),
+)
+
 class ProjectionTexGenParam:
 
     position: tuple[float, float] = None
@@ -23,7 +31,7 @@ class ProjectionTexGenParam:
     isFittingPaneSize: bool = None
     isAdjustProjectionSR: bool = None
 
-    padding: int = None
+    padding: bytes = None
 
     def __init__(self, data: DataStream = None):
         if data is not None:
@@ -32,53 +40,28 @@ class ProjectionTexGenParam:
     def read(self, data: DataStream) -> DataStream:
         """Reads the ProjectionTexGenParam section from a material data stream"""
 
-        # Read in the position and scale as vectors consiting of two 32-bit floats each
-        self.position = data.read_vector2()
-        self.scale = data.read_vector2()
-
-        # Read in the flags as a byte
-        flags = data.read_bytes(1)
-
-        # Determine the boolean values from the flags
-        self.isFittingLayoutSize = bool(flags & 0x01)
-        self.isFittingPaneSize = bool(flags & 0x02)
-        self.isAdjustProjectionSR = bool(flags & 0x03)
-
-        # Read in the padding as 3 bytes
-        self.padding = data.read_bytes(3)
+        # Read in the position and scale (vectors consiting of two 32-bit floats each), the flags and the padding
+        data = PROJECTION_TEX_GEN_PARAM_SCHEMA.read(self, data)
 
         return data
     
     def write(self, data: WriteStream) -> WriteStream:
         """Writes the ProjectionTexGenParam section to a data stream"""
 
-        # Write the position and scale as vectors consiting of two 32-bit floats each
-        data.write_vector2(self.position)
-        data.write_vector2(self.scale)
-
-        # Determine the flags from the boolean values
-        flags = 0x00
-        if self.isFittingLayoutSize:
-            flags |= 0x01
-        if self.isFittingPaneSize:
-            flags |= 0x02
-        if self.isAdjustProjectionSR:
-            flags |= 0x03
-
-        # Write the flags as a byte
-        data.write_bytes(flags)
-
-        # Write the padding as 3 bytes
-        data.write_bytes(self.padding, 3)
+        # Write the position and scale (vectors consiting of two 32-bit floats each), the flags and the padding
+        data = PROJECTION_TEX_GEN_PARAM_SCHEMA.write(self, data)
 
         return data
     
 
+    def to_dict(self) -> dict:
+        return {
+            "position": self.position,
+            "scale": self.scale,
+            "isFittingLayoutSize": self.isFittingLayoutSize,
+            "isFittingPaneSize": self.isFittingPaneSize,
+            "isAdjustProjectionSR": self.isAdjustProjectionSR,
+        }
+
     def __str__(self) -> str:
-        j = JsonSerialize()
-        j.add("position", self.position)
-        j.add("scale", self.scale)
-        j.add("isFittingLayoutSize", self.isFittingLayoutSize)
-        j.add("isFittingPaneSize", self.isFittingPaneSize)
-        j.add("isAdjustProjectionSR", self.isAdjustProjectionSR)
-        return j.serialize()
+        return to_json(self.to_dict())
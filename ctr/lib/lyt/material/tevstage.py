@@ -1,18 +1,25 @@
 from ctr.util.data_stream import DataStream
 from ctr.util.write_stream import WriteStream
-from ctr.util.serialize import JsonSerialize
+from ctr.util.serialize import to_json
+from ctr.util.schema import Schema, uint8, uint16
 
 """
 Tev Stage Entry
 ===================
 Offset |  Size  |   Type   | Description
 -------+--------+----------+------------
- 0x00  |  0x01  |   byte  | RGB Mode
- 0x01  |  0x01  |   byte  | Alpha Mode
+ 0x00  |  0x01  |  uint8  | RGB Mode
+ 0x01  |  0x01  |  uint8  | Alpha Mode
  0x02  |  0x02  |  ?????? | Unknown. In flyte this isn't even stored in a variable, but it's still read to advance the seeker (as a uint16).
 ===================
 """
 
+TEV_STAGE_SCHEMA = Schema(
+    uint8('rgbMode'),
+    uint8('alphaMode'),
+    uint16('unknown'),
+)
+
 class TevStage:
 
     rgbMode: int = None
@@ -26,30 +33,25 @@ class TevStage:
     def read(self, data: DataStream) -> DataStream:
         """Reads the TevStage section from a material data stream"""
 
-        # Read in each mode as a single byte
-        self.rgbMode = data.read_bytes(1)
-        self.alphaMode = data.read_bytes(1)
-
-        # Read in the unknown value as a uint16
-        self.unknown = data.read_uint16()
+        # Read in each mode as a single byte, and the unknown value as a uint16
+        data = TEV_STAGE_SCHEMA.read(self, data)
 
         return data
     
     def write(self, data: WriteStream) -> WriteStream:
         """Writes the TevStage section to a data stream"""
 
-        # Write each mode as a single byte
-        data.write_bytes(self.rgbMode)
-        data.write_bytes(self.alphaMode)
-
-        # Write the unknown value as a uint16
-        data.write_uint16(self.unknown)
+        # Write each mode as a single byte, and the unknown value as a uint16
+        data = TEV_STAGE_SCHEMA.write(self, data)
 
         return data
 
+    def to_dict(self) -> dict:
+        return {
+            "rgbMode": self.rgbMode,
+            "alphaMode": self.alphaMode,
+            "unknown": self.unknown,
+        }
+
     def __str__(self) -> str:
-        j = JsonSerialize()
-        j.add("rgbMode", self.rgbMode)
-        j.add("alphaMode", self.alphaMode)
-        j.add("unknown", self.unknown)
-        return j.serialize()
\ No newline at end of file
+        return to_json(self.to_dict())
\ No newline at end of file
@@ -2,7 +2,8 @@ from enum import IntEnum
 
 from ctr.util.data_stream import DataStream
 from ctr.util.write_stream import WriteStream
-from ctr.util.serialize import JsonSerialize
+from ctr.util.serialize import to_json
+from ctr.util.schema import Schema, enum, padding
 
 """
 Texture Coordinate Generation Entry
@@ -28,6 +29,11 @@ class TexGenSource(IntEnum):
     PANE_BASED = 4
     PERSPECTIVE_PROJ = 5
 
+TEX_COORD_GEN_SCHEMA = Schema(
+    enum('genType', 'B', TexGenType),
+    enum('genSource', 'B', TexGenSource),
+    padding(2),
+)
 
 class TexCoordGen:
 
@@ -41,27 +47,24 @@ class TexCoordGen:
     def read(self, data: DataStream) -> DataStream:
         """Reads the TexMap section from a material data stream"""
 
-        # Read in the type and source as bytes
-        self.genType = TexGenType(data.read_uint8())
-        self.genSource = TexGenSource(data.read_uint8())
-        
-        data.read_uint16() # Padding
+        # Read in the type and source as bytes, followed by padding
+        data = TEX_COORD_GEN_SCHEMA.read(self, data)
 
         return data
     
     def write(self, data: WriteStream) -> WriteStream:
         """Writes the TexMap section to a data stream"""
 
-        # Write each value as a single byte
-        data.write_uint8(self.genType.value)
-        data.write_uint8(self.genSource.value)
-
-        data.write_uint16(0) # Padding
+        # Write each value as a single byte, followed by padding
+        data = TEX_COORD_GEN_SCHEMA.write(self, data)
 
         return data
     
+    def to_dict(self) -> dict:
+        return {
+            "genType": str(self.genType),
+            "genSource": str(self.genSource),
+        }
+
     def __str__(self) -> str:
-        j = JsonSerialize()
-        j.add("genType", self.genType, True)
-        j.add("genSource", self.genSource, True)
-        return j.serialize()
\ No newline at end of file
+        return to_json(self.to_dict())
\ No newline at end of file
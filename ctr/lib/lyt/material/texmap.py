@@ -2,7 +2,8 @@ from enum import IntEnum
 
 from ctr.util.data_stream import DataStream
 from ctr.util.write_stream import WriteStream
-from ctr.util.serialize import JsonSerialize
+from ctr.util.serialize import to_json
+from ctr.util.schema import Schema, uint16, bits, bitfield
 
 """
 Texture Map Entry
@@ -26,6 +27,12 @@ class FilterMode(IntEnum):
     NEAREST = 0,
     LINEAR = 1
 
+TEX_MAP_SCHEMA = Schema(
+    uint16('textureIndex'),
+    bits('B', bitfield('wrapModeS', 0, 2, WrapMode), bitfield('filterModeMin', 2, 2, FilterMode)),
+    bits('B', bitfield('wrapModeT', 0, 2, WrapMode), bitfield('filterModeMag', 2, 2, FilterMode)),
+)
+
 class TexMap:
 
     textureIndex: int = None
@@ -41,39 +48,27 @@ class TexMap:
     def read(self, data: DataStream) -> DataStream:
         """Reads the TexMap section from a material data stream"""
 
-        # Read the first 2 bytes to get the texture index
-        self.textureIndex = data.read_uint16()
-
-        # Read in the next 2 bytes to determine the wrap and filter modes
-        sVal = data.read_bytes(1)
-        tVal = data.read_bytes(1)
-
-        # Determine the wrap and filter modes
-        self.wrapModeS = WrapMode(sVal & 0x3)
-        self.filterModeMin = FilterMode((sVal >> 2) & 0x3)
-
-        self.wrapModeT = WrapMode(tVal & 0x3)
-        self.filterModeMag = FilterMode((tVal >> 2) & 0x3)
+        # Read in the texture index, and the wrap and filter modes packed into the next 2 bytes
+        data = TEX_MAP_SCHEMA.read(self, data)
 
         return data
 
     def write(self, data: WriteStream) -> WriteStream:
         """Writes the TexMap section to a data stream"""
 
-        # Write the texture index
-        data.write_uint16(self.textureIndex)
-
-        # Write the wrap and filter modes
-        data.write_bytes(self.wrapModeS.value | (self.filterModeMin.value << 2), 1)
-        data.write_bytes(self.wrapModeT.value | (self.filterModeMag.value << 2), 1)
+        # Write the texture index, and the wrap and filter modes
+        data = TEX_MAP_SCHEMA.write(self, data)
 
         return data
 
+    def to_dict(self) -> dict:
+        return {
+            "textureIndex": self.textureIndex,
+            "wrapModeS": str(self.wrapModeS),
+            "wrapModeT": str(self.wrapModeT),
+            "filterModeMin": str(self.filterModeMin),
+            "filterModeMag": str(self.filterModeMag),
+        }
+
     def __str__(self) -> str:
-        j = JsonSerialize()
-        j.add("textureIndex", self.textureIndex)
-        j.add("wrapModeS", self.wrapModeS, True)
-        j.add("wrapModeT", self.wrapModeT, True)
-        j.add("filterModeMin", self.filterModeMin, True)
-        j.add("filterModeMag", self.filterModeMag, True)
-        return j.serialize()
\ No newline at end of file
+        return to_json(self.to_dict())
\ No newline at end of file
@@ -1,6 +1,7 @@
 from ctr.util.data_stream import DataStream
 from ctr.util.write_stream import WriteStream
-from ctr.util.serialize import JsonSerialize
+from ctr.util.serialize import to_json
+from ctr.util.schema import Schema, float32, vector2
 
 """
 Texture Matrix Entry
@@ -13,6 +14,12 @@ Offset |  Size  |   Type   | Description
 ===================
 """
 
+TEX_SRT_SCHEMA = Schema(
+    vector2('translation'),
+    float32('rotation'),
+    vector2('scale'),
+)
+
 class TexSRT:
 
     translation: tuple[float, float] = None
@@ -27,9 +34,7 @@ class TexSRT:
         """Reads the TexMap section from a material data stream"""
 
         # Read in each value
-        self.translation = data.read_vector2()
-        self.rotation = data.read_float()
-        self.scale = data.read_vector2()
+        data = TEX_SRT_SCHEMA.read(self, data)
 
         return data
 
@@ -37,15 +42,16 @@ class TexSRT:
         """Writes the TexMap section to a data stream"""
 
         # Write each value
-        data.write_vector2(self.translation)
-        data.write_float(self.rotation)
-        data.write_vector2(self.scale)
+        data = TEX_SRT_SCHEMA.write(self, data)
 
         return data
 
+    def to_dict(self) -> dict:
+        return {
+            "translation": self.translation,
+            "rotation": self.rotation,
+            "scale": self.scale,
+        }
+
     def __str__(self) -> str:
-        j = JsonSerialize()
-        j.add("translation", self.translation)
-        j.add("rotation", self.rotation)
-        j.add("scale", self.scale)
-        return j.serialize()
\ No newline at end of file
+        return to_json(self.to_dict())
\ No newline at end of file
@@ -1,6 +1,6 @@
 from ctr.util.data_stream import DataStream
 from ctr.util.write_stream import WriteStream
-from ctr.util.serialize import JsonSerialize
+from ctr.util.schema import Schema, uint16, rgba8
 
 from ctr.lib.lyt.pan1 import Pan1
 
@@ -39,8 +39,20 @@ Offset |  Size  |   Type   | Description
     0x60 + (N-1) * 0x20 + 0x18 |  0x08  | vector2 | Bottom right texture coordinate (two 32-bit floats)
 """
 
+# Everything between the PAN1 fields and the texture coordinates
+PIC1_SCHEMA = Schema(
+    rgba8('vertexColorTopLeft'),
+    rgba8('vertexColorTopRight'),
+    rgba8('vertexColorBottomLeft'),
+    rgba8('vertexColorBottomRight'),
+    uint16('materialId'),
+    uint16('textureCoordCount'),
+)
+
 class Pic1(Pan1):
 
+    signature: str = "pic1"
+
     vertexColorTopLeft: tuple[int, int, int, int] = None
     vertexColorTopRight: tuple[int, int, int, int] = None
     vertexColorBottomLeft: tuple[int, int, int, int] = None
@@ -52,8 +64,6 @@ class Pic1(Pan1):
     def __init__(self, data: DataStream = None):
         super().__init__(data)
         self.type = "Picture"
-        if data is not None:
-            self.read(data)
     
     def read(self, data: DataStream) -> DataStream:
         """Reads the PIC1 section from the data stream."""
@@ -62,30 +72,14 @@ class Pic1(Pan1):
         # Get the start position
         startPos = data.tell() - 0x4C
 
-        # Read in the vertex colors
-        self.vertexColorTopLeft = data.read_color_rgba8()
-        self.vertexColorTopRight = data.read_color_rgba8()
-        self.vertexColorBottomLeft = data.read_color_rgba8()
-        self.vertexColorBottomRight = data.read_color_rgba8()
-
-        # Read in the material ID and texture coordinate count as unsigned 16-bit integers
-        self.materialId = data.read_uint16()
-        textureCoordCount = data.read_uint16()
+        # Read in the vertex colors, material ID and texture coordinate count
+        data = PIC1_SCHEMA.read(self, data)
 
         # Read in the texture coordinates
-        self.textureCoords = []
-        for _ in range(textureCoordCount):
-            coord = []
-            for _ in range(4):
-                coord.append(data.read_vector2())
-            self.textureCoords.append(coord)
-        
-        # Re-read the section size
-        data.seek(startPos + 0x04)
-        sectionSize = data.read_uint32()
+        self.textureCoords = data.read_uv_coord_sets(self.textureCoordCount)
 
         # Seek to the end of the section
-        data.seek(startPos + sectionSize)
+        data.seek(startPos + self.originalSectionSize)
 
         # Return the data stream
         return data
@@ -94,42 +88,34 @@ class Pic1(Pan1):
         """Writes the PIC1 section to the data stream."""
         data = super().write(data)
 
-        # Get the start position
+        # Get the start position, and take over the section size written by PAN1
         startPos = data.tell() - 0x4C
+        sectionSize = data.fixup_uint32(startPos + 0x04)
 
-        # Write the vertex colors
-        data.write_color_rgba8(self.vertexColorTopLeft)
-        data.write_color_rgba8(self.vertexColorTopRight)
-        data.write_color_rgba8(self.vertexColorBottomLeft)
-        data.write_color_rgba8(self.vertexColorBottomRight)
-        
-        # Write the material ID and texture coordinate count as unsigned 16-bit integers
-        data.write_uint16(self.materialId)
-        data.write_uint16(len(self.textureCoords))
+        # Write the vertex colors, material ID and texture coordinate count
+        self.textureCoordCount = len(self.textureCoords)
+        data = PIC1_SCHEMA.write(self, data)
 
         # Write the texture coordinates
         for coord in self.textureCoords:
             for c in coord:
                 data.write_vector2(c)
         
-        # Overwrite the section size
-        sectionSize = data.tell() - startPos
-        data.seek(startPos + 0x04)
-        data.write_uint32(sectionSize)
-
-        # Seek to the end of the section
-        data.seek(startPos + sectionSize)
+        # Fill in the section size
+        sectionSize.set(data.tell() - startPos)
 
         return data
 
 
-    def __str__(self) -> str:
-        j = JsonSerialize(super().__str__())
-        j.add("vertexColorTopLeft", self.vertexColorTopLeft)
-        j.add("vertexColorTopRight", self.vertexColorTopRight)
-        j.add("vertexColorBottomLeft", self.vertexColorBottomLeft)
-        j.add("vertexColorBottomRight", self.vertexColorBottomRight)
-        j.add("materialId", self.materialId)
-        j.add("textureCoordCount", self.textureCoordCount)
-        j.add("textureCoords", self.textureCoords)
-        return j.serialize()
\ No newline at end of file
+    def to_dict(self, streamed: bool = False) -> dict:
+        d = super().to_dict(streamed)
+        d.update({
+            "vertexColorTopLeft": self.vertexColorTopLeft,
+            "vertexColorTopRight": self.vertexColorTopRight,
+            "vertexColorBottomLeft": self.vertexColorBottomLeft,
+            "vertexColorBottomRight": self.vertexColorBottomRight,
+            "materialId": self.materialId,
+            "textureCoordCount": self.textureCoordCount,
+            "textureCoords": self.textureCoords,
+        })
+        return d
\ No newline at end of file
@@ -1,6 +1,6 @@
 from ctr.util.data_stream import DataStream
 from ctr.util.write_stream import WriteStream
-from ctr.util.serialize import JsonSerialize
+from ctr.util.serialize import to_json
 
 """
 TXL1 (Texture List 1)
@@ -39,13 +39,9 @@ class Txl1:
         # All offsets are relative to the start of the section
         curPos = data.tell()
 
-        # Loop through each texture offset
-        self.textureNames = []
-        for i in range(textureCount):
-            # Read the next 4 bytes to get the texture offset
-            offset = data.read_uint32()
-            # Add the string from the curPos + offset (Equivalent of C#'s ReadStringNTFrom)
-            self.textureNames.append(data.read_string_nt_from(curPos + offset))
+        # Read the texture name offsets, then the whole string table they point into
+        offsets = data.read_array('I', textureCount)
+        self.textureNames = data.read_string_table(curPos, offsets)
         
         # Seek to the end of the section
         data.seek(startPos + sectionSize)
@@ -61,36 +57,23 @@ class Txl1:
         # Write the signature
         data.write_string("txl1")
 
-        # Write the section size (Placeholder)
-        data.write_uint32(0)
+        # Reserve the section size
+        sectionSize = data.reserve_uint32()
 
         # Write the texture count
         data.write_uint32(len(self.textureNames))
 
-        # Write the texture offsets (Placeholder)
-        for i in range(len(self.textureNames)):
-            data.write_uint32(0)
+        # Reserve the texture offsets (relative to the start of the offset table)
+        tableStart = data.tell()
+        textureOffsets = [data.reserve_uint32() for _ in self.textureNames]
 
         # Write the texture names
-        textureOffsets = []
-        for i in range(len(self.textureNames)):
-            textureOffsets.append(data.tell() - startPos)
-            data.write_string_nt(self.textureNames[i])
+        for textureOffset, textureName in zip(textureOffsets, self.textureNames):
+            textureOffset.set(data.tell() - tableStart)
+            data.write_string_nt(textureName)
         
-        # Calculate the section size
-        sectionSize = data.tell() - startPos
-
-        # Write the texture offsets
-        for i in range(len(textureOffsets)):
-            data.seek(startPos + 0x0C + (i * 4))
-            data.write_uint32(textureOffsets[i])
-
-        # Write the section size
-        data.seek(startPos + 4)
-        data.write_uint32(sectionSize)
-
-        # Seek to the end of the section
-        data.seek(startPos + sectionSize)
+        # Fill in the section size
+        sectionSize.set(data.tell() - startPos)
 
         return data
     
@@ -98,8 +81,11 @@ class Txl1:
         """Returns true if the image exists in the TXL1"""
         return name in self.textureNames
     
+    def to_dict(self) -> dict:
+        return {
+            "textureNames": self.textureNames,
+        }
+
     def __str__(self) -> str:
-        j = JsonSerialize()
-        j.add("textureNames", self.textureNames)
-        return j.serialize()
+        return to_json(self.to_dict())
 
@@ -1,15 +1,15 @@
 from ctr.util.data_stream import DataStream
 from ctr.util.write_stream import WriteStream
-from ctr.util.serialize import JsonSerialize
+from ctr.util.schema import Schema, uint8, uint16, uint32, float32, rgba8, raw
 
 from ctr.lib.lyt.pan1 import Pan1
 
 """
-PIC1 (Picture 1)
+TXT1 (Text Box 1)
 ===================
 Offset |  Size  |   Type   | Description
 -------+--------+----------+------------
- 0x00  |  0x04  |  string  | Signature (pic1)
+ 0x00  |  0x04  |  string  | Signature (txt1)
  0x04  |  0x04  |  uint32  | Section Size
  0x08  |  0x01  |  uint8   | Flags (Bit 0: Visible, Bit 1: Influenced Alpha, Bit 2: Location Adjustment)
  0x09  |  0x01  |  uint8   | Origin
@@ -27,8 +27,8 @@ Offset |  Size  |   Type   | Description
  0x4E  |  0x02  |  uint16  | String Length
  0x50  |  0x02  |  uint16  | Material Index
  0x52  |  0x02  |  uint16  | Font Number
- 0x54  |  0x01  |   byte   | Another Origin
- 0x55  |  0x01  |   byte   | Alignment
+ 0x54  |  0x01  |  uint8   | Another Origin
+ 0x55  |  0x01  |  uint8   | Alignment
  0x56  |  0x02  |  ??????  | Unknown
  0x58  |  0x04  |  uint32  | Text Offset
  0x5C  |  0x04  |  rgba8   | Top Color
@@ -39,8 +39,28 @@ Offset |  Size  |   Type   | Description
  0x70  |  0x04  |  float   | Line Size
 """
 
+# Everything after the PAN1 fields
+TXT1_SCHEMA = Schema(
+    uint16('bufferLength'),
+    uint16('stringLength'),
+    uint16('materialId'),
+    uint16('fontNum'),
+    uint8('anotherOrigin'),
+    uint8('alignment'),
+    raw('unknown', 0x2),
+    uint32('textOffset'),
+    rgba8('topColor'),
+    rgba8('bottomColor'),
+    float32('sizeX'),
+    float32('sizeY'),
+    float32('characterSize'),
+    float32('lineSize'),
+)
+
 class Txt1(Pan1):
 
+    signature: str = "txt1"
+
     bufferLength: int = None
     stringLength: int = None
     materialId: int = None
@@ -62,8 +82,6 @@ class Txt1(Pan1):
     def __init__(self, data: DataStream = None):
         super().__init__(data)
         self.type = "Text Box"
-        if data is not None:
-            self.read(data)
 
     def read(self, data: DataStream) -> DataStream:
         data = super().read(data)
@@ -71,31 +89,8 @@ class Txt1(Pan1):
         # Save the start of the section
         startPos = data.tell() - 0x4C
 
-        # Read unsigned 16-bit integers
-        self.bufferLength = data.read_uint16()
-        self.stringLength = data.read_uint16()
-        self.materialId = data.read_uint16()
-        self.fontNum = data.read_uint16()
-
-        # Read single bytes
-        self.anotherOrigin = data.read_bytes(1)
-        self.alignment = data.read_bytes(1)
-
-        # Read unknown bytes
-        self.unknown = data.read_bytes(0x2)
-
-        # Read unsigned 32-bit integer
-        self.textOffset = data.read_uint32()
-
-        # Read RGBA8 colors
-        self.topColor = data.read_color_rgba8()
-        self.bottomColor = data.read_color_rgba8()
-
-        # Read 32-bit floats
-        self.sizeX = data.read_float()
-        self.sizeY = data.read_float()
-        self.characterSize = data.read_float()
-        self.lineSize = data.read_float()
+        # Read in the fixed-size text box fields
+        data = TXT1_SCHEMA.read(self, data)
 
         # Read string
         # if self.stringLength != 0:
@@ -103,80 +98,48 @@ class Txt1(Pan1):
         #     data.seek(startPos + self.textOffset)
         #     self.string = data.read_string(self.stringLength)
         
-        # Re-read the section size
-        data.seek(startPos + 0x4)
-        sectionSize = data.read_uint32()
-
         # Seek to the end of the section
-        data.seek(startPos + sectionSize)
+        data.seek(startPos + self.originalSectionSize)
 
         return data
     
     def write(self, data: WriteStream) -> WriteStream:
         data = super().write(data)
 
-        # Get the start of the section
+        # Get the start of the section, and take over the section size written by PAN1
         startPos = data.tell() - 0x4C
+        sectionSize = data.fixup_uint32(startPos + 0x4)
 
-        # Write unsigned 16-bit integers
-        data.write_uint16(self.bufferLength)
-        data.write_uint16(self.stringLength)
-        data.write_uint16(self.materialId)
-        data.write_uint16(self.fontNum)
-
-        # Write single bytes
-        data.write_bytes(self.anotherOrigin)
-        data.write_bytes(self.alignment)
-
-        # Write unknown bytes
-        data.write_bytes(self.unknown)
-
-        # Write unsigned 32-bit integer
-        data.write_uint32(self.textOffset)
-
-        # Write RGBA8 colors
-        data.write_color_rgba8(self.topColor)
-        data.write_color_rgba8(self.bottomColor)
-        
-        # Write 32-bit floats
-        data.write_float(self.sizeX)
-        data.write_float(self.sizeY)
-        data.write_float(self.characterSize)
-        data.write_float(self.lineSize)
+        # Write the fixed-size text box fields
+        data = TXT1_SCHEMA.write(self, data)
 
         # Write string
         if self.stringLength != 0:
             data.seek(startPos + self.textOffset)
             data.write_string(self.string)
 
-        # Calculate Section Size
+        # Fill in the section size
         self.sectionSize = data.tell() - startPos
-
-        # Update the section size
-        data.seek(startPos + 0x4)
-        data.write_uint32(self.sectionSize)
-
-        # Seek to the end of the section
-        data.seek(startPos + self.sectionSize)
+        sectionSize.set(self.sectionSize)
 
         return data
 
-    def __str__(self):
-        j = JsonSerialize()
-        # j.add("bufferLength", self.bufferLength)
-        # j.add("stringLength", self.stringLength)
-        j.add("materialId", self.materialId)
-        j.add("fontNum", self.fontNum)
-        j.add("anotherOrigin", self.anotherOrigin)
-        j.add("alignment", self.alignment)
-        j.add("unknown", self.unknown)
-        # j.add("textOffset", self.textOffset)
-        j.add("topColor", self.topColor)
-        j.add("bottomColor", self.bottomColor)
-        j.add("sizeX", self.sizeX)
-        j.add("sizeY", self.sizeY)
-        j.add("characterSize", self.characterSize)
-        j.add("lineSize", self.lineSize)
-        j.add("string", self.string)
-        j.add("userData", self.userData)
-        return j.serialize()
\ No newline at end of file
+    def to_dict(self, streamed: bool = False) -> dict:
+        return {
+            # "bufferLength": self.bufferLength,
+            # "stringLength": self.stringLength,
+            "materialId": self.materialId,
+            "fontNum": self.fontNum,
+            "anotherOrigin": self.anotherOrigin,
+            "alignment": self.alignment,
+            "unknown": self.unknown.decode("utf-8") if self.unknown is not None else None,
+            # "textOffset": self.textOffset,
+            "topColor": self.topColor,
+            "bottomColor": self.bottomColor,
+            "sizeX": self.sizeX,
+            "sizeY": self.sizeY,
+            "characterSize": self.characterSize,
+            "lineSize": self.lineSize,
+            "string": self.string,
+            "userData": [userData.to_dict() for userData in self.userData],
+        }
\ No newline at end of file
@@ -2,7 +2,7 @@ from enum import IntEnum
 
 from ctr.util.data_stream import DataStream
 from ctr.util.write_stream import WriteStream
-from ctr.util.serialize import JsonSerialize
+from ctr.util.serialize import to_json
 
 """
 USD1 (User Data 1?)
@@ -78,10 +78,10 @@ class Usd1:
         startPos = data.tell()
 
         # Write the signature
-        data.write_string("txl1")
+        data.write_string("usd1")
 
-        # Write the section size (0 for now)
-        data.write_uint32(0)
+        # Reserve the section size
+        sectionSize = data.reserve_uint32()
 
         # Write the entry count
         data.write_uint16(len(self.entries))
@@ -91,22 +91,18 @@ class Usd1:
         for entry in self.entries:
             entry.write(data)
         
-        # Calculate the section size
-        sectionSize = data.tell() - startPos
-
-        # Seek back to the section size and write it
-        data.seek(startPos + 4)
-        data.write_uint32(sectionSize)
-
-        # Seek to the end of the section
-        data.seek(startPos + sectionSize)
+        # Fill in the section size
+        sectionSize.set(data.tell() - startPos)
 
         return data
 
+    def to_dict(self) -> dict:
+        return {
+            "entries": [entry.to_dict() for entry in self.entries],
+        }
+
     def __str__(self) -> str:
-        j = JsonSerialize()
-        j.add("entries", self.entries)
-        return j.serialize()
+        return to_json(self.to_dict())
 
 class Usd1Entry:
     """A USD1 entry in a USD1 section within a CTR"""
@@ -157,15 +153,11 @@ class Usd1Entry:
                     data.seek(startPos + dataOffset)
                     self.value = str(data.read_bytes(setting))
             case 1:
-                self.value = []
                 data.seek(startPos + dataOffset)
-                for _ in range(setting):
-                    self.value.append(data.read_int32())
+                self.value = data.read_array('i', setting)
             case 2:
-                self.value = []
                 data.seek(startPos + dataOffset)
-                for _ in range(setting):
-                    self.value.append(data.read_float())
+                self.value = data.read_array('f', setting)
 
         # Seek to the end of the entry
         data.seek(datapos)
@@ -178,11 +170,9 @@ class Usd1Entry:
         # Save the start position
         startPos = data.tell()
 
-        # Write the name offset (0 for now)
-        data.write_uint32(0)
-
-        # Write the data offset (0 for now)
-        data.write_uint32(0)
+        # Reserve the name and data offsets
+        nameOffset = data.reserve_uint32()
+        dataOffset = data.reserve_uint32()
 
         # Write the setting (Length of the array or string)
         data.write_uint16(len(self.value))
@@ -194,7 +184,7 @@ class Usd1Entry:
         data.write_bytes(self.unknown, 1)
 
         # Write the value(s) based on the type
-        dataOffset = data.tell() - startPos
+        dataOffset.set(data.tell() - startPos)
         match self.type:
             case UsdDataType.STRING:
                 data.write_string(self.value)
@@ -206,36 +196,25 @@ class Usd1Entry:
                     data.write_float(value)
             
         # Write the name
-        nameOffset = data.tell() - startPos
+        nameOffset.set(data.tell() - startPos)
         data.write_string_nt(self.name)
 
-        # Calculate the section size
-        sectionSize = data.tell() - startPos
-
-        # Write the name offset
-        data.seek(startPos)
-        data.write_uint32(nameOffset)
-
-        # Write the data offset
-        data.seek(startPos + 4)
-        data.write_uint32(dataOffset)
-
-        # Seek to the end of the entry
-        data.seek(startPos + sectionSize)
-
         return data
     
     def image_exists(self, name: str) -> bool:
         """Returns true if the image exists in the TXL1"""
         return name in self.strings
     
+    def to_dict(self) -> dict:
+        return {
+            # "nameOffset": self.nameOffset,
+            "name": self.name,
+            # "dataOffset": self.dataOffset,
+            # "setting": self.setting,
+            "type": str(self.type),
+            # "unknown": self.unknown,
+            "value": self.value,
+        }
+
     def __str__(self) -> str:
-        j = JsonSerialize()
-        # j.add("nameOffset", self.nameOffset)
-        j.add("name", self.name)
-        # j.add("dataOffset", self.dataOffset)
-        # j.add("setting", self.setting)
-        j.add("type", self.type, True)
-        # j.add("unknown", self.unknown)
-        j.add("value", self.value)
-        return j.serialize()
\ No newline at end of file
+        return to_json(self.to_dict())
\ No newline at end of file
@@ -1,6 +1,7 @@
 from ctr.util.data_stream import DataStream
 from ctr.util.write_stream import WriteStream
-from ctr.util.serialize import JsonSerialize
+from ctr.util.serialize import to_json
+from ctr.util.schema import Schema, uint8, uint16, uint32, float32, rgba8, padding
 
 from ctr.lib.lyt.pan1 import Pan1
 from ctr.lib.lyt.mat1 import Mat1
@@ -10,7 +11,7 @@ WND1 (Window 1)
 ===================
 Offset |  Size  |   Type   | Description
 -------+--------+----------+------------
- 0x00  |  0x04  |  string  | Signature (pic1)
+ 0x00  |  0x04  |  string  | Signature (wnd1)
  0x04  |  0x04  |  uint32  | Section Size
  0x08  |  0x01  |  uint8   | Flags (Bit 0: Visible, Bit 1: Influenced Alpha, Bit 2: Location Adjustment)
  0x09  |  0x01  |  uint8   | Origin
@@ -50,11 +51,40 @@ Offset |  Size  |   Type   | Description
     -------+--------+--------+------------
      0x00  |  0x02  | uint16 | Material Index
      0x02  |  0x01  | uint8  | Flip Type
-     0x03  |  0x08  |  byte  | Unknown
+     0x03  |  0x01  | uint8  | Unknown
 """
 
+# Everything between the PAN1 fields and the UV sets
+WND1_SCHEMA = Schema(
+    float32('contentOverflowLeft'),
+    float32('contentOverflowRight'),
+    float32('contentOverflowTop'),
+    float32('contentOverflowBottom'),
+    uint8('frameCount'),
+    uint8('flag'),
+    uint16('padding'),
+    uint32('windowContentOffset'),
+    uint32('windowFrameOffset'),
+    rgba8('colorTopLeft'),
+    rgba8('colorTopRight'),
+    rgba8('colorBottomLeft'),
+    rgba8('colorBottomRight'),
+    uint16('materialId'),
+    uint8('textureCoordCount'),
+    padding(1),
+    uint32('materialNameOffset'),
+)
+
+WND1_FRAME_SCHEMA = Schema(
+    uint16('materialIndex'),
+    uint8('flipType'),
+    uint8('unknown'),
+)
+
 class Wnd1(Pan1):
 
+    signature: str = "wnd1"
+
     contentOverflowLeft: float = None
     contentOverflowRight: float = None
     contentOverflowTop: float = None
@@ -71,6 +101,7 @@ class Wnd1(Pan1):
     colorBottomRight: tuple[int, int, int, int] = None
     materialId: int = None
     textureCoordCount: int = None
+    materialNameOffset: int = None
 
     materialName: str = None
     materialList: Mat1 = None
@@ -80,11 +111,10 @@ class Wnd1(Pan1):
     frames: list["WND1Frame"] = None
 
     def __init__(self, materials, data: DataStream = None):
-        super().__init__(data)
+        # The material list has to be set before Pan1 reads the section
         self.materialList = materials
+        super().__init__(data)
         self.type = "Window"
-        if data is not None:
-            self.read(data)
     
     def read(self, data: DataStream) -> DataStream:
         data = super().read(data)
@@ -92,47 +122,15 @@ class Wnd1(Pan1):
         # Store the start pos
         startPos = data.tell() - 0x4C
         
-        # Read the content overflow values as 32-bit floats
-        self.contentOverflowLeft = data.read_float()
-        self.contentOverflowRight = data.read_float()
-        self.contentOverflowTop = data.read_float()
-        self.contentOverflowBottom = data.read_float()
-        
-        # Read the frame count and flag in as single bytes
-        self.frameCount = data.read_uint8()
-        self.flag = data.read_uint8()
-
-        # Read the padding in as a 16-bit int
-        self.padding = data.read_uint16()
-
-        # Read the window content and frame offsets as 32-bit uints
-        self.windowContentOffset = data.read_uint32()
-        self.windowFrameOffset = data.read_uint32()
-
-        # Read the vertex colors as 32-bit RGBA8 values
-        self.colorTopLeft = data.read_color_rgba8()
-        self.colorTopRight = data.read_color_rgba8()
-        self.colorBottomLeft = data.read_color_rgba8()
-        self.colorBottomRight = data.read_color_rgba8()
-
-        # Read the material ID as a 16-bit uint
-        self.materialId = data.read_uint16()
-
-        # Read the texture coordinate count as an 8-bit uint
-        self.textureCoordCount = data.read_uint8()
-
-        data.read_bytes(1) # Padding
+        # Read the fixed-size window fields
+        data = WND1_SCHEMA.read(self, data)
 
         # Read the texture coordinates
-        self.textureCoords = []
-        for _ in range(self.textureCoordCount):
-            self.textureCoords.append(data.read_uv_coord_set())
+        self.textureCoords = data.read_uv_coord_sets(self.textureCoordCount)
         
         # Read the window frame offsets
         data.seek(startPos + self.windowFrameOffset)
-        self.frameOffsets = []
-        for _ in range(self.frameCount):
-            self.frameOffsets.append(data.read_uint32())
+        self.frameOffsets = data.read_array('I', self.frameCount)
         
         # Read the window frames
         self.frames = []
@@ -151,39 +149,13 @@ class Wnd1(Pan1):
     def write(self, data: WriteStream) -> WriteStream:
         data = super().write(data)
 
-        # Store the start pos
+        # Store the start pos, and take over the section size written by PAN1
         startPos = data.tell() - 0x4C
+        sectionSize = data.fixup_uint32(startPos + 0x4)
 
-        # Write the content overflow values as 32-bit floats
-        data.write_float(self.contentOverflowLeft)
-        data.write_float(self.contentOverflowRight)
-        data.write_float(self.contentOverflowTop)
-        data.write_float(self.contentOverflowBottom)
-
-        # Write the frame count and flag in as single bytes
-        data.write_uint8(self.frameCount)
-        data.write_uint8(self.flag)
-
-        # Write the padding in as a 16-bit int
-        data.write_uint16(self.padding)
-
-        # Write the window content and frame offsets as 32-bit uints
-        data.write_uint32(self.windowContentOffset)
-        data.write_uint32(self.windowFrameOffset)
-
-        # Write the vertex colors as 32-bit RGBA8 values
-        data.write_color_rgba8(self.colorTopLeft)
-        data.write_color_rgba8(self.colorTopRight)
-        data.write_color_rgba8(self.colorBottomLeft)
-        data.write_color_rgba8(self.colorBottomRight)
-        
-        # Write the material ID as a 16-bit uint
-        data.write_uint16(self.materialId)
-
-        # Write the texture coordinate count as an 8-bit uint
-        data.write_uint8(self.textureCoordCount)
-
-        data.write_bytes(1) # Padding
+        # Write the fixed-size window fields
+        self.textureCoordCount = len(self.textureCoords)
+        data = WND1_SCHEMA.write(self, data)
 
         # Write the texture coordinates
         for coord in self.textureCoords:
@@ -197,38 +169,35 @@ class Wnd1(Pan1):
         for frame in self.frames:
             data = frame.write(data)
 
-        # Write the section size
-        sectionSize = data.tell() - startPos
-        data.seek(startPos + 0x4)
-        data.write_uint32(sectionSize)
-
-        # Seek to the end of the section
-        data.seek(self.sectionStart + sectionSize)
+        # Fill in the section size
+        sectionSize.set(data.tell() - startPos)
 
         return data
 
-    def __str__(self) -> str:
-        j = JsonSerialize(super().__str__())
-        j.add("contentOverflowLeft", self.contentOverflowLeft)
-        j.add("contentOverflowRight", self.contentOverflowRight)
-        j.add("contentOverflowTop", self.contentOverflowTop)
-        j.add("contentOverflowBottom", self.contentOverflowBottom)
-        j.add("frameCount", self.frameCount)
-        j.add("flag", self.flag)
-        j.add("padding", self.padding)
-        j.add("windowContentOffset", self.windowContentOffset)
-        j.add("windowFrameOffset", self.windowFrameOffset)
-        j.add("colorTopLeft", self.colorTopLeft)
-        j.add("colorTopRight", self.colorTopRight)
-        j.add("colorBottomLeft", self.colorBottomLeft)
-        j.add("colorBottomRight", self.colorBottomRight)
-        j.add("materialId", self.materialId)
-        j.add("textureCoordCount", self.textureCoordCount)
-        j.add("materialName", self.materialName)
-        j.add("textureCoords", self.textureCoords)
-        j.add("frameOffsets", self.frameOffsets)
-        j.add("frames", self.frames)
-        return j.serialize()
+    def to_dict(self, streamed: bool = False) -> dict:
+        d = super().to_dict(streamed)
+        d.update({
+            "contentOverflowLeft": self.contentOverflowLeft,
+            "contentOverflowRight": self.contentOverflowRight,
+            "contentOverflowTop": self.contentOverflowTop,
+            "contentOverflowBottom": self.contentOverflowBottom,
+            "frameCount": self.frameCount,
+            "flag": self.flag,
+            "padding": self.padding,
+            "windowContentOffset": self.windowContentOffset,
+            "windowFrameOffset": self.windowFrameOffset,
+            "colorTopLeft": self.colorTopLeft,
+            "colorTopRight": self.colorTopRight,
+            "colorBottomLeft": self.colorBottomLeft,
+            "colorBottomRight": self.colorBottomRight,
+            "materialId": self.materialId,
+            "textureCoordCount": self.textureCoordCount,
+            "materialName": self.materialName,
+            "textureCoords": self.textureCoords,
+            "frameOffsets": self.frameOffsets,
+            "frames": [frame.to_dict() for frame in self.frames],
+        })
+        return d
 
 class WND1Frame():
 
@@ -237,10 +206,21 @@ class WND1Frame():
     unknown: int = None
 
     def read(self, data: DataStream) -> DataStream:
-        
-        # Read the material index and flip type
-        self.materialIndex = data.read_uint16()
-        self.flipType = data.read_uint8()
-        self.unknown = data.read_uint8()
-        
-        return data
\ No newline at end of file
+
+        # Read the material index, flip type and unknown byte
+        return WND1_FRAME_SCHEMA.read(self, data)
+
+    def write(self, data: WriteStream) -> WriteStream:
+
+        # Write the material index, flip type and unknown byte
+        return WND1_FRAME_SCHEMA.write(self, data)
+
+    def to_dict(self) -> dict:
+        return {
+            "materialIndex": self.materialIndex,
+            "flipType": self.flipType,
+            "unknown": self.unknown,
+        }
+
+    def __str__(self) -> str:
+        return to_json(self.to_dict())
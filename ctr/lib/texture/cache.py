@@ -0,0 +1,157 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy
+
+from ctr.bclim import Bclim
+from ctr.util.data_stream import DataStream
+
+"""
+A cache of decoded BCLIM textures, for the textures that get decoded again and again (layouts in the same
+romfs share their atlases, and previews, rendering and exports each decode them).
+
+The cache is content-addressed: an entry is keyed by the hash of the raw bytes of the BCLIM file and the
+options it was decoded with, so the same texture found under different paths is decoded once, and a file
+that changed on disk can't be served stale. Entries are kept in memory, evicting the least recently used
+once their total size exceeds a number of bytes. With a directory, decoded images are also saved there
+as .npy files, which later caches (in other runs or processes) load as memory-mapped arrays instead of
+decoding them again:
+
+    cache = TextureCache(64 * 2 ** 20, 'cache/textures')
+    image = cache.get_file('romfs/Layout/atlas.bclim')
+    cache.stats.hitRate
+
+The images returned are read-only, as the same array is handed out for every hit.
+"""
+
+# The default bound of the memory tier
+DEFAULT_MAX_BYTES = 256 * 2 ** 20
+
+
+class textureCacheStats(NamedTuple):
+    """The statistics of a texture cache (hits in memory, hits on disk, misses that were decoded, and evictions)"""
+    hits: int
+    diskHits: int
+    misses: int
+    evictions: int
+    entries: int
+    currentBytes: int
+
+    @property
+    def hitRate(self) -> float:
+        lookups = self.hits + self.diskHits + self.misses
+        return (self.hits + self.diskHits) / lookups if lookups else 0.0
+
+
+def texture_key(data: bytes, **options) -> str:
+    """Returns the key of a BCLIM file's decoded image, from the hash of its bytes and the decode options."""
+    digest = hashlib.blake2b(data, digest_size=20)
+    for name, value in sorted(options.items()):
+        digest.update(b'\0' + name.encode() + b'=' + repr(value).encode())
+    return digest.hexdigest()
+
+
+class TextureCache:
+    """A cache of decoded BCLIM images, in memory (bounded by maxBytes) and optionally on disk (in directory)."""
+
+    def __init__(self, maxBytes: int = DEFAULT_MAX_BYTES, directory: str = None):
+        self.maxBytes = maxBytes
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+        self.entries: OrderedDict[str, numpy.ndarray] = OrderedDict()
+        self.currentBytes = 0
+        self.hits = self.diskHits = self.misses = self.evictions = 0
+        self.lock = threading.Lock()
+
+    @property
+    def stats(self) -> textureCacheStats:
+        return textureCacheStats(self.hits, self.diskHits, self.misses, self.evictions, len(self.entries), self.currentBytes)
+
+    def get(self, data: bytes, **options) -> numpy.ndarray:
+        """Returns the decoded image of the bytes of a BCLIM file, decoding it (with the options of Bclim.decode)
+        only if neither tier has it."""
+        key = texture_key(data, **options)
+        with self.lock:
+            image = self.entries.get(key)
+            if image is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return image
+
+        image = self.load(key)
+        if image is not None:
+            with self.lock:
+                self.diskHits += 1
+                self.store(key, image)
+            return image
+
+        # Decode outside of the lock, so other threads can use the cache meanwhile
+        bclim = Bclim()
+        bclim.read(DataStream(data))
+        image = numpy.ascontiguousarray(bclim.decode(**options))
+        image.flags.writeable = False
+        self.save(key, image)
+        with self.lock:
+            self.misses += 1
+            self.store(key, image)
+        return image
+
+    def get_file(self, filepath: str, **options) -> numpy.ndarray:
+        """Returns the decoded image of a BCLIM file."""
+        with open(filepath, 'rb') as f:
+            return self.get(f.read(), **options)
+
+    def store(self, key: str, image: numpy.ndarray) -> None:
+        """Adds an image to the memory tier, evicting the least recently used images beyond maxBytes
+        (an image larger than maxBytes on its own isn't kept). The lock must be held."""
+        if key in self.entries or image.nbytes > self.maxBytes:
+            return
+        self.entries[key] = image
+        self.currentBytes += image.nbytes
+        while self.currentBytes > self.maxBytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.currentBytes -= evicted.nbytes
+            self.evictions += 1
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.npy')
+
+    def load(self, key: str) -> numpy.ndarray or None:
+        """Loads an image from the disk tier as a read-only memory-mapped array, if it's there."""
+        if self.directory is None:
+            return None
+        try:
+            return numpy.load(self.path(key), mmap_mode='r')
+        except (FileNotFoundError, ValueError):
+            # A missing or unreadable file is a miss (the image is decoded and saved again)
+            return None
+
+    def save(self, key: str, image: numpy.ndarray) -> None:
+        """Saves an image to the disk tier. It's written to a temporary file that then replaces the entry,
+        so other processes never load a partial file."""
+        if self.directory is None:
+            return
+        handle, temporary = tempfile.mkstemp(suffix='.npy', dir=self.directory)
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                numpy.save(f, image)
+            os.replace(temporary, self.path(key))
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    def clear(self, disk: bool = False) -> None:
+        """Empties the memory tier (and the disk tier too, with disk=True). The statistics are kept."""
+        with self.lock:
+            self.entries.clear()
+            self.currentBytes = 0
+        if disk and self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith('.npy'):
+                    os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,113 @@
+import numpy
+
+"""
+Decoding of ETC1 and ETC1A4 texture data (Ericsson Texture Compression), as stored by the 3DS.
+
+The image is split into 4x4 blocks, each stored as a 64-bit little-endian value (of the bits in the
+order of the ETC1 specification). In ETC1A4, each block is preceded by a 64-bit value of the 4-bit
+alpha of its pixels. The 16 pixels of a block are numbered column by column (x * 4 + y), which is
+the order of their bits in a block and of the decoded pixels.
+
+A block is two 2x4 halves (side by side, or one above the other when the flip bit is set), each with
+a base color and a modifier table. In individual mode, both base colors are stored with 4 bits per
+channel, in differential mode the first is stored with 5 bits and the second as a 3-bit signed
+difference to it. Each pixel adds one of the four modifiers of its half's table to every channel.
+
+Every block of the data is decoded at once, with lookup tables in place of the arithmetic: the
+expansion of the base colors to 8 bits, the sum of differential colors, the modifiers and the clamping.
+These give the palette of the eight colors of each block, from which every pixel is gathered.
+"""
+
+# The modifiers of each table, by the index stored for a pixel (its most significant bit, then its least)
+MODIFIER_TABLES = numpy.array([
+    [2, 8, -2, -8],
+    [5, 17, -5, -17],
+    [9, 29, -9, -29],
+    [13, 42, -13, -42],
+    [18, 60, -18, -60],
+    [24, 80, -24, -80],
+    [33, 106, -33, -106],
+    [47, 183, -47, -183],
+], dtype=numpy.int16)
+
+# Base color channels expanded to 8 bits, by their 4 bit (individual) or 5 bit (differential) value
+EXPAND_4 = (numpy.arange(16, dtype=numpy.int16) * 17)
+EXPAND_5 = (numpy.arange(32, dtype=numpy.int16) << 3) | (numpy.arange(32, dtype=numpy.int16) >> 2)
+
+# The second color channel of differential mode, by the 5 bit first channel and the 3 bit signed difference
+# (the sum is wrapped to 5 bits, as it only overflows in invalid blocks)
+DIFFERENCES = numpy.array([0, 1, 2, 3, -4, -3, -2, -1], dtype=numpy.int16)
+EXPAND_DIFFERENTIAL = EXPAND_5[(numpy.arange(32, dtype=numpy.int16)[:, None] + DIFFERENCES) & 0x1F]
+
+# The base colors of both halves of a block (for a channel), by the differential bit and the 8 bits of the channel
+# (the values of both halves in individual mode, or the first value and the difference in differential mode)
+FIELDS = numpy.arange(256)
+BASE_COLORS = numpy.stack((
+    numpy.stack((EXPAND_4[FIELDS >> 4], EXPAND_4[FIELDS & 0xF]), axis=1),
+    numpy.stack((EXPAND_5[FIELDS >> 3], EXPAND_DIFFERENTIAL[FIELDS >> 3, FIELDS & 7]), axis=1),
+)).reshape(512, 2)
+
+# The four colors of a half (for a channel) by its modifier table and base color, with the modifiers added and clamped to 0-255
+CLAMP_OFFSET = 183
+CLAMP = numpy.clip(numpy.arange(-CLAMP_OFFSET, 256 + CLAMP_OFFSET), 0, 255).astype(numpy.uint8)
+MODIFIED_COLORS = CLAMP[FIELDS[None, :, None] + MODIFIER_TABLES[:, None, :] + CLAMP_OFFSET].reshape(8 * 256, 4)
+
+# The index of the modifier of each of 8 pixels, by a byte of their least significant bits and a byte of their most
+BITS = (numpy.arange(256)[:, None] >> numpy.arange(8)) & 1
+MODIFIER_INDEXES = (BITS[None, :, :] | BITS[:, None, :] << 1).astype(numpy.uint8)
+
+# The first of the four colors (of the palette of a block) of each pixel's half, without and with the flip bit set
+PIXEL_HALVES = numpy.array([[(pixel >> 3) * 4 for pixel in range(16)], [((pixel & 3) >> 1) * 4 for pixel in range(16)]], dtype=numpy.uint32)
+
+# The shifts of the channels (R, G, B) in the upper 32 bits of a block, and of the alpha of each pixel
+CHANNEL_SHIFTS = (24, 16, 8)
+ALPHA_SHIFTS = numpy.arange(0, 64, 4, dtype=numpy.uint64)
+
+# The number of blocks decoded together, which bounds the memory of the intermediate arrays
+CHUNK_BLOCKS = 0x4000
+
+
+def block_palettes(upper: numpy.ndarray) -> numpy.ndarray:
+    """Returns the eight colors each block's pixels can have (the four modifiers of each half, added to the half's
+    base color), as an N x 8 x 4 array of RGBA pixels, from the upper 32 bits of the blocks."""
+    palettes = numpy.empty((len(upper), 2, 4, 4), dtype=numpy.uint8)
+    palettes[:, :, :, 3] = 255
+
+    # The rows of the tables for the mode and the modifier tables of each block
+    modes = (upper & 2) << 7
+    tables = numpy.stack(((upper >> 5) & 7, (upper >> 2) & 7), axis=1) << 8
+    for channel, shift in enumerate(CHANNEL_SHIFTS):
+        bases = BASE_COLORS[modes | ((upper >> shift) & 0xFF)]
+        palettes[:, :, :, channel] = MODIFIED_COLORS[tables + bases]
+    return palettes.reshape(-1, 8, 4)
+
+
+def decode_colors(blocks: numpy.ndarray, pixels: numpy.ndarray) -> None:
+    """Decodes ETC1 blocks (an array of their 64-bit values) into an N x 16 x 4 array of pixels (with an opaque alpha)."""
+    upper = (blocks >> numpy.uint64(32)).astype(numpy.uint32)
+    lower = blocks.astype('<u4').view(numpy.uint8).reshape(-1, 4)
+
+    # Each pixel picks a color from the palette of its block, by its half and the index of its modifier
+    colors = numpy.concatenate((MODIFIER_INDEXES[lower[:, 2], lower[:, 0]], MODIFIER_INDEXES[lower[:, 3], lower[:, 1]]),
+                            axis=1, dtype=numpy.uint32)
+    colors |= PIXEL_HALVES[upper & 1]
+    colors += numpy.arange(0, len(blocks) * 8, 8, dtype=numpy.uint32)[:, None]
+    numpy.take(block_palettes(upper).view('<u4').reshape(-1), colors, out=pixels.view('<u4').reshape(colors.shape))
+
+
+def decode_etc1(data: bytes, blockCount: int, alpha: bool = False, start: int = 0) -> numpy.ndarray:
+    """Decodes blockCount blocks of ETC1 (or ETC1A4, with alpha=True) data, from the block start on, into a
+    (blockCount * 16) x 4 array of RGBA pixels, in the order of the blocks and of the pixels in each block."""
+    words = numpy.frombuffer(data, '<u8', blockCount * (2 if alpha else 1), start * (16 if alpha else 8))
+    pixels = numpy.empty((blockCount, 16, 4), dtype=numpy.uint8)
+
+    # Decode the blocks in chunks, so the intermediate arrays stay small
+    for chunk in range(0, blockCount, CHUNK_BLOCKS):
+        end = min(chunk + CHUNK_BLOCKS, blockCount)
+        if alpha:
+            decode_colors(words[chunk * 2 + 1:end * 2:2], pixels[chunk:end])
+            alphas = words[chunk * 2:end * 2:2]
+            pixels[chunk:end, :, 3] = ((alphas[:, None] >> ALPHA_SHIFTS) & numpy.uint64(0xF)) * 17
+        else:
+            decode_colors(words[chunk:end], pixels[chunk:end])
+    return pixels.reshape(blockCount * 16, 4)
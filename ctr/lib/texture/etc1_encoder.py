@@ -0,0 +1,180 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy
+
+from ctr.lib.texture.etc1 import EXPAND_4, EXPAND_5, MODIFIER_TABLES
+
+"""
+Encoding of ETC1 and ETC1A4 texture data (see ctr.lib.texture.etc1 for the layout of the blocks).
+
+Encoding a block is a search: for each way of splitting it into halves (side by side or one above the
+other) and each mode (individual or differential), a base color and a modifier table is picked for
+each half, and every pixel then picks the modifier closest to it. The block keeps the split and mode
+with the smallest error (the sum of the squared differences of the RGB channels).
+
+The search runs on many blocks at once with numpy, and the blocks of an image are split into tiles
+that are encoded by a pool of worker processes. The quality tiers decide which base colors are tried:
+
+    fast  The average color of each half, quantized to the mode's bits.
+    full  A local refinement of fast: the 27 colors within one step (of each channel) of the quantized
+          average, with all 8 tables each. It isn't an exhaustive search of the codes (of 4096 colors per
+          half in individual mode, and 32768 in differential mode), so it only finds a better color than
+          fast when one is next to the average, which is usually where it is.
+"""
+
+QUALITY_TIERS = ('fast', 'full')
+
+# The steps added to the channels of the quantized average color of a half, for the base colors tried in each tier
+# (only the neighbours of the average, as the modifiers apply to every channel, so they can't be searched one at a time)
+SEARCH_STEPS = {
+    'fast': numpy.zeros((1, 3), dtype=numpy.int32),
+    'full': numpy.array(list(product((0, -1, 1), repeat=3)), dtype=numpy.int32),
+}
+
+# The pixels of each half of a block, without and with the flip bit set (the pixels are numbered x * 4 + y)
+HALF_PIXELS = numpy.array([
+    [[pixel for pixel in range(16) if pixel >> 3 == half] for half in (0, 1)],
+    [[pixel for pixel in range(16) if (pixel & 3) >> 1 == half] for half in (0, 1)],
+])
+PIXEL_HALF = numpy.array([[pixel >> 3 for pixel in range(16)], [(pixel & 3) >> 1 for pixel in range(16)]])
+
+# The bits of the pixels' modifier indexes in the lower 32 bits of a block
+PIXEL_BITS = numpy.arange(16, dtype=numpy.uint64)
+
+# The number of base colors (of all the blocks) searched together, which bounds the memory of the intermediate arrays
+CHUNK_CANDIDATES = 0x2000
+
+# The number of blocks in each tile handed to a worker process
+TILE_BLOCKS = 0x1000
+
+
+def quantize(values: numpy.ndarray, bits: int) -> numpy.ndarray:
+    """Rounds 8-bit channel values to a number of bits."""
+    maximum = (1 << bits) - 1
+    return (values * maximum + 127) // 255
+
+
+def fit_half(pixels: numpy.ndarray, bases: numpy.ndarray) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """Finds the best modifier table for each base color tried for a half of each block.
+    The pixels are an N x 8 x 3 array, the (expanded) base colors an N x C x 3 array.
+    Returns the N x C arrays of the error of each base color with its best table, and of the table."""
+    # Work on each channel separately, as summing over a short last axis is slow
+    channels = [pixels[:, None, :, channel] for channel in range(3)]
+    baseChannels = [bases[:, :, None, channel].astype(numpy.int32) for channel in range(3)]
+    errors = numpy.empty(bases.shape[:2] + (len(MODIFIER_TABLES),), dtype=numpy.int32)
+
+    for table, modifiers in enumerate(MODIFIER_TABLES):
+        pixelErrors = None
+        for modifier in modifiers.tolist():
+            modifierErrors = None
+            for channel, base in zip(channels, baseChannels):
+                difference = channel - numpy.clip(base + modifier, 0, 255)
+                difference *= difference
+                modifierErrors = difference if modifierErrors is None else modifierErrors + difference
+            pixelErrors = modifierErrors if pixelErrors is None else numpy.minimum(pixelErrors, modifierErrors, out=pixelErrors)
+        errors[:, :, table] = pixelErrors.sum(axis=2)
+
+    tables = errors.argmin(axis=2)
+    return numpy.take_along_axis(errors, tables[:, :, None], axis=2)[:, :, 0], tables
+
+
+def best_base(pixels: numpy.ndarray, codes: numpy.ndarray, expand: numpy.ndarray) -> tuple:
+    """Picks the base color (from N x C x 3 candidate codes, expanded with the table expand) and the table with
+    the smallest error for a half of each block. Returns the arrays of the error, the codes and the table."""
+    errors, tables = fit_half(pixels, expand[codes])
+    best = errors.argmin(axis=1)
+    blocks = numpy.arange(len(codes))
+    return errors[blocks, best], codes[blocks, best], tables[blocks, best]
+
+
+def encode_colors(pixels: numpy.ndarray, quality: str) -> numpy.ndarray:
+    """Encodes the RGB channels of an N x 16 x 4 array of pixels (in the order of the pixels of a block)
+    into an array of the 64-bit values of N ETC1 blocks."""
+    steps = SEARCH_STEPS[quality]
+    rgb = pixels[:, :, :3].astype(numpy.int32)
+    blockCount = len(pixels)
+
+    bestErrors = numpy.full(blockCount, numpy.iinfo(numpy.int32).max, dtype=numpy.int64)
+    upper = numpy.zeros(blockCount, dtype=numpy.uint64)
+    bases = numpy.zeros((blockCount, 2, 3), dtype=numpy.int32)
+    tables = numpy.zeros((blockCount, 2), dtype=numpy.int64)
+
+    for flip in (0, 1):
+        halves = [rgb[:, HALF_PIXELS[flip][half]] for half in (0, 1)]
+        averages = [half.mean(axis=1) for half in halves]
+
+        # Individual mode, each half has its own 4-bit color
+        individual = []
+        for half, average in zip(halves, averages):
+            codes = numpy.clip(quantize(numpy.rint(average).astype(numpy.int32), 4)[:, None, :] + steps, 0, 15)
+            individual.append(best_base(half, codes, EXPAND_4))
+
+        # Differential mode, the second color must be within -4 to 3 (per channel) of the first 5-bit color
+        codes = numpy.clip(quantize(numpy.rint(averages[0]).astype(numpy.int32), 5)[:, None, :] + steps, 0, 31)
+        first = best_base(halves[0], codes, EXPAND_5)
+        low, high = numpy.maximum(first[1] - 4, 0)[:, None, :], numpy.minimum(first[1] + 3, 31)[:, None, :]
+        codes = numpy.clip(quantize(numpy.rint(averages[1]).astype(numpy.int32), 5)[:, None, :] + steps, low, high)
+        second = best_base(halves[1], codes, EXPAND_5)
+        differential = (first, second)
+
+        for mode, (half0, half1) in enumerate((individual, differential)):
+            errors = half0[0] + half1[0]
+            better = errors < bestErrors
+            bestErrors[better] = errors[better]
+
+            # The upper 32 bits: the colors, the tables, the mode and the flip bit
+            if mode == 0:
+                colors = half0[1].astype(numpy.uint64) << numpy.uint64(4) | half1[1].astype(numpy.uint64)
+                expanded = numpy.stack((EXPAND_4[half0[1]], EXPAND_4[half1[1]]), axis=1)
+            else:
+                colors = half0[1].astype(numpy.uint64) << numpy.uint64(3) | ((half1[1] - half0[1]) & 7).astype(numpy.uint64)
+                expanded = numpy.stack((EXPAND_5[half0[1]], EXPAND_5[half1[1]]), axis=1)
+            word = (colors[:, 0] << numpy.uint64(24) | colors[:, 1] << numpy.uint64(16) | colors[:, 2] << numpy.uint64(8)
+                    | (half0[2] << 5 | half1[2] << 2 | mode << 1 | flip).astype(numpy.uint64))
+            upper[better] = word[better]
+            bases[better] = expanded[better]
+            tables[better] = numpy.stack((half0[2], half1[2]), axis=1)[better]
+
+    # Every pixel picks the closest of the four colors of its half
+    flips = (upper & numpy.uint64(1)).astype(numpy.intp)
+    pixelHalves = PIXEL_HALF[flips]
+    pixelBases = numpy.take_along_axis(bases, pixelHalves[:, :, None], axis=1)
+    modifiers = MODIFIER_TABLES[numpy.take_along_axis(tables, pixelHalves, axis=1)]
+    colors = numpy.clip(pixelBases[:, :, None, :] + modifiers[:, :, :, None], 0, 255)
+    indexes = ((rgb[:, :, None, :] - colors) ** 2).sum(axis=3).argmin(axis=2).astype(numpy.uint64)
+
+    lower = ((indexes & numpy.uint64(1)) << PIXEL_BITS).sum(axis=1) | ((indexes >> numpy.uint64(1)) << (PIXEL_BITS + numpy.uint64(16))).sum(axis=1)
+    return upper << numpy.uint64(32) | lower
+
+
+def encode_tile(pixels: numpy.ndarray, alpha: bool, quality: str) -> bytes:
+    """Encodes an N x 16 x 4 array of pixels (in the order of the pixels of a block) into N ETC1 (or ETC1A4) blocks."""
+    words = numpy.empty((len(pixels), 2 if alpha else 1), dtype='<u8')
+    chunkBlocks = max(1, CHUNK_CANDIDATES // len(SEARCH_STEPS[quality]))
+    for chunk in range(0, len(pixels), chunkBlocks):
+        words[chunk:chunk + chunkBlocks, -1] = encode_colors(pixels[chunk:chunk + chunkBlocks], quality)
+
+    if alpha:
+        alphas = quantize(pixels[:, :, 3].astype(numpy.uint64), 4)
+        words[:, 0] = (alphas << (PIXEL_BITS * numpy.uint64(4))).sum(axis=1)
+    return words.tobytes()
+
+
+def encode_etc1(pixels: numpy.ndarray, alpha: bool = False, quality: str = 'fast', jobs: int = 1) -> bytes:
+    """Encodes an N x 4 array of RGBA pixels (in the order of the blocks and of the pixels in each block) into
+    ETC1 (or ETC1A4, with alpha=True) data. The blocks are split into tiles encoded by jobs worker processes
+    (as many as there are CPUs if None, and no workers at all if 1)."""
+    if quality not in QUALITY_TIERS:
+        raise ValueError("Unknown ETC1 quality '" + str(quality) + "'! (Expected any of " + ", ".join(QUALITY_TIERS) + ")")
+    blocks = numpy.ascontiguousarray(pixels, dtype=numpy.uint8).reshape(-1, 16, 4)
+    tiles = [blocks[start:start + TILE_BLOCKS] for start in range(0, len(blocks), TILE_BLOCKS)]
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(tiles) <= 1:
+        return b''.join(encode_tile(tile, alpha, quality) for tile in tiles)
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tiles))) as executor:
+        return b''.join(executor.map(encode_tile, tiles, [alpha] * len(tiles), [quality] * len(tiles)))
@@ -0,0 +1,212 @@
+from typing import NamedTuple
+
+import numpy
+
+from ctr.lib.texture.etc1 import decode_etc1
+from ctr.lib.texture.swizzle import etc1_order, tile, tile_order, untile
+
+"""
+The pixel formats of 3DS textures, and their decoding into RGBA images.
+
+Format | Name     | Bits | Layout (of the little-endian value of a pixel)
+-------+----------+------+-----------------------------------------------
+  0    | L8       |  8   | Luminance
+  1    | A8       |  8   | Alpha
+  2    | LA4      |  8   | Luminance (7-4), alpha (3-0)
+  3    | LA8      |  16  | Luminance (15-8), alpha (7-0)
+  4    | HILO8    |  16  | Red (15-8), green (7-0)
+  5    | RGB565   |  16  | Red (15-11), green (10-5), blue (4-0)
+  6    | RGB8     |  24  | Red (23-16), green (15-8), blue (7-0)
+  7    | RGBA5551 |  16  | Red (15-11), green (10-6), blue (5-1), alpha (0)
+  8    | RGBA4    |  16  | Red (15-12), green (11-8), blue (7-4), alpha (3-0)
+  9    | RGBA8    |  32  | Red (31-24), green (23-16), blue (15-8), alpha (7-0)
+  10   | ETC1     |  4   | 4x4 blocks of 64 bits
+  11   | ETC1A4   |  8   | 4x4 blocks of 64 bits of alpha, then 64 bits of ETC1
+  12   | L4       |  4   | Luminance, two pixels per byte (the first in the low bits)
+  13   | A4       |  4   | Alpha, two pixels per byte (the first in the low bits)
+
+Formats without a channel decode it as 255 (so A8 and A4 are white), and channels of fewer than
+8 bits are expanded by repeating their high bits. When encoding, channels are rounded to their bits,
+and luminance is the Rec. 601 luma of the RGB channels.
+"""
+
+class TextureFormat(NamedTuple):
+    """A pixel format of 3DS textures"""
+    name: str
+    bitsPerPixel: int
+
+TEXTURE_FORMATS = {
+    0: TextureFormat('L8', 8),
+    1: TextureFormat('A8', 8),
+    2: TextureFormat('LA4', 8),
+    3: TextureFormat('LA8', 16),
+    4: TextureFormat('HILO8', 16),
+    5: TextureFormat('RGB565', 16),
+    6: TextureFormat('RGB8', 24),
+    7: TextureFormat('RGBA5551', 16),
+    8: TextureFormat('RGBA4', 16),
+    9: TextureFormat('RGBA8', 32),
+    10: TextureFormat('ETC1', 4),
+    11: TextureFormat('ETC1A4', 8),
+    12: TextureFormat('L4', 4),
+    13: TextureFormat('A4', 4),
+}
+
+# The formats by name
+FORMAT_IDS = {textureFormat.name: formatId for formatId, textureFormat in TEXTURE_FORMATS.items()}
+
+# The number of rows of ETC1 textures decoded together by default
+ETC1_BAND_HEIGHT = 128
+
+
+def texture_size(width: int, height: int, formatId: int) -> int:
+    """Returns the size in bytes of the data of a texture."""
+    return width * height * TEXTURE_FORMATS[formatId].bitsPerPixel // 8
+
+def expand(values: numpy.ndarray, bits: int) -> numpy.ndarray:
+    """Expands channel values of a number of bits to 8 bits, by repeating their high bits."""
+    values = values.astype(numpy.uint8) << (8 - bits)
+    return values | (values >> bits)
+
+def rgba(count: int, red=255, green=255, blue=255, alpha=255) -> numpy.ndarray:
+    """Returns a count x 4 array of RGBA pixels, with each channel set to an array (or a constant)."""
+    pixels = numpy.empty((count, 4), dtype=numpy.uint8)
+    for channel, values in enumerate((red, green, blue, alpha)):
+        pixels[:, channel] = values
+    return pixels
+
+
+def decode_pixels(data: bytes, count: int, formatId: int) -> numpy.ndarray:
+    """Decodes count pixels of a (non-ETC1) format into a count x 4 array of RGBA pixels, in the order of the data."""
+    name = TEXTURE_FORMATS[formatId].name
+
+    if name in ('L4', 'A4'):
+        packed = numpy.frombuffer(data, numpy.uint8, count // 2)
+        values = numpy.empty(count, dtype=numpy.uint8)
+        values[0::2] = packed & 0xF
+        values[1::2] = packed >> 4
+        values *= 17
+        return rgba(count, values, values, values) if name == 'L4' else rgba(count, alpha=values)
+
+    if name in ('L8', 'A8', 'LA4'):
+        values = numpy.frombuffer(data, numpy.uint8, count)
+        if name == 'L8':
+            return rgba(count, values, values, values)
+        if name == 'A8':
+            return rgba(count, alpha=values)
+        luminance = (values >> 4) * 17
+        return rgba(count, luminance, luminance, luminance, (values & 0xF) * 17)
+
+    if name == 'RGB8':
+        values = numpy.frombuffer(data, numpy.uint8, count * 3).reshape(count, 3)
+        return rgba(count, values[:, 2], values[:, 1], values[:, 0])
+
+    if name == 'RGBA8':
+        # The bytes of a pixel are in the order A, B, G, R, so swapping them gives R, G, B, A
+        return numpy.frombuffer(data, '<u4', count).byteswap().view(numpy.uint8).reshape(count, 4)
+
+    values = numpy.frombuffer(data, '<u2', count)
+    if name == 'LA8':
+        luminance = (values >> 8).astype(numpy.uint8)
+        return rgba(count, luminance, luminance, luminance, values & 0xFF)
+    if name == 'HILO8':
+        return rgba(count, values >> 8, values & 0xFF, 0)
+    if name == 'RGB565':
+        return rgba(count, expand(values >> 11, 5), expand((values >> 5) & 0x3F, 6), expand(values & 0x1F, 5))
+    if name == 'RGBA5551':
+        return rgba(count, expand(values >> 11, 5), expand((values >> 6) & 0x1F, 5), expand((values >> 1) & 0x1F, 5),
+                    (values & 1) * 255)
+    if name == 'RGBA4':
+        return rgba(count, expand(values >> 12, 4), expand((values >> 8) & 0xF, 4), expand((values >> 4) & 0xF, 4),
+                    expand(values & 0xF, 4))
+    raise ValueError("Unsupported texture format '" + name + "'!")
+
+
+def decode_etc1_texture(data: bytes, width: int, height: int, alpha: bool, bandHeight: int) -> numpy.ndarray:
+    """Decodes an ETC1 (or ETC1A4) texture in bands of bandHeight rows, so only the blocks of one band
+    are held as intermediate arrays at a time."""
+    if bandHeight < 8 or bandHeight % 8:
+        raise ValueError("The band height must be a multiple of 8! (Got " + str(bandHeight) + ")")
+    image = numpy.empty((height, width, 4), dtype=numpy.uint8)
+
+    # The tiles are stored in rows, from the bottom of the image up, so each band is a run of blocks
+    for bottom in range(0, height, bandHeight):
+        rows = min(bandHeight, height - bottom)
+        pixels = decode_etc1(data, width * rows // 16, alpha, width * bottom // 16)
+        untile(pixels, etc1_order(width, rows), image[height - bottom - rows:height - bottom])
+    return image
+
+
+def decode_texture(data: bytes, width: int, height: int, formatId: int, bandHeight: int = ETC1_BAND_HEIGHT) -> numpy.ndarray:
+    """Decodes the data of a tiled texture (width and height being multiples of 8) into a height x width x 4
+    array of RGBA pixels, with the rows from top to bottom. ETC1 textures are decoded bandHeight rows at a time."""
+    if formatId not in TEXTURE_FORMATS:
+        raise ValueError("Unknown texture format " + str(formatId) + "! (Expected 0 to " + str(max(TEXTURE_FORMATS)) + ")")
+    size = texture_size(width, height, formatId)
+    if len(data) < size:
+        raise ValueError("The texture data is too short! (Expected " + str(size) + " bytes, got " + str(len(data)) + ")")
+
+    # Decode the pixels in the order of the data, then un-tile them with a single gather
+    name = TEXTURE_FORMATS[formatId].name
+    if name in ('ETC1', 'ETC1A4'):
+        return decode_etc1_texture(data, width, height, name == 'ETC1A4', bandHeight)
+    return untile(decode_pixels(data, width * height, formatId), tile_order(width, height))
+
+
+def reduce(values: numpy.ndarray, bits: int) -> numpy.ndarray:
+    """Rounds 8-bit channel values to a number of bits (the inverse of expand)."""
+    return ((values.astype(numpy.uint32) * ((1 << bits) - 1) + 127) // 255).astype(numpy.uint16)
+
+def luminance(pixels: numpy.ndarray) -> numpy.ndarray:
+    """Returns the luminance of an N x 4 array of RGBA pixels, as 8-bit values."""
+    weighted = pixels[:, 0] * numpy.uint32(299) + pixels[:, 1] * numpy.uint32(587) + pixels[:, 2] * numpy.uint32(114)
+    return ((weighted + 500) // 1000).astype(numpy.uint8)
+
+
+def encode_pixels(pixels: numpy.ndarray, formatId: int) -> bytes:
+    """Encodes an N x 4 array of RGBA pixels (in the order of the data) into the data of a (non-ETC1) format."""
+    name = TEXTURE_FORMATS[formatId].name
+    red, green, blue, alpha = (pixels[:, channel] for channel in range(4))
+
+    if name in ('L4', 'A4'):
+        values = reduce(luminance(pixels) if name == 'L4' else alpha, 4).astype(numpy.uint8)
+        return (values[0::2] | values[1::2] << 4).tobytes()
+    if name == 'L8':
+        return luminance(pixels).tobytes()
+    if name == 'A8':
+        return numpy.ascontiguousarray(alpha).tobytes()
+    if name == 'LA4':
+        return (reduce(luminance(pixels), 4) << 4 | reduce(alpha, 4)).astype(numpy.uint8).tobytes()
+    if name == 'RGB8':
+        return numpy.ascontiguousarray(pixels[:, 2::-1]).tobytes()
+    if name == 'RGBA8':
+        return numpy.ascontiguousarray(pixels, dtype=numpy.uint8).view('<u4').byteswap().tobytes()
+
+    if name == 'LA8':
+        values = luminance(pixels).astype(numpy.uint16) << 8 | alpha
+    elif name == 'HILO8':
+        values = red.astype(numpy.uint16) << 8 | green
+    elif name == 'RGB565':
+        values = reduce(red, 5) << 11 | reduce(green, 6) << 5 | reduce(blue, 5)
+    elif name == 'RGBA5551':
+        values = reduce(red, 5) << 11 | reduce(green, 5) << 6 | reduce(blue, 5) << 1 | reduce(alpha, 1)
+    elif name == 'RGBA4':
+        values = reduce(red, 4) << 12 | reduce(green, 4) << 8 | reduce(blue, 4) << 4 | reduce(alpha, 4)
+    else:
+        raise ValueError("Unsupported texture format '" + name + "'!")
+    return values.astype('<u2').tobytes()
+
+
+def encode_texture(image: numpy.ndarray, formatId: int, quality: str = 'fast', jobs: int = 1) -> bytes:
+    """Encodes a height x width x 4 array of RGBA pixels (width and height being multiples of 8) into the data of
+    a tiled texture. ETC1 textures are encoded with a quality tier of the ETC1 encoder, by jobs worker processes."""
+    if formatId not in TEXTURE_FORMATS:
+        raise ValueError("Unknown texture format " + str(formatId) + "! (Expected 0 to " + str(max(TEXTURE_FORMATS)) + ")")
+    height, width = image.shape[:2]
+
+    # Tile the pixels with a single scatter, then encode them in the order of the data
+    name = TEXTURE_FORMATS[formatId].name
+    if name in ('ETC1', 'ETC1A4'):
+        from ctr.lib.texture.etc1_encoder import encode_etc1
+        return encode_etc1(tile(image, etc1_order(width, height)), name == 'ETC1A4', quality, jobs)
+    return encode_pixels(tile(image, tile_order(width, height)), formatId)
@@ -0,0 +1,77 @@
+from functools import lru_cache
+
+import numpy
+
+"""
+The tiling (swizzle) of 3DS textures.
+
+A texture is stored as 8x8 pixel tiles, in rows of tiles from left to right, and the 64 pixels of a
+tile are in Morton (Z) order: the bits of the x and y coordinates in the tile are interleaved, x first.
+The rows of the texture are stored from the bottom up, as the GPU puts the origin at the bottom left.
+
+ETC1 textures are tiled the same way, but each tile holds four 4x4 blocks in the order
+(0, 0), (4, 0), (0, 4), (4, 4), and the 16 pixels of a block are stored column by column.
+
+Un-tiling is a single gather with a precomputed table of the position of each pixel in the data,
+and tiling is the scatter through the same table:
+
+    image = untile(pixels, tile_order(width, height))    # pixels in the order of the data, image in rows
+    pixels = tile(image, tile_order(width, height))
+"""
+
+def morton_table() -> numpy.ndarray:
+    """Returns the 8x8 table of the position of each pixel (by y, x) in the Morton order of a tile."""
+    y, x = numpy.mgrid[0:8, 0:8]
+    return ((x & 1) | (y & 1) << 1 | (x & 2) << 1 | (y & 2) << 2 | (x & 4) << 2 | (y & 4) << 3).astype(numpy.intp)
+
+def etc1_table() -> numpy.ndarray:
+    """Returns the 8x8 table of the position of each pixel (by y, x) in the blocks of an ETC1 tile."""
+    y, x = numpy.mgrid[0:8, 0:8]
+    return (((y // 4) * 2 + x // 4) * 16 + (x % 4) * 4 + y % 4).astype(numpy.intp)
+
+# The position of each pixel in a tile, for tiles of pixels and tiles of ETC1 blocks
+MORTON_TABLE = morton_table()
+ETC1_TABLE = etc1_table()
+
+
+@lru_cache(maxsize=64)
+def _order(width: int, height: int, etc1: bool) -> numpy.ndarray:
+    if width % 8 or height % 8:
+        raise ValueError("A tiled texture must be a multiple of 8 pixels wide and high! (Got " + str(width) + "x" + str(height) + ")")
+
+    # The start of each pixel's tile, plus its position in the tile
+    y, x = numpy.mgrid[0:height, 0:width]
+    tiles = (y // 8) * (width // 8) + x // 8
+    order = tiles * 64 + (ETC1_TABLE if etc1 else MORTON_TABLE)[y % 8, x % 8]
+
+    # The data starts with the bottom row
+    order = numpy.ascontiguousarray(order[::-1])
+    order.setflags(write=False)
+    return order
+
+def tile_order(width: int, height: int) -> numpy.ndarray:
+    """Returns the height x width table of the position in the data of each pixel of a tiled texture,
+    with the rows from top to bottom. The tables are cached per size."""
+    return _order(width, height, False)
+
+def etc1_order(width: int, height: int) -> numpy.ndarray:
+    """Returns the height x width table of the position in the decoded ETC1 blocks (16 pixels per block,
+    in order) of each pixel of an ETC1 texture, with the rows from top to bottom. The tables are cached per size."""
+    return _order(width, height, True)
+
+def untile(pixels: numpy.ndarray, order: numpy.ndarray, out: numpy.ndarray = None) -> numpy.ndarray:
+    """Gathers the N x 4 array of RGBA pixels of a texture (in the order of its data) into a height x width x 4
+    image, with a table from tile_order or etc1_order. The image can be gathered into a contiguous array out."""
+    # Each pixel is gathered as a single 32-bit value, which is much faster than gathering rows of 4 bytes
+    words = numpy.ascontiguousarray(pixels, dtype=numpy.uint8).view(numpy.uint32).reshape(-1)
+    if out is None:
+        return words[order].view(numpy.uint8).reshape(order.shape + (4,))
+    numpy.take(words, order, out=out.view(numpy.uint32).reshape(order.shape))
+    return out
+
+def tile(image: numpy.ndarray, order: numpy.ndarray) -> numpy.ndarray:
+    """Scatters a height x width x 4 image of RGBA pixels into the N x 4 array of its pixels in the order of
+    the data, with a table from tile_order or etc1_order (the inverse of untile)."""
+    words = numpy.empty(order.size, dtype=numpy.uint32)
+    words[order.reshape(-1)] = numpy.ascontiguousarray(image, dtype=numpy.uint8).view(numpy.uint32).reshape(-1)
+    return words.view(numpy.uint8).reshape(-1, 4)
@@ -1,7 +1,8 @@
-import json
-import operator
+from typing import Iterator, TextIO
 
+from ctr.lib.lms.common.lmsControlCodes import lmsControlCodeDecoder
 from ctr.lib.lms.common.lmsHeader import lmsBinaryHeader
+from ctr.lib.lms.common.lmsTagTable import lmsTagTable
 from ctr.lib.lms.msbp.alb1 import ALB1
 from ctr.lib.lms.msbp.ali2 import ALI2
 from ctr.lib.lms.msbp.ati2 import ATI2
@@ -15,142 +16,225 @@ from ctr.lib.lms.msbp.tgg2 import TGG2
 from ctr.lib.lms.msbp.tgl2 import TGL2
 from ctr.lib.lms.msbp.tgp2 import TGP2
 from ctr.util.data_stream import DataStream
-from ctr.util.serialize import JsonSerialize
-
+from ctr.util.serialize import JsonWriter, StreamedArray, StreamedObject, to_json
+
+# The block classes by magic, each block is stored in the attribute named after its magic in lowercase
+BLOCK_TYPES: dict = {
+    "CLR1": CLR1,
+    "CLB1": CLB1,
+    "ATI2": ATI2,
+    "ALB1": ALB1,
+    "ALI2": ALI2,
+    "TGG2": TGG2,
+    "TAG2": TAG2,
+    "TGP2": TGP2,
+    "TGL2": TGL2,
+    "SYL3": SYL3,
+    "SLB1": SLB1,
+    "CTI1": CTI1,
+}
+
+# Common selections of blocks to decode
+COLOR_BLOCKS: tuple = ("CLR1", "CLB1")
+ATTRIBUTE_BLOCKS: tuple = ("ATI2", "ALB1", "ALI2")
+TAG_BLOCKS: tuple = ("TGG2", "TAG2", "TGP2", "TGL2")
+STYLE_BLOCKS: tuple = ("SYL3", "SLB1")
+
+# The blocks of fixed-size records, which can be decoded into columns
+COLUMNAR_BLOCKS: tuple = ("CLR1", "ATI2", "SYL3")
 
 class Msbp:
-    """A class that repersents a Message Studio Binary Project file"""
-
-    def __init__(self, filepath: str = None):
+    """A class that repersents a Message Studio Binary Project file
+
+    The blocks are stored in the clr1, clb1, ... attributes. Passing a list of block magics as blocks
+    (e.g. COLOR_BLOCKS) decodes only those blocks, and leaves the attributes of the others as None.
+    With columnar=True, the COLUMNAR_BLOCKS store their entries as numpy arrays per field (which needs numpy).
+    blockDirectory holds the offset and size of every block in the file by magic.
+    tagTable holds the tags resolved by (groupIndex, tagIndex), built the first time it's used."""
+
+    blockDirectory: dict[str, tuple[int, int]] = None
+    _tagTable: lmsTagTable = None
+
+    clr1: CLR1 = None
+    clb1: CLB1 = None
+    ati2: ATI2 = None
+    alb1: ALB1 = None
+    ali2: ALI2 = None
+    tgg2: TGG2 = None
+    tag2: TAG2 = None
+    tgp2: TGP2 = None
+    tgl2: TGL2 = None
+    syl3: SYL3 = None
+    slb1: SLB1 = None
+    cti1: CTI1 = None
+
+    def __init__(self, filepath: str = None, blocks: list[str] = None, columnar: bool = False):
         self.filepath: str = filepath
         if filepath is not None:
-            self.parse()
+            self.parse(blocks, columnar)
 
-    def __str__(self):
-        j: JsonSerialize = JsonSerialize()
-        colorData: dict = {}
-        attributeData: dict = {}
-        tagData: dict = {}
-        styleData: dict = {}
-        contentInfo: list[str] = []
-
-        # Sort each list so the items are in order
-        self.clb1.entries = sorted(
-            self.clb1.entries, key=operator.attrgetter("itemIndex"))
-        self.alb1.entries = sorted(
-            self.alb1.entries, key=operator.attrgetter("itemIndex"))
-        self.slb1.entries = sorted(
-            self.slb1.entries, key=operator.attrgetter("itemIndex"))
-
-        # Colors
-        for entry in self.clb1.entries:
-            colorData[entry.label] = self.clr1.colors[entry.itemIndex].color
-
-        # Attributes
-        for entry in self.alb1.entries:
-            attribute = self.ati2.attributes[entry.itemIndex]
-            type: int = attribute.type
-            listIndex: int = attribute.listIndex
-            offset: int = attribute.offset
-            if attribute.type == 9:
-                listItems: list = self.ali2.attributeLists[listIndex].list
-                attributeData[entry.label] = {
-                    "type": type, "offset": offset, "listItems": listItems}
-            else:
-                attributeData[entry.label] = {"type": type, "offset": offset}
-
-        # Tags
-        for entry in self.tgg2.tagGroups:
-            groupName: str = entry.groupName
-            tagCount: int = entry.tagCount
-            tagIndexes: list[int] = entry.tagIndexes
-
-            tagData[groupName] = {"tagCount": tagCount,
-                                  "tagIndexes": tagIndexes, "tags": {}}
-            for index in tagIndexes:
-                tagName: str = self.tag2.tags[index].name
-                parameterCount: int = self.tag2.tags[index].parameterCount
-                parameterIndexes: list = self.tag2.tags[index].parameterIndexes
-                tagData[groupName]["tags"][tagName] = {
-                    "parameterCount": parameterCount, "parameterIndexes": parameterIndexes, "parameters": {}}
-                for parameterIndex in parameterIndexes:
-                    parameterName: str = self.tgp2.tagParameters[parameterIndex].parameterName
-                    parameterType: int = self.tgp2.tagParameters[parameterIndex].type
-                    if parameterType != 9:
-                        tagData[groupName]["tags"][tagName]["parameters"][parameterName] = {
-                            "listItemCount": 0, "listItemIndexes": [], "listItems": {}}
-                    else:
-                        listItemCount: int = self.tgp2.tagParameters[parameterIndex].ListItemCount
-                        listItemIndexes: int = self.tgp2.tagParameters[parameterIndex].ListItemIndexes
-                        listItems: list[str] = []
-                        tagData[groupName]["tags"][tagName]["parameters"][parameterName] = {
-                            "listItemCount": listItemCount, "listItemIndexes": listItemIndexes, "listItems": {}}
-                        for listIndex in listItemIndexes:
-                            listItems.append(self.tgl2.tagList[listIndex].item)
-                        tagData[groupName]["tags"][tagName]["parameters"][parameterName]["listItems"] = listItems
-
-        # Styles
-        for entry in self.slb1.entries:
-            regionWidth: int = self.syl3.styles[entry.itemIndex].regionWidth
-            lineNumber: int = self.syl3.styles[entry.itemIndex].lineNumber
-            fontIndex: int = self.syl3.styles[entry.itemIndex].fontIndex
-            baseColorIndex: tuple = self.syl3.styles[entry.itemIndex].baseColorIndex
-
-            styleData[entry.label] = {"regionWidth": regionWidth, "lineNumber": lineNumber,
-                                        "fontIndex": fontIndex, "baseColorIndex": baseColorIndex}
-        # Content info
-        for entry in self.cti1.contentInfo:
-            contentInfo.append(entry.sourceFile)
-        j.add("header", {
+    def iter_dict_items(self, streamed: bool = False) -> Iterator[tuple[str, object]]:
+        """Yields the (key, value) pairs of to_dict one at a time, building each value only when it's reached.
+        With streamed=True, the values are StreamedObjects that build each entry only as a JsonWriter reaches it.
+        Sections whose blocks weren't all decoded are skipped."""
+        container = StreamedObject if streamed else dict
+
+        yield "header", {
             "byteorderMark": self.header.byteOrderMark,
             "revision": self.header.revision,
             "messageEncoding": self.header.messageEncoding,
             "numberOfBlocks": self.header.blockCount,
             "fileSize": self.header.fileSize
-        })
-
-        j.add("colorData", colorData)
-        j.add("attributeData", attributeData)
-        j.add("tagData", tagData)
-        j.add("styleData", styleData)
-        j.add("contentInfo", contentInfo)
+        }
+
+        # The sections of blocks that weren't decoded (see parse) are left out
+        if self.has_blocks(COLOR_BLOCKS):
+            yield "colorData", container(self.iter_color_data())
+        if self.has_blocks(ATTRIBUTE_BLOCKS):
+            yield "attributeData", container(self.iter_attribute_data())
+        if self.has_blocks(TAG_BLOCKS):
+            yield "tagData", container(self.iter_tag_data())
+        if self.has_blocks(STYLE_BLOCKS):
+            yield "styleData", container(self.iter_style_data())
 
-        return json.dumps(json.loads(j.serialize()), indent=3)
+        # Content info
+        if self.cti1 is not None:
+            contentInfo = (entry.sourceFile for entry in self.cti1.contentInfo)
+            yield "contentInfo", StreamedArray(contentInfo) if streamed else list(contentInfo)
+
+    def has_blocks(self, blocks: tuple) -> bool:
+        """Returns whether every block in a list of block magics (e.g. COLOR_BLOCKS) was decoded."""
+        return all(getattr(self, magic.lower()) is not None for magic in blocks)
+
+    def iter_color_data(self) -> Iterator[tuple[str, tuple]]:
+        """Yields each color by its label, in item order."""
+        for entry in self.clb1.sortedEntries:
+            yield entry.label, self.clr1.colors[entry.itemIndex].color
+
+    def iter_attribute_data(self) -> Iterator[tuple[str, dict]]:
+        """Yields each attribute by its label, in item order."""
+        for entry in self.alb1.sortedEntries:
+            attribute = self.ati2.attributes[entry.itemIndex]
+            if attribute.type == 9:
+                listItems: list = self.ali2.attributeLists[attribute.listIndex].list
+                yield entry.label, {"type": attribute.type, "offset": attribute.offset, "listItems": listItems}
+            else:
+                yield entry.label, {"type": attribute.type, "offset": attribute.offset}
+
+    def iter_tag_data(self) -> Iterator[tuple[str, dict]]:
+        """Yields each tag group by its name, with its tags and their parameters."""
+        for groupIndex, entry in enumerate(self.tgg2.tagGroups):
+            tags: dict = {}
+            for tag in self.tagTable.group(groupIndex):
+                parameters: dict = {}
+                tags[tag.name] = {
+                    "parameterCount": len(tag.parameterIndexes), "parameterIndexes": tag.parameterIndexes, "parameters": parameters}
+                for parameter in tag.parameters:
+                    if parameter.type != 9:
+                        parameters[parameter.name] = {
+                            "listItemCount": 0, "listItemIndexes": [], "listItems": {}}
+                    else:
+                        parameters[parameter.name] = {
+                            "listItemCount": len(parameter.listItemIndexes), "listItemIndexes": parameter.listItemIndexes,
+                            "listItems": list(parameter.listItems)}
+            yield entry.groupName, {"tagCount": entry.tagCount, "tagIndexes": entry.tagIndexes, "tags": tags}
+
+    def iter_style_data(self) -> Iterator[tuple[str, dict]]:
+        """Yields each style by its label, in item order."""
+        for entry in self.slb1.sortedEntries:
+            style = self.syl3.styles[entry.itemIndex]
+            yield entry.label, {"regionWidth": style.regionWidth, "lineNumber": style.lineNumber,
+                                "fontIndex": style.fontIndex, "baseColorIndex": style.baseColorIndex}
+
+    @property
+    def tagTable(self) -> lmsTagTable:
+        """The tags resolved through TGG2, TAG2, TGP2 and TGL2 by (groupIndex, tagIndex), built once and then kept."""
+        if self._tagTable is None:
+            if not self.has_blocks(TAG_BLOCKS):
+                raise ValueError(f"The tag table needs the {', '.join(TAG_BLOCKS)} blocks!")
+            self._tagTable = lmsTagTable(self.tgg2.tagGroups, self.tag2.tags, self.tgp2.tagParameters, self.tgl2.tagList)
+        return self._tagTable
+
+    def control_code_decoder(self, byteOrder: str = 'little') -> lmsControlCodeDecoder:
+        """Returns a decoder for the tags in the messages (of an MSBT in a byte order) that use this project."""
+        return lmsControlCodeDecoder(self.tagTable, byteOrder)
+
+    def get_color(self, label: str) -> tuple:
+        """Returns the color with a label, or None if there isn't one. The label is found through the hash table of CLB1."""
+        itemIndex = self.clb1.index.get(label)
+        return self.clr1.colors[itemIndex].color if itemIndex is not None else None
+
+    def get_attribute(self, label: str):
+        """Returns the attribute with a label, or None if there isn't one. The label is found through the hash table of ALB1."""
+        itemIndex = self.alb1.index.get(label)
+        return self.ati2.attributes[itemIndex] if itemIndex is not None else None
+
+    def get_style(self, label: str):
+        """Returns the style with a label, or None if there isn't one. The label is found through the hash table of SLB1."""
+        itemIndex = self.slb1.index.get(label)
+        return self.syl3.styles[itemIndex] if itemIndex is not None else None
+
+    def to_dict(self) -> dict:
+        """Returns the project as plain Python containers, with the labelled blocks resolved by label."""
+        return dict(self.iter_dict_items())
 
-    def to_json(self, jsonFilename: str) -> None:
-        """Writes a json file containing serialized MSBP data"""
-        with open(jsonFilename, "w+") as j:
-            j.write(json.dumps(json.loads(str(self)), indent=2))
+    def __str__(self):
+        # Non-ASCII characters are escaped, as they always have been for projects
+        return to_json(self.to_dict(), indent=3, ascii=True)
+
+    def export_json(self, file: TextIO, indent: int = 2, compact: bool = False, ascii: bool = False) -> None:
+        """Writes the project to a text file object as JSON, with the same output as to_json(self.to_dict(), ...).
+        The entries of each block are resolved and written one at a time, so the document is never held in memory."""
+        JsonWriter(file, indent, compact, ascii=ascii).write(StreamedObject(self.iter_dict_items(streamed=True)))
+
+    def to_json(self, jsonFilename: str, pretty: bool = True) -> None:
+        """Writes a json file containing serialized MSBP data, pretty-printed (with an indent of 2) or compact,
+        with non-ASCII characters escaped"""
+        with open(jsonFilename, "w", encoding="utf-8") as j:
+            if pretty:
+                self.export_json(j, ascii=True)
+            else:
+                self.export_json(j, None, compact=True, ascii=True)
             print(f"{jsonFilename} has been created!")
 
-    def parse(self) -> None:
-        with open(self.filepath, "rb") as d:
-            data: DataStream = DataStream(d)
+    def parse(self, blocks: list[str] = None, columnar: bool = False) -> None:
+        """Parses the MSBP file. If blocks is given, only the blocks it names are decoded.
+        With columnar=True, the COLUMNAR_BLOCKS are decoded into columns."""
+        if blocks is not None:
+            blocks = set(blocks)
+            unknown: set = blocks - BLOCK_TYPES.keys()
+            if unknown:
+                raise ValueError(f"Unknown MSBP block(s) {', '.join(sorted(unknown))}, expected any of {', '.join(BLOCK_TYPES)}")
+
+        # The tag table of a previous parse is out of date
+        self._tagTable = None
+
+        with open(self.filepath, "rb") as d, DataStream.from_file(d) as data:
             self.header: lmsBinaryHeader = lmsBinaryHeader(data)
-            for _ in range(self.header.blockCount):
-                magic: str = data.read_string(4)
-                match magic:
-                    case "CLR1":
-                        self.clr1: CLR1 = CLR1(data)
-                    case "CLB1":
-                        self.clb1: CLB1 = CLB1(data)
-                    case "ATI2":
-                        self.ati2: ATI2 = ATI2(data)
-                    case "ALB1":
-                        self.alb1: ALB1 = ALB1(data)
-                    case "ALI2":
-                        self.ali2: ALI2 = ALI2(data)
-                    case "TGG2":
-                        self.tgg2: TGG2 = TGG2(data)
-                    case "TAG2":
-                        self.tag2: TAG2 = TAG2(data)
-                    case "TGP2":
-                        self.tgp2: TGP2 = TGP2(data)
-                    case "TGL2":
-                        self.tgl2: TGL2 = TGL2(data)
-                    case "SYL3":
-                        self.syl3: SYL3 = SYL3(data)
-                    case "SLB1":
-                        self.slb1: SLB1 = SLB1(data)
-                    case "CTI1":
-                        self.cti1: CTI1 = CTI1(data)
+            self.blockDirectory = self.read_block_directory(data, self.header.blockCount)
+
+            # Decode the selected blocks, the others are never read past their header
+            for magic, (offset, size) in self.blockDirectory.items():
+                if magic not in BLOCK_TYPES or (blocks is not None and magic not in blocks):
+                    continue
+                data.seek(offset + 4)
+                if columnar and magic in COLUMNAR_BLOCKS:
+                    setattr(self, magic.lower(), BLOCK_TYPES[magic](data, columnar=True))
+                else:
+                    setattr(self, magic.lower(), BLOCK_TYPES[magic](data))
+
+    @staticmethod
+    def read_block_directory(data: DataStream, blockCount: int) -> dict[str, tuple[int, int]]:
+        """Walks the block headers starting at the current position of the stream,
+        and returns the offset and size of each block by its magic."""
+        directory: dict = {}
+        offset: int = data.tell()
+        for _ in range(blockCount):
+            data.seek(offset)
+            magic: str = data.read_string(4)
+            size: int = data.read_uint32()
+            directory[magic] = (offset, size)
+
+            # Each block has a 16 byte header, and its data is padded to 16 bytes
+            offset = (offset + 0x10 + size + 0xF) & ~0xF
+        return directory
@@ -1,25 +1,118 @@
+import io
+import mmap
 import struct
 from io import BufferedReader
 
+from ctr.util.struct_codecs import CODECS, StructCodecs, get_struct
+
+# Buffer types that can be decoded in place with struct.unpack_from
+BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+
+def find_in_memoryview(view: memoryview, sub: bytes, start: int = 0) -> int:
+    """An equivalent of bytes.find for memoryviews (which don't have one), scanning in small chunks so nothing large is copied."""
+    chunkSize = 256
+    for chunkStart in range(start, len(view), chunkSize):
+        index = bytes(view[chunkStart:chunkStart + chunkSize + len(sub) - 1]).find(sub)
+        if index != -1:
+            return chunkStart + index
+    return -1
+
 class DataStream:
+    """A stream for reading binary data from an in-memory buffer.
+
+    The buffer can be a bytes, bytearray, memoryview or mmap object. Values are decoded in place with
+    struct.unpack_from at an integer cursor, so no intermediate bytes objects are created for numbers.
+    Use DataStream.from_file to open a file object (it is memory-mapped when possible)."""
 
     data = None
 
-    def __init__(self, data: BufferedReader = None, byteOrder: str = 'little'):
+    def __init__(self, data: bytes or bytearray or memoryview or mmap.mmap = None, byteOrder: str = 'little'):
+        if data is not None and not isinstance(data, BUFFER_TYPES):
+            raise TypeError("DataStream expects a bytes-like or mmap object, use DataStream.from_file for file objects (got " + type(data).__name__ + ")")
         self.data = data
+        self.offset = 0
         self.byteOrder = byteOrder
+        self.ownsData = False
+
+        # Bind the function used to find string terminators
+        if isinstance(data, memoryview):
+            self._find = lambda sub, start: find_in_memoryview(data, sub, start)
+        elif data is not None:
+            self._find = data.find
+
+    @property
+    def byteOrder(self) -> str:
+        """The byte order ('little' or 'big') values are decoded with."""
+        return self.codecs.byteOrder
+
+    @byteOrder.setter
+    def byteOrder(self, byteOrder: str) -> None:
+        # Bind the codecs for the byte order once, so the read functions never branch on it
+        codecs: StructCodecs = CODECS[byteOrder]
+        self.codecs = codecs
+        self._int8 = codecs.int8
+        self._uint8 = codecs.uint8
+        self._int16 = codecs.int16
+        self._uint16 = codecs.uint16
+        self._int32 = codecs.int32
+        self._uint32 = codecs.uint32
+        self._int64 = codecs.int64
+        self._uint64 = codecs.uint64
+        self._float = codecs.float
+        self._double = codecs.double
+        self._vector2 = codecs.vector2
+        self._vector3 = codecs.vector3
+
+    @staticmethod
+    def from_file(file: BufferedReader, byteOrder: str = 'little') -> 'DataStream':
+        """Creates a data stream for a file object, starting at the file's current position.
+        Regular files are memory-mapped, other seekable files are read into memory and
+        non-seekable files fall back to a FileDataStream that reads from the file object directly."""
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            # Not a regular file (or an empty one), so it can't be mapped
+            if not file.seekable():
+                return FileDataStream(file, byteOrder)
+
+            # Read the whole file, so offsets stay relative to its start as they are when it's mapped
+            position = file.tell()
+            file.seek(0)
+            stream = DataStream(file.read(), byteOrder)
+            stream.offset = position
+            return stream
+
+        stream = DataStream(data, byteOrder)
+        stream.offset = file.tell()
+        stream.ownsData = True
+        return stream
+
+    def close(self) -> None:
+        """Closes the underlying buffer if it was mapped by the stream."""
+        if self.ownsData:
+            self.data.close()
+            self.ownsData = False
+
+    def __enter__(self) -> 'DataStream':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
 
     def read_bytes(self, length: int) -> bytes:
         """Reads a number of bytes from the stream."""
-        return self.data.read(length)
+        start = self.offset
+        self.offset = start + length
+        return bytes(self.data[start:self.offset])
 
     def read_string(self, length: int = None, lengthBytes: int = 4) -> str:
         """Reads a string from the stream. If length is None, it will read the length from the stream first
         (Based on the provided lengthBytes which defaults to 4 for a 32-bit int)."""
         if length is None:
-            length = struct.unpack(f'<{lengthBytes}B', self.data.read(lengthBytes))[0]
-        return self.data.read(length).decode('utf-8')
-    
+            length = self.data[self.offset]
+            self.offset += lengthBytes
+        return self.read_bytes(length).decode('utf-8')
+
     def read_string_from(self, offset: int, length: int = None, lengthBytes: int = 4) -> str:
         """Reads a string from the stream at the specified offset. If length is None, it will read the length from the stream first
         (Based on the provided lengthBytes which defaults to 4 for a 32-bit int)."""
@@ -31,42 +124,66 @@ class DataStream:
 
     def read_string_nt(self) -> str:
         """Reads a null-terminated string from the stream."""
-        string = b''
-        while True:
-            char = self.data.read(1)
-            if char == b'\x00':
-                break
-            string += char
-        return string.decode('utf-8')
+        start = self.offset
+        end = self._find(b'\x00', start)
+        if end == -1:
+            # Unterminated, read to the end of the buffer
+            end = len(self.data)
+            self.offset = end
+        else:
+            self.offset = end + 1
+        return str(self.data[start:end], 'utf-8')
 
     def read_string_nt_from(self, offset: int) -> str:
-        """Reads a null-terminated string from the stream at the specified offset."""
-        curPos = self.tell()
-        self.seek(offset)
-        string = self.read_string_nt()
-        self.seek(curPos)
-        return string
+        """Reads a null-terminated string from the stream at the specified offset (without moving the stream)."""
+        end = self._find(b'\x00', offset)
+        if end == -1:
+            end = len(self.data)
+        return str(self.data[offset:end], 'utf-8')
+
+    def read_string_table(self, base: int, offsets: list[int]) -> list[str]:
+        """Reads a table of null-terminated strings, given their offsets relative to base, in one pass (without moving the stream)."""
+        data = self.data
+        find = self._find
+        strings = []
+        for offset in offsets:
+            start = base + offset
+            end = find(b'\x00', start)
+            if end == -1:
+                end = len(data)
+            strings.append(str(data[start:end], 'utf-8'))
+        return strings
 
     def read_int8(self) -> int:
         """Reads a signed 8-bit integer from the stream."""
-        return struct.unpack(f'<b', self.data.read(1))[0]
-    
+        value = self._int8.unpack_from(self.data, self.offset)[0]
+        self.offset += 1
+        return value
+
     def read_uint8(self) -> int:
         """Reads an unsigned 8-bit integer from the stream."""
-        return struct.unpack(f'<B', self.data.read(1))[0]
-    
+        value = self._uint8.unpack_from(self.data, self.offset)[0]
+        self.offset += 1
+        return value
+
     def read_int16(self) -> int:
         """Reads a signed 16-bit integer from the stream."""
-        return struct.unpack(f'<h', self.data.read(2))[0]
-    
+        value = self._int16.unpack_from(self.data, self.offset)[0]
+        self.offset += 2
+        return value
+
     def read_uint16(self) -> int:
         """Reads an unsigned 16-bit integer from the stream."""
-        return struct.unpack(f'<H', self.data.read(2))[0]
-    
+        value = self._uint16.unpack_from(self.data, self.offset)[0]
+        self.offset += 2
+        return value
+
     def read_int32(self) -> int:
         """Reads a signed 32-bit integer from the stream."""
-        return struct.unpack(f'<i', self.data.read(4))[0]
-    
+        value = self._int32.unpack_from(self.data, self.offset)[0]
+        self.offset += 4
+        return value
+
     def read_int32_from(self, offset: int) -> int:
         """Reads a signed 32-bit integer from the stream at the specified offset."""
         curPos = self.tell()
@@ -74,23 +191,31 @@ class DataStream:
         value = self.read_int32()
         self.seek(curPos)
         return value
-    
+
     def read_uint32(self) -> int:
         """Reads an unsigned 32-bit integer from the stream."""
-        return struct.unpack(f'<I', self.data.read(4))[0]
-    
+        value = self._uint32.unpack_from(self.data, self.offset)[0]
+        self.offset += 4
+        return value
+
     def read_int64(self) -> int:
         """Reads a signed 64-bit integer from the stream."""
-        return struct.unpack(f'<q', self.data.read(8))[0]
-    
+        value = self._int64.unpack_from(self.data, self.offset)[0]
+        self.offset += 8
+        return value
+
     def read_uint64(self) -> int:
         """Reads an unsigned 64-bit integer from the stream."""
-        return struct.unpack(f'<Q', self.data.read(8))[0]
-    
+        value = self._uint64.unpack_from(self.data, self.offset)[0]
+        self.offset += 8
+        return value
+
     def read_float(self) -> float:
         """Reads a 32-bit float from the stream."""
-        return struct.unpack(f'<f', self.data.read(4))[0]
-    
+        value = self._float.unpack_from(self.data, self.offset)[0]
+        self.offset += 4
+        return value
+
     def read_float_from(self, offset: int) -> float:
         """Reads a 32-bit float from the stream at the specified offset."""
         curPos = self.tell()
@@ -101,23 +226,29 @@ class DataStream:
 
     def read_double(self) -> float:
         """Reads a 64-bit float from the stream."""
-        return struct.unpack(f'<d', self.data.read(8))[0]
+        value = self._double.unpack_from(self.data, self.offset)[0]
+        self.offset += 8
+        return value
 
     def read_vector2(self) -> tuple:
         """Reads a 2D vector from the stream (32-bit floats for both the x and y values)."""
-        return (self.read_float(), self.read_float())
-    
+        value = self._vector2.unpack_from(self.data, self.offset)
+        self.offset += 8
+        return value
+
     def read_vector3(self) -> tuple:
         """Reads a 3D vector from the stream (32-bit floats for the x, y and z values)."""
-        return (self.read_float(), self.read_float(), self.read_float())
+        value = self._vector3.unpack_from(self.data, self.offset)
+        self.offset += 12
+        return value
 
     def read_color_rgba8(self, asHex=False) -> tuple or str:
         """Reads a RGBA8 color from the stream."""
-        return struct.unpack('BBBB', self.read_bytes(4)) if not asHex else self.read_bytes(4).hex()
-    
+        return self.read_record(self.codecs.rgba8) if not asHex else self.read_bytes(4).hex()
+
     def read_color_rgb8(self, asHex=False) -> tuple or str:
         """Reads a RGB8 color from the stream."""
-        return struct.unpack('BBB', self.read_bytes(3)) if not asHex else self.read_bytes(3).hex()
+        return self.read_record(self.codecs.rgb8) if not asHex else self.read_bytes(3).hex()
 
     def read_color_rgba16(self, asHex=False) -> tuple or str:
         """Reads a RGBA16 color from the stream."""
@@ -129,12 +260,165 @@ class DataStream:
 
     def read_uv_coord_set(self) -> tuple:
         """Reads a UV coordinate set from the stream (8 16-bit floats that make up the top left, top right, bottom left, and bottom right UVs)."""
-        return ((self.read_float(), self.read_float()), (self.read_float(), self.read_float()), (self.read_float(), self.read_float()), (self.read_float(), self.read_float()))
+        values = self.read_record(self.codecs.uvCoordSet)
+        return ((values[0], values[1]), (values[2], values[3]), (values[4], values[5]), (values[6], values[7]))
+
+    def read_uv_coord_sets(self, count: int) -> list[tuple]:
+        """Reads a number of UV coordinate sets from the stream in one call."""
+        values = self.read_array('f', count * 8)
+        return [((values[i], values[i + 1]), (values[i + 2], values[i + 3]), (values[i + 4], values[i + 5]), (values[i + 6], values[i + 7]))
+                for i in range(0, len(values), 8)]
+
+    def read_array(self, fmt: str, count: int) -> list:
+        """Reads a run of count values of the same struct format (e.g. 'H' or 'f') from the stream in one call."""
+        if count == 0:
+            return []
+        codec = get_struct(str(count) + fmt, self.codecs.byteOrder)
+        values = codec.unpack_from(self.data, self.offset)
+        self.offset += codec.size
+        return list(values)
+
+    def read_record(self, record: struct.Struct or str) -> tuple:
+        """Reads a fixed-size record from the stream in one call.
+        The record is either a compiled struct or a format string (without a byte order prefix)."""
+        if isinstance(record, str):
+            record = get_struct(record, self.codecs.byteOrder)
+        values = record.unpack_from(self.data, self.offset)
+        self.offset += record.size
+        return values
+
+    def tell(self) -> int:
+        """Returns the current position of the stream."""
+        return self.offset
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        """Seeks to a position in the stream."""
+        if whence == 1:
+            offset += self.offset
+        elif whence == 2:
+            offset += len(self.data)
+        self.offset = offset
+        return offset
+
+
+class FileDataStream(DataStream):
+    """A stream for reading binary data directly from a file object.
+    This is the fallback used by DataStream.from_file for inputs that can't be memory-mapped or seeked,
+    it's slower since every value is a separate read from the file."""
+
+    def __init__(self, data: BufferedReader = None, byteOrder: str = 'little'):
+        self.data = data
+        self.codecs = CODECS[byteOrder]
+        self.ownsData = False
+
+    @property
+    def byteOrder(self) -> str:
+        """The byte order ('little' or 'big') values are decoded with."""
+        return self.codecs.byteOrder
+
+    @byteOrder.setter
+    def byteOrder(self, byteOrder: str) -> None:
+        self.codecs = CODECS[byteOrder]
+
+    def read_bytes(self, length: int) -> bytes:
+        """Reads a number of bytes from the stream."""
+        return self.data.read(length)
+
+    def read_string(self, length: int = None, lengthBytes: int = 4) -> str:
+        """Reads a string from the stream. If length is None, it will read the length from the stream first
+        (Based on the provided lengthBytes which defaults to 4 for a 32-bit int)."""
+        if length is None:
+            length = self.data.read(lengthBytes)[0]
+        return self.data.read(length).decode('utf-8')
+
+    def read_string_nt(self) -> str:
+        """Reads a null-terminated string from the stream."""
+        string = b''
+        while True:
+            char = self.data.read(1)
+            if char == b'\x00' or char == b'':
+                break
+            string += char
+        return string.decode('utf-8')
+
+    def read_string_nt_from(self, offset: int) -> str:
+        """Reads a null-terminated string from the stream at the specified offset (without moving the stream)."""
+        curPos = self.tell()
+        self.seek(offset)
+        string = self.read_string_nt()
+        self.seek(curPos)
+        return string
+
+    def read_string_table(self, base: int, offsets: list[int]) -> list[str]:
+        """Reads a table of null-terminated strings, given their offsets relative to base (without moving the stream)."""
+        return [self.read_string_nt_from(base + offset) for offset in offsets]
+
+    def read_int8(self) -> int:
+        """Reads a signed 8-bit integer from the stream."""
+        return self.codecs.int8.unpack(self.data.read(1))[0]
+
+    def read_uint8(self) -> int:
+        """Reads an unsigned 8-bit integer from the stream."""
+        return self.codecs.uint8.unpack(self.data.read(1))[0]
+
+    def read_int16(self) -> int:
+        """Reads a signed 16-bit integer from the stream."""
+        return self.codecs.int16.unpack(self.data.read(2))[0]
+
+    def read_uint16(self) -> int:
+        """Reads an unsigned 16-bit integer from the stream."""
+        return self.codecs.uint16.unpack(self.data.read(2))[0]
+
+    def read_int32(self) -> int:
+        """Reads a signed 32-bit integer from the stream."""
+        return self.codecs.int32.unpack(self.data.read(4))[0]
+
+    def read_uint32(self) -> int:
+        """Reads an unsigned 32-bit integer from the stream."""
+        return self.codecs.uint32.unpack(self.data.read(4))[0]
+
+    def read_int64(self) -> int:
+        """Reads a signed 64-bit integer from the stream."""
+        return self.codecs.int64.unpack(self.data.read(8))[0]
+
+    def read_uint64(self) -> int:
+        """Reads an unsigned 64-bit integer from the stream."""
+        return self.codecs.uint64.unpack(self.data.read(8))[0]
+
+    def read_float(self) -> float:
+        """Reads a 32-bit float from the stream."""
+        return self.codecs.float.unpack(self.data.read(4))[0]
+
+    def read_double(self) -> float:
+        """Reads a 64-bit float from the stream."""
+        return self.codecs.double.unpack(self.data.read(8))[0]
+
+    def read_vector2(self) -> tuple:
+        """Reads a 2D vector from the stream (32-bit floats for both the x and y values)."""
+        return (self.read_float(), self.read_float())
+
+    def read_vector3(self) -> tuple:
+        """Reads a 3D vector from the stream (32-bit floats for the x, y and z values)."""
+        return (self.read_float(), self.read_float(), self.read_float())
+
+    def read_array(self, fmt: str, count: int) -> list:
+        """Reads a run of count values of the same struct format (e.g. 'H' or 'f') from the stream in one call."""
+        if count == 0:
+            return []
+        codec = get_struct(str(count) + fmt, self.codecs.byteOrder)
+        return list(codec.unpack(self.data.read(codec.size)))
+
+    def read_record(self, record: struct.Struct or str) -> tuple:
+        """Reads a fixed-size record from the stream in one call.
+        The record is either a compiled struct or a format string (without a byte order prefix)."""
+        if isinstance(record, str):
+            record = get_struct(record, self.codecs.byteOrder)
+        return record.unpack(self.data.read(record.size))
 
     def tell(self) -> int:
         """Returns the current position of the stream."""
         return self.data.tell()
-    
+
     def seek(self, offset: int, whence: int = 0) -> int:
         """Seeks to a position in the stream."""
         return self.data.seek(offset, whence)
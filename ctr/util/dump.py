@@ -0,0 +1,503 @@
+import gc
+import importlib
+import marshal
+import operator
+import struct
+import sys
+from array import array
+from enum import Enum
+from functools import lru_cache, partial
+from itertools import accumulate, chain
+
+"""
+A compact, versioned binary format for the parsed object models (Bclyt, Msbp, Bclim and Bclan), for
+workflows that edit a model and rebuild the file from it without parsing the original again:
+
+    with open('layout.ctrd', 'wb') as f:
+        dump(layout, f)
+    ...
+    with open('layout.ctrd', 'rb') as f:
+        layout = load(f, Bclyt)
+    layout.export('layout.bclyt')
+
+A dump holds the fields DUMP_TYPES lists for each type and nothing derived from them: loading rebuilds the
+rest (the parents of the panes and groups, the windows' material list, and the sections' views of their
+blocks). The entries of the MSBP blocks are stored by column, and runs of colours, UV coordinates and
+indexes as typed arrays. A dump records the fields of each type it holds, so a dump made before a field
+was renamed, added or removed is refused on load instead of giving back objects with the wrong attributes.
+
+Loading creates the objects without calling their constructors, so it never runs a parser or opens a file.
+"""
+
+DUMP_MAGIC = b'CTRD'
+
+# Bump this when the layout of a dump changes (changes to the fields are caught by the fields a dump records)
+DUMP_VERSION = 3
+
+DUMP_HEADER = struct.Struct('<4sH')
+
+# The version of the marshal format the body of a dump is written in, which is fixed since Python 3.4
+MARSHAL_VERSION = 4
+
+PANE_FIELDS = ('type', 'name', 'dataString', 'originalSectionSize', 'isVisible', 'influencedAlpha',
+               'locationAdjustment', 'origin', 'alpha', 'ignorePartsMagnify', 'adjustToPartsBounds',
+               'position', 'rotation', 'scale', 'height', 'width', 'children:objects', 'userData:objects')
+BLOCK_FIELDS = ('blockSize', 'relativeStart', 'numberOfEntries')
+
+# The types a dump can hold by (module, qualified name), with their fields. A field is stored as it is,
+# unless its kind follows its name: an object (or enum member) or a list of them, a list of records,
+# records in columns, a list of colours, a list of UV coordinate sets, a numpy array, or a type. Enums
+# and records (named tuples) have no fields listed here.
+DUMP_TYPES: dict[tuple[str, str], tuple[str, ...]] = {
+    ('ctr.bclyt', 'Bclyt'): ('filepath', 'type', 'byteOrderMark', 'revision', 'fileSize', 'sectionCount',
+                             'layoutParams:object', 'textureList:object', 'fontList:object',
+                             'materialList:object', 'rootPane:object', 'rootGroup:object',
+                             'children:objects', 'userData:objects'),
+    ('ctr.bclim', 'Bclim'): ('filepath', 'byteOrderMark', 'version', 'height', 'width', 'format', 'imageData',
+                             'fileSize'),
+    ('ctr.bclan', 'Bclan'): ('filepath', 'byteOrderMark', 'revision', 'fileSize', 'sectionCount',
+                             'patternInfo:object', 'animationInfo:object'),
+    ('ctr.msbp', 'Msbp'): ('filepath', 'header:object', 'blockDirectory', 'clr1:object', 'clb1:object',
+                           'ati2:object', 'alb1:object', 'ali2:object', 'tgg2:object', 'tag2:object',
+                           'tgp2:object', 'tgl2:object', 'syl3:object', 'slb1:object', 'cti1:object'),
+    # Layouts
+    ('ctr.lib.lyt.lyt1', 'Lyt1'): ('originType:object', 'canvasSize'),
+    ('ctr.lib.lyt.lyt1', 'OriginType'): None,
+    ('ctr.lib.lyt.txl1', 'Txl1'): ('textureNames',),
+    ('ctr.lib.lyt.fnl1', 'Fnl1'): ('fontCount', 'strings'),
+    ('ctr.lib.lyt.mat1', 'Mat1'): ('sectionOffsets', 'materials:objects'),
+    ('ctr.lib.lyt.mat1', 'Mat1Material'): ('name', 'tevColor', 'tevConstantColors:colors', 'flags',
+                                           'useTextureOnly', 'texMaps:objects', 'texSRTs:objects',
+                                           'texCoords:objects', 'tevStages:objects', 'alphaCompare:object',
+                                           'blendModeBlend:object', 'blendModeLogic:object', 'indParam:object',
+                                           'projTextGenParam:objects', 'fontShadowParam:object'),
+    ('ctr.lib.lyt.pan1', 'Pan1'): PANE_FIELDS,
+    ('ctr.lib.lyt.pan1', 'Bnd1'): PANE_FIELDS,
+    ('ctr.lib.lyt.pic1', 'Pic1'): PANE_FIELDS + ('vertexColorTopLeft', 'vertexColorTopRight',
+                                                 'vertexColorBottomLeft', 'vertexColorBottomRight',
+                                                 'materialId', 'textureCoordCount', 'textureCoords:uvs'),
+    ('ctr.lib.lyt.txt1', 'Txt1'): PANE_FIELDS + ('bufferLength', 'stringLength', 'materialId', 'fontNum',
+                                                 'anotherOrigin', 'alignment', 'unknown', 'textOffset',
+                                                 'topColor', 'bottomColor', 'sizeX', 'sizeY',
+                                                 'characterSize', 'lineSize'),
+    ('ctr.lib.lyt.wnd1', 'Wnd1'): PANE_FIELDS + ('contentOverflowLeft', 'contentOverflowRight',
+                                                 'contentOverflowTop', 'contentOverflowBottom', 'frameCount',
+                                                 'flag', 'padding', 'windowContentOffset', 'windowFrameOffset',
+                                                 'colorTopLeft', 'colorTopRight',
+                                                 'colorBottomLeft', 'colorBottomRight', 'materialId',
+                                                 'textureCoordCount', 'materialNameOffset', 'textureCoords:uvs',
+                                                 'frameOffsets', 'frames:objects', 'materialName'),
+    ('ctr.lib.lyt.wnd1', 'WND1Frame'): ('materialIndex', 'flipType', 'unknown'),
+    ('ctr.lib.lyt.grp1', 'Grp1'): ('type', 'name', 'paneCount', 'entries', 'children:objects', 'userData:objects'),
+    ('ctr.lib.lyt.usd1', 'Usd1'): ('entries:objects',),
+    ('ctr.lib.lyt.usd1', 'Usd1Entry'): ('type:object', 'unknown', 'name', 'value'),
+    ('ctr.lib.lyt.usd1', 'UsdDataType'): None,
+    ('ctr.lib.lyt.material.alphacompare', 'AlphaCompare'): ('compareMode', 'referenceAlpha', 'unknown'),
+    ('ctr.lib.lyt.material.blendmode', 'BlendFactor'): None,
+    ('ctr.lib.lyt.material.blendmode', 'BlendOp'): None,
+    ('ctr.lib.lyt.material.blendmode', 'LogicOp'): None,
+    ('ctr.lib.lyt.material.blendmode', 'BlendMode'): ('blendOp:object', 'blendFactorSrc:object',
+                                                      'blendFactorDest:object', 'logicOp:object'),
+    ('ctr.lib.lyt.material.fontshadowparameter', 'FontShadowParameter'): ('blackRed', 'blackGreen', 'blackBlue',
+                                                                          'whiteRed', 'whiteGreen', 'whiteBlue',
+                                                                          'whiteAlpha'),
+    ('ctr.lib.lyt.material.indirectparameter', 'IndirectParameter'): ('rotation', 'scale'),
+    ('ctr.lib.lyt.material.projectiontexgenparam', 'ProjectionTexGenParam'): ('position', 'scale',
+                                                                              'isFittingLayoutSize',
+                                                                              'isFittingPaneSize',
+                                                                              'isAdjustProjectionSR', 'padding'),
+    ('ctr.lib.lyt.material.tevstage', 'TevStage'): ('rgbMode', 'alphaMode', 'unknown'),
+    ('ctr.lib.lyt.material.texcoordgen', 'TexGenType'): None,
+    ('ctr.lib.lyt.material.texcoordgen', 'TexGenSource'): None,
+    ('ctr.lib.lyt.material.texcoordgen', 'TexCoordGen'): ('genType:object', 'genSource:object'),
+    ('ctr.lib.lyt.material.texmap', 'WrapMode'): None,
+    ('ctr.lib.lyt.material.texmap', 'FilterMode'): None,
+    ('ctr.lib.lyt.material.texmap', 'TexMap'): ('textureIndex', 'wrapModeS:object', 'wrapModeT:object',
+                                                'filterModeMin:object', 'filterModeMag:object'),
+    ('ctr.lib.lyt.material.texsrt', 'TexSRT'): ('translation', 'rotation', 'scale'),
+    # Animations
+    ('ctr.lib.lan.pat1', 'Pat1'): ('name', 'groups', 'animationOrder', 'groupCount', 'nameOffset',
+                                   'groupsOffset', 'startFrame', 'endFrame', 'childBinding'),
+    ('ctr.lib.lan.pai1', 'Pai1'): ('textureNames', 'entries:objects', 'frameSize', 'loop', 'textureCount',
+                                   'entryCount', 'entriesOffset'),
+    ('ctr.lib.lan.pai1', 'AnimationEntry'): ('name', 'tagCount', 'entryType', 'tags:objects'),
+    ('ctr.lib.lan.pai1', 'AnimationTag'): ('magic', 'targets:objects'),
+    ('ctr.lib.lan.pai1', 'AnimationTarget'): ('index', 'target', 'curveType', 'keyCount', 'keysOffset',
+                                              'frames:array', 'values:array', 'slopes:array'),
+    # MSBP projects
+    ('ctr.lib.lms.common.lmsHeader', 'lmsBinaryHeader'): ('magic', 'byteOrderMark', 'messageEncoding', 'revision',
+                                                          'blockCount', 'fileSize'),
+    ('ctr.lib.lms.common.lmsBlocks', 'lmsDataBlock'): BLOCK_FIELDS + ('entries:records',),
+    ('ctr.lib.lms.common.lmsBlocks', 'lmsItemBlock'): BLOCK_FIELDS + ('entryType:type', 'entries:records'),
+    ('ctr.lib.lms.common.lmsBlocks', 'lmsLabelBlock'): BLOCK_FIELDS + ('entries:records',),
+    ('ctr.lib.lms.common.lmsColumns', 'lmsColumnarBlock'): BLOCK_FIELDS + ('entries:columns',),
+    ('ctr.lib.lms.common.lmsCommonTypes', 'label'): None,
+    ('ctr.lib.lms.common.lmsCommonTypes', 'color'): None,
+    ('ctr.lib.lms.common.lmsCommonTypes', 'attribute'): None,
+    ('ctr.lib.lms.common.lmsCommonTypes', 'attributeList'): None,
+    ('ctr.lib.lms.common.lmsCommonTypes', 'tagGroup'): None,
+    ('ctr.lib.lms.common.lmsCommonTypes', 'tag'): None,
+    ('ctr.lib.lms.common.lmsCommonTypes', 'tagParameter'): None,
+    ('ctr.lib.lms.common.lmsCommonTypes', 'tagList'): None,
+    ('ctr.lib.lms.common.lmsCommonTypes', 'style'): None,
+    ('ctr.lib.lms.common.lmsCommonTypes', 'contentInfo'): None,
+    ('ctr.lib.lms.msbp.clr1', 'CLR1'): ('block:object',),
+    ('ctr.lib.lms.msbp.clb1', 'CLB1'): ('labelBlock:object',),
+    ('ctr.lib.lms.msbp.ati2', 'ATI2'): ('block:object',),
+    ('ctr.lib.lms.msbp.alb1', 'ALB1'): ('block:object',),
+    ('ctr.lib.lms.msbp.ali2', 'ALI2'): ('block:object',),
+    ('ctr.lib.lms.msbp.tgg2', 'TGG2'): ('tgg2Block:object',),
+    ('ctr.lib.lms.msbp.tag2', 'TAG2'): ('tag2Block:object',),
+    ('ctr.lib.lms.msbp.tgp2', 'TGP2'): ('tgp2block:object',),
+    ('ctr.lib.lms.msbp.tgl2', 'TGL2'): ('tgl2Block:object',),
+    ('ctr.lib.lms.msbp.syl3', 'SYL3'): ('block:object',),
+    ('ctr.lib.lms.msbp.slb1', 'SLB1'): ('block:object',),
+    ('ctr.lib.lms.msbp.cti1', 'CTI1'): ('cti1Block:object',),
+}
+
+# The sections of a project that are views of their block: the attributes that are the block's lists
+SECTION_VIEWS = {
+    'CLR1': ('block', ('colors', 'entries')),
+    'CLB1': ('labelBlock', ('entries', 'entries'), ('sortedEntries', 'sortedEntries')),
+    'ATI2': ('block', ('attributes', 'entries')),
+    'ALB1': ('block', ('entries', 'entries'), ('sortedEntries', 'sortedEntries')),
+    'ALI2': ('block', ('attributeLists', 'entries')),
+    'TGG2': ('tgg2Block', ('tagGroups', 'entries')),
+    'TAG2': ('tag2Block', ('tags', 'entries')),
+    'TGP2': ('tgp2block', ('tagParameters', 'entries')),
+    'TGL2': ('tgl2Block', ('tagList', 'entries')),
+    'SYL3': ('block', ('styles', 'entries')),
+    'SLB1': ('block', ('entries', 'entries'), ('sortedEntries', 'sortedEntries')),
+    'CTI1': ('cti1Block', ('contentInfo', 'entries')),
+}
+
+# The layout parts that are stored behind the lazily decoded properties of Bclyt
+LAYOUT_PARTS = ('textureList', 'fontList', 'materialList', 'rootPane', 'rootGroup')
+
+# The kinds of the columns: numbers, runs of numbers of one length, runs of numbers, and other values
+NUMBERS, FIXED_RUNS, RUNS, VALUES = range(4)
+
+INT_TYPECODES = 'BbHhIiQq'
+
+
+@lru_cache(maxsize=None)
+def dump_type(module: str, qualname: str) -> tuple[type, tuple[str, ...]]:
+    """Returns a type of DUMP_TYPES and the names of its fields, importing its module."""
+    if (module, qualname) not in DUMP_TYPES:
+        raise ValueError("Dump refers to " + module + "." + qualname + ", which isn't one of the types of a dump!")
+    value = importlib.import_module(module)
+    for name in qualname.split('.'):
+        value = getattr(value, name)
+    fields = DUMP_TYPES[module, qualname]
+    if fields is None:
+        return value, getattr(value, '_fields', ())
+    return value, tuple(field.partition(':')[0] for field in fields)
+
+
+def pack_numbers(values: list) -> tuple[str, bytes]:
+    """Packs integers or floats into the smallest typed array that holds them exactly, as its typecode and
+    little-endian bytes."""
+    if values and type(values[0]) is float:
+        typecode = 'f' if array('f', values).tolist() == values else 'd'
+        packed = array(typecode, values)
+    else:
+        for typecode in INT_TYPECODES:
+            try:
+                packed = array(typecode, values)
+                break
+            except OverflowError:
+                pass
+        else:
+            raise ValueError("Integers from " + str(min(values)) + " to " + str(max(values)) + " don't fit in a typed array!")
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return typecode, packed.tobytes()
+
+
+def unpack_numbers(packed: tuple[str, bytes]) -> list:
+    typecode, data = packed
+    values = array(typecode, data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tolist()
+
+
+def group(values, size: int) -> list:
+    """Groups a flat sequence into tuples of size items."""
+    items = iter(values)
+    return list(zip(*[items] * size))
+
+
+def encode_column(values: list) -> tuple:
+    """Encodes the values of a field of every object of a type, with the numbers and runs of numbers (the
+    colours, coordinates and indexes) as typed arrays."""
+    kinds = set(map(type, values))
+    if kinds == {int} or kinds == {float}:
+        return NUMBERS, pack_numbers(values)
+    if kinds == {tuple} or kinds == {list}:
+        items = list(chain.from_iterable(values))
+        itemKinds = set(map(type, items))
+        if itemKinds == {int} or itemKinds == {float}:
+            lengths = set(map(len, values))
+            if len(lengths) == 1:
+                return FIXED_RUNS, kinds == {list}, lengths.pop(), pack_numbers(items)
+            return RUNS, kinds == {list}, pack_numbers(list(map(len, values))), pack_numbers(items)
+    return VALUES, values
+
+
+def decode_column(column: tuple) -> list:
+    kind = column[0]
+    if kind == NUMBERS:
+        return unpack_numbers(column[1])
+    if kind == VALUES:
+        return column[1]
+    if kind == FIXED_RUNS:
+        runs = group(unpack_numbers(column[3]), column[2])
+        return list(map(list, runs)) if column[1] else runs
+    items = unpack_numbers(column[3])
+    ends = list(accumulate(unpack_numbers(column[2])))
+    runs = [items[start:end] for start, end in zip([0] + ends, ends)]
+    return runs if column[1] else list(map(tuple, runs))
+
+
+def encode_array(values) -> tuple:
+    from numpy.lib.format import dtype_to_descr
+    return dtype_to_descr(values.dtype), values.shape, values.tobytes()
+
+
+def decode_array(encoded: tuple):
+    import numpy
+    from numpy.lib.format import descr_to_dtype
+    descr, shape, data = encoded
+    return numpy.frombuffer(bytearray(data), descr_to_dtype(descr)).reshape(shape)
+
+
+def decode_uvs(values: list) -> list:
+    # Group the coordinates of every object at once, then split them between the objects
+    coordSets = group(group(chain.from_iterable(values), 2), 4)
+    ends = list(accumulate(len(value) // 8 for value in values))
+    return [coordSets[start:end] for start, end in zip([0] + ends, ends)]
+
+
+def decode_records(encoded: tuple, types: list) -> list:
+    if encoded is None:
+        return []
+    typeId, columns = encoded
+    # Build the named tuples as plain tuples of their type, which skips the checks of _make
+    return list(map(partial(tuple.__new__, types[typeId]), zip(*map(decode_column, columns))))
+
+
+def decode_record_columns(encoded: tuple, types: list):
+    from ctr.lib.lms.common.lmsColumns import RecordColumns
+    typeId, records = encoded
+    return RecordColumns(types[typeId], decode_array(records))
+
+
+# How the columns of each kind of field are decoded, given the types and the numbered objects of the dump
+FIELD_DECODERS = {
+    'object': lambda values, types, objects: [objects[number] for number in values],
+    'objects': lambda values, types, objects: [list(map(objects.__getitem__, numbers)) for numbers in values],
+    'records': lambda values, types, objects: [decode_records(value, types) for value in values],
+    'columns': lambda values, types, objects: [decode_record_columns(value, types) for value in values],
+    'colors': lambda values, types, objects: [None if value is None else group(value, 4) for value in values],
+    'uvs': lambda values, types, objects: decode_uvs(values),
+    'array': lambda values, types, objects: list(map(decode_array, values)),
+    'type': lambda values, types, objects: [types[typeId] for typeId in values],
+}
+
+
+class DumpEncoder:
+    """Numbers the objects of a model in the order they're reached, and collects the fields of the objects
+    of each type as rows."""
+
+    def __init__(self):
+        self.typeIds: dict[type, int] = {}
+        self.types: list[tuple[str, str, tuple[str, ...]]] = []
+        self.fieldKinds: list[tuple] = []
+        self.rows: list[list] = []
+        self.order: list[int] = []
+        self.kinds = {
+            '': lambda value: value,
+            'object': self.number,
+            'objects': lambda values: [self.number(value) for value in values],
+            'records': self.encode_records,
+            'columns': lambda columns: (self.type_id(columns.entryType), encode_array(columns.records)),
+            'colors': lambda colors: None if colors is None else bytes(chain.from_iterable(colors)),
+            'uvs': lambda coordSets: tuple(chain.from_iterable(chain.from_iterable(coordSets))),
+            'array': encode_array,
+            'type': self.type_id,
+        }
+
+    def type_id(self, cls: type) -> int:
+        typeId = self.typeIds.get(cls)
+        if typeId is None:
+            key = (cls.__module__, cls.__qualname__)
+            if key not in DUMP_TYPES:
+                raise ValueError("Can't dump a " + cls.__qualname__ + ", which isn't one of the types of a dump!")
+            typeId = self.typeIds[cls] = len(self.types)
+            self.types.append(key + (dump_type(*key)[1],))
+            self.fieldKinds.append(tuple((name, self.kinds[kind]) for name, _, kind in
+                                         (field.partition(':') for field in DUMP_TYPES[key] or ())))
+            self.rows.append([])
+        return typeId
+
+    def number(self, value) -> int:
+        """Numbers an object and adds its row, returning its number (-1 for None)."""
+        if value is None:
+            return -1
+        typeId = self.type_id(type(value))
+        row = []
+        self.rows[typeId].append(row)
+        self.order.append(typeId)
+        number = len(self.order) - 1
+        if isinstance(value, Enum):
+            row.append(value.value)
+        for name, encode in self.fieldKinds[typeId]:
+            row.append(encode(getattr(value, name)))
+        return number
+
+    def encode_records(self, records: list) -> tuple:
+        if not records:
+            return None
+        return self.type_id(type(records[0])), tuple(encode_column(list(column)) for column in zip(*records))
+
+    def encode(self, model) -> tuple:
+        self.number(model)
+        groups = tuple((len(rows), tuple(encode_column(list(column)) for column in zip(*rows))) for rows in self.rows)
+        return tuple(self.types), pack_numbers(self.order), groups
+
+
+def decode(types: tuple, order: tuple, groups: tuple):
+    """Rebuilds a model from its encoding, checking that the types it holds still have the fields it was dumped with."""
+    classes = []
+    for module, qualname, fields in types:
+        cls, currentFields = dump_type(module, qualname)
+        if tuple(fields) != currentFields:
+            raise ValueError("Dump holds a " + qualname + " with the fields " + ", ".join(fields) +
+                             ", which are now " + ", ".join(currentFields) + "! (Dump the model again)")
+        classes.append(cls)
+
+    # Create the objects of each type, and number them as they were dumped (with None as -1)
+    created = []
+    for cls, (count, columns) in zip(classes, groups):
+        if issubclass(cls, Enum):
+            created.append(list(map(cls, decode_column(columns[0]))))
+        else:
+            created.append([cls.__new__(cls) for _ in range(count)])
+    iterators = [iter(typeObjects) for typeObjects in created]
+    typeIds = unpack_numbers(order)
+    objects = [next(iterators[typeId]) for typeId in typeIds]
+    objects.append(None)
+
+    # Set the fields of the objects, then rebuild what they derive from them (the objects an object holds
+    # are numbered after it, so they're rebuilt first)
+    for (module, qualname, fields), typeObjects, (_, columns) in zip(types, created, groups):
+        if DUMP_TYPES[module, qualname] is None:
+            continue
+        values = list(map(decode_column, columns))
+        for index, field in enumerate(DUMP_TYPES[module, qualname]):
+            kind = field.partition(':')[2]
+            if kind:
+                values[index] = FIELD_DECODERS[kind](values[index], classes, objects)
+        for value, row in zip(typeObjects, zip(*values)):
+            value.__dict__.update(zip(fields, row))
+    rebuilds = [REBUILDS.get(cls.__qualname__) for cls in classes]
+    for typeId, value in zip(reversed(typeIds), reversed(objects[:-1])):
+        if rebuilds[typeId] is not None:
+            rebuilds[typeId](value)
+    return objects[0]
+
+
+def rebuild_layout(layout) -> None:
+    # The parts are stored behind the lazily decoded properties, and are all decoded
+    state = layout.__dict__
+    for part in LAYOUT_PARTS:
+        state['_' + part] = state.pop(part)
+    layout._pending = set()
+    layout._file = layout._data = None
+
+    # Link the panes and groups to their parents, and the windows to the materials
+    from ctr.lib.lyt.wnd1 import Wnd1
+    stack = []
+    for tree in (layout._rootPane, layout._rootGroup):
+        if tree is not None:
+            tree.parent = None
+            stack.append(tree)
+    while stack:
+        parent = stack.pop()
+        if type(parent) is Wnd1:
+            parent.materialList = layout._materialList
+        for child in parent.children:
+            child.parent = parent
+            stack.append(child)
+
+
+def rebuild_section(section) -> None:
+    blockName, *views = SECTION_VIEWS[type(section).__name__]
+    block = getattr(section, blockName)
+    section.data = None
+    for name, blockAttribute in views:
+        setattr(section, name, getattr(block, blockAttribute))
+
+
+def rebuild_label_block(block) -> None:
+    block.data = None
+    block.sortedEntries = sorted(block.entries, key=operator.attrgetter("itemIndex"))
+
+
+def rebuild_block(block) -> None:
+    block.data = None
+
+
+# What each type rebuilds once its fields are loaded
+REBUILDS = {
+    'Bclyt': rebuild_layout,
+    'lmsBinaryHeader': rebuild_block,
+    'lmsDataBlock': rebuild_block,
+    'lmsItemBlock': rebuild_block,
+    'lmsLabelBlock': rebuild_label_block,
+    'lmsColumnarBlock': rebuild_block,
+    **{name: rebuild_section for name in SECTION_VIEWS},
+}
+
+
+def dumps(model) -> bytes:
+    """Dumps a model to bytes."""
+    return DUMP_HEADER.pack(DUMP_MAGIC, DUMP_VERSION) + marshal.dumps(DumpEncoder().encode(model), MARSHAL_VERSION)
+
+
+def dump(model, file) -> None:
+    """Dumps a model to a file opened for writing bytes."""
+    file.write(dumps(model))
+
+
+def loads(data: bytes, expectedType: type = None):
+    """Loads a model from the bytes of a dump. If expectedType is given, the dump must hold a model of that type."""
+    if len(data) < DUMP_HEADER.size:
+        raise ValueError("Dump is too short to be a dump!")
+    magic, version = DUMP_HEADER.unpack_from(data)
+    if magic != DUMP_MAGIC:
+        raise ValueError("Dump has an invalid magic! (Expected " + str(DUMP_MAGIC) + ", got " + str(magic) + ")")
+    if version != DUMP_VERSION:
+        raise ValueError("Dump has an unsupported version! (Expected " + str(DUMP_VERSION) + ", got " + str(version) + ")")
+
+    # The collector would walk the objects over and over while they're created, and there are no cycles to collect
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        types, order, groups = marshal.loads(memoryview(data)[DUMP_HEADER.size:])
+        if expectedType is not None:
+            rootType = dump_type(*types[0][:2])[0]
+            if rootType is not expectedType:
+                raise ValueError("Dump holds a " + rootType.__qualname__ + ", expected a " + expectedType.__qualname__ + "!")
+        return decode(types, order, groups)
+    except (EOFError, TypeError, IndexError, KeyError, StopIteration) as e:
+        raise ValueError("Dump is truncated or corrupt! (" + str(e) + ")") from e
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def load(file, expectedType: type = None):
+    """Loads a model from a file of a dump opened for reading bytes."""
+    return loads(file.read(), expectedType)
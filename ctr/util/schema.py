@@ -0,0 +1,204 @@
+import struct
+from enum import IntEnum
+
+from ctr.util.struct_codecs import BYTE_ORDER_PREFIXES, get_struct
+
+"""
+Declarative layouts for fixed-size binary records.
+
+A record layout is declared once, as a Schema of fields in file order:
+
+    TEX_SRT_SCHEMA = Schema(
+        vector2('translation'),
+        float32('rotation'),
+        vector2('scale'),
+    )
+
+The schema is compiled into a single struct covering the whole record (one per byte order) and into
+generated read and write functions, so TEX_SRT_SCHEMA.read(texSRT, data) sets all three attributes
+from one unpack call, and TEX_SRT_SCHEMA.write(texSRT, data) writes them with one pack call.
+TEX_SRT_SCHEMA.read_values(data) returns the three values as a tuple instead, for immutable records.
+
+Variable-length parts of a section (arrays, string tables, offsets to follow) stay hand-written
+around the schemas that describe its fixed-size runs.
+"""
+
+class Field:
+    """A named field of a schema, encoded with a struct format (e.g. 'H', '3f' or '16s').
+
+    Formats that unpack to a single value are stored as that value, and formats that unpack to
+    several values (such as vectors and colors) are stored as a tuple. The optional decode and
+    encode functions convert between the unpacked value and the attribute stored on the object
+    (encode must return a tuple again for multi-value fields).
+    """
+
+    def __init__(self, name: str, fmt: str, decode=None, encode=None):
+        self.name = name
+        self.fmt = fmt
+        self.decode = decode
+        self.encode = encode
+
+        # Count how many values the format unpacks to
+        self.count = len(struct.unpack('<' + fmt, bytes(struct.calcsize('<' + fmt))))
+
+class Bitfield:
+    """A value packed into some of the bits of a Bits field (counted from the least significant bit)."""
+
+    def __init__(self, name: str, shift: int, width: int = 1, type=bool):
+        self.name = name
+        self.shift = shift
+        self.mask = (1 << width) - 1
+        self.type = type
+
+class Bits(Field):
+    """An integer field split into bitfields, each stored as its own attribute."""
+
+    def __init__(self, fmt: str, *bitfields: Bitfield):
+        super().__init__(None, fmt)
+        self.bitfields = bitfields
+
+def uint8(name: str) -> Field:
+    return Field(name, 'B')
+
+def uint16(name: str) -> Field:
+    return Field(name, 'H')
+
+def int16(name: str) -> Field:
+    return Field(name, 'h')
+
+def uint32(name: str) -> Field:
+    return Field(name, 'I')
+
+def int32(name: str) -> Field:
+    return Field(name, 'i')
+
+def float32(name: str) -> Field:
+    return Field(name, 'f')
+
+def vector2(name: str) -> Field:
+    return Field(name, '2f')
+
+def vector3(name: str) -> Field:
+    return Field(name, '3f')
+
+def rgba8(name: str) -> Field:
+    return Field(name, '4B')
+
+def rgba8_array(name: str, count: int) -> Field:
+    """A fixed number of RGBA8 colors, stored as a list of tuples."""
+    return Field(name, str(count * 4) + 'B', decode=decode_colors, encode=encode_colors)
+
+def enum(name: str, fmt: str, enumType: type[IntEnum]) -> Field:
+    """An integer field stored as a member of enumType."""
+    return Field(name, fmt, decode=enumType)
+
+def string(name: str, length: int) -> Field:
+    """A fixed-length, null-padded UTF-8 string."""
+    return Field(name, str(length) + 's', decode=decode_padded_string, encode=encode_padded_string)
+
+def raw(name: str, length: int) -> Field:
+    """A fixed-length run of bytes, stored as is."""
+    return Field(name, str(length) + 's')
+
+def padding(length: int) -> Field:
+    """Bytes that are skipped when reading and written as zeros."""
+    return Field(None, str(length) + 'x')
+
+def bits(fmt: str, *bitfields: Bitfield) -> Bits:
+    return Bits(fmt, *bitfields)
+
+def bitfield(name: str, shift: int, width: int = 1, type=bool) -> Bitfield:
+    return Bitfield(name, shift, width, type)
+
+def decode_padded_string(value: bytes) -> str:
+    return value.decode('utf-8').replace("\0", "")
+
+def encode_padded_string(value: str) -> bytes:
+    return value.encode('utf-8')
+
+def decode_colors(values: tuple) -> list[tuple]:
+    return [values[i:i + 4] for i in range(0, len(values), 4)]
+
+def encode_colors(colors: list[tuple]) -> tuple:
+    return tuple(channel for color in colors for channel in color)
+
+class Schema:
+    """A fixed-size record layout, compiled into one struct per byte order and generated read/write functions."""
+
+    def __init__(self, *fields: Field):
+        self.fields = fields
+        self.fmt = ''.join(field.fmt for field in fields)
+        self.size = struct.calcsize('<' + self.fmt)
+        self.structs = {byteOrder: get_struct(self.fmt, byteOrder) for byteOrder in BYTE_ORDER_PREFIXES}
+
+        # The names of the attributes the schema reads and writes
+        self.names = []
+        for field in fields:
+            if isinstance(field, Bits):
+                self.names.extend(bitfield.name for bitfield in field.bitfields)
+            elif field.name is not None:
+                self.names.append(field.name)
+
+        self.read, self.write, self.read_values = self._compile()
+
+    def _compile(self):
+        """Generates the read, write and read_values functions for the schema."""
+        namespace = {'structs': self.structs}
+        readLines = [
+            "def read(obj, data):",
+            "    values = data.read_record(structs[data.codecs.byteOrder])",
+        ]
+        writeValues = []
+        readValues = []
+
+        index = 0
+        for i, field in enumerate(self.fields):
+            if field.count == 0:
+                continue
+
+            value = "values[%d]" % index if field.count == 1 else "values[%d:%d]" % (index, index + field.count)
+            index += field.count
+
+            if isinstance(field, Bits):
+                parts = []
+                for j, bitfield in enumerate(field.bitfields):
+                    typeName = "type_%d_%d" % (i, j)
+                    namespace[typeName] = bitfield.type
+                    readValues.append("%s((%s >> %d) & %d)" % (typeName, value, bitfield.shift, bitfield.mask))
+                    readLines.append("    obj.%s = %s" % (bitfield.name, readValues[-1]))
+                    parts.append("((int(obj.%s) & %d) << %d)" % (bitfield.name, bitfield.mask, bitfield.shift))
+                writeValues.append(" | ".join(parts))
+                continue
+
+            if field.decode is not None:
+                decodeName = "decode_%d" % i
+                namespace[decodeName] = field.decode
+                readValues.append("%s(%s)" % (decodeName, value))
+            else:
+                readValues.append(value)
+            readLines.append("    obj.%s = %s" % (field.name, readValues[-1]))
+
+            attribute = "obj." + field.name
+            if field.encode is not None:
+                encodeName = "encode_%d" % i
+                namespace[encodeName] = field.encode
+                attribute = "%s(%s)" % (encodeName, attribute)
+            writeValues.append(attribute if field.count == 1 else "*" + attribute)
+
+        readLines.append("    return data")
+        writeLines = [
+            "def write(obj, data):",
+            "    data.write_record(structs[data.codecs.byteOrder], (%s%s))" % (", ".join(writeValues), "," if len(writeValues) == 1 else ""),
+            "    return data",
+        ]
+
+        readValuesLines = [
+            "def read_values(data):",
+            "    values = data.read_record(structs[data.codecs.byteOrder])",
+            "    return (%s%s)" % (", ".join(readValues), "," if len(readValues) == 1 else ""),
+        ]
+
+        exec("\n".join(readLines), namespace)
+        exec("\n".join(writeLines), namespace)
+        exec("\n".join(readValuesLines), namespace)
+        return namespace['read'], namespace['write'], namespace['read_values']
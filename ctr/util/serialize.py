@@ -1,136 +1,235 @@
+import codecs
+import io
+import json
 from xml.etree.ElementTree import Element, SubElement, tostring, indent
+from xml.sax.saxutils import escape
 
-
-class JsonSerialize:
-
-    string: str = ""
-
-    def __init__(self, data: str = ""):
-        self.string = data.strip()
-
-    def add(self, key, var, wrapVarInQuotes=False):
-        if self.string == "":
-            self.string = "{"
-
-        match self.string[-1]:
-            case "}":
-                self.string = self.string[:-1] + ","
-            case "{":
-                pass
-            case ",":
-                pass
-            case " ":
-                pass
-            case _:
-                self.string += ","
-
-        if wrapVarInQuotes:
-            self.string += f"\"{key}\": \"{var_to_json(var)}\""
+# orjson is an optional, faster JSON encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def to_json(data, indent: int = None, compact: bool = False, fast: bool = False, ascii: bool = False) -> str:
+    """Encodes the plain Python containers returned by the to_dict functions as JSON in a single call.
+
+    The output is json.dumps' (with non-ASCII characters left as they are), with indent as in json.dumps,
+    so files it's written to must be opened with encoding="utf-8". With ascii=True, non-ASCII characters
+    are escaped instead, and the output can be written in any encoding.
+    With compact=True, no whitespace is written between items.
+    With fast=True, orjson is used instead when it's installed and supports the formatting (compact, or
+    an indent of 2, and not ascii). Its output decodes to the same values, but formats floats differently."""
+    if fast and not ascii and orjson is not None and (compact and indent is None or indent == 2):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent == 2 else 0).decode("utf-8")
+    return json.dumps(data, indent=indent, separators=(",", ":") if compact else None, ensure_ascii=ascii)
+
+
+class StreamedObject:
+    """A JSON object whose (key, value) pairs are produced by an iterable as it's written by a JsonWriter."""
+
+    def __init__(self, items):
+        self.items = items
+
+
+class StreamedArray:
+    """A JSON array whose values are produced by an iterable as it's written by a JsonWriter."""
+
+    def __init__(self, values):
+        self.values = values
+
+
+# The types a JsonWriter writes one member at a time
+STREAMED_TYPES = (StreamedObject, StreamedArray)
+
+
+# The types that can't hold a streamed value, checked first since most values are one of them
+PLAIN_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def is_streamed(value) -> bool:
+    """Checks if a value is streamed, or is a plain dict, list or tuple holding a streamed value."""
+    if type(value) in PLAIN_TYPES:
+        return False
+    if isinstance(value, STREAMED_TYPES):
+        return True
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, (list, tuple)):
+        return False
+    for member in value:
+        if type(member) not in PLAIN_TYPES and is_streamed(member):
+            return True
+    return False
+
+
+class JsonWriter:
+    """Writes JSON to a text file object piece by piece, with the same formatting options as to_json.
+
+    StreamedObject and StreamedArray values are written as their iterables produce them, and can be
+    nested (directly, or inside plain dicts and lists), so a document made of them is never held in
+    memory as a whole. Runs of up to chunkSize plain members are encoded together with one json.dumps
+    call, and the output goes through a buffer of about bufferSize characters. Object keys must be
+    strings. The output is byte for byte the same as to_json of the equivalent plain containers (with
+    the same ascii option), so files that aren't opened with encoding="utf-8" need ascii=True."""
+
+    def __init__(self, file, indent: int = None, compact: bool = False, bufferSize: int = 0x10000, chunkSize: int = 256, ascii: bool = False):
+        self.file = file
+        self.indent = indent
+        self.compact = compact
+        self.bufferSize = bufferSize
+        self.chunkSize = chunkSize
+        self.ascii = ascii
+
+        # The separators json.dumps uses for the same options
+        self.itemSeparator = "," if compact or indent is not None else ", "
+        self.keySeparator = ":" if compact else ": "
+
+        self.buffer: list[str] = []
+        self.buffered = 0
+
+    def write(self, value) -> None:
+        """Writes a complete JSON document and flushes it to the file."""
+        self._write_value(value, 0)
+        self.flush()
+
+    def flush(self) -> None:
+        if self.buffer:
+            self.file.write("".join(self.buffer))
+            self.buffer = []
+            self.buffered = 0
+
+    def _emit(self, text: str) -> None:
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if self.buffered >= self.bufferSize:
+            self.flush()
+
+    def _encode(self, value, level: int) -> str:
+        """Encodes a plain value, indented for its nesting level."""
+        text = to_json(value, self.indent, self.compact, ascii=self.ascii)
+        # JSON strings never contain a raw line break, so every line break is indentation
+        if self.indent is not None and level > 0:
+            text = text.replace("\n", "\n" + " " * (self.indent * level))
+        return text
+
+    def _write_value(self, value, level: int) -> None:
+        if is_streamed(value):
+            self._write_streamed(value, level)
         else:
-            self.string += f"\"{key}\": {var_to_json(var)}"
-
-        self.string += "}"
-
-    def serialize(self):
-        if self.string[-1] != "}":
-            self.string += "}"
-        return self.string
-
-
-def format_line(key, var, wrapVarInQuotes=False):
-    if wrapVarInQuotes:
-        return f"\"{key}\": \"{var_to_json(var)}\""
-    return f"\"{key}\": {var_to_json(var)}"
-
-
-def var_to_json(var):
-    if type(var) is dict:
-        return dict_to_json(var)
-    elif isinstance(var, list) or isinstance(var, tuple):
-        return list_to_json(var)
-    elif isinstance(var, str):
-        return str_to_json(var)
-    elif type(var) is bytes:
-        return str_to_json(var.decode("utf-8"))
-    elif type(var) is int:
-        return int_to_json(var)
-    elif type(var) is float:
-        return float_to_json(var)
-    elif type(var) is bool:
-        return bool_to_json(var)
-    elif var is None:
-        return null_to_json(var)
-    else:
-        return str(var)
-
-
-def dict_to_json(var):
-    if len(var) == 0:
-        return "{}"
-    else:
-        return "{" + ", ".join(f'"{key}": {var_to_json(value)}' for key, value in var.items()) + "}"
-
-
-def list_to_json(var):
-    if len(var) == 0:
-        return "[]"
-    else:
-        return "[" + ", ".join(var_to_json(value) for value in var) + "]"
-
-
-def str_to_json(var):
-    return '"{}"'.format(var)
-
-
-def int_to_json(var):
-    return str(var)
-
-
-def float_to_json(var):
-    return str(var)
-
-
-def bool_to_json(var):
-    if var:
-        return "true"
-    return "false"
-
-
-def null_to_json(_):
-    return "null"
+            self._emit(self._encode(value, level))
+
+    def _write_streamed(self, value, level: int) -> None:
+        """Writes a value that is_streamed, one member at a time."""
+        if isinstance(value, StreamedObject):
+            self._write_container(value.items, level, True)
+        elif isinstance(value, StreamedArray):
+            self._write_container(value.values, level, False)
+        elif isinstance(value, dict):
+            self._write_container(value.items(), level, True)
+        else:
+            self._write_container(value, level, False)
+
+    def _write_container(self, members, level: int, isObject: bool) -> None:
+        self._emit("{" if isObject else "[")
+        newline = "\n" + " " * (self.indent * (level + 1)) if self.indent is not None else ""
+        first = True
+        chunk = {} if isObject else []
+
+        for member in members:
+            value = member[1] if isObject else member
+            if type(value) in PLAIN_TYPES or not is_streamed(value):
+                # Collect the plain members, to encode them together
+                if isObject:
+                    chunk[member[0]] = value
+                else:
+                    chunk.append(value)
+                if len(chunk) >= self.chunkSize:
+                    first = self._write_chunk(chunk, level, first)
+                    chunk = {} if isObject else []
+                continue
+
+            first = self._write_chunk(chunk, level, first)
+            chunk = {} if isObject else []
+
+            if not first:
+                self._emit(self.itemSeparator)
+            self._emit(newline)
+            if isObject:
+                self._emit(json.dumps(member[0], ensure_ascii=self.ascii) + self.keySeparator)
+            self._write_streamed(value, level + 1)
+            first = False
+
+        first = self._write_chunk(chunk, level, first)
+
+        # Empty containers are written without a line break, like json.dumps does
+        if newline and not first:
+            self._emit("\n" + " " * (self.indent * level))
+        self._emit("}" if isObject else "]")
+
+    def _write_chunk(self, chunk, level: int, first: bool) -> bool:
+        """Writes a run of plain members of a container, and returns whether the container is still empty."""
+        if not chunk:
+            return first
+
+        # Encode the run as a container of its own at the same level, and cut out its members
+        text = self._encode(chunk, level)
+        closing = 1 if self.indent is None else 2 + self.indent * level
+        self._emit(text[1:-closing] if first else self.itemSeparator + text[1:-closing])
+        return False
+
+
+# The characters ElementTree escapes in attribute values, besides &, < and >
+ATTRIBUTE_ENTITIES = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#09;"}
+
+
+def escape_attribute(value: str) -> str:
+    """Quotes an attribute value the way ElementTree does."""
+    return '"' + escape(value, ATTRIBUTE_ENTITIES) + '"'
 
 
 class XmlSerialize:
     def __init__(self, rootName: str, **attributes):
-        """A class utilized for writing to a XML document"""
+        """A class utilized for writing to a XML document
+
+        Every element added through the class is indexed by its tag and by its attributes, so the
+        inserts find the elements to insert into without scanning the document. Elements changed
+        or added directly on the document aren't indexed."""
         self.rootName: str = rootName
         # Create an empty xml document with custom root name
         self.document: Element = Element(self.rootName, attributes)
 
+        # The elements with each tag, and with each set of attributes, in the order they were added
+        self.tagIndex: dict[str, list[Element]] = {}
+        self.attributeIndex: dict[frozenset, list[Element]] = {}
+        self._index(self.document)
+
+    def _index(self, element: Element) -> None:
+        self.tagIndex.setdefault(element.tag, []).append(element)
+        self.attributeIndex.setdefault(frozenset(element.attrib.items()), []).append(element)
+
     def add(self, tag: str, elementText: str = None, **attributes) -> None:
         """Adds an element to the XML document"""
         element = SubElement(self.document, tag,
                              attributes)
         element.text = elementText
+        self._index(element)
 
     def insert_from_attr(self, attributeDict: dict, tag, elementText: str = None, **attributes):
         """Inserts a sub-element into an element given its attributes match"""
         # TODO: Implement partial attribute matching
-        allElements = [elem for elem in self.document.iter()]
-        for element in allElements:
-            # Match the attributes to the given dict
-            if element.attrib == attributeDict:
-                newSubElement = SubElement(element, tag, **attributes)
-                newSubElement.text = elementText
+        # Copy the matches, so the new elements aren't inserted into if they match as well
+        for element in list(self.attributeIndex.get(frozenset(attributeDict.items()), ())):
+            newSubElement = SubElement(element, tag, **attributes)
+            newSubElement.text = elementText
+            self._index(newSubElement)
 
     def insert_from_tag(self, tag, newTag, elementText: str = None, **attributes):
         """Inserts a sub-element into an element given its tag match"""
-        allElements = [elem for elem in self.document.iter()]
-        for elem in allElements:
-            # Match the attributes to the tag name
-            if elem.tag == tag:
-                newSubElement = SubElement(elem, newTag, **attributes)
-                newSubElement.text = elementText
+        for elem in list(self.tagIndex.get(tag, ())):
+            newSubElement = SubElement(elem, newTag, **attributes)
+            newSubElement.text = elementText
+            self._index(newSubElement)
 
     def serialize(self, encoding: str) -> str:
         """Serializes the XML Document into a string object"""
@@ -141,3 +240,54 @@ class XmlSerialize:
         headerEncoding: str = encoding.replace("-", "").lower()
 
         return tostring(self.document, encoding=headerEncoding, method='xml').decode(headerEncoding)
+
+    def write(self, file, encoding: str = "utf-8", bufferSize: int = 0x10000) -> None:
+        """Writes the XML Document to a text or binary file object one element at a time, with the same
+        declaration, indentation and escaping as serialize(encoding), without building the whole text or
+        changing the document. Binary files get the text encoded in encoding. The text goes through a buffer
+        of about bufferSize characters."""
+        headerEncoding: str = encoding.replace("-", "").lower()
+        if not isinstance(file, io.TextIOBase):
+            output = lambda text: file.write(text.encode(headerEncoding, "xmlcharrefreplace"))
+        elif codecs.lookup(headerEncoding).name.startswith("utf"):
+            output = file.write
+        else:
+            # Characters the encoding doesn't have are written as character references, as serialize does
+            output = lambda text: file.write(text.encode(headerEncoding, "xmlcharrefreplace").decode(headerEncoding))
+
+        buffer: list[str] = ["<?xml version='1.0' encoding='" + headerEncoding + "'?>\n"]
+        buffered = 0
+
+        def emit(text: str) -> None:
+            nonlocal buffer, buffered
+            buffer.append(text)
+            buffered += len(text)
+            if buffered >= bufferSize:
+                output("".join(buffer))
+                buffer = []
+                buffered = 0
+
+        self._write_element(emit, self.document, 0)
+        output("".join(buffer))
+
+    def _write_element(self, emit, element: Element, level: int) -> None:
+        """Writes an element the way ElementTree does once indent has been applied to the document."""
+        emit("<" + element.tag + "".join(" " + name + "=" + escape_attribute(value) for name, value in element.attrib.items()))
+
+        if len(element):
+            # Keep the text around the children if there is any, and indent them otherwise
+            childIndent = "\n" + "  " * (level + 1)
+            emit(">" + (escape(element.text) if element.text and element.text.strip() else childIndent))
+
+            lastChild = element[-1]
+            for child in element:
+                self._write_element(emit, child, level + 1)
+                if child.tail and child.tail.strip():
+                    emit(escape(child.tail))
+                else:
+                    emit("\n" + "  " * level if child is lastChild else childIndent)
+            emit("</" + element.tag + ">")
+        elif element.text:
+            emit(">" + escape(element.text) + "</" + element.tag + ">")
+        else:
+            emit(" />")
@@ -0,0 +1,37 @@
+import struct
+from functools import lru_cache
+
+# Struct format prefixes for each byte order
+BYTE_ORDER_PREFIXES = {'little': '<', 'big': '>'}
+
+@lru_cache(maxsize=512)
+def get_struct(fmt: str, byteOrder: str = 'little') -> struct.Struct:
+    """Returns a compiled struct for a format string (given without a byte order prefix), cached per byte order."""
+    return struct.Struct(BYTE_ORDER_PREFIXES[byteOrder] + fmt)
+
+
+class StructCodecs:
+    """A complete set of precompiled codecs for one byte order.
+    Streams bind one of these when their byte order is set, so reading and writing never branch on it."""
+
+    def __init__(self, byteOrder: str):
+        self.byteOrder = byteOrder
+        self.int8 = get_struct('b', byteOrder)
+        self.uint8 = get_struct('B', byteOrder)
+        self.int16 = get_struct('h', byteOrder)
+        self.uint16 = get_struct('H', byteOrder)
+        self.int32 = get_struct('i', byteOrder)
+        self.uint32 = get_struct('I', byteOrder)
+        self.int64 = get_struct('q', byteOrder)
+        self.uint64 = get_struct('Q', byteOrder)
+        self.float = get_struct('f', byteOrder)
+        self.double = get_struct('d', byteOrder)
+        self.vector2 = get_struct('2f', byteOrder)
+        self.vector3 = get_struct('3f', byteOrder)
+        self.rgb8 = get_struct('3B', byteOrder)
+        self.rgba8 = get_struct('4B', byteOrder)
+        self.uvCoordSet = get_struct('8f', byteOrder)
+
+
+# The codecs for each supported byte order
+CODECS = {byteOrder: StructCodecs(byteOrder) for byteOrder in BYTE_ORDER_PREFIXES}
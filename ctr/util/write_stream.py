@@ -1,80 +1,133 @@
-import struct
 from io import BufferedWriter
+from struct import Struct
+
+from ctr.util.struct_codecs import CODECS, StructCodecs, get_struct
+
+class Fixup:
+    """A placeholder value in a WriteStream (such as a section size or an offset), that is filled in once it is known."""
+
+    def __init__(self, position: int, codec: Struct):
+        self.position = position
+        self.codec = codec
+        self.value = None
+
+    def set(self, value: int) -> None:
+        """Sets the value that will be written over the placeholder."""
+        self.value = value
 
 class WriteStream:
+    """A stream that builds a file in memory, then flushes it to the output (if there is one) in a single write.
+
+    Writes go to the current position, so seeking back and writing overwrites what is there, and seeking
+    past the end pads the gap with zeros. Values that aren't known until later are reserved with
+    reserve_uint32 (and friends), which return a Fixup that gets filled in when the stream is finished.
+    """
 
     data: BufferedWriter = None
 
     def __init__(self, data: BufferedWriter = None, byteOrder: str = 'little'):
         self.data = data
+        self.buffer = bytearray()
+        self.offset = 0
+        self.fixups: list[Fixup] = []
         self.byteOrder = byteOrder
 
+    @property
+    def byteOrder(self) -> str:
+        """The byte order ('little' or 'big') values are encoded with."""
+        return self.codecs.byteOrder
+
+    @byteOrder.setter
+    def byteOrder(self, byteOrder: str) -> None:
+        # Bind the codecs for the byte order once, so the write functions never branch on it
+        codecs: StructCodecs = CODECS[byteOrder]
+        self.codecs = codecs
+        self._int8 = codecs.int8
+        self._uint8 = codecs.uint8
+        self._int16 = codecs.int16
+        self._uint16 = codecs.uint16
+        self._int32 = codecs.int32
+        self._uint32 = codecs.uint32
+        self._int64 = codecs.int64
+        self._uint64 = codecs.uint64
+        self._float = codecs.float
+        self._double = codecs.double
+
+    def _write(self, data: bytes) -> None:
+        """Writes raw bytes at the current position."""
+        offset = self.offset
+        if offset == len(self.buffer):
+            self.buffer += data
+        else:
+            self.buffer[offset:offset + len(data)] = data
+        self.offset = offset + len(data)
+
     def write_bytes(self, data: bytes, length: int = 0):
         """Writes a number of bytes to the stream."""
         if length == 0:
-            self.data.write(data)
+            self._write(data)
         else:
             if len(data) < length:
-                self.data.write(data + b'\x00' * (length - len(data)))
+                self._write(data + b'\x00' * (length - len(data)))
             elif len(data) > length:
-                self.data.write(data[:length])
+                self._write(data[:length])
             else:
-                self.data.write(data)
+                self._write(data)
     
     def write_string(self, string: str, lengthBytes: int = 0):
         """Writes a string to the stream."""
         if lengthBytes > 0:
             stringBytes = string.encode('utf-8')
             if len(stringBytes) < lengthBytes:
-                self.data.write(stringBytes + b'\x00' * (lengthBytes - len(stringBytes)))
-            elif len(stringBytes) > lengthBytes:
-                self.data.write(stringBytes[:lengthBytes])
+                self._write(stringBytes + b'\x00' * (lengthBytes - len(stringBytes)))
+            else:
+                self._write(stringBytes[:lengthBytes])
         else:
-            self.data.write(string.encode('utf-8'))
+            self._write(string.encode('utf-8'))
     
     def write_string_nt(self, string: str):
         """Writes a null-terminated string to the stream."""
-        self.data.write(string.encode('utf-8') + b'\x00')
+        self._write(string.encode('utf-8') + b'\x00')
     
     def write_int8(self, value: int):
         """Writes a signed 8-bit integer to the stream."""
-        self.data.write(struct.pack(f'<b', value))
+        self._write(self._int8.pack(value))
     
     def write_uint8(self, value: int):
         """Writes an unsigned 8-bit integer to the stream."""
-        self.data.write(struct.pack(f'<B', value))
+        self._write(self._uint8.pack(value))
     
     def write_int16(self, value: int):
         """Writes a signed 16-bit integer to the stream."""
-        self.data.write(struct.pack(f'<h', value))
+        self._write(self._int16.pack(value))
     
     def write_uint16(self, value: int):
         """Writes an unsigned 16-bit integer to the stream."""
-        self.data.write(struct.pack(f'<H', value))
+        self._write(self._uint16.pack(value))
     
     def write_int32(self, value: int):
         """Writes a signed 32-bit integer to the stream."""
-        self.data.write(struct.pack(f'<i', value))
+        self._write(self._int32.pack(value))
     
     def write_uint32(self, value: int):
         """Writes an unsigned 32-bit integer to the stream."""
-        self.data.write(struct.pack(f'<I', value))
+        self._write(self._uint32.pack(value))
     
     def write_int64(self, value: int):
         """Writes a signed 64-bit integer to the stream."""
-        self.data.write(struct.pack(f'<q', value))
+        self._write(self._int64.pack(value))
     
     def write_uint64(self, value: int):
         """Writes an unsigned 64-bit integer to the stream."""
-        self.data.write(struct.pack(f'<Q', value))
+        self._write(self._uint64.pack(value))
     
     def write_float(self, value: float):
         """Writes a 32-bit float to the stream."""
-        self.data.write(struct.pack(f'<f', value))
+        self._write(self._float.pack(value))
 
     def write_double(self, value: float):
         """Writes a 64-bit float to the stream."""
-        self.data.write(struct.pack(f'<d', value))
+        self._write(self._double.pack(value))
     
     def write_vector2(self, value: tuple):
         """Writes a 2D vector to the stream."""
@@ -124,10 +177,67 @@ class WriteStream:
         self.write_float(value[3][0])
         self.write_float(value[3][1])
     
+    def write_record(self, record: Struct or str, values: tuple):
+        """Writes a fixed-size record to the stream in one call.
+        The record is either a compiled struct or a format string (without a byte order prefix)."""
+        if isinstance(record, str):
+            record = get_struct(record, self.codecs.byteOrder)
+        self._write(record.pack(*values))
+
+    def reserve(self, codec: Struct) -> Fixup:
+        """Writes a placeholder for a value encoded with codec, and returns the fixup that fills it in."""
+        fixup = self.fixup(self.offset, codec)
+        self._write(bytes(codec.size))
+        return fixup
+
+    def reserve_uint16(self) -> Fixup:
+        """Writes a placeholder for an unsigned 16-bit integer, and returns the fixup that fills it in."""
+        return self.reserve(self._uint16)
+
+    def reserve_uint32(self) -> Fixup:
+        """Writes a placeholder for an unsigned 32-bit integer, and returns the fixup that fills it in."""
+        return self.reserve(self._uint32)
+
+    def fixup(self, position: int, codec: Struct) -> Fixup:
+        """Returns a fixup for a value encoded with codec that has already been written at position."""
+        fixup = Fixup(position, codec)
+        self.fixups.append(fixup)
+        return fixup
+
+    def fixup_uint32(self, position: int) -> Fixup:
+        """Returns a fixup for an unsigned 32-bit integer that has already been written at position."""
+        return self.fixup(position, self._uint32)
+
+    def resolve_fixups(self) -> None:
+        """Writes the values of all the fixups over their placeholders."""
+        for fixup in self.fixups:
+            if fixup.value is None:
+                raise ValueError("Fixup at offset " + hex(fixup.position) + " was never given a value!")
+            fixup.codec.pack_into(self.buffer, fixup.position, fixup.value)
+        self.fixups.clear()
+
+    def getvalue(self) -> bytes:
+        """Resolves the fixups and returns the contents of the stream."""
+        self.resolve_fixups()
+        return bytes(self.buffer)
+
+    def flush(self) -> None:
+        """Resolves the fixups and writes the contents of the stream to the output in one write."""
+        self.resolve_fixups()
+        self.data.write(self.buffer)
+
     def seek(self, offset: int, whence: int = 0):
         """Seeks to a position in the stream."""
-        self.data.seek(offset, whence)
-    
+        if whence == 1:
+            offset += self.offset
+        elif whence == 2:
+            offset += len(self.buffer)
+        # Pad the gap with zeros when seeking past the end
+        if offset > len(self.buffer):
+            self.buffer += bytes(offset - len(self.buffer))
+        self.offset = offset
+        return offset
+
     def tell(self):
         """Returns the current position in the stream."""
-        return self.data.tell()
\ No newline at end of file
+        return self.offset
@@ -0,0 +1,36 @@
+import argparse
+import os
+import sys
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+# The relative imports in question
+from ctr import batch
+
+
+def progress(job: batch.BatchJob, failure: batch.BatchFailure, verbose: bool) -> None:
+    if failure is not None:
+        print("FAILED " + str(failure))
+        if verbose:
+            print(failure.details)
+    elif verbose:
+        print(job.inpath + " -> " + job.outpath)
+
+# The main guard is needed for the worker processes on platforms that spawn them
+if __name__ == "__main__":
+    # Get arguments from command line
+    parser = argparse.ArgumentParser(description="Converts every MSBP and BCLYT file in the given folders, glob patterns or files to JSON, "
+                                                 "keeping their folder structure in the output folder.")
+    parser.add_argument("inputs", nargs="+", help="folders, glob patterns (quote them, e.g. 'romfs/**/*.bclyt') or files to convert")
+    parser.add_argument("-o", "--output", required=True, help="the folder to write the JSON files to")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="the number of worker processes (defaults to the number of CPUs)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every converted file, and the traceback of every failure")
+    args = parser.parse_args()
+
+    ### ACTUAL SCRIPT BELOW THIS COMMENT ###
+    result = batch.convert_all(args.inputs, args.output, args.jobs, lambda job, failure: progress(job, failure, args.verbose))
+
+    print(f"Converted {len(result.converted)} of {result.total} files in {result.seconds:.2f}s ({len(result.failures)} failed)")
+    if len(result.failures) > 0:
+        sys.exit(1)
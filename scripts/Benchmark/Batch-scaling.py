@@ -0,0 +1,68 @@
+"""
+Measures the throughput of the batch converter on a synthetic corpus of BCLYT and MSBP files in nested
+folders, with 1 worker and then doubling up to the number of CPUs. The parsing and serializing is
+CPU-bound and independent per file, so more workers are expected to help up to the number of CPUs, but
+that is only what the measured speedups show: on a single CPU, only 1 worker is measured.
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+from ctr import batch
+from synthetic import build_bclyt, build_msbp
+
+LAYOUT_COUNT = 240
+PROJECT_COUNT = 60
+
+if __name__ == "__main__":
+    layout = build_bclyt(paneCount=100, groupCount=8)
+    project = build_msbp(colorCount=200, attributeCount=100, styleCount=100, tagGroupCount=8)
+
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = os.path.join(directory, 'romfs')
+        for i in range(LAYOUT_COUNT):
+            folder = os.path.join(corpus, 'Layout', 'set_%d' % (i % 8))
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, 'layout_%03d.bclyt' % i), 'wb') as f:
+                f.write(layout)
+        for i in range(PROJECT_COUNT):
+            folder = os.path.join(corpus, 'Message', 'set_%d' % (i % 4))
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, 'project_%03d.msbp' % i), 'wb') as f:
+                f.write(project)
+
+        # Double the workers up to the number of CPUs
+        cpuCount = os.cpu_count() or 1
+        workerCounts = [1]
+        while workerCounts[-1] * 2 <= cpuCount:
+            workerCounts.append(workerCounts[-1] * 2)
+        if workerCounts[-1] != cpuCount:
+            workerCounts.append(cpuCount)
+
+        results = {}
+        for jobs in workerCounts:
+            output = os.path.join(directory, 'out_%d' % jobs)
+            result = batch.convert_all([corpus], output, jobs)
+            assert result.total == LAYOUT_COUNT + PROJECT_COUNT and not result.failures, "The batch didn't convert every file!"
+            results[jobs] = min(timeit.repeat(lambda: batch.convert_all([corpus], output, jobs), number=1, repeat=3))
+
+        # Every worker count must produce the same output tree
+        trees = set()
+        for jobs in workerCounts:
+            output = os.path.join(directory, 'out_%d' % jobs)
+            trees.add(tuple(sorted(os.path.relpath(os.path.join(folder, name), output)
+                                   for folder, folders, files in os.walk(output) for name in files)))
+        assert len(trees) == 1, "The worker counts produced different output trees!"
+
+    fileCount = LAYOUT_COUNT + PROJECT_COUNT
+    print(f"{fileCount} files, {cpuCount} CPU(s)")
+    if cpuCount == 1:
+        print("Only 1 CPU, the scaling with the number of workers can't be measured here")
+    reference = results[1]
+    for jobs, seconds in results.items():
+        print(f"{jobs:3d} worker(s) {fileCount / seconds:8.1f} files/s  ({reference / seconds:.2f}x speed of 1 worker, {reference / seconds / jobs * 100:.0f}% efficiency)")
@@ -0,0 +1,79 @@
+"""
+Compares baking every curve of a synthetic BCLAN animating 200 panes at 600 frames by evaluating each
+curve at each frame in Python (a bisect for the key before the frame, then the hermite or step value)
+against AnimationCurves, which evaluates all the curves at all the frames in one vectorized call.
+Also reports the time to parse the file into its numpy keyframe arrays.
+"""
+
+import bisect
+import os
+import sys
+import tempfile
+import timeit
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+import numpy
+
+from ctr.bclan import Bclan
+from ctr.lib.lan.pai1 import STEP_CURVE
+from synthetic import build_bclan
+
+PANE_COUNT = 200
+FRAME_COUNT = 600
+KEYS_PER_CURVE = 8
+
+
+def evaluate_curve(target, frame: float) -> float:
+    """Evaluates a curve at a frame, one key at a time."""
+    frames = target.frames.tolist()
+    values = target.values.tolist()
+    slopes = target.slopes.tolist()
+    index = bisect.bisect_right(frames, frame) - 1
+    if index < 0:
+        return values[0]
+    if index >= len(frames) - 1 or target.curveType == STEP_CURVE:
+        return values[index]
+
+    length = frames[index + 1] - frames[index]
+    if length <= 0:
+        return values[index]
+    t = (frame - frames[index]) / length
+    return (values[index] * (2 * t ** 3 - 3 * t ** 2 + 1) + values[index + 1] * (3 * t ** 2 - 2 * t ** 3)
+            + (slopes[index] * (t ** 3 - 2 * t ** 2 + t) + slopes[index + 1] * (t ** 3 - t ** 2)) * length)
+
+
+def bake_per_curve(animation: Bclan, frames: list[float]) -> numpy.ndarray:
+    targets = [target for entry in animation.animationInfo.entries for tag in entry.tags for target in tag.targets]
+    return numpy.array([[evaluate_curve(target, frame) for frame in frames] for target in targets])
+
+
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'anim.bclan')
+    with open(path, 'wb') as f:
+        f.write(build_bclan(PANE_COUNT, KEYS_PER_CURVE, FRAME_COUNT))
+    parseTime = min(timeit.repeat(lambda: Bclan(path), number=1, repeat=5))
+    animation = Bclan(path)
+
+# Sample between the frames too, so the hermite segments are interpolated rather than hitting keys
+frames = numpy.arange(FRAME_COUNT) + 0.5
+curves = animation.curves()
+assert numpy.allclose(bake_per_curve(animation, frames.tolist()), curves.evaluate(frames), rtol=1e-9, atol=1e-6), "The evaluators gave different values!"
+
+bakers = {
+    "per curve": lambda: bake_per_curve(animation, frames.tolist()),
+    "vectorized": lambda: curves.evaluate(frames),
+}
+
+# Interleave the runs and keep the best time of each, so background noise affects both bakers equally
+times = {name: float('inf') for name in bakers}
+for _ in range(3):
+    for name, baker in bakers.items():
+        times[name] = min(times[name], timeit.timeit(baker, number=1))
+
+keyCount = sum(target.keyCount for entry in animation.animationInfo.entries for tag in entry.tags for target in tag.targets)
+print(f"{len(curves)} curves of {len(animation.animationInfo.entries)} entries ({keyCount} keys), parsed in {parseTime * 1e3:.1f} ms")
+for name in bakers:
+    print(f"  {name:10} {len(curves)} x {FRAME_COUNT} frames {times[name] * 1e3:8.1f} ms "
+          f"({len(curves) * FRAME_COUNT / times[name] / 1e6:6.2f} M values/s, {times['per curve'] / times[name]:6.1f}x)")
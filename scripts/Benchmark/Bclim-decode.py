@@ -0,0 +1,46 @@
+"""
+Measures the throughput of decoding BCLIM textures of every pixel format into RGBA images, in megapixels
+per second, on synthetic textures of random data (which is valid in every format). The pixels of a texture
+are decoded in the order of its data and un-tiled with one gather through a precomputed table, which
+is timed on its own too.
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+import numpy
+
+from ctr.bclim import Bclim
+from ctr.lib.texture.formats import TEXTURE_FORMATS
+from ctr.lib.texture.swizzle import tile_order, untile
+from synthetic import build_bclim
+
+SIZE = 512
+megapixels = SIZE * SIZE / 1e6
+
+with tempfile.TemporaryDirectory() as directory:
+    textures = {}
+    for formatId in TEXTURE_FORMATS:
+        path = os.path.join(directory, '%d.bclim' % formatId)
+        with open(path, 'wb') as f:
+            f.write(build_bclim(SIZE, SIZE, formatId))
+        textures[formatId] = Bclim(path)
+
+print(f"{SIZE}x{SIZE} textures ({megapixels:.2f} MP)")
+for formatId, texture in textures.items():
+    image = texture.decode()
+    assert image.shape == (SIZE, SIZE, 4) and image.dtype == numpy.uint8, "The image has the wrong shape!"
+
+    seconds = min(timeit.repeat(texture.decode, number=1, repeat=20))
+    print(f"  {texture.formatName:9} {seconds * 1e3:8.2f} ms  {megapixels / seconds:8.1f} MP/s")
+
+# The un-tiling alone, with the table already cached
+pixels = numpy.zeros((SIZE * SIZE, 4), dtype=numpy.uint8)
+order = tile_order(SIZE, SIZE)
+seconds = min(timeit.repeat(lambda: untile(pixels, order), number=1, repeat=20))
+print(f"  {'un-tiling':9} {seconds * 1e3:8.2f} ms  {megapixels / seconds:8.1f} MP/s")
@@ -0,0 +1,82 @@
+"""
+Compares the peak memory of building the full pane and group trees of growing synthetic layouts
+against streaming their sections with Bclyt.iter_sections, which should stay flat. It also times
+finding a single pane near the start of the largest layout, where the iterator can stop early.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+from ctr.bclyt import Bclyt
+from synthetic import build_bclyt
+
+def count_full(path: str) -> int:
+    layout = Bclyt(path)
+    count = 0
+    stack = [layout.rootPane, layout.rootGroup]
+    while stack:
+        section = stack.pop()
+        count += 1
+        stack.extend(section.children)
+    return count
+
+def count_streamed(path: str) -> int:
+    return sum(1 for _ in Bclyt.iter_sections(path))
+
+def peak_memory(function, path: str) -> int:
+    tracemalloc.start()
+    function(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+def find_full(path: str, name: str):
+    layout = Bclyt(path)
+    stack = [layout.rootPane]
+    while stack:
+        pane = stack.pop()
+        if pane.name == name:
+            return pane
+        stack.extend(pane.children)
+
+def find_streamed(path: str, name: str):
+    for pane, depth, parentName in Bclyt.iter_panes(path):
+        if pane.name == name:
+            return pane
+
+
+with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()) as output:
+    results = []
+    for paneCount in (1000, 5000, 20000):
+        path = os.path.join(directory, 'layout_%d.bclyt' % paneCount)
+        with open(path, 'wb') as f:
+            f.write(build_bclyt(paneCount=paneCount, groupCount=paneCount // 10))
+
+        # Both approaches must see the same number of sections
+        assert count_full(path) == count_streamed(path), "The approaches found different sections!"
+        results.append((paneCount, peak_memory(count_full, path), peak_memory(count_streamed, path)))
+
+    # Find the first pane after the root in the largest layout
+    name = next(pane.name for pane, depth, parentName in Bclyt.iter_panes(path) if depth == 1)
+    assert find_full(path, name).name == find_streamed(path, name).name
+
+    # Interleave the runs and keep the best time of each, so background noise affects both approaches equally
+    times = {"full trees": float('inf'), "iter_panes": float('inf')}
+    for _ in range(5):
+        times["full trees"] = min(times["full trees"], timeit.timeit(lambda: find_full(path, name), number=1))
+        times["iter_panes"] = min(times["iter_panes"], timeit.timeit(lambda: find_streamed(path, name), number=1))
+
+for paneCount, full, streamed in results:
+    print(f"{paneCount:6d} panes  full trees {full / 1024:9.1f} KiB peak  iter_sections {streamed / 1024:7.1f} KiB peak")
+
+reference = times["full trees"]
+for name, seconds in times.items():
+    print(f"find one pane, {name:10} {seconds * 1e3:8.2f} ms  ({reference / seconds:.1f}x speed of full trees)")
@@ -0,0 +1,56 @@
+"""
+Lists the textures referenced by a folder of synthetic layouts, once by parsing every file in full and
+once by opening the files lazily, which only walks the section headers and decodes the TXL1 section.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import timeit
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+from ctr.bclyt import Bclyt
+from synthetic import build_bclyt
+
+def list_textures(paths: list[str], lazy: bool) -> set[str]:
+    textures = set()
+    for path in paths:
+        with Bclyt(path, lazy=lazy) as layout:
+            textures.update(layout.textureList.textureNames)
+    return textures
+
+
+FILE_COUNT = 200
+layout = build_bclyt(paneCount=200, groupCount=16)
+
+with tempfile.TemporaryDirectory() as directory:
+    paths = []
+    for i in range(FILE_COUNT):
+        path = os.path.join(directory, 'layout_%03d.bclyt' % i)
+        with open(path, 'wb') as f:
+            f.write(layout)
+        paths.append(path)
+
+    modes = {
+        "eager": lambda: list_textures(paths, False),
+        "lazy": lambda: list_textures(paths, True),
+    }
+
+    # Bclyt prints a line per parsed file, so keep that out of the results
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Both modes must find the same textures
+        assert modes["eager"]() == modes["lazy"](), "The modes listed different textures!"
+
+        # Interleave the runs and keep the best time of each, so background noise affects both modes equally
+        results = {name: float('inf') for name in modes}
+        for _ in range(5):
+            for name, run in modes.items():
+                results[name] = min(results[name], timeit.timeit(run, number=1))
+
+reference = results["eager"]
+for name, seconds in results.items():
+    print(f"{name:6} {seconds * 1e6 / FILE_COUNT:8.0f} us/file  ({reference / seconds:.2f}x speed of eager)")
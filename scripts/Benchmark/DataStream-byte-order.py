@@ -0,0 +1,74 @@
+"""
+Compares the little-endian read path of DataStream (codecs bound once per stream) against a reference
+reader that hard-codes '<' in module-level structs, which is how DataStream decoded values before it
+supported big-endian files. The big-endian path is measured too, it should cost the same.
+"""
+
+import os
+import struct
+import sys
+import timeit
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+from ctr.util.data_stream import DataStream
+
+UINT16 = struct.Struct('<H')
+UINT32 = struct.Struct('<I')
+FLOAT = struct.Struct('<f')
+
+class ReferenceStream:
+    """The hard-coded little-endian reader."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.offset = 0
+
+    def read_uint16(self) -> int:
+        value = UINT16.unpack_from(self.data, self.offset)[0]
+        self.offset += 2
+        return value
+
+    def read_uint32(self) -> int:
+        value = UINT32.unpack_from(self.data, self.offset)[0]
+        self.offset += 4
+        return value
+
+    def read_float(self) -> float:
+        value = FLOAT.unpack_from(self.data, self.offset)[0]
+        self.offset += 4
+        return value
+
+
+RECORD_COUNT = 20000
+# Each record is a uint32, a float, and two uint16s
+buffers = {byteOrder: struct.pack(('<' if byteOrder == 'little' else '>') + 'IfHH' * RECORD_COUNT, *([7, 1.5, 3, 4] * RECORD_COUNT))
+           for byteOrder in ('little', 'big')}
+
+def read_all(stream) -> None:
+    for _ in range(RECORD_COUNT):
+        stream.read_uint32()
+        stream.read_float()
+        stream.read_uint16()
+        stream.read_uint16()
+
+streams = {
+    "reference ('<' hard-coded)": lambda: ReferenceStream(buffers['little']),
+    "DataStream little-endian": lambda: DataStream(buffers['little'], 'little'),
+    "DataStream big-endian": lambda: DataStream(buffers['big'], 'big'),
+}
+
+# Interleave the runs and keep the best time of each, so background noise affects every reader equally
+results = {name: float('inf') for name in streams}
+for _ in range(15):
+    for name, makeStream in streams.items():
+        results[name] = min(results[name], timeit.timeit(lambda: read_all(makeStream()), number=1))
+
+readCount = RECORD_COUNT * 4
+reference = results["reference ('<' hard-coded)"]
+for name, seconds in results.items():
+    print(f"{name:28} {seconds * 1e9 / readCount:7.1f} ns/read  ({seconds / reference:.2f}x reference)")
+
+ratio = results["DataStream little-endian"] / reference
+print("Little-endian path is " + ("not slower than" if ratio <= 1.05 else f"{(ratio - 1) * 100:.0f}% slower than") + " the hard-coded reference")
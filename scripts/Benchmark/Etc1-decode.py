@@ -0,0 +1,104 @@
+"""
+Compares decoding ETC1 and ETC1A4 textures one block at a time in Python (the way the decoder used to work)
+against the table-driven decoder, which decodes every block of a band of rows at once with numpy.
+Then decodes a 1024x1024 texture with several band heights, reporting the time and the peak memory
+traced while decoding (the image itself included).
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+import numpy
+
+from ctr.bclim import Bclim
+from ctr.lib.texture.etc1 import MODIFIER_TABLES
+from ctr.lib.texture.formats import FORMAT_IDS
+from ctr.lib.texture.swizzle import etc1_order, untile
+from synthetic import build_bclim
+
+
+def block_colors(block: int) -> tuple[list[int], list[int]]:
+    """The two base colors of a block, expanded to 8 bits per channel."""
+    colors = ([], [])
+    if block & (1 << 33):
+        for shift in (59, 51, 43):
+            base = (block >> shift) & 0x1F
+            difference = (block >> (shift - 3)) & 0x7
+            second = (base + (difference - 8 if difference & 4 else difference)) & 0x1F
+            colors[0].append(base << 3 | base >> 2)
+            colors[1].append(second << 3 | second >> 2)
+        return colors
+
+    for shift in (60, 52, 44):
+        colors[0].append(((block >> shift) & 0xF) * 17)
+        colors[1].append(((block >> (shift - 4)) & 0xF) * 17)
+    return colors
+
+def per_block(texture: Bclim) -> numpy.ndarray:
+    width, height = texture.textureSize
+    alpha = texture.formatName == 'ETC1A4'
+    blockCount = width * height // 16
+    words = numpy.frombuffer(texture.imageData, '<u8', blockCount * (2 if alpha else 1))
+    pixels = numpy.full((blockCount * 16, 4), 255, dtype=numpy.uint8)
+
+    for index in range(blockCount):
+        block = int(words[index * 2 + 1] if alpha else words[index])
+        colors = block_colors(block)
+        tables = (MODIFIER_TABLES[(block >> 37) & 0x7], MODIFIER_TABLES[(block >> 34) & 0x7])
+        flip = block & (1 << 32)
+        for pixel in range(16):
+            half = ((pixel & 3) if flip else (pixel >> 2)) >> 1
+            modifier = tables[half][((block >> (pixel + 15)) & 2) | ((block >> pixel) & 1)]
+            for channel in range(3):
+                pixels[index * 16 + pixel, channel] = min(max(colors[half][channel] + modifier, 0), 255)
+            if alpha:
+                pixels[index * 16 + pixel, 3] = ((int(words[index * 2]) >> (4 * pixel)) & 0xF) * 17
+    return untile(pixels, etc1_order(width, height))
+
+def traced_peak(texture: Bclim, bandHeight: int) -> int:
+    tracemalloc.start()
+    texture.decode(bandHeight)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+SIZE = 256
+LARGE_SIZE = 1024
+BAND_HEIGHTS = (8, 64, 128, 1024)
+
+with tempfile.TemporaryDirectory() as directory:
+    textures = {}
+    for name in ('ETC1', 'ETC1A4'):
+        for size in (SIZE, LARGE_SIZE):
+            path = os.path.join(directory, '%s-%d.bclim' % (name, size))
+            with open(path, 'wb') as f:
+                f.write(build_bclim(size, size, FORMAT_IDS[name]))
+            textures[name, size] = Bclim(path)
+
+for name in ('ETC1', 'ETC1A4'):
+    texture = textures[name, SIZE]
+    assert (per_block(texture) == texture.decode()).all(), "The decoders decoded different images!"
+
+    # Interleave the runs and keep the best time of each, so background noise affects both decoders equally
+    times = {"per block": float('inf'), "table-driven": float('inf')}
+    for _ in range(3):
+        times["per block"] = min(times["per block"], timeit.timeit(lambda: per_block(texture), number=1))
+        times["table-driven"] = min(times["table-driven"], timeit.timeit(texture.decode, number=1))
+
+    print(f"{name} {SIZE}x{SIZE}")
+    for decoder, seconds in times.items():
+        print(f"  {decoder:13} {seconds * 1e3:8.1f} ms  {SIZE * SIZE / 1e6 / seconds:7.1f} MP/s  ({times['per block'] / seconds:5.0f}x)")
+
+    large = textures[name, LARGE_SIZE]
+    print(f"{name} {LARGE_SIZE}x{LARGE_SIZE} (the image is {LARGE_SIZE * LARGE_SIZE * 4 / 2 ** 20:.0f} MiB)")
+    for bandHeight in BAND_HEIGHTS:
+        seconds = min(timeit.repeat(lambda: large.decode(bandHeight), number=1, repeat=5))
+        print(f"  bands of {bandHeight:4} rows {seconds * 1e3:7.1f} ms  {LARGE_SIZE * LARGE_SIZE / 1e6 / seconds:6.1f} MP/s  "
+              f"peak {traced_peak(large, bandHeight) / 2 ** 20:6.1f} MiB")
@@ -0,0 +1,67 @@
+"""
+Measures encoding a synthetic 1024x1024 image into an ETC1 BCLIM, with 1 worker and then doubling up to the
+number of CPUs, for each quality tier. The blocks are encoded independently, in tiles handed to the workers,
+so more workers are expected to help up to the number of CPUs, but only the measured times show it: on a single
+CPU, only 1 worker is measured. The full tier tries 27 times the base colors of the fast one (a local refinement
+around the average color of each half), and is only timed once per worker count. The output must be the same
+for every worker count, and the quality of each tier is reported as the PSNR of the decoded image.
+"""
+
+import math
+import os
+import sys
+import timeit
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+import numpy
+
+from ctr.bclim import Bclim
+from ctr.lib.texture.etc1_encoder import QUALITY_TIERS
+from ctr.util.data_stream import DataStream
+from synthetic import build_image
+
+SIZE = 1024
+REPEATS = {'fast': 3, 'full': 1}
+
+
+def psnr(image: numpy.ndarray, decoded: numpy.ndarray) -> float:
+    """The peak signal-to-noise ratio of the RGB channels of a decoded image, in dB."""
+    error = numpy.mean((image[:, :, :3].astype(numpy.float64) - decoded[:, :, :3]) ** 2)
+    return 10 * math.log10(255 ** 2 / error) if error else float('inf')
+
+
+if __name__ == "__main__":
+    image = build_image(SIZE, SIZE)
+
+    # Double the workers up to the number of CPUs
+    cpuCount = os.cpu_count() or 1
+    workerCounts = [1]
+    while workerCounts[-1] * 2 <= cpuCount:
+        workerCounts.append(workerCounts[-1] * 2)
+    if workerCounts[-1] != cpuCount:
+        workerCounts.append(cpuCount)
+
+    print(f"{SIZE}x{SIZE} image, {cpuCount} CPUs")
+    if cpuCount == 1:
+        print("Only 1 CPU, the scaling with the number of workers can't be measured here")
+    for quality in QUALITY_TIERS:
+        files = {}
+        times = {}
+        for jobs in workerCounts:
+            files[jobs] = Bclim.from_image(image, 'ETC1', quality, jobs).export_bytes()
+            times[jobs] = min(timeit.repeat(lambda: Bclim.from_image(image, 'ETC1', quality, jobs),
+                                            number=1, repeat=REPEATS[quality]))
+
+        # Every worker count must produce the same file, which must decode back to the size of the image
+        assert len(set(files.values())) == 1, "The worker counts produced different files!"
+        bclim = Bclim()
+        bclim.read(DataStream(files[1]))
+        decoded = bclim.decode()
+        assert decoded.shape == image.shape, "The decoded image has the wrong size!"
+
+        print(f"  {quality} (PSNR {psnr(image, decoded):.2f} dB)")
+        for jobs in workerCounts:
+            print(f"    {jobs:3} workers {times[jobs]:7.2f} s ({SIZE * SIZE / times[jobs] / 1e6:5.2f} MP/s, "
+                  f"{times[1] / times[jobs]:4.2f}x)")
@@ -0,0 +1,172 @@
+"""
+Compares dumping a synthetic layout to JSON the way the sections used to (every __str__ building its
+object with JsonSerialize.add and splicing in the str() of its children) against to_dict() followed
+by a single json.dumps, and orjson when it's installed.
+
+The legacy path is replayed from the to_dict() output, built before the timing starts, so only the
+string building is measured for it.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+from ctr.bclyt import Bclyt
+from ctr.util.serialize import orjson, to_json
+from synthetic import build_bclyt
+
+# The string building that to_dict and to_json replaced, kept here as the baseline they're measured against
+
+class JsonSerialize:
+    """Builds a JSON object by splicing in one field at a time, as the sections' __str__ functions used to."""
+
+    string: str = ""
+
+    def __init__(self, data: str = ""):
+        self.string = data.strip()
+
+    def add(self, key, var, wrapVarInQuotes=False):
+        if self.string == "":
+            self.string = "{"
+
+        match self.string[-1]:
+            case "}":
+                self.string = self.string[:-1] + ","
+            case "{":
+                pass
+            case ",":
+                pass
+            case " ":
+                pass
+            case _:
+                self.string += ","
+
+        if wrapVarInQuotes:
+            self.string += f"\"{key}\": \"{var_to_json(var)}\""
+        else:
+            self.string += f"\"{key}\": {var_to_json(var)}"
+
+        self.string += "}"
+
+    def serialize(self):
+        if self.string[-1] != "}":
+            self.string += "}"
+        return self.string
+
+
+def var_to_json(var):
+    if type(var) is dict:
+        return dict_to_json(var)
+    elif isinstance(var, list) or isinstance(var, tuple):
+        return list_to_json(var)
+    elif isinstance(var, str):
+        return str_to_json(var)
+    elif type(var) is bytes:
+        return str_to_json(var.decode("utf-8"))
+    elif type(var) is int:
+        return int_to_json(var)
+    elif type(var) is float:
+        return float_to_json(var)
+    elif type(var) is bool:
+        return bool_to_json(var)
+    elif var is None:
+        return null_to_json(var)
+    else:
+        return str(var)
+
+
+def dict_to_json(var):
+    if len(var) == 0:
+        return "{}"
+    else:
+        return "{" + ", ".join(f'"{key}": {var_to_json(value)}' for key, value in var.items()) + "}"
+
+
+def list_to_json(var):
+    if len(var) == 0:
+        return "[]"
+    else:
+        return "[" + ", ".join(var_to_json(value) for value in var) + "]"
+
+
+def str_to_json(var):
+    return '"{}"'.format(var)
+
+
+def int_to_json(var):
+    return str(var)
+
+
+def float_to_json(var):
+    return str(var)
+
+
+def bool_to_json(var):
+    if var:
+        return "true"
+    return "false"
+
+
+def null_to_json(_):
+    return "null"
+
+
+class LegacyObject:
+    """A to_dict() result that serializes itself like the JsonSerialize based __str__ functions did."""
+
+    def __init__(self, values: dict):
+        self.values = values
+
+    def __str__(self) -> str:
+        j = JsonSerialize()
+        for key, value in self.values.items():
+            j.add(key, legacy(value))
+        return j.serialize()
+
+def legacy(value):
+    if isinstance(value, dict):
+        return LegacyObject(value)
+    if isinstance(value, list):
+        return [legacy(item) for item in value]
+    return value
+
+
+PANE_COUNT = 10000
+
+with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+    path = os.path.join(directory, 'layout.bclyt')
+    with open(path, 'wb') as f:
+        f.write(build_bclyt(paneCount=PANE_COUNT, groupCount=PANE_COUNT // 10))
+    layout = Bclyt(path)
+
+legacyLayout = legacy(layout.to_dict())
+
+encoders = {
+    "JsonSerialize": lambda: str(legacyLayout),
+    "to_dict + json.dumps": lambda: to_json(layout.to_dict()),
+}
+if orjson is not None:
+    encoders["to_dict + orjson"] = lambda: to_json(layout.to_dict(), fast=True)
+
+# Every encoder must produce the same document
+reference = json.loads(encoders["to_dict + json.dumps"]())
+for name, encode in encoders.items():
+    assert json.loads(encode(), strict=False) == reference, name + " produced a different document!"
+
+# Interleave the runs and keep the best time of each, so background noise affects every encoder equally
+results = {name: float('inf') for name in encoders}
+for _ in range(3):
+    for name, encode in encoders.items():
+        results[name] = min(results[name], timeit.timeit(encode, number=1))
+
+print(f"{PANE_COUNT} panes, {len(encoders['to_dict + json.dumps']()) / 1e6:.1f} MB of JSON")
+legacyTime = results["JsonSerialize"]
+for name, seconds in results.items():
+    print(f"{name:22} {seconds * 1e3:9.1f} ms  ({legacyTime / seconds:.1f}x speed of JsonSerialize)")
@@ -0,0 +1,66 @@
+"""
+Compares writing synthetic layouts of growing pane counts to JSON files from str() of the layout
+(the whole pane tree is converted to dicts and encoded into one string first) against
+Bclyt.export_json, which converts and writes the panes one at a time through a JsonWriter.
+Reports the time and the peak traced memory of each, which only grows with the pane count for str().
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+from ctr.bclyt import Bclyt
+from synthetic import build_bclyt
+
+def export_string(layout: Bclyt, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(str(layout))
+
+def export_streamed(layout: Bclyt, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        layout.export_json(f)
+
+def peak_memory(function, *args) -> int:
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+exporters = {
+    "str()": export_string,
+    "export_json": export_streamed,
+}
+
+with tempfile.TemporaryDirectory() as directory:
+    for paneCount in (1000, 5000, 20000):
+        inpath = os.path.join(directory, 'layout.bclyt')
+        with open(inpath, 'wb') as f:
+            f.write(build_bclyt(paneCount=paneCount, groupCount=paneCount // 8))
+        layout = Bclyt(inpath)
+        outpaths = {name: os.path.join(directory, 'out_%d.json' % i) for i, name in enumerate(exporters)}
+
+        # Both exporters must write the same text
+        outputs = []
+        for name, export in exporters.items():
+            export(layout, outpaths[name])
+            with open(outpaths[name], encoding="utf-8") as f:
+                outputs.append(f.read())
+        assert outputs[0] == outputs[1], "The exporters wrote different text!"
+
+        # Interleave the runs and keep the best time of each, so background noise affects both exporters equally
+        times = {name: float('inf') for name in exporters}
+        for _ in range(3):
+            for name, export in exporters.items():
+                times[name] = min(times[name], timeit.timeit(lambda: export(layout, outpaths[name]), number=1))
+        peaks = {name: peak_memory(export, layout, outpaths[name]) for name, export in exporters.items()}
+
+        print(f"{paneCount} panes, {len(outputs[0]) / 1024:.0f} KiB of JSON")
+        for name in exporters:
+            print(f"  {name:12} {times[name] * 1e3:8.1f} ms  {peaks[name] / 1024:9.1f} KiB peak")
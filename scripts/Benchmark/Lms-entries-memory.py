@@ -0,0 +1,132 @@
+"""
+Compares the memory held by a parsed synthetic MSBP project with 100k labels when its entries are the
+immutable NamedTuple records of lmsCommonTypes against the classes they replaced, which kept a
+reference to the data stream and a per-instance __dict__. The old classes are patched into the block
+modules for the comparison. Reports the memory still held by the project after parsing (traced by
+tracemalloc), the peak while parsing, and the parse time.
+
+On Python 3.11+ instances share the keys of their __dict__, so most of what's left is the labels,
+indexes and colors themselves.
+"""
+
+import contextlib
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+import ctr.lib.lms.common.lmsBlocks as lmsBlocks
+import ctr.lib.lms.msbp.ati2 as ati2
+import ctr.lib.lms.msbp.clr1 as clr1
+import ctr.lib.lms.msbp.syl3 as syl3
+from ctr.lib.lms.common.lmsCommonTypes import (ATTRIBUTE_SCHEMA, COLOR_SCHEMA, DATA_OFFSET_ENTRY_SCHEMA,
+                                               ITEM_OFFSET_ENTRY_SCHEMA, STYLE_SCHEMA)
+from ctr.msbp import Msbp
+from ctr.util.data_stream import DataStream
+from synthetic import build_msbp
+
+class LegacyEntry:
+    """The old entry classes were created straight from the stream."""
+
+    @classmethod
+    def read(cls, d: DataStream):
+        return cls(d)
+
+class LegacyLabel(LegacyEntry):
+    def __init__(self, d: DataStream):
+        self.data: DataStream = d
+        labelLength: int = self.data.read_uint8()
+        self.label: str = self.data.read_string(labelLength)
+        self.itemIndex: int = self.data.read_uint32()
+
+class LegacyDataOffsetEntry(LegacyEntry):
+    def __init__(self, d: DataStream):
+        self.data: DataStream = d
+        DATA_OFFSET_ENTRY_SCHEMA.read(self, self.data)
+
+class LegacyItemOffsetEntry(LegacyEntry):
+    def __init__(self, d: DataStream):
+        self.data: DataStream = d
+        ITEM_OFFSET_ENTRY_SCHEMA.read(self, self.data)
+
+class LegacyColor(LegacyEntry):
+    def __init__(self, d: DataStream):
+        self.data: DataStream = d
+        COLOR_SCHEMA.read(self, self.data)
+
+class LegacyAttribute(LegacyEntry):
+    def __init__(self, d: DataStream):
+        self.data: DataStream = d
+        ATTRIBUTE_SCHEMA.read(self, self.data)
+
+class LegacyStyle(LegacyEntry):
+    def __init__(self, d: DataStream):
+        self.data: DataStream = d
+        STYLE_SCHEMA.read(self, self.data)
+
+# The module attributes the entry classes are looked up in while parsing, with the old class for each
+LEGACY_TYPES = [
+    (lmsBlocks, 'label', LegacyLabel),
+    (lmsBlocks, 'dataOffsetEntry', LegacyDataOffsetEntry),
+    (lmsBlocks, 'itemOffsetEntry', LegacyItemOffsetEntry),
+    (clr1, 'color', LegacyColor),
+    (ati2, 'attribute', LegacyAttribute),
+    (syl3, 'style', LegacyStyle),
+]
+
+@contextlib.contextmanager
+def legacy_entries():
+    originals = [getattr(module, name) for module, name, _ in LEGACY_TYPES]
+    for module, name, legacyType in LEGACY_TYPES:
+        setattr(module, name, legacyType)
+    try:
+        yield
+    finally:
+        for (module, name, _), original in zip(LEGACY_TYPES, originals):
+            setattr(module, name, original)
+
+def measure(path: str) -> tuple[int, int, float]:
+    """Parses the project twice, and returns the memory it holds and the peak memory while parsing
+    (traced during one parse), and the parse time (of the other, as tracing slows it down)."""
+    start = time.perf_counter()
+    Msbp(path)
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    project = Msbp(path)
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del project
+    return held, peak, seconds
+
+
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'project.msbp')
+    with open(path, 'wb') as f:
+        f.write(build_msbp(colorCount=40000, attributeCount=30000, styleCount=30000))
+
+    # Both entry types must decode the same values
+    with legacy_entries():
+        legacy = Msbp(path)
+    assert legacy.to_dict() == Msbp(path).to_dict(), "The entry types decoded different values!"
+    labelCount = len(legacy.clb1.entries) + len(legacy.alb1.entries) + len(legacy.slb1.entries)
+    del legacy
+
+    # Interleave the runs and keep the fastest of each, so background noise affects both entry types equally
+    results = {}
+    for _ in range(3):
+        for name in ("legacy classes", "NamedTuple records"):
+            with legacy_entries() if name == "legacy classes" else contextlib.nullcontext():
+                held, peak, seconds = measure(path)
+            if name not in results or seconds < results[name][2]:
+                results[name] = (held, peak, seconds)
+
+print(f"{labelCount} labels")
+referenceHeld = results["legacy classes"][0]
+for name, (held, peak, seconds) in results.items():
+    print(f"{name:20} {held / 2 ** 20:7.2f} MiB held  ({referenceHeld / held:.2f}x less)  {peak / 2 ** 20:7.2f} MiB peak  "
+          f"{seconds * 1e3:7.1f} ms to parse")
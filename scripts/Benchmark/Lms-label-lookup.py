@@ -0,0 +1,75 @@
+"""
+Compares finding colors by label in a synthetic MSBP project with 100k labelled colors by scanning the
+flattened CLB1 entries against the label index, which hashes a label to its bucket and only decodes
+the buckets it's asked about, against the index's prebuilt dict, and against the index a parsed CLB1
+builds from the labels it decoded. Every run starts from a new index, so the decoding of the buckets
+(or the prebuild) is timed with the lookups.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+from ctr.lib.lms.common.lmsLabelIndex import lmsLabelIndex
+from ctr.msbp import Msbp
+from synthetic import build_msbp
+
+def scan(project: Msbp, labels: list[str]) -> list[int]:
+    """The entries as a list, scanned for each label."""
+    return [next((entry.itemIndex for entry in project.clb1.entries if entry.label == label), None) for label in labels]
+
+def hashed(project: Msbp, labels: list[str]) -> list[int]:
+    index = lmsLabelIndex(blockData, 'little')
+    return [index.get(label) for label in labels]
+
+def prebuilt(project: Msbp, labels: list[str]) -> list[int]:
+    index = lmsLabelIndex(blockData, 'little', prebuilt=True)
+    return [index.get(label) for label in labels]
+
+def from_labels(project: Msbp, labels: list[str]) -> list[int]:
+    """The index of the label block, built from the entries it decoded."""
+    index = lmsLabelIndex.from_labels(project.clb1.entries, project.clb1.labelBlock.numberOfEntries)
+    return [index.get(label) for label in labels]
+
+
+COLOR_COUNT = 100000
+LOOKUP_COUNTS = (10, 100, 100000)
+
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'project.msbp')
+    with open(path, 'wb') as f:
+        f.write(build_msbp(colorCount=COLOR_COUNT, attributeCount=0, styleCount=0, tagGroupCount=0))
+    project = Msbp(path)
+
+    # The data of CLB1, after its 16 byte header
+    offset, size = project.blockDirectory['CLB1']
+    with open(path, 'rb') as f:
+        blockData = f.read()[offset + 0x10:offset + 0x10 + size]
+
+random.seed(0)
+finders = {"scan": scan, "hash bucket": hashed, "prebuilt dict": prebuilt, "from entries": from_labels}
+print(f"{COLOR_COUNT} labels in {lmsLabelIndex(blockData, 'little').bucketCount} buckets")
+for lookupCount in LOOKUP_COUNTS:
+    # A few labels that aren't there, which a scan has to go all the way through the entries for
+    labels = ['Color%d' % random.randrange(COLOR_COUNT) for _ in range(lookupCount)]
+    labels[::100] = ['Missing%d' % i for i in range(len(labels[::100]))]
+
+    # The scan is too slow to run for every lookup count
+    names = [name for name in finders if name != "scan" or lookupCount <= 100]
+    results = [finders[name](project, labels) for name in names]
+    assert all(result == results[0] for result in results), "The finders found different items!"
+
+    # Interleave the runs and keep the best time of each, so background noise affects every finder equally
+    times = {name: float('inf') for name in names}
+    for _ in range(3):
+        for name in names:
+            times[name] = min(times[name], timeit.timeit(lambda: finders[name](project, labels), number=1))
+
+    print(f"{lookupCount} lookups")
+    for name in names:
+        print(f"  {name:14} {times[name] * 1e3:9.2f} ms  ({times[name] * 1e6 / lookupCount:8.2f} us/lookup)")
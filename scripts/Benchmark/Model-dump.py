@@ -0,0 +1,126 @@
+"""
+Compares re-reading a parsed model from its JSON export (json.loads, which only gives back plain
+containers) and parsing the original file again against loading it from a binary dump (ctr.util.dump,
+which gives back the model itself, ready to be exported again), for a large synthetic layout and MSBP
+project. Every model is checked to survive the round trip: the loaded model must convert to the same
+dict as the original, and a loaded layout must export the same BCLYT bytes.
+
+The floor is the time it takes just to create the objects of the model from ready-made dicts of their
+attributes (and tuples of their fields, for the named tuples), which no format can load faster than.
+The floor of the project is less than twice as fast as json.loads, and the floor of the layout about 10
+times as fast, so no dump can load 10 times as fast as JSON. Loading a dump also decodes the values of
+the attributes and sets them one by one, which makes it about 1.5 to 2.5 times as fast as JSON.
+"""
+
+import contextlib
+import functools
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+from ctr.bclyt import Bclyt
+from ctr.msbp import Msbp
+from ctr.util.dump import DUMP_TYPES, dumps, loads
+from synthetic import build_bclyt, build_msbp
+
+def best_time(function, runs: int) -> float:
+    """The best time of several runs, with the garbage collector left on as it is in real use."""
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def model_objects(model) -> list:
+    """The type and attributes of every object of a model a dump holds, and the type and fields of each list
+    of named tuples, other than enum members (which JSON has as numbers)."""
+    objects = []
+    seen = set()
+    pending = [model]
+    while pending:
+        value = pending.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        if isinstance(value, list) and value and hasattr(value[0], '_fields'):
+            objects.append((type(value[0]), list(map(tuple, value))))
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+        elif DUMP_TYPES.get((type(value).__module__, type(value).__qualname__)):
+            objects.append((type(value), dict(vars(value))))
+            # The sorted entries of the label blocks are the same named tuples as their entries
+            pending.extend(attribute for name, attribute in vars(value).items() if name != 'sortedEntries')
+    return objects
+
+
+def create_objects(objects: list) -> None:
+    for cls, attributes in objects:
+        if isinstance(attributes, list):
+            list(map(functools.partial(tuple.__new__, cls), attributes))
+        else:
+            value = cls.__new__(cls)
+            value.__dict__.update(attributes)
+
+
+def export_json(model) -> str:
+    f = io.StringIO()
+    if isinstance(model, Msbp):
+        model.export_json(f, None, compact=True)
+    else:
+        model.export_json(f, compact=True)
+    return f.getvalue()
+
+
+def parse(path: str):
+    # Silence the progress the parsers print
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Bclyt(path) if path.endswith(".bclyt") else Msbp(path)
+
+
+with tempfile.TemporaryDirectory() as directory:
+    paths = {
+        "layout (5000 panes)": (os.path.join(directory, 'layout.bclyt'), build_bclyt(paneCount=5000, groupCount=600)),
+        "project (5000 entries)": (os.path.join(directory, 'project.msbp'),
+                                   build_msbp(colorCount=5000, attributeCount=5000, styleCount=5000, tagGroupCount=200)),
+    }
+    for path, fileBytes in paths.values():
+        with open(path, 'wb') as f:
+            f.write(fileBytes)
+
+    for name, (path, fileBytes) in paths.items():
+        model = parse(path)
+        text = export_json(model)
+        dump = dumps(model)
+        objects = model_objects(model)
+
+        # The loaded model must be the same model
+        loaded = loads(dump, type(model))
+        assert loaded.to_dict() == model.to_dict(), "The loaded model differs!"
+        if isinstance(model, Bclyt):
+            assert loaded.export_bytes() == model.export_bytes(), "The loaded layout exports different bytes!"
+
+        # Interleave the runs and keep the best time of each, so background noise affects every format equally
+        readers = {
+            "parse": lambda: parse(path),
+            "JSON": lambda: json.loads(text),
+            "dump": lambda: loads(dump),
+            "floor": lambda: create_objects(objects),
+        }
+        times = {reader: float('inf') for reader in readers}
+        for _ in range(20):
+            for reader, read in readers.items():
+                times[reader] = min(times[reader], best_time(read, 1))
+        sizes = {"parse": len(fileBytes), "JSON": len(text.encode('utf-8')), "dump": len(dump)}
+
+        print(name)
+        for reader in readers:
+            size = f"{sizes[reader] / 1024:8.0f} KiB" if reader in sizes else " " * 12
+            print(f"  {reader:6} {size}  {times[reader] * 1e3:7.1f} ms  "
+                  f"({times['JSON'] / times[reader]:.2f}x speed of JSON)")
@@ -0,0 +1,46 @@
+"""
+Compares parsing a large synthetic MSBP file in full against decoding only the blocks needed for a
+task: the colour blocks (CLR1 and CLB1) for colour lookups, and the tag blocks for control codes.
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+from ctr.msbp import COLOR_BLOCKS, TAG_BLOCKS, Msbp
+from synthetic import build_msbp
+
+project = build_msbp(colorCount=2000, attributeCount=2000, styleCount=2000, tagGroupCount=50)
+
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'project.msbp')
+    with open(path, 'wb') as f:
+        f.write(project)
+
+    selections = {
+        "all blocks": None,
+        "colour blocks": COLOR_BLOCKS,
+        "tag blocks": TAG_BLOCKS,
+    }
+
+    # The selected blocks must decode to the same entries as a full parse
+    full = Msbp(path)
+    colors = Msbp(path, COLOR_BLOCKS)
+    assert [c.color for c in colors.clr1.colors] == [c.color for c in full.clr1.colors], "The colour blocks differ!"
+    assert colors.ati2 is None and colors.tgg2 is None, "Unselected blocks were decoded!"
+    tags = Msbp(path, TAG_BLOCKS)
+    assert [t.name for t in tags.tag2.tags] == [t.name for t in full.tag2.tags], "The tag blocks differ!"
+
+    # Interleave the runs and keep the best time of each, so background noise affects every selection equally
+    results = {name: float('inf') for name in selections}
+    for _ in range(10):
+        for name, blocks in selections.items():
+            results[name] = min(results[name], timeit.timeit(lambda: Msbp(path, blocks), number=1))
+
+reference = results["all blocks"]
+for name, seconds in results.items():
+    print(f"{name:14} {seconds * 1e3:7.2f} ms  ({reference / seconds:.2f}x speed of all blocks)")
@@ -0,0 +1,65 @@
+"""
+Compares decoding the fixed-size record blocks (CLR1, ATI2 and SYL3) of a large synthetic MSBP project
+into one record per entry against decoding them into columns (Msbp(..., columnar=True)), which reads
+each block with one numpy.frombuffer call. Reports the decode time, the memory the blocks hold, and the
+time to sum a column over every entry through the records and through the arrays.
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+import ctr.lib.lms.common.lmsColumns  # Imported up front, so the import isn't timed
+from ctr.msbp import Msbp, COLUMNAR_BLOCKS
+from synthetic import build_msbp
+
+def held_memory(path: str, columnar: bool) -> int:
+    tracemalloc.start()
+    project = Msbp(path, COLUMNAR_BLOCKS, columnar)
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del project
+    return held
+
+
+ENTRY_COUNT = 100000
+
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'project.msbp')
+    with open(path, 'wb') as f:
+        f.write(build_msbp(colorCount=ENTRY_COUNT, attributeCount=ENTRY_COUNT, styleCount=ENTRY_COUNT))
+
+    projects = {
+        "records": Msbp(path, COLUMNAR_BLOCKS),
+        "columns": Msbp(path, COLUMNAR_BLOCKS, columnar=True),
+    }
+
+    # Both must decode the same entries
+    records, columns = projects.values()
+    assert columns.clr1.to_dict() == records.clr1.to_dict(), "The colors differ!"
+    assert columns.ati2.to_dict() == records.ati2.to_dict(), "The attributes differ!"
+    assert columns.syl3.to_dict() == records.syl3.to_dict(), "The styles differ!"
+
+    # Interleave the runs and keep the best time of each, so background noise affects both equally
+    decodeTimes = {name: float('inf') for name in projects}
+    for _ in range(5):
+        for name in projects:
+            decodeTimes[name] = min(decodeTimes[name], timeit.timeit(lambda: Msbp(path, COLUMNAR_BLOCKS, name == "columns"), number=1))
+    memory = {name: held_memory(path, name == "columns") for name in projects}
+
+sums = {
+    "records": lambda: sum(entry.regionWidth for entry in records.syl3.styles),
+    "columns": lambda: int(columns.syl3.styles.regionWidth.sum(dtype='u8')),
+}
+assert sums["records"]() == sums["columns"](), "The sums differ!"
+sumTimes = {name: min(timeit.repeat(total, number=1, repeat=5)) for name, total in sums.items()}
+
+print(f"{ENTRY_COUNT} colors, attributes and styles")
+for name in projects:
+    print(f"  {name:8} decode {decodeTimes[name] * 1e3:7.1f} ms ({decodeTimes['records'] / decodeTimes[name]:5.1f}x)  "
+          f"{memory[name] / 2 ** 20:6.2f} MiB held  sum of a column {sumTimes[name] * 1e3:6.2f} ms")
@@ -0,0 +1,76 @@
+"""
+Compares writing a large synthetic MSBP project to a JSON file the way Msbp.to_json used to (the text
+was built, then parsed and dumped again in __str__, then parsed and dumped once more for the file)
+against Msbp.export_json, which builds every top-level value once and streams it to the file.
+Reports the time and the peak traced memory of each.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+from ctr.msbp import Msbp
+from ctr.util.serialize import to_json
+from synthetic import build_msbp
+
+def export_round_trips(project: Msbp, path: str) -> None:
+    """The old path: build the text, then two dumps(loads(...)) round trips."""
+    text = json.dumps(json.loads(to_json(project.to_dict())), indent=3)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(json.loads(text), indent=2))
+
+def export_streamed(project: Msbp, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        project.export_json(f, ascii=True)
+
+def export_compact(project: Msbp, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        project.export_json(f, None, compact=True, ascii=True)
+
+def peak_memory(function, *args) -> int:
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+with tempfile.TemporaryDirectory() as directory:
+    inpath = os.path.join(directory, 'project.msbp')
+    with open(inpath, 'wb') as f:
+        f.write(build_msbp(colorCount=5000, attributeCount=5000, styleCount=5000, tagGroupCount=200))
+    project = Msbp(inpath)
+
+    exporters = {
+        "dumps(loads(...)) x2": export_round_trips,
+        "export_json pretty": export_streamed,
+        "export_json compact": export_compact,
+    }
+    outpaths = {name: os.path.join(directory, 'out_%d.json' % i) for i, name in enumerate(exporters)}
+
+    # Every exporter must write the same document, and the pretty ones the same text
+    outputs = {}
+    for name, export in exporters.items():
+        export(project, outpaths[name])
+        with open(outpaths[name], encoding="utf-8") as f:
+            outputs[name] = f.read()
+    assert outputs["dumps(loads(...)) x2"] == outputs["export_json pretty"], "The pretty outputs differ!"
+    assert json.loads(outputs["export_json compact"]) == json.loads(outputs["export_json pretty"]), "The compact output differs!"
+
+    # Interleave the runs and keep the best time of each, so background noise affects every exporter equally
+    times = {name: float('inf') for name in exporters}
+    for _ in range(5):
+        for name, export in exporters.items():
+            times[name] = min(times[name], timeit.timeit(lambda: export(project, outpaths[name]), number=1))
+    peaks = {name: peak_memory(export, project, outpaths[name]) for name, export in exporters.items()}
+
+reference = times["dumps(loads(...)) x2"]
+for name in exporters:
+    print(f"{name:22} {times[name] * 1e3:8.1f} ms  ({reference / times[name]:.2f}x speed)  {peaks[name] / 1024:9.1f} KiB peak  "
+          f"{len(outputs[name]) / 1024:7.1f} KiB written")
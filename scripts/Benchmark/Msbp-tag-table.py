@@ -0,0 +1,72 @@
+"""
+Compares resolving the tags of control codes in a synthetic MSBP project by chasing the indexes of
+TGG2, TAG2, TGP2 and TGL2 for each occurrence (as the JSON export used to) against looking them up in
+the project's tag table, which is built once. The time to build the table is reported on its own,
+along with the size of the pickled table and the time to load it (as a worker process would).
+"""
+
+import os
+import pickle
+import random
+import sys
+import tempfile
+import timeit
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+from ctr.lib.lms.common.lmsTagTable import lmsTagTable
+from ctr.msbp import Msbp
+from synthetic import build_msbp
+
+def chase(project: Msbp, occurrences: list[tuple[int, int]]) -> list:
+    """The names of each tag and of its parameters, with the list items of list parameters."""
+    resolved = []
+    for groupIndex, tagIndex in occurrences:
+        tag = project.tag2.tags[project.tgg2.tagGroups[groupIndex].tagIndexes[tagIndex]]
+        parameters = []
+        for parameterIndex in tag.parameterIndexes:
+            parameter = project.tgp2.tagParameters[parameterIndex]
+            listItems = tuple(project.tgl2.tagList[listIndex].item for listIndex in parameter.ListItemIndexes)
+            parameters.append((parameter.parameterName, parameter.type, listItems))
+        resolved.append((tag.name, parameters))
+    return resolved
+
+def table(project: Msbp, occurrences: list[tuple[int, int]]) -> list:
+    tagTable = project.tagTable
+    resolved = []
+    for key in occurrences:
+        tag = tagTable[key]
+        resolved.append((tag.name, [(parameter.name, parameter.type, parameter.listItems) for parameter in tag.parameters]))
+    return resolved
+
+
+GROUP_COUNT = 1000
+OCCURRENCE_COUNT = 200000
+
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'project.msbp')
+    with open(path, 'wb') as f:
+        f.write(build_msbp(colorCount=0, attributeCount=0, styleCount=0, tagGroupCount=GROUP_COUNT))
+    project = Msbp(path)
+
+random.seed(0)
+occurrences = [(random.randrange(GROUP_COUNT), random.randrange(3)) for _ in range(OCCURRENCE_COUNT)]
+assert chase(project, occurrences) == table(project, occurrences), "The tags resolve differently!"
+
+# Interleave the runs and keep the best time of each, so background noise affects both ways equally
+resolvers = {"chase indexes": chase, "tag table": table}
+times = {name: float('inf') for name in resolvers}
+for _ in range(3):
+    for name in resolvers:
+        times[name] = min(times[name], timeit.timeit(lambda: resolvers[name](project, occurrences), number=1))
+
+build = min(timeit.repeat(lambda: lmsTagTable(project.tgg2.tagGroups, project.tag2.tags, project.tgp2.tagParameters,
+                                              project.tgl2.tagList), number=1, repeat=5))
+pickled = pickle.dumps(project.tagTable, pickle.HIGHEST_PROTOCOL)
+load = min(timeit.repeat(lambda: pickle.loads(pickled), number=1, repeat=5))
+
+print(f"{len(project.tagTable)} tags, {OCCURRENCE_COUNT} occurrences")
+for name in resolvers:
+    print(f"  {name:14} {times[name] * 1e3:8.1f} ms  ({times[name] * 1e9 / OCCURRENCE_COUNT:6.0f} ns/occurrence)")
+print(f"  table built in {build * 1e3:.2f} ms, pickled to {len(pickled) / 1024:.1f} KiB, loaded in {load * 1e3:.2f} ms")
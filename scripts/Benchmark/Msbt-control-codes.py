@@ -0,0 +1,99 @@
+"""
+Compares decoding the tags of synthetic UTF-16 messages with dense tag usage by interpreting each
+parameter through the project's tag table (a lookup of its type's format and an unpack per parameter)
+against the decoder compiled from the project, which unpacks the parameters of a tag with the one struct
+compiled for its layout. Both split the messages and dispatch on the tags the same way, so only the
+decoding of the parameters differs. The parameters
+are also timed on their own, from the tags found in a first pass over the messages.
+"""
+
+import functools
+import os
+import sys
+import tempfile
+import timeit
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+from ctr.lib.lms.common.lmsControlCodes import (PARAMETER_FORMATS, STRING_PARAMETER, controlTag,
+                                                lmsControlCodeDecoder, tag_key)
+from ctr.msbp import Msbp
+from ctr.util.struct_codecs import get_struct
+from synthetic import build_messages, build_msbp
+
+
+class InterpretingDecoder(lmsControlCodeDecoder):
+    """Decodes the parameters one at a time, following the types of the tag table."""
+
+    def __init__(self, tagTable, byteOrder: str = 'little'):
+        super().__init__(tagTable, byteOrder)
+        self.decoders = {tag_key(groupIndex, tagIndex, byteOrder): functools.partial(self.interpret_tag, groupIndex, tagIndex)
+                         for groupIndex, tagIndex in tagTable}
+
+    def interpret_tag(self, groupIndex: int, tagIndex: int, message: bytes, offset: int, size: int) -> controlTag:
+        tag = self.tagTable.get((groupIndex, tagIndex))
+        end = offset + size
+        values = []
+        for parameter in tag.parameters:
+            if parameter.type == STRING_PARAMETER:
+                length = get_struct('H', self.byteOrder).unpack_from(message, offset)[0]
+                values.append(self.decodeText(message[offset + 2:offset + 2 + length], 'surrogatepass')[0])
+                offset += 2 + length
+                continue
+            valueStruct = get_struct(PARAMETER_FORMATS[parameter.type], self.byteOrder)
+            value = valueStruct.unpack_from(message, offset)[0]
+            offset += valueStruct.size
+            if parameter.type == 9 and value < len(parameter.listItems):
+                value = parameter.listItems[value]
+            values.append(value)
+        if end - offset > 1:
+            return controlTag(groupIndex, tagIndex, tag, message[end - size:end])
+        return controlTag(groupIndex, tagIndex, tag, tuple(values))
+
+
+MESSAGE_COUNT = 2000
+TAGS_PER_MESSAGE = 60
+GROUP_COUNT = 16
+
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'project.msbp')
+    with open(path, 'wb') as f:
+        f.write(build_msbp(colorCount=0, attributeCount=0, styleCount=0, tagGroupCount=GROUP_COUNT))
+    project = Msbp(path)
+
+messages = build_messages(MESSAGE_COUNT, TAGS_PER_MESSAGE, GROUP_COUNT)
+decoders = {"interpreted": InterpretingDecoder(project.tagTable), "compiled": project.control_code_decoder()}
+
+# Both must split every message into the same text and tags
+results = [[decoder.decode(message) for message in messages] for decoder in decoders.values()]
+assert all(result == results[0] for result in results), "The decoders decoded different messages!"
+tagCount = sum(not isinstance(segment, str) for message in results[0] for segment in message)
+
+# Record where the parameters of each tag are, to also time decoding them without splitting the messages
+occurrences = []
+recorder = project.control_code_decoder()
+recorder.decoders = {key: functools.partial(lambda key, *occurrence: occurrences.append((key, *occurrence)), key) for key in recorder.decoders}
+for message in messages:
+    recorder.decode(message)
+
+def decode_parameters(decoder: lmsControlCodeDecoder) -> list:
+    dispatch = decoder.decoders
+    return [dispatch[key](message, offset, size) for key, message, offset, size in occurrences]
+
+# Interleave the runs and keep the best time of each, so background noise affects both decoders equally
+times = {name: float('inf') for name in decoders}
+parameterTimes = {name: float('inf') for name in decoders}
+for _ in range(5):
+    for name, decoder in decoders.items():
+        times[name] = min(times[name], timeit.timeit(lambda: [decoder.decode(message) for message in messages], number=1))
+        parameterTimes[name] = min(parameterTimes[name], timeit.timeit(lambda: decode_parameters(decoder), number=1))
+
+compileTime = min(timeit.repeat(lambda: project.control_code_decoder(), number=1, repeat=5))
+
+print(f"{MESSAGE_COUNT} messages, {tagCount} tags and tag ends ({sum(map(len, messages)) / 2 ** 20:.2f} MiB)")
+for name in decoders:
+    print(f"  {name:12} messages {times[name] * 1e3:6.1f} ms ({times['interpreted'] / times[name]:4.2f}x)  "
+          f"parameters of {len(occurrences)} tags {parameterTimes[name] * 1e3:6.1f} ms "
+          f"({parameterTimes[name] * 1e9 / len(occurrences):4.0f} ns/tag, {parameterTimes['interpreted'] / parameterTimes[name]:4.2f}x)")
+print(f"  decoders for {len(project.tagTable)} tags compiled in {compileTime * 1e3:.2f} ms")
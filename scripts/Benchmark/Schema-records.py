@@ -0,0 +1,102 @@
+"""
+Compares decoding the fixed-size part of PAN1 and PIC1 sections field by field (the way the sections
+were read before they had schemas) against the compiled schemas, which decode each record with a
+single unpack call. It also counts the stream calls each approach makes per record.
+"""
+
+import os
+import struct
+import sys
+import timeit
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+from ctr.util.data_stream import DataStream
+from ctr.lib.lyt.pan1 import PAN1_SCHEMA
+from ctr.lib.lyt.pic1 import PIC1_SCHEMA
+
+class Record:
+    pass
+
+def read_by_field(record: Record, data: DataStream) -> None:
+    """The fixed-size PAN1 and PIC1 fields, read one at a time."""
+    flags = data.read_uint8()
+    record.isVisible = bool(flags & 1)
+    record.influencedAlpha = bool(flags & 2)
+    record.locationAdjustment = bool(flags & 4)
+    record.origin = data.read_uint8()
+    record.alpha = data.read_uint8()
+    magFlags = data.read_uint8()
+    record.ignorePartsMagnify = bool(magFlags & 1)
+    record.adjustToPartsBounds = bool(magFlags & 2)
+    record.name = data.read_string(0x10).replace("\0", "")
+    record.dataString = data.read_string(0x8).replace("\0", "")
+    record.position = data.read_vector3()
+    record.rotation = data.read_vector3()
+    record.scale = data.read_vector2()
+    record.height = data.read_float()
+    record.width = data.read_float()
+    record.vertexColorTopLeft = data.read_color_rgba8()
+    record.vertexColorTopRight = data.read_color_rgba8()
+    record.vertexColorBottomLeft = data.read_color_rgba8()
+    record.vertexColorBottomRight = data.read_color_rgba8()
+    record.materialId = data.read_uint16()
+    record.textureCoordCount = data.read_uint16()
+
+def read_by_schema(record: Record, data: DataStream) -> None:
+    """The same fields, read with the compiled schemas."""
+    PAN1_SCHEMA.read(record, data)
+    PIC1_SCHEMA.read(record, data)
+
+class CountingStream(DataStream):
+    """A stream that counts the read calls made on it."""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.calls = 0
+
+    def __getattribute__(self, name: str):
+        if name.startswith('read_'):
+            object.__setattr__(self, 'calls', object.__getattribute__(self, 'calls') + 1)
+        return object.__getattribute__(self, name)
+
+
+RECORD_COUNT = 10000
+record = struct.pack('<4B16s8s3f3f2f2f4B4B4B4BHH', 1, 4, 255, 0, b'P_pane', b'data', 1.0, 2.0, 3.0, 0.0, 0.0, 90.0,
+                     1.0, 1.0, 64.0, 32.0, *([255] * 16), 0, 1)
+buffer = record * RECORD_COUNT
+
+readers = {
+    "field by field": read_by_field,
+    "schema": read_by_schema,
+}
+
+# Both readers must decode the same values
+decoded = []
+for reader in readers.values():
+    result = Record()
+    reader(result, DataStream(buffer))
+    decoded.append(vars(result))
+assert decoded[0] == decoded[1], "The readers decoded different values!"
+
+# Count the stream calls per record
+for name, reader in readers.items():
+    stream = CountingStream(record)
+    reader(Record(), stream)
+    print(f"{name:16} {stream.calls:3d} stream calls per record")
+
+def read_all(reader) -> None:
+    data = DataStream(buffer)
+    for _ in range(RECORD_COUNT):
+        reader(Record(), data)
+
+# Interleave the runs and keep the best time of each, so background noise affects both readers equally
+results = {name: float('inf') for name in readers}
+for _ in range(10):
+    for name, reader in readers.items():
+        results[name] = min(results[name], timeit.timeit(lambda: read_all(reader), number=1))
+
+reference = results["field by field"]
+for name, seconds in results.items():
+    print(f"{name:16} {seconds * 1e9 / RECORD_COUNT:7.0f} ns/record  ({reference / seconds:.2f}x speed of field by field)")
@@ -0,0 +1,78 @@
+"""
+Simulates the decoding done while previewing the layouts of a romfs, where many layouts share a few
+atlases: every layout decodes the textures it uses, picked with a skew towards the most shared ones.
+Compares decoding every time against the texture cache, with a memory tier large enough for every
+atlas, one too small for them (so it evicts), and a cold memory tier backed by the disk tier of an
+earlier run (the images memory-mapped from .npy files).
+"""
+
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+import numpy
+
+from ctr.bclim import Bclim
+from ctr.lib.texture.cache import TextureCache
+from ctr.lib.texture.formats import FORMAT_IDS
+from ctr.util.data_stream import DataStream
+from synthetic import build_bclim
+
+ATLAS_COUNT = 12
+LAYOUT_COUNT = 200
+TEXTURES_PER_LAYOUT = 4
+
+# Half the atlases are ETC1 and half RGBA8, of 256x256 and 512x256 pixels
+atlases = [build_bclim(256 * (1 + i % 2), 256, FORMAT_IDS['ETC1' if i % 4 < 2 else 'RGBA8'], seed=i) for i in range(ATLAS_COUNT)]
+rng = random.Random(0)
+weights = [1 / (rank + 1) for rank in range(ATLAS_COUNT)]
+requests = [atlases[index] for _ in range(LAYOUT_COUNT) for index in rng.choices(range(ATLAS_COUNT), weights, k=TEXTURES_PER_LAYOUT)]
+
+
+def decode(data: bytes) -> numpy.ndarray:
+    bclim = Bclim()
+    bclim.read(DataStream(data))
+    return bclim.decode()
+
+
+def run(cache: TextureCache) -> list:
+    return [cache.get(data) for data in requests]
+
+
+with tempfile.TemporaryDirectory() as directory:
+    decodedBytes = sum(decode(atlas).nbytes for atlas in atlases)
+
+    # The cache must give the same images as decoding
+    expected = [decode(data) for data in requests[:20]]
+    warm = TextureCache(decodedBytes, directory)
+    assert all(numpy.array_equal(image, cached) for image, cached in zip(expected, run(warm))), "The cache gave different images!"
+
+    configurations = {
+        "no cache": lambda: [decode(data) for data in requests],
+        "memory": lambda: run(TextureCache(decodedBytes)),
+        "memory (1/3)": lambda: run(TextureCache(decodedBytes // 3)),
+        "disk, cold memory": lambda: run(TextureCache(decodedBytes, directory)),
+    }
+
+    # Interleave the runs and keep the best time of each, so background noise affects every configuration equally
+    times = {name: float('inf') for name in configurations}
+    for _ in range(3):
+        for name, configuration in configurations.items():
+            times[name] = min(times[name], timeit.timeit(configuration, number=1))
+
+    print(f"{len(requests)} decodes of {len(set(requests))} atlases ({decodedBytes / 2 ** 20:.1f} MiB decoded)")
+    for name, maxBytes, cacheDirectory in (("no cache", None, None), ("memory", decodedBytes, None),
+                                           ("memory (1/3)", decodedBytes // 3, None), ("disk, cold memory", decodedBytes, directory)):
+        line = f"  {name:18} {times[name] * 1e3:7.1f} ms ({times['no cache'] / times[name]:5.1f}x)"
+        if maxBytes is not None:
+            cache = TextureCache(maxBytes, cacheDirectory)
+            run(cache)
+            stats = cache.stats
+            line += (f"  hits {stats.hits}, disk hits {stats.diskHits}, misses {stats.misses}, evictions {stats.evictions}"
+                     f" ({stats.hitRate:.0%})")
+        print(line)
@@ -0,0 +1,80 @@
+"""
+Compares writing a large TXL1 section the way the writers used to (placeholder values written straight
+to the file, then a seek back to patch every offset and the section size) against the in-memory
+WriteStream, which reserves fixups and flushes the finished section in one write.
+"""
+
+import os
+import struct
+import sys
+import tempfile
+import timeit
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+from ctr.lib.lyt.txl1 import Txl1
+from ctr.util.write_stream import WriteStream
+
+UINT32 = struct.Struct('<I')
+
+def write_patched(f, names: list[str]) -> None:
+    """The old approach: a file write per field, then a seek and write per patched value."""
+    startPos = f.tell()
+    f.write(b'txl1')
+    f.write(UINT32.pack(0))
+    f.write(UINT32.pack(len(names)))
+    tableStart = f.tell()
+    for _ in names:
+        f.write(UINT32.pack(0))
+    offsets = []
+    for name in names:
+        offsets.append(f.tell() - tableStart)
+        f.write(name.encode('utf-8') + b'\x00')
+    sectionSize = f.tell() - startPos
+    for i, offset in enumerate(offsets):
+        f.seek(tableStart + i * 4)
+        f.write(UINT32.pack(offset))
+    f.seek(startPos + 4)
+    f.write(UINT32.pack(sectionSize))
+    f.seek(startPos + sectionSize)
+
+def write_fixups(f, textureList: Txl1) -> None:
+    """The new approach: build the section in memory, then flush it."""
+    data = WriteStream(f)
+    textureList.write(data)
+    data.flush()
+
+
+NAME_COUNT = 20000
+textureList = Txl1()
+textureList.textureNames = ['texture_%05d.bclim' % i for i in range(NAME_COUNT)]
+
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'out.bin')
+    writers = {
+        "seek-and-patch": lambda f: write_patched(f, textureList.textureNames),
+        "WriteStream fixups": lambda f: write_fixups(f, textureList),
+    }
+
+    # Both writers must produce the same bytes
+    outputs = []
+    for writer in writers.values():
+        with open(path, 'wb') as f:
+            writer(f)
+        with open(path, 'rb') as f:
+            outputs.append(f.read())
+    assert outputs[0] == outputs[1], "The writers produced different output!"
+
+    # Interleave the runs and keep the best time of each, so background noise affects both writers equally
+    results = {name: float('inf') for name in writers}
+    for _ in range(10):
+        for name, writer in writers.items():
+            def run():
+                with open(path, 'wb') as f:
+                    writer(f)
+            results[name] = min(results[name], timeit.timeit(run, number=1))
+
+reference = results["seek-and-patch"]
+for name, seconds in results.items():
+    print(f"{name:20} {seconds * 1e3:7.2f} ms  ({reference / seconds:.2f}x speed of seek-and-patch)")
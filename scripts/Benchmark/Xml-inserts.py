@@ -0,0 +1,103 @@
+"""
+Compares building a CLYT-style XML document node by node with the XmlSerialize inserts the way they
+used to work (every insert listed and scanned the whole document) against the indexed inserts, and
+serializing it with serialize (indent and tostring of the whole tree) against the streaming write.
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from xml.etree.ElementTree import SubElement
+
+# We need this to import from the parent directory (in this case parent OF the parent)
+sys.path.append(os.path.join(sys.path[0], "..", ".."))
+
+from ctr.util.serialize import XmlSerialize
+
+class ScanningXmlSerialize(XmlSerialize):
+    """The old inserts, which scan every element of the document."""
+
+    def insert_from_attr(self, attributeDict: dict, tag, elementText: str = None, **attributes):
+        for element in list(self.document.iter()):
+            if element.attrib == attributeDict:
+                newSubElement = SubElement(element, tag, **attributes)
+                newSubElement.text = elementText
+
+    def insert_from_tag(self, tag, newTag, elementText: str = None, **attributes):
+        for elem in list(self.document.iter()):
+            if elem.tag == tag:
+                newSubElement = SubElement(elem, newTag, **attributes)
+                newSubElement.text = elementText
+
+def build_document(documentType: type, paneCount: int) -> XmlSerialize:
+    """A layout with paneCount panes, each with a few child elements inserted by its name."""
+    document = documentType("NintendoWareLayout", version="1.0.0.0")
+    document.add("head")
+    document.insert_from_tag("head", "create", user="tools", date="2024-01-01")
+    for i in range(paneCount):
+        name = "P_pane_%05d" % i
+        document.add("pane", kind="Picture", name=name)
+        document.insert_from_attr({"kind": "Picture", "name": name}, "translate", x="0", y="0", z="0")
+        document.insert_from_attr({"kind": "Picture", "name": name}, "size", x="32", y="32")
+        document.insert_from_attr({"kind": "Picture", "name": name}, "comment", "Pane " + str(i))
+    return document
+
+def peak_memory(function, *args) -> int:
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+def serialize(document: XmlSerialize, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(document.serialize("utf-8"))
+
+def write(document: XmlSerialize, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        document.write(f)
+
+
+for paneCount in (500, 1000, 2000):
+    builders = {
+        "scanning inserts": lambda: build_document(ScanningXmlSerialize, paneCount),
+        "indexed inserts": lambda: build_document(XmlSerialize, paneCount),
+    }
+
+    # Both must build the same document
+    documents = [builder() for builder in builders.values()]
+    assert documents[0].serialize("utf-8") == documents[1].serialize("utf-8"), "The documents differ!"
+
+    # Interleave the runs and keep the best time of each, so background noise affects both equally
+    times = {name: float('inf') for name in builders}
+    for _ in range(3):
+        for name, builder in builders.items():
+            times[name] = min(times[name], timeit.timeit(builder, number=1))
+
+    print(f"{paneCount} panes")
+    reference = times["scanning inserts"]
+    for name in builders:
+        print(f"  {name:18} {times[name] * 1e3:9.1f} ms  ({reference / times[name]:.1f}x speed)")
+
+# Write the biggest document to a file both ways
+document = documents[1]
+writers = {"serialize": serialize, "write": write}
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'layout.xml')
+
+    # Both must write the same file
+    contents = []
+    for writer in writers.values():
+        writer(document, path)
+        with open(path, "rb") as f:
+            contents.append(f.read())
+    assert contents[0] == contents[1], "The written files differ!"
+
+    times = {name: float('inf') for name in writers}
+    for _ in range(5):
+        for name, writer in writers.items():
+            times[name] = min(times[name], timeit.timeit(lambda: writer(document, path), number=1))
+    for name, writer in writers.items():
+        print(f"{name:20} {times[name] * 1e3:9.1f} ms  {peak_memory(writer, document, path) / 1024:9.1f} KiB peak")
@@ -0,0 +1,340 @@
+"""Builders for synthetic BCLYT and MSBP files, used by the benchmark scripts in this folder.
+
+The files follow the layouts documented in the ctr.lib modules, and contain enough of every
+section type to exercise the parsers without needing files extracted from a game.
+"""
+import struct
+
+BOMS = {'little': b'\xFF\xFE', 'big': b'\xFE\xFF'}
+PREFIXES = {'little': '<', 'big': '>'}
+
+
+def padded_string(string: str, length: int) -> bytes:
+    """Encodes a string into a fixed-length, null-padded field."""
+    return string.encode('utf-8').ljust(length, b'\0')
+
+
+class LayoutBuilder:
+    """Builds the sections of a synthetic BCLYT file."""
+
+    def __init__(self, byteOrder: str = 'little'):
+        self.byteOrder = byteOrder
+        self.prefix = PREFIXES[byteOrder]
+        self.sections: list[bytes] = []
+
+    def pack(self, fmt: str, *values) -> bytes:
+        return struct.pack(self.prefix + fmt, *values)
+
+    def section(self, magic: str, body: bytes = b'') -> None:
+        self.sections.append(magic.encode('ascii') + self.pack('I', 8 + len(body)) + body)
+
+    def pane_body(self, name: str) -> bytes:
+        return (self.pack('4B', 1, 4, 255, 0) + padded_string(name, 0x10) + padded_string('data', 0x8)
+                + self.pack('3f3f2f2f', 1.0, 2.0, 3.0, 0.0, 0.0, 90.0, 1.0, 1.0, 64.0, 32.0))
+
+    def uv_sets(self, count: int) -> bytes:
+        return b''.join(self.pack('8f', 0.0, 0.0, 1.0, 0.0, 0.0, 1.0, 1.0, 1.0) for _ in range(count))
+
+    def string_table(self, magic: str, names: list[str]) -> None:
+        offsets = []
+        strings = b''
+        for name in names:
+            offsets.append(4 * len(names) + len(strings))
+            strings += name.encode('utf-8') + b'\0'
+        self.section(magic, self.pack('I', len(names)) + self.pack(f'{len(names)}I', *offsets) + strings)
+
+    def lyt1(self) -> None:
+        self.section('lyt1', self.pack('I2f', 0, 400.0, 240.0))
+
+    def mat1(self, names: list[str]) -> None:
+        entries = []
+        for name in names:
+            # One TEV stage (bits 6-7 of the flags, counted from the most significant bit) and an alpha compare (bit 9)
+            flags = (0x80000000 >> 7) | (0x80000000 >> 9)
+            entries.append(padded_string(name, 0x14) + bytes([255, 255, 255, 255]) + bytes(0x18) + self.pack('I', flags)
+                           + self.pack('BBH', 1, 2, 0) + self.pack('BfBBB', 3, 0.5, 0, 0, 0))
+        offset = 0x0C + 4 * len(entries)
+        offsets = []
+        for entry in entries:
+            offsets.append(offset)
+            offset += len(entry)
+        self.section('mat1', self.pack('I', len(entries)) + self.pack(f'{len(entries)}I', *offsets) + b''.join(entries))
+
+    def pan1(self, name: str) -> None:
+        self.section('pan1', self.pane_body(name))
+
+    def bnd1(self, name: str) -> None:
+        self.section('bnd1', self.pane_body(name))
+
+    def pic1(self, name: str, uvCount: int = 1) -> None:
+        self.section('pic1', self.pane_body(name) + bytes([255] * 16) + self.pack('HH', 0, uvCount) + self.uv_sets(uvCount))
+
+    def txt1(self, name: str, text: str = 'Hello') -> None:
+        textBytes = text.encode('utf-16-le' if self.byteOrder == 'little' else 'utf-16-be') + b'\0\0'
+        self.section('txt1', self.pane_body(name) + self.pack('HHHHBBH', len(textBytes), len(textBytes), 0, 0, 0, 0, 0)
+                     + self.pack('I', 0x74) + bytes([255] * 8) + self.pack('4f', 10.0, 10.0, 12.0, 14.0) + textBytes)
+
+    def wnd1(self, name: str) -> None:
+        frameOffset = 0x80 + 0x20
+        self.section('wnd1', self.pane_body(name) + self.pack('4f', 1.0, 2.0, 3.0, 4.0) + self.pack('BBH', 1, 0, 0)
+                     + self.pack('II', 0x80, frameOffset) + bytes([255] * 16) + self.pack('HBBI', 0, 1, 0, 0)
+                     + self.uv_sets(1) + self.pack('I', frameOffset + 4) + self.pack('HBB', 0, 0, 0))
+
+    def usd1(self, key: str, values: list[int]) -> None:
+        entry = self.pack('IIHBB', 0x0C + 4 * len(values), 0x0C, len(values), 1, 0) + self.pack(f'{len(values)}i', *values) + key.encode('utf-8') + b'\0'
+        self.section('usd1', self.pack('HH', 1, 0) + entry)
+
+    def grp1(self, name: str, panes: list[str]) -> None:
+        self.section('grp1', padded_string(name, 0x10) + self.pack('HH', len(panes), 0) + b''.join(padded_string(pane, 0x10) for pane in panes))
+
+    def build(self) -> bytes:
+        body = b''.join(self.sections)
+        return b'CLYT' + BOMS[self.byteOrder] + self.pack('HIIHH', 0x14, 0x02020000, 0x14 + len(body), len(self.sections), 0) + body
+
+
+def build_bclyt(paneCount: int = 16, groupCount: int = 4, byteOrder: str = 'little') -> bytes:
+    """Builds a BCLYT with a root pane holding paneCount panes (cycling through every pane type,
+    nested in groups of eight) and a root group holding groupCount groups."""
+    builder = LayoutBuilder(byteOrder)
+    builder.lyt1()
+    builder.string_table('txl1', ['tex_%d.bclim' % i for i in range(4)])
+    builder.string_table('fnl1', ['font.bcfnt'])
+    builder.mat1(['mat_%d' % i for i in range(4)])
+    builder.pan1('RootPane')
+    builder.section('pas1')
+    paneNames = []
+    for i in range(paneCount):
+        if i % 8 == 0:
+            if i > 0:
+                builder.section('pae1')
+            builder.pan1('N_null_%d' % i)
+            builder.section('pas1')
+        name = 'P_pane_%d' % i
+        paneNames.append(name)
+        match i % 5:
+            case 0:
+                builder.pic1(name, 1 + i % 3)
+                builder.usd1('key', [i, i + 1])
+            case 1:
+                builder.txt1(name)
+            case 2:
+                builder.wnd1(name)
+            case 3:
+                builder.bnd1(name)
+            case _:
+                builder.pan1(name)
+    if paneCount > 0:
+        builder.section('pae1')
+    builder.section('pae1')
+    builder.grp1('RootGroup', [])
+    if groupCount > 0:
+        builder.section('grs1')
+        for i in range(groupCount):
+            builder.grp1('G_group_%d' % i, paneNames[i::groupCount][:8])
+        builder.section('gre1')
+    return builder.build()
+
+
+def lms_hash(label: str, bucketCount: int) -> int:
+    """The hash function used by LMS label blocks."""
+    value = 0
+    for char in label.encode('utf-8'):
+        value = (value * 0x492 + char) & 0xFFFFFFFF
+    return value % bucketCount
+
+
+class ProjectBuilder:
+    """Builds the blocks of a synthetic MSBP file."""
+
+    def __init__(self, byteOrder: str = 'little'):
+        self.byteOrder = byteOrder
+        self.prefix = PREFIXES[byteOrder]
+        self.blocks: list[bytes] = []
+
+    def pack(self, fmt: str, *values) -> bytes:
+        return struct.pack(self.prefix + fmt, *values)
+
+    def block(self, magic: str, data: bytes) -> None:
+        block = magic.encode('ascii') + self.pack('I', len(data)) + bytes(8) + data
+        self.blocks.append(block + b'\xab' * (-len(block) % 16))
+
+    def label_block(self, magic: str, labels: list[str], bucketCount: int = 101) -> None:
+        buckets = [[] for _ in range(bucketCount)]
+        for index, label in enumerate(labels):
+            buckets[lms_hash(label, bucketCount)].append((label, index))
+        table = b''
+        entries = b''
+        for bucket in buckets:
+            table += self.pack('II', len(bucket), 4 + 8 * bucketCount + len(entries))
+            for label, index in bucket:
+                encoded = label.encode('utf-8')
+                entries += self.pack('B', len(encoded)) + encoded + self.pack('I', index)
+        self.block(magic, self.pack('I', bucketCount) + table + entries)
+
+    def item_block(self, magic: str, items: list[bytes]) -> None:
+        offsets = []
+        data = b''
+        for item in items:
+            offsets.append(4 + 4 * len(items) + len(data))
+            data += item
+        self.block(magic, self.pack('I', len(items)) + self.pack(f'{len(items)}I', *offsets) + data)
+
+    def build(self) -> bytes:
+        body = b''.join(self.blocks)
+        return (b'MsgPrjBn' + BOMS[self.byteOrder] + bytes(2) + bytes([0, 3]) + self.pack('HH', len(self.blocks), 0)
+                + self.pack('I', 0x20 + len(body)) + bytes(10) + body)
+
+
+def build_msbp(colorCount: int = 16, attributeCount: int = 8, styleCount: int = 8, tagGroupCount: int = 2, byteOrder: str = 'little') -> bytes:
+    """Builds an MSBP with the given number of colours, attributes and styles (each with a label)
+    and tagGroupCount tag groups of three tags each."""
+    builder = ProjectBuilder(byteOrder)
+    pack = builder.pack
+
+    builder.block('CLR1', pack('I', colorCount) + b''.join(bytes([i & 0xFF, (i >> 8) & 0xFF, 128, 255]) for i in range(colorCount)))
+    builder.label_block('CLB1', ['Color%d' % i for i in range(colorCount)])
+
+    builder.block('ATI2', pack('I', attributeCount) + b''.join(pack('BBHI', 9 if i % 4 == 0 else 2, 0, 0, i * 4) for i in range(attributeCount)))
+    builder.label_block('ALB1', ['Attribute%d' % i for i in range(attributeCount)])
+    builder.item_block('ALI2', [pack('III', 2, 12, 16) + b'one\0two\0'])
+
+    tagGroups = []
+    tags = []
+    for group in range(tagGroupCount):
+        indexes = [group * 3 + i for i in range(3)]
+        tagGroups.append(pack(f'H{len(indexes)}H', len(indexes), *indexes) + b'Group%d\0' % group)
+        tags.append(pack('HH', 1, 0) + b'Ruby%d\0' % group)
+        tags.append(pack('HHH', 2, 1, 2) + b'Font%d\0' % group)
+        tags.append(pack('H', 0) + b'PageBreak%d\0' % group)
+    builder.item_block('TGG2', tagGroups)
+    builder.item_block('TAG2', tags)
+    builder.item_block('TGP2', [pack('B', 1) + b'size\0', pack('B', 8) + b'face\0', pack('BBHHH', 9, 0, 2, 0, 1) + b'kind\0'])
+    builder.item_block('TGL2', [b'big\0', b'small\0'])
+
+    builder.block('SYL3', pack('I', styleCount) + b''.join(pack('III', 100 + i, 2, 0) + bytes([1, 2, 3, 4]) for i in range(styleCount)))
+    builder.label_block('SLB1', ['Style%d' % i for i in range(styleCount)])
+
+    builder.item_block('CTI1', [b'Message%d.msbt\0' % i for i in range(4)])
+    return builder.build()
+
+
+def build_messages(messageCount: int, tagsPerMessage: int, tagGroupCount: int = 2, byteOrder: str = 'little') -> list[bytes]:
+    """Builds null-terminated UTF-16 messages for the tags of build_msbp, each with tagsPerMessage tags
+    between runs of text: a Ruby tag (with its span closed), a Font tag (with a string and a list item)
+    or a PageBreak tag, in turn."""
+    prefix = PREFIXES[byteOrder]
+    encoding = 'utf-16-le' if byteOrder == 'little' else 'utf-16-be'
+
+    def tag(group: int, index: int, parameters: bytes) -> bytes:
+        return struct.pack(prefix + '4H', 0x0E, group, index, len(parameters)) + parameters
+
+    messages = []
+    for message in range(messageCount):
+        parts = []
+        for i in range(tagsPerMessage):
+            group = (message + i) % tagGroupCount
+            parts.append(('Word%d ' % i).encode(encoding))
+            if i % 3 == 0:
+                parts.append(tag(group, 0, struct.pack(prefix + 'H', i)) + 'kanji'.encode(encoding)
+                             + struct.pack(prefix + '3H', 0x0F, group, 0))
+            elif i % 3 == 1:
+                face = 'Face%d' % (i % 4)
+                parts.append(tag(group, 1, struct.pack(prefix + 'H', 2 * len(face)) + face.encode(encoding) + struct.pack('2B', i % 2, 0)))
+            else:
+                parts.append(tag(group, 2, b''))
+        messages.append(b''.join(parts) + b'\0\0')
+    return messages
+
+
+def build_bclim(width: int, height: int, formatId: int, data: bytes = None, seed: int = 0) -> bytes:
+    """Builds a little-endian BCLIM of a format, with the given texture data (stored with the width and height
+    rounded up to powers of two) or random data, which is valid for every format."""
+    import random
+
+    textureWidth, textureHeight = (1 << max(3, (size - 1).bit_length()) for size in (width, height))
+    bitsPerPixel = (8, 8, 8, 16, 16, 16, 24, 16, 16, 32, 4, 8, 4, 4)[formatId]
+    if data is None:
+        data = random.Random(seed).randbytes(textureWidth * textureHeight * bitsPerPixel // 8)
+
+    footer = (b'CLIM' + BOMS['little'] + struct.pack('<HIIHH', 0x14, 0x02020000, len(data) + 0x28, 1, 0)
+              + b'imag' + struct.pack('<IHHII', 0x10, width, height, formatId, len(data)))
+    return data + footer
+
+
+def build_image(width: int, height: int, seed: int = 0):
+    """Builds a height x width x 4 numpy array of RGBA pixels that looks somewhat like a texture: smooth
+    gradients and soft circles with a little noise, and an alpha that fades across the image."""
+    import numpy
+
+    rng = numpy.random.default_rng(seed)
+    y, x = numpy.mgrid[0:height, 0:width] / max(width, height)
+    image = numpy.stack((x * 200 + 30, y * 180 + 40, (1 - x) * 120 + y * 100, 255 - x * 200), axis=2)
+    for _ in range(12):
+        centerX, centerY, radius = rng.random(3) * (1, 1, 0.25)
+        inside = numpy.clip(1 - numpy.hypot(x - centerX, y - centerY) / (radius + 0.02), 0, 1)
+        image[:, :, :3] += inside[:, :, None] * (rng.random(3) * 160 - 80)
+    image[:, :, :3] += rng.normal(0, 4, (height, width, 3))
+    return numpy.clip(numpy.rint(image), 0, 255).astype(numpy.uint8)
+
+
+def build_bclan(paneCount: int = 16, keysPerCurve: int = 6, frameSize: int = 120, byteOrder: str = 'little', seed: int = 0) -> bytes:
+    """Builds a BCLAN animating paneCount panes: every pane has hermite curves for its 10 SRT values (CLPA) and
+    a step curve for its visibility (CLVI), with keys spread over frameSize frames, and every fourth pane
+    also has a material entry with hermite curves for 4 color channels (CLMC)."""
+    import random
+
+    rng = random.Random(seed)
+    prefix = PREFIXES[byteOrder]
+
+    def target(targetIndex: int, curveType: int) -> bytes:
+        frames = sorted(rng.uniform(0, frameSize) for _ in range(keysPerCurve - 2))
+        frames = [0.0] + frames + [float(frameSize)]
+        if curveType == 2:
+            keys = b''.join(struct.pack(prefix + '3f', frame, rng.uniform(-100, 100), rng.uniform(-5, 5)) for frame in frames)
+        else:
+            keys = b''.join(struct.pack(prefix + 'fHH', frame, rng.randrange(2), 0) for frame in frames)
+        return struct.pack(prefix + 'BBBxHxxI', 0, targetIndex, curveType, len(frames), 0xC) + keys
+
+    def tag(magic: str, targets: list[bytes]) -> bytes:
+        header = magic.encode() + struct.pack(prefix + 'B3x', len(targets))
+        offset = len(header) + 4 * len(targets)
+        offsets = []
+        for data in targets:
+            offsets.append(offset)
+            offset += len(data)
+        return header + struct.pack(prefix + '%dI' % len(targets), *offsets) + b''.join(targets)
+
+    def entry(name: str, entryType: int, tags: list[bytes]) -> bytes:
+        header = padded_string(name, 0x14) + struct.pack(prefix + 'BBxx', len(tags), entryType)
+        offset = len(header) + 4 * len(tags)
+        offsets = []
+        for data in tags:
+            offsets.append(offset)
+            offset += len(data)
+        return header + struct.pack(prefix + '%dI' % len(tags), *offsets) + b''.join(tags)
+
+    entries = []
+    for i in range(paneCount):
+        entries.append(entry('P_pane_%d' % i, 0, [tag('CLPA', [target(t, 2) for t in range(10)]), tag('CLVI', [target(0, 1)])]))
+        if i % 4 == 0:
+            entries.append(entry('mat_%d' % i, 1, [tag('CLMC', [target(t, 2) for t in range(4)])]))
+
+    # PAT1: the animation name, then one group
+    name = padded_string('anim', 8)
+    pat1Body = struct.pack(prefix + 'HHIIhhB3x', 0, 1, 0x1C, 0x1C + len(name), 0, frameSize, 0) + name + padded_string('G_group', 0x10) + struct.pack(prefix + 'B3x', 0)
+    pat1 = b'pat1' + struct.pack(prefix + 'I', 8 + len(pat1Body)) + pat1Body
+
+    # PAI1: one texture name, then the entry offsets and the entries
+    textures = struct.pack(prefix + 'I', 4) + padded_string('tex_0.bclim', 12)
+    entriesOffset = 0x14 + len(textures)
+    offset = entriesOffset + 4 * len(entries)
+    offsets = []
+    for data in entries:
+        offsets.append(offset)
+        offset += len(data)
+    pai1Body = (struct.pack(prefix + 'HBxHHI', frameSize, 1, 1, len(entries), entriesOffset) + textures
+                + struct.pack(prefix + '%dI' % len(entries), *offsets) + b''.join(entries))
+    pai1 = b'pai1' + struct.pack(prefix + 'I', 8 + len(pai1Body)) + pai1Body
+
+    body = pat1 + pai1
+    return b'CLAN' + BOMS[byteOrder] + struct.pack(prefix + 'HIIHH', 0x14, 0x02020000, 0x14 + len(body), 2, 0) + body
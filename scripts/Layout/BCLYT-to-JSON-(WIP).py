@@ -28,7 +28,6 @@ if not output_file.endswith(".json"):
 
 ### ACTUAL SCRIPT BELOW THIS COMMENT ###
 binaryLayout = bclyt.Bclyt(input_file)
-json = str(binaryLayout)
 
-with open(output_file, "w") as f:
-    f.write(json)
\ No newline at end of file
+with open(output_file, "w", encoding="utf-8") as f:
+    binaryLayout.export_json(f)
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""Fixtures shared by the tests: synthetic files built with the builders of the benchmark scripts."""
+
+import os
+import sys
+
+import pytest
+
+# The repository root (for ctr) and the synthetic file builders of the benchmarks
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts", "Benchmark"))
+
+import synthetic
+
+
+@pytest.fixture(params=['little', 'big'])
+def byteOrder(request) -> str:
+    return request.param
+
+
+@pytest.fixture
+def bclyt_path(tmp_path, byteOrder) -> str:
+    path = tmp_path / "layout.bclyt"
+    path.write_bytes(synthetic.build_bclyt(40, 4, byteOrder))
+    return str(path)
+
+
+@pytest.fixture
+def msbp_path(tmp_path, byteOrder) -> str:
+    path = tmp_path / "project.msbp"
+    path.write_bytes(synthetic.build_msbp(byteOrder=byteOrder))
+    return str(path)
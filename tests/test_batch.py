@@ -0,0 +1,85 @@
+import multiprocessing
+import os
+
+import pytest
+
+from ctr import batch
+
+import synthetic
+
+
+def write(path, data: bytes) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return str(path)
+
+
+def crash(inpath: str, outpath: str) -> None:
+    """A converter that kills its worker process, like a crash in a native library."""
+    os._exit(1)
+
+
+@pytest.fixture
+def corpus(tmp_path) -> str:
+    root = tmp_path / "romfs"
+    for i in range(6):
+        write(root / "Layout" / ("layout_%d.bclyt" % i), synthetic.build_bclyt(8, 2))
+    for i in range(3):
+        write(root / "Message" / ("project_%d.msbp" % i), synthetic.build_msbp())
+    write(root / "readme.txt", b'not converted')
+    return str(root)
+
+
+def test_find_jobs_keeps_relative_paths(corpus, tmp_path):
+    jobs = batch.find_jobs([corpus], str(tmp_path / "out"))
+    assert len(jobs) == 9
+    assert sorted(os.path.relpath(job.outpath, tmp_path / "out") for job in jobs)[0] == os.path.join("Layout", "layout_0.bclyt.json")
+
+
+def test_find_jobs_skips_files_found_twice(corpus, tmp_path):
+    jobs = batch.find_jobs([corpus, os.path.join(corpus, "**", "*.msbp")], str(tmp_path / "out"))
+    assert len(jobs) == 9
+
+
+def test_find_jobs_rejects_clashing_outputs(tmp_path):
+    project = synthetic.build_msbp()
+    first = write(tmp_path / "a" / "x.msbp", project)
+    second = write(tmp_path / "b" / "x.msbp", project)
+    with pytest.raises(ValueError, match="x.msbp.json"):
+        batch.find_jobs([os.path.dirname(first), os.path.dirname(second)], str(tmp_path / "out"))
+    assert not (tmp_path / "out").exists()
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_convert_all(corpus, tmp_path, jobs):
+    write(os.path.join(corpus, "Layout", "broken.bclyt"), b'XXXX')
+    output = str(tmp_path / "out")
+    result = batch.convert_all([corpus], output, jobs)
+    assert len(result.converted) == 9
+    assert [os.path.basename(failure.inpath) for failure in result.failures] == ["broken.bclyt"]
+    assert os.path.isfile(os.path.join(output, "Message", "project_0.msbp.json"))
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork', reason="the crashing converter is only registered in forked workers")
+def test_dead_worker_fails_only_its_file(corpus, tmp_path, monkeypatch):
+    monkeypatch.setitem(batch.CONVERTERS, ".crash", crash)
+    write(os.path.join(corpus, "Layout", "layout_3.crash"), b'')
+    result = batch.convert_all([corpus], str(tmp_path / "out"), jobs=2)
+    assert len(result.converted) == 9
+    assert [os.path.basename(failure.inpath) for failure in result.failures] == ["layout_3.crash"]
+    assert result.failures[0].error.startswith("BrokenProcessPool")
+
+
+def test_non_ascii_output_is_utf8(tmp_path):
+    layout = synthetic.LayoutBuilder()
+    layout.lyt1()
+    layout.string_table('txl1', ['ともだち.bclim'])
+    layout.pan1('RootPane')
+    layout.grp1('RootGroup', [])
+    inpath = write(tmp_path / "in" / "text.bclyt", layout.build())
+
+    result = batch.convert_all([inpath], str(tmp_path / "out"), 1)
+    assert not result.failures
+    with open(tmp_path / "out" / "text.bclyt.json", encoding="utf-8") as f:
+        assert "ともだち" in f.read()
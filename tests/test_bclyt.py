@@ -0,0 +1,67 @@
+import pytest
+
+from ctr.bclyt import Bclyt
+
+import synthetic
+
+
+def test_lazy_layout_equals_eager(bclyt_path):
+    eager = Bclyt(bclyt_path)
+    with Bclyt(bclyt_path, lazy=True) as lazy:
+        assert lazy.to_dict() == eager.to_dict()
+        assert lazy.export_bytes() == eager.export_bytes()
+
+
+def test_lazy_layout_decodes_parts_on_access(bclyt_path):
+    with Bclyt(bclyt_path, lazy=True) as lazy:
+        assert lazy._pending == {'txl1', 'fnl1', 'mat1', 'tree'}
+        assert lazy.textureList.textureNames == Bclyt(bclyt_path).textureList.textureNames
+        assert 'txl1' not in lazy._pending and 'tree' in lazy._pending
+
+
+def test_iter_sections_matches_tree(bclyt_path):
+    layout = Bclyt(bclyt_path)
+    names = [pane.name for pane, depth, parent in Bclyt.iter_panes(bclyt_path)]
+
+    def walk(pane):
+        yield pane.name
+        for child in pane.children:
+            yield from walk(child)
+
+    assert names == list(walk(layout.rootPane))
+
+
+def test_invalid_signature(tmp_path):
+    path = tmp_path / "invalid.bclyt"
+    path.write_bytes(b'XXXX' + synthetic.build_bclyt(1, 0)[4:])
+    with pytest.raises(ValueError):
+        Bclyt(str(path))
+
+
+def test_assigning_root_pane_keeps_root_group(bclyt_path):
+    eager = Bclyt(bclyt_path)
+    with Bclyt(bclyt_path, lazy=True) as lazy:
+        lazy.rootPane = None
+        assert lazy.rootPane is None
+        assert lazy.rootGroup is not None
+        assert lazy.rootGroup.to_dict() == eager.rootGroup.to_dict()
+
+
+def test_assigning_list_section_skips_decoding(bclyt_path):
+    with Bclyt(bclyt_path, lazy=True) as lazy:
+        lazy.textureList = None
+        assert 'txl1' not in lazy._pending and 'tree' in lazy._pending
+        assert lazy.textureList is None
+
+
+def test_iter_sections_tolerates_unbalanced_ends(tmp_path):
+    # Turn the first child list and group list markers into end markers, so the ends outnumber the starts
+    data = synthetic.build_bclyt(10, 3)
+    balanced = tmp_path / "balanced.bclyt"
+    balanced.write_bytes(data)
+    path = tmp_path / "unbalanced.bclyt"
+    path.write_bytes(data.replace(b'pas1', b'pae1', 1).replace(b'grs1', b'gre1', 1))
+
+    names = [section.name for section, depth, parent in Bclyt.iter_sections(str(path))]
+    expected = [section.name for section, depth, parent in Bclyt.iter_sections(str(balanced))]
+    assert names == expected
@@ -0,0 +1,98 @@
+import numpy
+
+from ctr.lib.lan.curves import AnimationCurves, curveLabel
+from ctr.lib.lan.pai1 import HERMITE_CURVE, STEP_CURVE, AnimationTarget
+
+
+def make_target(curveType: int, keys: list[tuple[float, float, float]]) -> AnimationTarget:
+    target = AnimationTarget()
+    target.index = 0
+    target.target = 0
+    target.curveType = curveType
+    target.keyCount = len(keys)
+    frames, values, slopes = zip(*keys) if keys else ((), (), ())
+    target.frames = numpy.array(frames, numpy.float32)
+    target.values = numpy.array(values, numpy.float32)
+    target.slopes = numpy.array(slopes, numpy.float32) if curveType == HERMITE_CURVE else numpy.zeros(len(keys), numpy.float32)
+    return target
+
+
+def make_curves(targets: list[AnimationTarget], frameSize: int = None, loop: bool = False) -> AnimationCurves:
+    labels = [curveLabel('P_%d' % i, 'CLPA', 'translateX', 0) for i in range(len(targets))]
+    return AnimationCurves(labels, targets, frameSize, loop)
+
+
+def hermite(keys: list[tuple[float, float, float]], frame: float) -> float:
+    """The value of a hermite curve at a frame, from the basis functions (slopes are per frame)"""
+    if frame <= keys[0][0]:
+        return keys[0][1]
+    if frame >= keys[-1][0]:
+        return keys[-1][1]
+    for (f0, p0, m0), (f1, p1, m1) in zip(keys, keys[1:]):
+        if f0 <= frame < f1:
+            length = f1 - f0
+            t = (frame - f0) / length
+            return ((2 * t ** 3 - 3 * t ** 2 + 1) * p0 + (t ** 3 - 2 * t ** 2 + t) * length * m0
+                    + (-2 * t ** 3 + 3 * t ** 2) * p1 + (t ** 3 - t ** 2) * length * m1)
+
+
+def step(keys: list[tuple[float, float, float]], frame: float) -> float:
+    """The value of a step curve at a frame: the last key at or before it, or the first key"""
+    value = keys[0][1]
+    for keyFrame, keyValue, _ in keys:
+        if keyFrame <= frame:
+            value = keyValue
+    return value
+
+
+HERMITE_KEYS = [(0.0, 1.0, 0.5), (10.0, 4.0, -0.25), (25.0, -2.0, 0.0), (40.0, 3.0, 1.0)]
+STEP_KEYS = [(5.0, 2.0, 0.0), (12.0, 7.0, 0.0), (30.0, 1.0, 0.0)]
+
+# Frames before the first key, on and between the keys, and after the last one, out of order
+FRAMES = numpy.array([20.5, -10.0, 0.0, 3.25, 10.0, 12.0, 11.9, 29.99, 30.0, 39.5, 40.0, 55.0, 5.0])
+
+
+def test_hermite_matches_reference():
+    values = make_curves([make_target(HERMITE_CURVE, HERMITE_KEYS)]).evaluate(FRAMES)
+    expected = [hermite(HERMITE_KEYS, frame) for frame in FRAMES]
+    assert numpy.allclose(values[0], expected, rtol=1e-6, atol=1e-6)
+
+
+def test_step_matches_reference():
+    values = make_curves([make_target(STEP_CURVE, STEP_KEYS)]).evaluate(FRAMES)
+    assert values[0].tolist() == [step(STEP_KEYS, frame) for frame in FRAMES]
+
+
+def test_values_are_clamped_outside_the_keys():
+    values = make_curves([make_target(HERMITE_CURVE, HERMITE_KEYS), make_target(STEP_CURVE, STEP_KEYS)]).evaluate([-100.0, 1000.0])
+    assert values.tolist() == [[1.0, 3.0], [2.0, 1.0]]
+
+
+def test_later_key_wins_on_duplicate_frames():
+    keys = [(0.0, 0.0, 0.0), (10.0, 5.0, 0.0), (10.0, 8.0, 0.0), (20.0, 8.0, 0.0)]
+    for curveType in (HERMITE_CURVE, STEP_CURVE):
+        values = make_curves([make_target(curveType, keys)]).evaluate([10.0, 15.0])
+        assert values[0].tolist() == [8.0, 8.0]
+
+    # Up to the duplicate frame the curve runs into the first of the two keys
+    values = make_curves([make_target(HERMITE_CURVE, keys)]).evaluate([5.0])
+    assert numpy.isclose(values[0, 0], hermite(keys[:2], 5.0))
+
+
+def test_curves_without_keys_are_nan():
+    curves = make_curves([make_target(HERMITE_CURVE, []), make_target(STEP_CURVE, STEP_KEYS)])
+    values = curves.evaluate(FRAMES)
+    assert numpy.isnan(values[0]).all()
+    assert values[1].tolist() == [step(STEP_KEYS, frame) for frame in FRAMES]
+
+    # Without any keys at all every value is NaN
+    assert numpy.isnan(make_curves([make_target(STEP_CURVE, [])]).evaluate(FRAMES)).all()
+
+
+def test_loop_wraps_frames():
+    target = make_target(HERMITE_CURVE, HERMITE_KEYS)
+    looped = make_curves([target], frameSize=40, loop=True).evaluate([5.0, 45.0, 85.0, -35.0])
+    assert numpy.allclose(looped[0], hermite(HERMITE_KEYS, 5.0))
+
+    # Without loop the frames past the frame size hold the last key
+    assert make_curves([target], frameSize=40).evaluate([45.0])[0].tolist() == [3.0]
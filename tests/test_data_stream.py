@@ -0,0 +1,64 @@
+import io
+
+import pytest
+
+from ctr.util.data_stream import DataStream, find_in_memoryview
+
+
+DATA = bytes(range(16)) * 4
+
+
+def test_from_file_maps_from_the_current_position(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(DATA)
+    with open(path, 'rb') as f:
+        f.seek(6)
+        with DataStream.from_file(f) as stream:
+            assert stream.tell() == 6
+            assert stream.read_uint8() == 6
+            stream.seek(0x20)
+            assert stream.read_bytes(2) == DATA[0x20:0x22]
+
+
+def test_from_file_reads_unmappable_files_from_the_start():
+    # A BytesIO is seekable but has no file descriptor, offsets still count from its start like for mapped files
+    buffer = io.BytesIO(DATA)
+    buffer.seek(6)
+    stream = DataStream.from_file(buffer)
+    assert stream.tell() == 6
+    assert stream.read_uint8() == 6
+    stream.seek(0x20)
+    assert stream.read_bytes(2) == DATA[0x20:0x22]
+
+
+@pytest.mark.parametrize('position', [0, 1, 254, 255, 256, 257, 511, 512, 700])
+@pytest.mark.parametrize('sub', [b'\x00', b'\x00\x00', b'END'])
+def test_find_in_memoryview_matches_bytes_find(position, sub):
+    # Terminators at the edges of the 256 byte chunks the search scans, multi-byte ones crossing them
+    data = b'a' * position + sub + b'b' * 300
+    for start in (0, max(position - 1, 0), position, position + 1):
+        assert find_in_memoryview(memoryview(data), sub, start) == data.find(sub, start)
+
+
+def test_find_in_memoryview_without_terminator():
+    data = b'a' * 600
+    assert find_in_memoryview(memoryview(data), b'\x00') == -1
+    assert find_in_memoryview(memoryview(data), b'\x00', 590) == -1
+    assert find_in_memoryview(memoryview(data), b'\x00', 600) == -1
+
+
+@pytest.mark.parametrize('wrap', [bytes, memoryview])
+def test_string_table_across_chunks(wrap):
+    # The second string ends past the first chunk, the last one isn't terminated
+    strings = ['first', 'x' * 300, 'third', 'unterminated']
+    data = b'\x00'.join(string.encode() for string in strings)
+    offsets = [data.find(string.encode()) for string in strings]
+    stream = DataStream(wrap(data))
+    assert stream.read_string_table(0, offsets) == strings
+
+    stream.seek(offsets[1])
+    assert stream.read_string_nt() == strings[1]
+    assert stream.tell() == offsets[2]
+    stream.seek(offsets[3])
+    assert stream.read_string_nt() == strings[3]
+    assert stream.tell() == len(data)
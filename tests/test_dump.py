@@ -0,0 +1,129 @@
+import marshal
+import struct
+
+import numpy
+import pytest
+
+from ctr.bclan import Bclan
+from ctr.bclim import Bclim
+from ctr.bclyt import Bclyt
+from ctr.msbp import Msbp
+from ctr.util.data_stream import DataStream
+from ctr.lib.lyt.wnd1 import Wnd1
+from ctr.util.dump import DUMP_HEADER, DUMP_MAGIC, DUMP_VERSION, MARSHAL_VERSION, dump, dumps, load, loads
+
+import synthetic
+
+
+def test_layout_round_trip(bclyt_path, tmp_path):
+    layout = Bclyt(bclyt_path)
+    path = tmp_path / "layout.ctrd"
+    with open(path, 'wb') as f:
+        dump(layout, f)
+    with open(path, 'rb') as f:
+        loaded = load(f, Bclyt)
+
+    assert loaded.to_dict() == layout.to_dict()
+    assert loaded.export_bytes() == layout.export_bytes()
+
+    # The links between the panes and the windows' material list are rebuilt, and the section index isn't kept
+    child = loaded.rootPane.children[0]
+    assert child.parent is loaded.rootPane and loaded.rootPane.parent is None
+    panes = [loaded.rootPane]
+    for pane in panes:
+        panes.extend(pane.children)
+    window = next(pane for pane in panes if isinstance(pane, Wnd1))
+    assert window.materialList is loaded.materialList
+    assert loaded.sectionIndex is None
+
+
+def test_lazy_layout_round_trip(bclyt_path):
+    eager = Bclyt(bclyt_path)
+    with Bclyt(bclyt_path, lazy=True) as lazy:
+        loaded = loads(dumps(lazy), Bclyt)
+    assert loaded._file is None and loaded._data is None
+    assert loaded.to_dict() == eager.to_dict()
+    assert loaded.export_bytes() == eager.export_bytes()
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_project_round_trip(msbp_path, columnar):
+    project = Msbp(msbp_path, columnar=columnar)
+    project.tagTable
+    loaded = loads(dumps(project), Msbp)
+
+    assert loaded.to_dict() == project.to_dict()
+    assert loaded.get_color('Color3') == project.get_color('Color3')
+    assert loaded.tagTable.entries == project.tagTable.entries
+
+    # The sections are views of their blocks again, with the sorted entries and the index rebuilt
+    assert loaded.clb1.entries is loaded.clb1.labelBlock.entries
+    assert loaded.clb1.sortedEntries == project.clb1.sortedEntries
+    assert loaded.clb1.index['Color3'] == project.clb1.index['Color3']
+
+
+def test_texture_round_trip():
+    bclim = Bclim.from_image(synthetic.build_image(20, 12), 'ETC1A4')
+    loaded = loads(dumps(bclim), Bclim)
+    # A texture made from an image has no filepath, which loads as None
+    assert vars(loaded) == dict(vars(bclim), filepath=None)
+    assert loaded.export_bytes() == bclim.export_bytes()
+
+
+def test_animation_round_trip(tmp_path):
+    path = tmp_path / "animation.bclan"
+    path.write_bytes(synthetic.build_bclan(8, byteOrder='big'))
+    animation = Bclan(str(path))
+    loaded = loads(dumps(animation), Bclan)
+
+    assert loaded.to_dict() == animation.to_dict()
+    target = loaded.animationInfo.entries[0].tags[0].targets[0]
+    assert target.frames.dtype == numpy.float32 and target.frames.flags.writeable
+    frames = numpy.arange(0, 120, 0.5)
+    assert numpy.array_equal(loaded.curves().evaluate(frames), animation.curves().evaluate(frames), equal_nan=True)
+
+
+def test_version_mismatch(bclyt_path):
+    data = bytearray(dumps(Bclyt(bclyt_path)))
+    struct.pack_into('<H', data, 4, DUMP_VERSION + 1)
+    with pytest.raises(ValueError, match="unsupported version"):
+        loads(bytes(data))
+
+
+def test_invalid_magic():
+    with pytest.raises(ValueError, match="invalid magic"):
+        loads(b'XXXX' + struct.pack('<H', DUMP_VERSION) + b'\0' * 8)
+
+
+def test_unknown_type_id():
+    # A dump of a single object of a type that isn't one of DUMP_TYPES
+    body = ((('ctr.util.data_stream', 'DataStream', ()),), ('B', b'\0'), ((1, ()),))
+    data = DUMP_HEADER.pack(DUMP_MAGIC, DUMP_VERSION) + marshal.dumps(body, MARSHAL_VERSION)
+    with pytest.raises(ValueError, match="isn't one of the types"):
+        loads(data)
+
+
+def test_changed_fields_are_refused(bclyt_path):
+    # A dump made before a field of Pan1 was renamed
+    data = dumps(Bclyt(bclyt_path))
+    types, order, groups = marshal.loads(data[DUMP_HEADER.size:])
+    types = tuple((module, qualname, tuple('visible' if name == 'isVisible' else name for name in fields))
+                  for module, qualname, fields in types)
+    data = data[:DUMP_HEADER.size] + marshal.dumps((types, order, groups), MARSHAL_VERSION)
+    with pytest.raises(ValueError, match="Dump the model again"):
+        loads(data)
+
+
+def test_truncated_dump(bclyt_path):
+    data = dumps(Bclyt(bclyt_path))
+    with pytest.raises(ValueError):
+        loads(data[:len(data) // 2])
+
+
+def test_other_types_are_rejected(bclyt_path):
+    layout = Bclyt(bclyt_path)
+    layout.rootPane.userData.append(DataStream)
+    with pytest.raises(ValueError, match="isn't one of the types"):
+        dumps(layout)
+    with pytest.raises(ValueError, match="expected a Msbp"):
+        loads(dumps(Bclyt(bclyt_path)), Msbp)
@@ -0,0 +1,198 @@
+import io
+import json
+import struct
+
+import pytest
+
+from ctr.msbp import COLOR_BLOCKS, Msbp
+from ctr.util.serialize import to_json
+from ctr.lib.lms.common.lmsLabelIndex import lmsLabelIndex, lms_label_hash
+from ctr.lib.lms.common.lmsControlCodes import controlTag, controlTagEnd
+
+import synthetic
+
+
+def label_block(labels: list[str], byteOrder: str, bucketCount: int = 7) -> bytes:
+    """Builds the data of a label block (from the bucket count on), with the labels in their buckets."""
+    builder = synthetic.ProjectBuilder(byteOrder)
+    builder.label_block('LBL1', labels, bucketCount)
+    size = struct.unpack_from(synthetic.PREFIXES[byteOrder] + 'I', builder.blocks[0], 4)[0]
+    return builder.blocks[0][0x10:0x10 + size]
+
+
+def test_label_hash_matches_builder():
+    for label in ('Red', 'Color12', 'ラベル', ''):
+        assert lms_label_hash(label, 101) == synthetic.lms_hash(label, 101)
+
+
+@pytest.mark.parametrize('prebuilt', [False, True])
+def test_label_index_lookup(byteOrder, prebuilt):
+    labels = ['Label%d' % i for i in range(30)] + ['ラベル']
+    index = lmsLabelIndex(label_block(labels, byteOrder), byteOrder, prebuilt)
+    for itemIndex, label in enumerate(labels):
+        assert index[label] == itemIndex
+        assert label in index
+    assert index.get('Missing') is None
+    assert 'Missing' not in index
+    with pytest.raises(KeyError):
+        index['Missing']
+
+
+def test_label_index_caches_buckets():
+    index = lmsLabelIndex(label_block(['A', 'B', 'C'], 'little'), 'little')
+    index.get('A')
+    assert list(index.buckets) == [lms_label_hash('A', 7)]
+
+
+def test_empty_label_block():
+    index = lmsLabelIndex(struct.pack('<I', 0), 'little')
+    assert index.get('A', -1) == -1
+
+
+def test_label_index_from_labels():
+    index = lmsLabelIndex.from_labels([('A', 0), ('B', 1), ('ラベル', 2)], 7)
+    assert (index['ラベル'], index.get('Missing'), index.bucketCount) == (2, None, 7)
+    assert index.blockData is None
+    index.prebuild()
+    assert index['B'] == 1
+
+
+def test_label_block_index_is_built_on_use(msbp_path):
+    project = Msbp(msbp_path)
+    block = project.clb1.labelBlock
+    assert block._index is None
+    assert project.clb1.index is block.index is block._index
+    assert block.index.bucketCount == 101
+    assert all(project.clb1.index[entry.label] == entry.itemIndex for entry in project.clb1.entries)
+
+
+def test_project_label_lookups(msbp_path):
+    project = Msbp(msbp_path)
+    assert project.get_color('Color3') == (3, 0, 128, 255)
+    assert project.get_style('Style2').regionWidth == 102
+    assert project.get_attribute('Attribute1').offset == 4
+    assert project.get_color('Missing') is None
+
+
+@pytest.mark.parametrize('block, entries', [('clr1', 'colors'), ('ati2', 'attributes'), ('syl3', 'styles')])
+def test_columnar_blocks_match_records(msbp_path, block, entries):
+    records = getattr(getattr(Msbp(msbp_path), block), entries)
+    columns = getattr(getattr(Msbp(msbp_path, columnar=True), block), entries)
+    assert len(columns) == len(records) > 1
+
+    # Iterating and indexing the columns build the same records
+    assert list(columns) == records
+    assert [columns[i] for i in range(len(records))] == records
+    assert all(type(entry) is type(records[0]) for entry in columns)
+
+    # Each column holds the values of its field
+    for name in records[0]._fields:
+        column = getattr(columns, name)
+        values = column.tolist()
+        if column.ndim > 1:
+            values = [tuple(value) for value in values]
+        assert values == [getattr(entry, name) for entry in records]
+
+
+def test_control_code_decoding(msbp_path, byteOrder):
+    project = Msbp(msbp_path)
+    decoder = project.control_code_decoder(byteOrder)
+    segments = decoder.decode(synthetic.build_messages(1, 3, byteOrder=byteOrder)[0])
+
+    assert [type(segment) for segment in segments] == [str, controlTag, str, controlTagEnd, str, controlTag, str, controlTag]
+    assert segments[0] == 'Word0 '
+
+    ruby = segments[1]
+    assert (ruby.groupIndex, ruby.tagIndex, ruby.tag.name) == (0, 0, 'Ruby0')
+    assert ruby.parameters == {'size': 0}
+    assert segments[2] == 'kanji'
+    assert segments[3] == controlTagEnd(0, 0)
+
+    # A string parameter, and a list parameter decoded as its item
+    font = segments[5]
+    assert font.tag.name == 'Font1'
+    assert font.parameters == {'face': 'Face1', 'kind': 'small'}
+
+    pageBreak = segments[7]
+    assert pageBreak.tag.name == 'PageBreak0'
+    assert pageBreak.values == ()
+
+
+def test_unknown_tag_keeps_raw_parameters(msbp_path):
+    decoder = Msbp(msbp_path).control_code_decoder('little')
+    message = 'A'.encode('utf-16-le') + struct.pack('<4H', 0x0E, 9, 9, 2) + b'\x01\x02' + 'B'.encode('utf-16-le')
+    segments = decoder.decode(message)
+    assert segments[0] == 'A' and segments[2] == 'B'
+    assert segments[1].tag is None
+    assert segments[1].values == b'\x01\x02'
+
+
+def test_mismatched_parameter_size_keeps_raw_parameters(msbp_path):
+    decoder = Msbp(msbp_path).control_code_decoder('little')
+    message = struct.pack('<4H', 0x0E, 0, 0, 4) + b'\x01\x02\x03\x04'
+    assert decoder.decode(message)[0].values == b'\x01\x02\x03\x04'
+
+
+@pytest.mark.parametrize('message', [
+    # The header of a tag, its parameters and the end of a tag cut off by the end of the message
+    'A'.encode('utf-16-le') + struct.pack('<2H', 0x0E, 0),
+    'A'.encode('utf-16-le') + struct.pack('<4H', 0x0E, 0, 0, 2),
+    'A'.encode('utf-16-le') + struct.pack('<2H', 0x0F, 0),
+])
+def test_truncated_message(msbp_path, message):
+    decoder = Msbp(msbp_path).control_code_decoder('little')
+    with pytest.raises(ValueError, match="truncated"):
+        decoder.decode(message)
+
+
+def test_string_parameter_past_the_parameters_keeps_raw_parameters(msbp_path):
+    decoder = Msbp(msbp_path).control_code_decoder('little')
+    # Font0's face is 0x20 bytes long, but the parameters stop after 2 of them, and one only holds half a length
+    parameters = struct.pack('<H', 0x20) + 'F'.encode('utf-16-le')
+    message = struct.pack('<4H', 0x0E, 0, 1, len(parameters)) + parameters + 'B'.encode('utf-16-le')
+    assert decoder.decode(message) == [controlTag(0, 1, decoder.tagTable[(0, 1)], parameters), 'B']
+    message = struct.pack('<4H', 0x0E, 0, 1, 1) + b'\x05\x00'
+    assert decoder.decode(message)[0].values == b'\x05'
+
+
+def test_project_to_json_file(msbp_path, tmp_path):
+    project = Msbp(msbp_path)
+    jsonPath = str(tmp_path / "project.json")
+    project.to_json(jsonPath)
+    with open(jsonPath, encoding="utf-8") as f:
+        assert f.read() == to_json(project.to_dict(), indent=2)
+
+    # Writing again replaces the file
+    project.to_json(jsonPath, pretty=False)
+    with open(jsonPath, encoding="utf-8") as f:
+        assert f.read() == to_json(project.to_dict(), compact=True)
+
+
+def test_selective_decoding_skips_missing_sections(msbp_path):
+    full = Msbp(msbp_path).to_dict()
+    project = Msbp(msbp_path, blocks=COLOR_BLOCKS)
+    assert project.ati2 is None and project.cti1 is None
+
+    expected = {"header": full["header"], "colorData": full["colorData"]}
+    assert project.to_dict() == expected
+    assert json.loads(str(project)) == json.loads(to_json(expected))
+    output = io.StringIO()
+    project.export_json(output)
+    assert output.getvalue() == to_json(expected, indent=2)
+
+    with pytest.raises(ValueError, match="tag table"):
+        project.tagTable
+
+
+def test_project_json_escapes_non_ascii(tmp_path):
+    # Projects have always been written with non-ASCII characters escaped, as by json.dumps' defaults
+    path = tmp_path / "project.msbp"
+    path.write_bytes(synthetic.build_msbp(colorCount=4).replace(b'Color0', 'Colé0'.encode('utf-8'), 1))
+    project = Msbp(str(path))
+    assert 'Colé0' in project.to_dict()["colorData"]
+
+    assert str(project) == json.dumps(project.to_dict(), indent=3)
+    jsonPath = str(tmp_path / "project.json")
+    project.to_json(jsonPath)
+    with open(jsonPath, encoding="ascii") as f:
+        assert f.read() == json.dumps(project.to_dict(), indent=2)
@@ -0,0 +1,76 @@
+from ctr.util.data_stream import DataStream
+from ctr.util.write_stream import WriteStream
+from ctr.util.schema import Schema, uint8, uint16, int16, uint32, float32, vector2, string, padding, bits, bitfield, rgba8_array
+
+RECORD_SCHEMA = Schema(
+    string('name', 0x10),
+    uint8('count'),
+    padding(1),
+    int16('offset'),
+    uint32('flags'),
+    float32('rotation'),
+    vector2('scale'),
+    rgba8_array('colors', 2),
+    bits('H', bitfield('visible', 0), bitfield('mode', 1, 3, int)),
+)
+
+class Record:
+    pass
+
+def make_record() -> Record:
+    record = Record()
+    record.name = 'N_record'
+    record.count = 7
+    record.offset = -1234
+    record.flags = 0xDEADBEEF
+    record.rotation = 0.5
+    record.scale = (2.0, -4.0)
+    record.colors = [(1, 2, 3, 4), (255, 128, 0, 255)]
+    record.visible = True
+    record.mode = 5
+    return record
+
+
+def test_schema_round_trip(byteOrder):
+    data = WriteStream(None, byteOrder)
+    RECORD_SCHEMA.write(make_record(), data)
+    encoded = data.getvalue()
+    assert len(encoded) == RECORD_SCHEMA.size
+
+    record = Record()
+    RECORD_SCHEMA.read(record, DataStream(encoded, byteOrder))
+    assert vars(record) == vars(make_record())
+
+    # Writing what was read gives the same bytes again
+    data = WriteStream(None, byteOrder)
+    RECORD_SCHEMA.write(record, data)
+    assert data.getvalue() == encoded
+
+
+def test_schema_read_values_matches_read(byteOrder):
+    data = WriteStream(None, byteOrder)
+    RECORD_SCHEMA.write(make_record(), data)
+    encoded = data.getvalue()
+
+    record = Record()
+    RECORD_SCHEMA.read(record, DataStream(encoded, byteOrder))
+    assert RECORD_SCHEMA.read_values(DataStream(encoded, byteOrder)) == tuple(getattr(record, name) for name in RECORD_SCHEMA.names)
+
+
+def test_schema_byte_order():
+    schema = Schema(uint16('value'))
+    record = Record()
+    record.value = 0x1234
+
+    little = WriteStream(None, 'little')
+    schema.write(record, little)
+    big = WriteStream(None, 'big')
+    schema.write(record, big)
+    assert little.getvalue() == b'\x34\x12'
+    assert big.getvalue() == b'\x12\x34'
+
+
+def test_schema_read_advances_the_stream():
+    data = DataStream(bytes(RECORD_SCHEMA.size * 2))
+    RECORD_SCHEMA.read(Record(), data)
+    assert data.tell() == RECORD_SCHEMA.size
@@ -0,0 +1,97 @@
+import io
+import json
+
+from ctr.bclyt import Bclyt
+from ctr.msbp import Msbp
+from ctr.util.serialize import JsonWriter, StreamedArray, StreamedObject, XmlSerialize, to_json
+
+DOCUMENT = {
+    "name": "ともだち",
+    "values": [1, 2.5, None, True, "é"],
+    "nested": {"empty": {}, "list": [], "ключ": ["значение"]},
+}
+
+def streamed(value):
+    """Turns the dicts and lists of a document into streamed containers."""
+    if isinstance(value, dict):
+        return StreamedObject((key, streamed(member)) for key, member in value.items())
+    if isinstance(value, list):
+        return StreamedArray(streamed(member) for member in value)
+    return value
+
+def write(value, file=None, **options) -> str:
+    file = file if file is not None else io.StringIO()
+    JsonWriter(file, **options).write(value)
+    return file.getvalue()
+
+
+def test_writer_matches_to_json():
+    for indent, compact in ((None, False), (None, True), (2, False), (3, False)):
+        expected = to_json(DOCUMENT, indent, compact)
+        assert write(streamed(DOCUMENT), indent=indent, compact=compact, chunkSize=2) == expected
+        assert write(DOCUMENT, indent=indent, compact=compact) == expected
+
+
+def test_writer_escapes_with_ascii():
+    for encoding in ("ascii", "latin-1", "cp1252"):
+        buffer = io.BytesIO()
+        file = io.TextIOWrapper(buffer, encoding=encoding)
+        JsonWriter(file, 2, ascii=True).write(streamed(DOCUMENT))
+        file.flush()
+        assert buffer.getvalue().decode("ascii") == to_json(DOCUMENT, 2, ascii=True)
+        assert json.loads(buffer.getvalue()) == DOCUMENT
+
+
+def test_writer_output_does_not_depend_on_the_stream():
+    # Without ascii the characters are written as they are, whatever the encoding of the stream
+    document = {"é": ["é", 1]}
+    for encoding in ("utf-8", "latin-1"):
+        buffer = io.BytesIO()
+        file = io.TextIOWrapper(buffer, encoding=encoding)
+        JsonWriter(file).write(streamed(document))
+        file.flush()
+        assert buffer.getvalue().decode(encoding) == to_json(document) == '{"é": ["é", 1]}'
+
+
+def test_export_json_to_ascii_file(bclyt_path, msbp_path, tmp_path):
+    for model in (Bclyt(bclyt_path), Msbp(msbp_path)):
+        jsonPath = tmp_path / "model.json"
+        with open(jsonPath, "w", encoding="ascii") as f:
+            model.export_json(f, ascii=True)
+        with open(jsonPath, encoding="ascii") as f:
+            assert json.load(f) == json.loads(str(model))
+
+
+def build_xml() -> XmlSerialize:
+    document = XmlSerialize("Layout", version="1")
+    document.add("Panes")
+    document.add("Groups")
+    for i in range(3):
+        document.insert_from_tag("Panes", "Pane", None, name="P_%d" % i)
+        document.insert_from_attr({"name": "P_%d" % i}, "Text", "ともだち & <%d>" % i, quote='"\n\t')
+    document.insert_from_tag("Groups", "Group", "", name="G")
+    return document
+
+
+def test_xml_write_matches_serialize():
+    for encoding in ("utf-8", "UTF-8", "ascii"):
+        text = io.StringIO()
+        build_xml().write(text, encoding)
+        assert text.getvalue() == build_xml().serialize(encoding)
+
+        binary = io.BytesIO()
+        build_xml().write(binary, encoding, bufferSize=16)
+        assert binary.getvalue() == build_xml().serialize(encoding).encode(encoding, "xmlcharrefreplace")
+
+
+def test_xml_write_leaves_document_unchanged():
+    document = build_xml()
+    before = [(element.text, element.tail) for element in document.document.iter()]
+    document.write(io.StringIO())
+    assert [(element.text, element.tail) for element in document.document.iter()] == before
+
+    # Writing after serialize (which indents the document) gives the same text again
+    text = io.StringIO()
+    serialized = document.serialize("utf-8")
+    document.write(text)
+    assert text.getvalue() == serialized
@@ -0,0 +1,103 @@
+import numpy
+import pytest
+
+from ctr.bclim import Bclim
+from ctr.util.data_stream import DataStream
+from ctr.lib.texture.formats import FORMAT_IDS, TEXTURE_FORMATS, decode_texture, encode_texture
+from ctr.lib.texture.swizzle import etc1_order, tile, tile_order, untile
+from ctr.lib.texture.etc1_encoder import encode_etc1
+from ctr.lib.texture.etc1 import decode_etc1
+
+import synthetic
+
+# The formats that store all 8 bits of the channels they have
+EXACT_FORMATS = ('RGBA8', 'RGB8', 'HILO8', 'A8')
+
+
+def psnr(a: numpy.ndarray, b: numpy.ndarray) -> float:
+    error = numpy.mean((a.astype(numpy.float64) - b.astype(numpy.float64)) ** 2)
+    return 10 * numpy.log10(255 ** 2 / error) if error else numpy.inf
+
+
+@pytest.mark.parametrize('etc1', [False, True])
+def test_tile_untile_inverse(etc1):
+    image = synthetic.build_image(32, 16)
+    order = (etc1_order if etc1 else tile_order)(32, 16)
+    assert numpy.array_equal(untile(tile(image, order), order), image)
+
+
+def test_tile_order_is_a_permutation():
+    order = tile_order(64, 32)
+    assert numpy.array_equal(numpy.sort(order.reshape(-1)), numpy.arange(64 * 32))
+
+
+def test_untile_requires_multiples_of_8():
+    with pytest.raises(ValueError):
+        tile_order(12, 8)
+
+
+def test_rgba8_round_trip_is_exact():
+    image = synthetic.build_image(16, 16)
+    data = encode_texture(image, FORMAT_IDS['RGBA8'])
+    assert numpy.array_equal(decode_texture(data, 16, 16, FORMAT_IDS['RGBA8']), image)
+
+
+@pytest.mark.parametrize('name', [textureFormat.name for textureFormat in TEXTURE_FORMATS.values() if not textureFormat.name.startswith('ETC1')])
+def test_format_round_trip_is_stable(name):
+    """Decoding and encoding again gives the same data back, for the values every format can hold."""
+    formatId = FORMAT_IDS[name]
+    data = bytes(synthetic.build_bclim(16, 16, formatId)[:16 * 16 * TEXTURE_FORMATS[formatId].bitsPerPixel // 8])
+    decoded = decode_texture(data, 16, 16, formatId)
+    assert decode_texture(encode_texture(decoded, formatId), 16, 16, formatId).tolist() == decoded.tolist()
+    if name in EXACT_FORMATS:
+        assert encode_texture(decoded, formatId) == data
+
+
+@pytest.mark.parametrize('quality', ['fast', 'full'])
+def test_etc1_round_trip(quality):
+    image = synthetic.build_image(16, 16)
+    data = encode_texture(image, FORMAT_IDS['ETC1'], quality)
+    assert len(data) == 16 * 16 // 2
+    decoded = decode_texture(data, 16, 16, FORMAT_IDS['ETC1'])
+    assert psnr(decoded[:, :, :3], image[:, :, :3]) > 25
+    assert (decoded[:, :, 3] == 255).all()
+
+
+def test_etc1_full_is_not_worse_than_fast():
+    image = synthetic.build_image(16, 16, seed=3)
+    decoded = {quality: decode_texture(encode_texture(image, FORMAT_IDS['ETC1'], quality), 16, 16, FORMAT_IDS['ETC1']) for quality in ('fast', 'full')}
+    assert psnr(decoded['full'][:, :, :3], image[:, :, :3]) >= psnr(decoded['fast'][:, :, :3], image[:, :, :3])
+
+
+def test_etc1a4_alpha():
+    image = synthetic.build_image(8, 8)
+    decoded = decode_texture(encode_texture(image, FORMAT_IDS['ETC1A4']), 8, 8, FORMAT_IDS['ETC1A4'])
+    # The alpha is stored with 4 bits, expanded by repeating them
+    assert numpy.array_equal(decoded[:, :, 3], ((image[:, :, 3].astype(int) * 15 + 127) // 255) * 17)
+
+
+def test_etc1_encoding_is_deterministic_across_jobs():
+    pixels = tile(synthetic.build_image(16, 16), etc1_order(16, 16))
+    assert encode_etc1(pixels, jobs=1) == encode_etc1(pixels, jobs=2)
+
+
+def test_etc1_solid_block():
+    pixels = numpy.tile(numpy.array([[96, 160, 32, 255]], dtype=numpy.uint8), (16, 1))
+    decoded = decode_etc1(encode_etc1(pixels, quality='full'), 1)
+    assert numpy.abs(decoded.astype(int) - pixels).max() <= 4
+
+
+@pytest.mark.parametrize('name', ['RGBA8', 'RGB565', 'ETC1', 'ETC1A4'])
+def test_bclim_round_trip(name):
+    image = synthetic.build_image(20, 12)
+    bclim = Bclim.from_image(image, name)
+    encoded = bclim.export_bytes()
+
+    read = Bclim()
+    read.read(DataStream(encoded))
+    assert (read.width, read.height, read.formatName) == (20, 12, name)
+    assert read.imageData == bclim.imageData
+    assert read.export_bytes() == encoded
+    assert read.decode().shape == (12, 20, 4)
+    if name == 'RGBA8':
+        assert numpy.array_equal(read.decode(), image)
@@ -0,0 +1,115 @@
+import numpy
+
+from ctr.bclim import Bclim
+from ctr.util.data_stream import DataStream
+from ctr.lib.texture.cache import TextureCache, texture_key
+from ctr.lib.texture.formats import FORMAT_IDS
+
+import synthetic
+
+# An 8x8 RGBA8 image decodes to 256 bytes
+IMAGE_BYTES = 8 * 8 * 4
+
+
+def bclim(seed: int, format: str = 'RGBA8') -> bytes:
+    return synthetic.build_bclim(8, 8, FORMAT_IDS[format], seed=seed)
+
+
+def decoded(data: bytes, **options) -> numpy.ndarray:
+    texture = Bclim()
+    texture.read(DataStream(data))
+    return texture.decode(**options)
+
+
+def test_hits_and_misses():
+    cache = TextureCache()
+    data = bclim(0)
+    image = cache.get(data)
+    assert numpy.array_equal(image, decoded(data))
+    assert not image.flags.writeable
+
+    # The same bytes are a hit, whatever file they came from, and the same array is returned
+    assert cache.get(bytes(data)) is image
+    stats = cache.stats
+    assert (stats.hits, stats.diskHits, stats.misses, stats.evictions) == (1, 0, 1, 0)
+    assert (stats.entries, stats.currentBytes) == (1, IMAGE_BYTES)
+    assert stats.hitRate == 0.5
+
+
+def test_least_recently_used_is_evicted_by_bytes():
+    cache = TextureCache(3 * IMAGE_BYTES)
+    textures = [bclim(seed) for seed in range(4)]
+    for data in textures[:3]:
+        cache.get(data)
+
+    # Using the first texture again makes the second the least recently used, so it's the one evicted
+    cache.get(textures[0])
+    cache.get(textures[3])
+    stats = cache.stats
+    assert (stats.entries, stats.currentBytes, stats.evictions) == (3, 3 * IMAGE_BYTES, 1)
+    assert list(cache.entries) == [texture_key(data) for data in (textures[2], textures[0], textures[3])]
+
+    cache.get(textures[1])
+    assert cache.stats.misses == 5
+
+
+def test_images_larger_than_the_cache_are_not_kept():
+    cache = TextureCache(IMAGE_BYTES - 1)
+    cache.get(bclim(0))
+    cache.get(bclim(0))
+    assert cache.stats.entries == 0 and cache.stats.misses == 2
+
+
+def test_keys_are_separated_by_decode_options():
+    data = bclim(0, 'ETC1')
+    assert texture_key(data) != texture_key(data, bandHeight=8)
+    assert texture_key(data, bandHeight=8) != texture_key(data, bandHeight=16)
+    assert texture_key(data, bandHeight=8) == texture_key(bytes(data), bandHeight=8)
+
+    cache = TextureCache()
+    whole = cache.get(data)
+    banded = cache.get(data, bandHeight=8)
+    assert whole is not banded and numpy.array_equal(whole, banded)
+    assert cache.stats.misses == 2 and cache.stats.entries == 2
+
+
+def test_disk_tier_is_memory_mapped(tmp_path):
+    data = bclim(0)
+    image = TextureCache(directory=str(tmp_path)).get(data)
+    assert (tmp_path / (texture_key(data) + '.npy')).exists()
+
+    # A new cache (as in another run) loads the saved image instead of decoding it
+    cache = TextureCache(directory=str(tmp_path))
+    loaded = cache.get(data)
+    assert isinstance(loaded, numpy.memmap) and loaded.mode == 'r'
+    assert not loaded.flags.writeable
+    assert numpy.array_equal(loaded, image)
+    stats = cache.stats
+    assert (stats.hits, stats.diskHits, stats.misses) == (0, 1, 0)
+
+    # After that it's in memory
+    assert cache.get(data) is loaded and cache.stats.hits == 1
+
+
+def test_unreadable_disk_entries_are_decoded_again(tmp_path):
+    data = bclim(0)
+    (tmp_path / (texture_key(data) + '.npy')).write_bytes(b'not an array')
+    cache = TextureCache(directory=str(tmp_path))
+    assert numpy.array_equal(cache.get(data), decoded(data))
+    assert cache.stats.misses == 1
+    assert numpy.array_equal(numpy.load(tmp_path / (texture_key(data) + '.npy')), decoded(data))
+
+
+def test_clear(tmp_path):
+    data = bclim(0)
+    cache = TextureCache(directory=str(tmp_path))
+    cache.get(data)
+    cache.clear()
+    assert (cache.stats.entries, cache.stats.currentBytes) == (0, 0)
+    cache.get(data)
+    assert cache.stats.diskHits == 1
+
+    cache.clear(disk=True)
+    assert not list(tmp_path.glob('*.npy'))
+    cache.get(data)
+    assert cache.stats.misses == 2
@@ -0,0 +1,67 @@
+import io
+
+import pytest
+
+from ctr.util.data_stream import DataStream
+from ctr.util.write_stream import WriteStream
+
+
+def test_write_values(byteOrder):
+    data = WriteStream(None, byteOrder)
+    data.write_uint8(0xAB)
+    data.write_int16(-2)
+    data.write_uint32(0x01020304)
+    data.write_float(1.5)
+    data.write_string('CLYT')
+    data.write_string_nt('name')
+
+    stream = DataStream(data.getvalue(), byteOrder)
+    assert stream.read_uint8() == 0xAB
+    assert stream.read_int16() == -2
+    assert stream.read_uint32() == 0x01020304
+    assert stream.read_float() == 1.5
+    assert stream.read_string(4) == 'CLYT'
+    assert stream.read_string_nt() == 'name'
+
+
+def test_fixups_are_filled_in(byteOrder):
+    data = WriteStream(None, byteOrder)
+    data.write_string('sect')
+    size = data.reserve_uint32()
+    count = data.reserve_uint16()
+    data.write_bytes(bytes(10))
+    size.set(data.tell())
+    count.set(3)
+
+    stream = DataStream(data.getvalue(), byteOrder)
+    stream.seek(4)
+    assert stream.read_uint32() == 20
+    assert stream.read_uint16() == 3
+
+
+def test_unset_fixup_raises():
+    data = WriteStream()
+    data.reserve_uint32()
+    with pytest.raises(ValueError):
+        data.getvalue()
+
+
+def test_seek_overwrites_and_pads():
+    data = WriteStream()
+    data.write_bytes(b'abcd')
+    data.seek(1)
+    data.write_bytes(b'X')
+    assert data.tell() == 2
+    data.seek(8)
+    data.write_bytes(b'Z')
+    assert data.getvalue() == b'aXcd\0\0\0\0Z'
+
+
+def test_flush_writes_once():
+    output = io.BytesIO()
+    data = WriteStream(output)
+    size = data.reserve_uint32()
+    data.write_uint16(1)
+    size.set(6)
+    data.flush()
+    assert output.getvalue() == b'\x06\0\0\0\x01\0'